@@ -0,0 +1,142 @@
+#!/usr/bin/python
+"""
+    dispatch
+    ========
+
+    Measure the per-call overhead of dispatching requests through clients.
+
+    Clients are backed by in-memory sessions returning the test fixtures,
+    so only the time spent in the client itself is measured: routing,
+    network type resolution, retry bookkeeping, decoding and the cache.
+    The "decode" rows are the cost of decoding the response alone, and
+    the difference with the other rows is the dispatch overhead.
+
+    Usage:
+        python benchmarks/dispatch.py [-n NUMBER]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+import timeit
+
+from xpxchain import client
+from xpxchain import models
+from xpxchain.client import codec
+from xpxchain.client import nis
+
+DATADIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tests', 'data')
+ENDPOINT = 'http://localhost:3000'
+NETWORK_TYPE = models.NetworkType.MIJIN_TEST
+
+
+def load_content(name: str) -> bytes:
+    """Load the response body for a fixture."""
+
+    with open(os.path.join(DATADIR, name)) as f:
+        return json.load(f)['content'].encode('utf-8')
+
+
+class Response:
+    """Minimal synchronous and asynchronous response."""
+
+    def __init__(self, content: bytes) -> None:
+        self.content = content
+        self.status = self.status_code = 200
+
+    def raise_for_status(self) -> None:
+        pass
+
+    async def read(self) -> bytes:
+        return self.content
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+class Session:
+    """In-memory session, returning the same response for every request."""
+
+    def __init__(self, content: bytes) -> None:
+        self.response = Response(content)
+        self.closed = False
+
+    def get(self, url, **kwds) -> Response:
+        return self.response
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class AsyncSession(Session):
+    """In-memory asynchronous session."""
+
+    async def close(self) -> None:  # type: ignore
+        self.closed = True
+
+
+def report(name: str, elapsed: float, number: int) -> None:
+    print(f'{name:<28}{elapsed / number * 1e6:>10.2f}')
+
+
+def bench_sync(number: int) -> None:
+    height = load_content('chain_height.json')
+    block = load_content('block_info.json')
+
+    decode = lambda: nis.process_get_blockchain_height(200, codec.loads(height), NETWORK_TYPE)  # noqa: E731
+    report('decode height', min(timeit.repeat(decode, number=number, repeat=3)), number)
+
+    with client.BlockchainHTTP(ENDPOINT, network_type=NETWORK_TYPE) as http:
+        http.raw._session = Session(height)
+        elapsed = min(timeit.repeat(http.get_blockchain_height, number=number, repeat=3))
+        report('sync height', elapsed, number)
+
+    # Height 1 is the only block served, so treat it as final.
+    cache = client.ResponseCache(confirmations=0)
+    with client.BlockchainHTTP(ENDPOINT, network_type=NETWORK_TYPE, cache=cache) as http:
+        http.raw._session = Session(block)
+        elapsed = min(timeit.repeat(lambda: http.get_block_by_height(1), number=number, repeat=3))
+        report('sync cached block', elapsed, number)
+
+
+async def bench_async(number: int) -> None:
+    height = load_content('chain_height.json')
+    block = load_content('block_info.json')
+
+    async def run(call):
+        best = float('inf')
+        for _ in range(3):
+            start = time.perf_counter()
+            for _ in range(number):
+                await call()
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    async with client.AsyncBlockchainHTTP(ENDPOINT, network_type=NETWORK_TYPE) as http:
+        http.raw._session = AsyncSession(height)
+        report('async height', await run(http.get_blockchain_height), number)
+
+    # Height 1 is the only block served, so treat it as final.
+    cache = client.ResponseCache(confirmations=0)
+    async with client.AsyncBlockchainHTTP(ENDPOINT, network_type=NETWORK_TYPE, cache=cache) as http:
+        http.raw._session = AsyncSession(block)
+        report('async cached block', await run(lambda: http.get_block_by_height(1)), number)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure client dispatch overhead.')
+    parser.add_argument('-n', '--number', type=int, default=20000, help='calls per measurement')
+    args = parser.parse_args()
+
+    print(f'{"call":<28}{"time (us)":>10}')
+    bench_sync(args.number)
+    asyncio.get_event_loop().run_until_complete(bench_async(args.number))
+
+
+if __name__ == '__main__':
+    main()
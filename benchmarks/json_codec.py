@@ -0,0 +1,56 @@
+#!/usr/bin/python
+"""
+    json_codec
+    ==========
+
+    Compare JSON backends decoding large REST responses.
+
+    Builds a `/blocks/{height}/limit/{limit}` and a transactions payload
+    from the test fixtures, and reports the time to decode each with
+    every installed backend.
+
+    Usage:
+        python benchmarks/json_codec.py [-n COUNT] [-r REPEAT]
+"""
+
+import argparse
+import json
+import os
+import timeit
+
+from xpxchain.client import codec
+
+DATADIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tests', 'data')
+
+
+def load_payload(name: str, count: int) -> bytes:
+    """Build a list response with `count` elements from a fixture."""
+
+    with open(os.path.join(DATADIR, name)) as f:
+        elements = json.loads(json.load(f)['content'])
+    return json.dumps(elements * (count // len(elements) + 1)).encode('utf-8')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare JSON backends.')
+    parser.add_argument('-n', '--count', type=int, default=100, help='elements per payload')
+    parser.add_argument('-r', '--repeat', type=int, default=200, help='decodes per backend')
+    args = parser.parse_args()
+
+    payloads = {
+        'blocks': load_payload('blocks_info.json', args.count),
+        'transactions': load_payload('transactions.json', args.count),
+    }
+    names = codec.available_codecs()
+    print(f'{"payload":<14}{"backend":<10}{"size (KiB)":>12}{"time (ms)":>12}{"MiB/s":>10}')
+    for payload_name, payload in payloads.items():
+        for name in names:
+            loads = codec.load_codec(name).loads
+            elapsed = min(timeit.repeat(lambda: loads(payload), number=args.repeat, repeat=3))
+            per_call = elapsed / args.repeat
+            throughput = len(payload) / per_call / 2**20
+            print(f'{payload_name:<14}{name:<10}{len(payload) / 1024:>12.1f}{per_call * 1e3:>12.3f}{throughput:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
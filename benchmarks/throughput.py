@@ -0,0 +1,100 @@
+#!/usr/bin/python
+"""
+    throughput
+    ==========
+
+    Measure announce and confirmation throughput end to end.
+
+    Serves a stand-in node locally, announces pre-signed transfers through
+    an announce pipeline, and waits for their confirmation from listener
+    messages, so the whole client stack is exercised with no network.
+    Latency and error injection on the node simulate a remote, busy node.
+
+    Usage:
+        python benchmarks/throughput.py [-n COUNT] [-c CONCURRENCY] [--latency SECONDS]
+            [--error-rate RATE] [--block-interval SECONDS] [--lazy]
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+from xpxchain import client
+from xpxchain import models
+from xpxchain.testing import StandInNode
+
+NETWORK_TYPE = models.NetworkType.MIJIN_TEST
+
+
+def sign_transfers(count: int, generation_hash: str):
+    """Sign `count` transfers, from a single account."""
+
+    account = models.Account.generate_new_account(NETWORK_TYPE, entropy=lambda x: os.urandom(32))
+    transactions = []
+    for index in range(count):
+        transaction = models.TransferTransaction.create(
+            deadline=models.Deadline.create(),
+            recipient=account.address,
+            network_type=NETWORK_TYPE,
+            message=models.PlainMessage(index.to_bytes(4, 'little')),
+        )
+        transactions.append(transaction.sign_with(account, generation_hash))
+    return account, transactions
+
+
+async def run(args) -> None:
+    node = StandInNode(
+        block_interval=args.block_interval,
+        latency=args.latency,
+        error_rate=args.error_rate,
+    )
+    async with node:
+        async with client.AsyncTransactionHTTP(node.endpoint, network_type=NETWORK_TYPE) as http:
+            async with client.AsyncBlockchainHTTP(node.endpoint, network_type=NETWORK_TYPE) as blockchain:
+                nemesis = await blockchain.get_block_by_height(1)
+            account, transactions = sign_transfers(args.count, nemesis.generation_hash)
+
+            pipeline = client.AnnouncePipeline([http], concurrency=args.concurrency)
+            listener = client.Listener(node.ws_endpoint, lazy=args.lazy)
+            async with listener, client.ConfirmationTracker(http) as tracker:
+                await listener.confirmed(account.address)
+                await listener.status(account.address)
+                consumer = asyncio.ensure_future(tracker.consume(listener))
+                # Track before announcing, so no confirmation is missed.
+                futures = [tracker.track(i) for i in transactions]
+
+                start = time.perf_counter()
+                failed = 0
+                async for outcome in pipeline.announce(transactions):
+                    failed += not outcome.ok
+                announced = time.perf_counter() - start
+                results = await asyncio.gather(*futures)
+                confirmed = time.perf_counter() - start
+                consumer.cancel()
+
+    ok = sum(isinstance(i, models.TransactionStatus) for i in results)
+    print(f'{"transactions":<24}{args.count:>12}')
+    print(f'{"announce failures":<24}{failed:>12}')
+    print(f'{"announce retries":<24}{pipeline.retries:>12}')
+    print(f'{"injected errors":<24}{node.errors:>12}')
+    print(f'{"announce rate (tx/s)":<24}{args.count / announced:>12.1f}')
+    print(f'{"confirmed":<24}{ok:>12}')
+    print(f'{"confirm time (s)":<24}{confirmed:>12.3f}')
+    print(f'{"models decoded":<24}{sum(listener.decoded.values()):>12}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure announce and confirmation throughput.')
+    parser.add_argument('-n', '--count', type=int, default=1000, help='transactions to announce')
+    parser.add_argument('-c', '--concurrency', type=int, default=32, help='in-flight announces')
+    parser.add_argument('--latency', type=float, default=0.005, help='seconds to delay each request by')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests to fail')
+    parser.add_argument('--block-interval', type=float, default=0.5, help='seconds between blocks')
+    parser.add_argument('--lazy', action='store_true', help='only decode listener messages when required')
+    args = parser.parse_args()
+    asyncio.get_event_loop().run_until_complete(run(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -9,6 +9,8 @@ import chardet
 import contextlib
 import copy
 import json
+import typing
+import urllib.parse
 import asyncio
 
 __version__ = "3.5.4"
@@ -18,8 +20,27 @@ class ClientError(Exception):
     pass
 
 
+class RequestInfo(typing.NamedTuple):
+    url: str
+    method: str
+    headers: dict
+    real_url: str
+
+
 class ClientResponseError(ClientError):
-    pass
+
+    def __init__(self, request_info=None, history=(), *, code=None, status=None, message='', headers=None):
+        super().__init__(request_info, history)
+        self.request_info = request_info
+        self.history = history
+        self.status = status if status is not None else code
+        self.message = message
+        self.headers = headers
+
+    def __str__(self):
+        if self.status is None:
+            return str(self.request_info)
+        return "{}, message={!r}, url={!r}".format(self.status, self.message, self.request_info.real_url)
 
 
 class ContentTypeError(ClientResponseError):
@@ -225,7 +246,8 @@ class ClientResponse:
 
     def raise_for_status(self):
         if self.status >= 400:
-            raise ClientResponseError("Error: {}".format(self.status))
+            request_info = RequestInfo(self._url, None, self._headers, self._url)
+            raise ClientResponseError(request_info, (), status=self.status, message="Error")
 
 
 class AsyncContextManager:
@@ -257,9 +279,24 @@ class AsyncContextManager:
         self._resp.release()
 
 
-class ClientSession:
+class TCPConnector:
 
     def __init__(self, **kwds):
+        self.kwds = kwds
+        self._closed = False
+
+    @property
+    def closed(self):
+        return self._closed
+
+    async def close(self):
+        self._closed = True
+
+
+class ClientSession:
+
+    def __init__(self, connector=None, **kwds):
+        self.connector = connector
         self._closed = False
 
     def __enter__(self):
@@ -285,7 +322,14 @@ class ClientSession:
         return AsyncContextManager(self._request(method, url, **kwds))
 
     async def _request(self, method, url, **kwds):
-        if EXCEPTION is not None:
+        host = urllib.parse.urlsplit(url).netloc
+        if host in ENDPOINT_EXCEPTIONS:
+            raise ENDPOINT_EXCEPTIONS[host]
+        elif host in ENDPOINT_RESPONSES:
+            response = copy.copy(ENDPOINT_RESPONSES[host])
+            response._url = url
+            return response
+        elif EXCEPTION is not None:
             raise EXCEPTION
         elif RESPONSE is None:
             raise RuntimeError("Must use within `default_response` block.")
@@ -319,6 +363,8 @@ class ClientSession:
 
 EXCEPTION = None
 RESPONSE = None
+ENDPOINT_EXCEPTIONS = {}
+ENDPOINT_RESPONSES = {}
 
 
 @contextlib.contextmanager
@@ -343,3 +389,25 @@ def default_response(status=200, **kwds):
         yield
     finally:
         RESPONSE = None
+
+
+@contextlib.contextmanager
+def endpoint_exception(endpoint, exception_type, *args, **kwds):
+    """Set the exception for a single endpoint (host and port)."""
+
+    try:
+        ENDPOINT_EXCEPTIONS[endpoint] = exception_type(*args, **kwds)
+        yield
+    finally:
+        ENDPOINT_EXCEPTIONS.pop(endpoint, None)
+
+
+@contextlib.contextmanager
+def endpoint_response(endpoint, status=200, **kwds):
+    """Set the response for a single endpoint (host and port)."""
+
+    try:
+        ENDPOINT_RESPONSES[endpoint] = ClientResponse.mock(status, **kwds)
+        yield
+    finally:
+        ENDPOINT_RESPONSES.pop(endpoint, None)
@@ -10,7 +10,9 @@ import contextlib
 import copy
 import datetime
 import json
+import urllib.parse
 
+from . import adapters
 from .exceptions import *
 
 __version__ = "2.21"
@@ -167,7 +169,10 @@ class Response:
 class Session:
 
     def __init__(self):
-        pass
+        self.adapters = {}
+
+    def mount(self, prefix, adapter):
+        self.adapters[prefix] = adapter
 
     def __enter__(self):
         return self
@@ -179,7 +184,14 @@ class Session:
         pass
 
     def request(self, method, url, **kwds):
-        if EXCEPTION is not None:
+        host = urllib.parse.urlsplit(url).netloc
+        if host in ENDPOINT_EXCEPTIONS:
+            raise ENDPOINT_EXCEPTIONS[host]
+        elif host in ENDPOINT_RESPONSES:
+            response = copy.copy(ENDPOINT_RESPONSES[host])
+            response.url = url
+            return response
+        elif EXCEPTION is not None:
             raise EXCEPTION
         elif RESPONSE is None:
             raise RuntimeError("Must use within `default_response` block.")
@@ -246,6 +258,8 @@ def delete(url, **kwds):
 
 EXCEPTION = None
 RESPONSE = None
+ENDPOINT_EXCEPTIONS = {}
+ENDPOINT_RESPONSES = {}
 
 
 @contextlib.contextmanager
@@ -270,3 +284,25 @@ def default_response(status_code=200, **kwds):
         yield
     finally:
         RESPONSE = None
+
+
+@contextlib.contextmanager
+def endpoint_exception(endpoint, exception_type, *args, **kwds):
+    """Set the exception for a single endpoint (host and port)."""
+
+    try:
+        ENDPOINT_EXCEPTIONS[endpoint] = exception_type(*args, **kwds)
+        yield
+    finally:
+        ENDPOINT_EXCEPTIONS.pop(endpoint, None)
+
+
+@contextlib.contextmanager
+def endpoint_response(endpoint, status_code=200, **kwds):
+    """Set the response for a single endpoint (host and port)."""
+
+    try:
+        ENDPOINT_RESPONSES[endpoint] = Response.mock(status_code, **kwds)
+        yield
+    finally:
+        ENDPOINT_RESPONSES.pop(endpoint, None)
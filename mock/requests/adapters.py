@@ -0,0 +1,18 @@
+"""
+    adapters
+    ========
+
+    Mock version of the `requests.adapters` module for unittesting.
+"""
+
+
+class HTTPAdapter:
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, max_retries=0, pool_block=False):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.max_retries = max_retries
+        self.pool_block = pool_block
+
+    def close(self):
+        pass
@@ -78,6 +78,8 @@ EXTRAS_REQUIRE = {
     'crypto': ['pycryptodome>=3.4', 'ed25519>=1.4', 'ed25519sha3>=1.4'],
     # Use ReactiveX for asynchronous code scheduling.
     'reactive': ['rx>=1.6'],
+    # Use a faster JSON decoder for REST responses and websocket messages.
+    'json': ['orjson>=2.0'],
 
     # TESTING / DOCUMENTATION
 
@@ -0,0 +1,93 @@
+import aiohttp
+import os
+
+from xpxchain import client
+from xpxchain import models
+from xpxchain.testing import StandInNode
+from tests import harness
+
+NETWORK_TYPE = models.NetworkType.MIJIN_TEST
+PRIVATE_KEY = '97131746d864f4c9001b1b86044d765ba08d7fddc7a0fa3abbc8d111c3dc6b4b'
+
+
+def sign_transfer(account, generation_hash):
+    transaction = models.TransferTransaction.create(
+        deadline=models.Deadline.create(),
+        recipient=account.address,
+        network_type=NETWORK_TYPE,
+        message=models.PlainMessage(b'Hello world'),
+    )
+    return transaction.sign_with(account, generation_hash)
+
+
+class TestStandInNode(harness.TestCase):
+
+    def setUp(self):
+        self.account = models.Account.create_from_private_key(PRIVATE_KEY, NETWORK_TYPE)
+
+    async def test_fixtures(self):
+        async with StandInNode(block_interval=None) as node:
+            async with client.AsyncHTTP(node.endpoint) as http:
+                self.assertEqual(await http.network.get_network_type(), NETWORK_TYPE)
+                self.assertEqual(await http.blockchain.get_blockchain_height(), 1)
+                self.assertEqual((await http.node.get_node_info()).friendly_name, 'api-node-0')
+        self.assertEqual(node.requests['GET /node/info'], 1)
+
+    async def test_chain(self):
+        async with StandInNode(block_interval=None) as node:
+            async with client.AsyncHTTP(node.endpoint) as http:
+                nemesis = await http.blockchain.get_block_by_height(1)
+                signed = sign_transfer(self.account, nemesis.generation_hash)
+                async with client.Listener(node.ws_endpoint) as listener:
+                    await listener.new_block()
+                    await listener.confirmed_added(self.account.address)
+                    await http.transaction.announce(signed)
+                    status = await http.transaction.get_transaction_status(signed.hash)
+                    self.assertEqual(status.group, models.TransactionStatusGroup.UNCONFIRMED)
+
+                    await node.add_block()
+                    block = await listener.__anext__()
+                    confirmed = await listener.__anext__()
+
+                self.assertEqual((block.channel_name, block.message.height), ('block', 2))
+                self.assertEqual(confirmed.channel_name, 'confirmedAdded')
+                self.assertEqual(confirmed.message.transaction_info.hash, signed.hash.upper())
+
+                status = await http.transaction.get_transaction_status(signed.hash)
+                self.assertEqual(status.group, models.TransactionStatusGroup.CONFIRMED)
+                self.assertEqual(status.height, 2)
+                blocks = await http.blockchain.get_blocks_by_height_with_limit(1, 25)
+                self.assertEqual(blocks[1].previous_block_hash, nemesis.hash)
+                self.assertEqual(len(await http.blockchain.get_block_transactions(2)), 1)
+
+    async def test_failures(self):
+        async with StandInNode(block_interval=0.01, failure_rate=1) as node:
+            async with client.AsyncHTTP(node.endpoint) as http:
+                nemesis = await http.blockchain.get_block_by_height(1)
+                signed = sign_transfer(self.account, nemesis.generation_hash)
+                async with client.Listener(node.ws_endpoint) as listener:
+                    await listener.status(self.account.address)
+                    await http.transaction.announce(signed)
+                    message = await listener.__anext__()
+
+        self.assertIsInstance(message.message, models.TransactionStatusError)
+        self.assertEqual(message.message.hash, signed.hash.upper())
+        self.assertGreater(node.height, 1)
+
+    async def test_errors(self):
+        async with StandInNode(block_interval=None, error_rate=1, error_status=429, seed=7) as node:
+            async with client.AsyncBlockchainHTTP(node.endpoint, network_type=NETWORK_TYPE) as http:
+                with self.assertRaises(aiohttp.ClientResponseError) as context:
+                    await http.get_blockchain_height()
+        self.assertEqual(context.exception.status, 429)
+        self.assertEqual(node.errors, 1)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            StandInNode(height=0)
+        with self.assertRaises(ValueError):
+            StandInNode(error_rate=2)
+        with self.assertRaises(RuntimeError):
+            StandInNode().endpoint
+        with self.assertRaises(FileNotFoundError):
+            StandInNode(data_dir=os.path.join(os.path.dirname(__file__), 'missing'))
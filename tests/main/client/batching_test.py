@@ -0,0 +1,122 @@
+import aiohttp
+import asyncio
+from unittest import mock
+
+from xpxchain import client
+from xpxchain import models
+from xpxchain.client import batching
+from tests import harness
+from tests import responses
+
+RULES = {
+    'get_item': batching.BatchRule(
+        ('get_item', 'async_get_item'),
+        ('get_items', 'async_get_items'),
+        lambda x: x,
+        lambda x: x['id'],
+    ),
+}
+
+
+class FakeNode:
+    """Fake NIS callbacks, storing each request made."""
+
+    def __init__(self, items):
+        self.items = items
+        self.requests = []
+
+    async def send(self, cbs, arg):
+        self.requests.append((cbs[0], arg))
+        await asyncio.sleep(0)
+        if cbs[0] == 'get_items':
+            return [self.items[i] for i in arg if i in self.items]
+        return self.items[arg]
+
+
+class TestBatcher(harness.TestCase):
+
+    def test_accepts(self):
+        batcher = batching.Batcher(rules=RULES)
+        self.assertTrue(batcher.accepts('get_item', [1], {}))
+        self.assertFalse(batcher.accepts('get_items', [[1]], {}))
+        self.assertFalse(batcher.accepts('get_item', [1], {'timeout': 5}))
+
+    async def test_batch(self):
+        batcher = batching.Batcher(rules=RULES)
+        node = FakeNode({i: {'id': i} for i in range(5)})
+        results = await asyncio.gather(*(batcher.load(node.send, 'get_item', i % 3) for i in range(6)))
+        self.assertEqual([i['id'] for i in results], [0, 1, 2, 0, 1, 2])
+        self.assertEqual(node.requests, [('get_items', [0, 1, 2])])
+        self.assertEqual((batcher.batches, batcher.items), (1, 6))
+
+    async def test_max_size(self):
+        batcher = batching.Batcher(max_size=2, rules=RULES)
+        node = FakeNode({i: {'id': i} for i in range(5)})
+        await asyncio.gather(*(batcher.load(node.send, 'get_item', i) for i in range(5)))
+        self.assertEqual(node.requests, [
+            ('get_items', [0, 1]),
+            ('get_items', [2, 3]),
+            ('get_items', [4]),
+        ])
+
+    async def test_window(self):
+        batcher = batching.Batcher(window=0.01, rules=RULES)
+        node = FakeNode({i: {'id': i} for i in range(5)})
+        first = asyncio.ensure_future(batcher.load(node.send, 'get_item', 0))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(batcher.load(node.send, 'get_item', 1))
+        await asyncio.gather(first, second)
+        self.assertEqual(node.requests, [('get_items', [0, 1])])
+
+    async def test_missing(self):
+        batcher = batching.Batcher(rules=RULES)
+        node = FakeNode({0: {'id': 0}})
+        results = await asyncio.gather(
+            batcher.load(node.send, 'get_item', 0),
+            batcher.load(node.send, 'get_item', 1),
+            return_exceptions=True,
+        )
+        self.assertEqual(results[0], {'id': 0})
+        self.assertIsInstance(results[1], KeyError)
+        self.assertEqual(node.requests, [('get_items', [0, 1]), ('get_item', 1)])
+
+    async def test_exception(self):
+        batcher = batching.Batcher(rules=RULES)
+
+        async def send(cbs, arg):
+            raise ConnectionRefusedError
+
+        results = await asyncio.gather(
+            batcher.load(send, 'get_item', 0),
+            batcher.load(send, 'get_item', 1),
+            return_exceptions=True,
+        )
+        self.assertTrue(all(isinstance(i, ConnectionRefusedError) for i in results))
+
+
+class TestBatching(harness.TestCase):
+
+    async def test_http(self):
+        address = models.Address('SD3MA6SM7GWRX4DEJVAZEGFXF7G7D36MA6TMSIBM')
+        network_type = models.NetworkType.MIJIN_TEST
+        async with client.AsyncHTTP(responses.ENDPOINT, network_type=network_type, batch_window=0) as http:
+            session = http.raw._session
+            with mock.patch.object(session, 'request', wraps=session.request) as request:
+                with aiohttp.default_response(200, **responses.ACCOUNTS_INFO["Ok"]):
+                    infos = await asyncio.gather(*(http.account.get_account_info(address) for _ in range(5)))
+                self.assertEqual(request.call_count, 1)
+                self.assertEqual(request.call_args[0][0], 'POST')
+
+            public_key = '7A562888C7AE1E082579951D6D93BF931DE979360ACCA4C4085D754E5E122808'
+            self.assertEqual([i.public_key for i in infos], [public_key] * 5)
+            self.assertIs(http.account.batcher, http.batcher)
+            self.assertEqual(http.batcher.batches, 1)
+
+    async def test_disabled(self):
+        address = models.Address('SD3MA6SM7GWRX4DEJVAZEGFXF7G7D36MA6TMSIBM')
+        network_type = models.NetworkType.MIJIN_TEST
+        async with client.AsyncAccountHTTP(responses.ENDPOINT, network_type=network_type) as http:
+            self.assertIs(http.batcher, None)
+            with aiohttp.default_response(200, **responses.ACCOUNT_INFO["Ok"]):
+                info = await http.get_account_info(address)
+            self.assertEqual(info.address, address)
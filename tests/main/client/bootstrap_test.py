@@ -0,0 +1,144 @@
+import aiohttp
+import json
+import os
+import requests
+import tempfile
+from unittest import mock
+
+from xpxchain import client
+from xpxchain import models
+from tests import harness
+from tests import responses
+
+NETWORK_TYPE = models.NetworkType.MIJIN_TEST
+
+
+def load_model(model_type, response):
+    return model_type.create_from_dto(json.loads(response['Ok']['content']), NETWORK_TYPE)
+
+
+def patch_requests(is_async):
+    values = {
+        'NetworkHTTP.get_network_type': NETWORK_TYPE,
+        'BlockchainHTTP.get_block_by_height': load_model(models.BlockInfo, responses.BLOCK_INFO),
+        'NodeHTTP.get_node_info': load_model(models.NodeInfo, responses.INFO),
+        'BlockchainHTTP.get_blockchain_height': 53577,
+        'ConfigHTTP.get_config': load_model(models.CatapultConfig, responses.CONFIG),
+    }
+    patches = []
+    for name, value in values.items():
+        cls_name, method = name.split('.')
+        if is_async:
+            cls_name = 'Async' + cls_name
+        new = mock.AsyncMock(return_value=value) if is_async else mock.Mock(return_value=value)
+        patches.append(mock.patch.object(getattr(client, cls_name), method, new))
+    return patches
+
+
+class TestBootstrapCache(harness.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'bootstrap.json')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    @harness.async_test(
+        sync_data=(client.HTTP, requests, False),
+        async_data=(client.AsyncHTTP, aiohttp, True)
+    )
+    async def test_load(self, data, await_cb, with_cb):
+        path = os.path.join(self.tmpdir.name, f'{data[0].__name__}.json')
+        bootstrap = client.BootstrapCache(path)
+        patches = patch_requests(data[2])
+        for patch in patches:
+            patch.start()
+        try:
+            async with with_cb(data[0](responses.ENDPOINT)) as http:
+                load = bootstrap.load_async if data[2] else bootstrap.load
+                info = await await_cb(load(http))
+                self.assertEqual(await await_cb(http.network_type), NETWORK_TYPE)
+                # A second load is served from the cache.
+                self.assertEqual(await await_cb(load(http)), info)
+        finally:
+            for patch in patches:
+                patch.stop()
+
+        self.assertEqual(info.network_type, NETWORK_TYPE)
+        self.assertEqual(info.generation_hash, '7CCDF81A60B0A03A3B30D715C5C7513916319C09215E22C67B0A81106FB21445')
+        self.assertEqual(info.height, 53577)
+        self.assertEqual((bootstrap.hits, bootstrap.misses), (1, 1))
+
+        # Another process preloads the client from the file, without any requests.
+        reloaded = client.BootstrapCache(path)
+        self.assertEqual(reloaded.get(responses.ENDPOINT), info)
+        with data[1].default_exception(ConnectionRefusedError):
+            async with with_cb(data[0](responses.ENDPOINT, bootstrap=reloaded)) as http:
+                self.assertEqual(await await_cb(http.network_type), NETWORK_TYPE)
+                self.assertEqual(await await_cb(reloaded.load_async(http) if data[2] else reloaded.load(http)), info)
+
+    def test_expired(self):
+        info = client.BootstrapInfo(
+            'http://localhost:3000',
+            NETWORK_TYPE,
+            '7CCDF81A60B0A03A3B30D715C5C7513916319C09215E22C67B0A81106FB21445',
+            load_model(models.NodeInfo, responses.INFO),
+            load_model(models.CatapultConfig, responses.CONFIG),
+            1,
+        )
+        bootstrap = client.BootstrapCache(self.path, ttl=60)
+        bootstrap.put(info)
+        self.assertEqual(bootstrap.get('http://localhost:3000'), info)
+
+        info.fetched -= 120
+        self.assertIsNone(bootstrap.get('http://localhost:3000'))
+
+        bootstrap.invalidate()
+        self.assertIsNone(client.BootstrapCache(self.path).get('http://localhost:3000'))
+
+    def test_concurrent(self):
+        def create_info(endpoint):
+            return client.BootstrapInfo(
+                endpoint,
+                NETWORK_TYPE,
+                '7CCDF81A60B0A03A3B30D715C5C7513916319C09215E22C67B0A81106FB21445',
+                load_model(models.NodeInfo, responses.INFO),
+                load_model(models.CatapultConfig, responses.CONFIG),
+                1,
+            )
+
+        # Both processes read the file before either updates it.
+        first = client.BootstrapCache(self.path)
+        second = client.BootstrapCache(self.path)
+        self.assertIsNone(first.get('http://localhost:3000'))
+        self.assertIsNone(second.get('http://localhost:3001'))
+        first.put(create_info('http://localhost:3000'))
+        second.put(create_info('http://localhost:3001'))
+
+        reloaded = client.BootstrapCache(self.path)
+        self.assertIsNotNone(reloaded.get('http://localhost:3000'))
+        self.assertIsNotNone(reloaded.get('http://localhost:3001'))
+
+    def test_invalid(self):
+        info = client.BootstrapInfo(
+            'http://localhost:3000',
+            models.NetworkType.MAIN_NET,
+            '7CCDF81A60B0A03A3B30D715C5C7513916319C09215E22C67B0A81106FB21445',
+            load_model(models.NodeInfo, responses.INFO),
+            load_model(models.CatapultConfig, responses.CONFIG),
+            1,
+        )
+        bootstrap = client.BootstrapCache(self.path)
+        with self.assertRaises(ValueError):
+            bootstrap.put(info)
+
+        # Corrupt files are ignored.
+        with open(self.path, 'w') as f:
+            f.write('{"version": 1, "entries": [{"endpoint": ')
+        self.assertIsNone(client.BootstrapCache(self.path).get('http://localhost:3000'))
+
+    def test_memory(self):
+        bootstrap = client.BootstrapCache(persist=False)
+        self.assertIsNone(bootstrap.path)
+        self.assertIsNone(bootstrap.get('http://localhost:3000'))
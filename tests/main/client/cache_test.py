@@ -0,0 +1,122 @@
+import aiohttp
+import requests
+
+from xpxchain import client
+from xpxchain import models
+from tests import harness
+from tests import responses
+
+
+class TestResponseCache(harness.TestCase):
+
+    def test_key(self):
+        cache = client.ResponseCache()
+        self.assertEqual(cache.key('get_block_by_height', [1]), ('get_block_by_height', '', (1,)))
+        self.assertNotEqual(cache.key('get_block_by_height', [1], 'http://a'), cache.key('get_block_by_height', [1], 'http://b'))
+        self.assertEqual(cache.key('get_blockchain_height', []), None)
+        self.assertEqual(cache.key('get_block_by_height', [[1]]), None)
+
+    def test_tip(self):
+        cache = client.ResponseCache(confirmations=10)
+        key = cache.key('get_block_transactions', [90], 'http://a')
+        self.assertFalse(cache.put(key, []))
+        self.assertEqual(cache.tip('http://a'), 90)
+
+        cache.observe_height('http://a', 100)
+        cache.observe_height('http://a', 95)
+        self.assertEqual(cache.tip('http://a'), 100)
+        self.assertFalse(cache.put(cache.key('get_block_transactions', [91], 'http://a'), []))
+        self.assertTrue(cache.put(key, []))
+        # Tips are tracked per endpoint.
+        self.assertFalse(cache.put(cache.key('get_block_transactions', [90], 'http://b'), []))
+
+    def test_lru(self):
+        cache = client.ResponseCache(max_entries=2, confirmations=0)
+        keys = [cache.key('get_block_by_height', [i]) for i in range(3)]
+        self.assertTrue(cache.put(keys[0], 'a'))
+        self.assertTrue(cache.put(keys[1], 'b'))
+        self.assertEqual(cache[keys[0]], 'a')
+        self.assertTrue(cache.put(keys[2], 'c'))
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.evictions, 1)
+        self.assertIn(keys[0], cache)
+        self.assertNotIn(keys[1], cache)
+        with self.assertRaises(KeyError):
+            cache[keys[1]]
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_max_bytes(self):
+        cache = client.ResponseCache(max_bytes=1024, confirmations=0)
+        key = cache.key('get_block_by_height', [1])
+        self.assertFalse(cache.put(key, 'a' * 2048))
+        self.assertEqual(len(cache), 0)
+
+        for index in range(64):
+            cache.put(cache.key('get_block_by_height', [index]), 'a' * 256)
+        self.assertLessEqual(cache.size, 1024)
+        self.assertGreater(cache.evictions, 0)
+
+        cache.clear()
+        self.assertEqual((len(cache), cache.size), (0, 0))
+
+    def test_rules(self):
+        cache = client.ResponseCache(rules={'get_transaction': lambda x: x > 0})
+        self.assertFalse(cache.put(cache.key('get_transaction', ['A']), 0))
+        self.assertTrue(cache.put(cache.key('get_transaction', ['A']), 1))
+        self.assertEqual(cache.key('get_block_by_height', [1]), None)
+
+    @harness.async_test(
+        sync_data=(client.BlockchainHTTP, requests),
+        async_data=(client.AsyncBlockchainHTTP, aiohttp)
+    )
+    async def test_http(self, data, await_cb, with_cb):
+        cache = client.ResponseCache()
+        network_type = models.NetworkType.MIJIN_TEST
+        async with with_cb(data[0](responses.ENDPOINT, network_type=network_type, cache=cache)) as http:
+            # Blocks at the chain tip are not cached.
+            with data[1].default_response(200, **responses.BLOCK_INFO["Ok"]):
+                await await_cb(http.get_block_by_height(1))
+            self.assertEqual(len(cache), 0)
+
+            # Uncacheable endpoints always reach the network, but the
+            # chain height is recorded.
+            with data[1].default_response(200, **responses.CHAIN_HEIGHT["Ok"]):
+                await await_cb(http.get_blockchain_height())
+                await await_cb(http.get_blockchain_height())
+            self.assertEqual(cache.tip(http.raw.endpoint), 53577)
+
+            with data[1].default_response(200, **responses.BLOCK_INFO["Ok"]):
+                block = await await_cb(http.get_block_by_height(1))
+
+            # Cached responses never reach the network.
+            self.assertIs(await await_cb(http.get_block_by_height(1)), block)
+            self.assertIs(http.root.blockchain.cache, cache)
+            self.assertEqual((cache.hits, cache.misses), (1, 2))
+            self.assertEqual(len(cache), 1)
+
+    @harness.async_test(
+        sync_data=(client.NetworkHTTP, requests),
+        async_data=(client.AsyncNetworkHTTP, aiohttp)
+    )
+    async def test_network_type(self, data, await_cb, with_cb):
+        cache = client.ResponseCache()
+        async with with_cb(data[0](responses.ENDPOINT, cache=cache)) as http:
+            with data[1].default_response(200, **responses.NETWORK_TYPE["MIJIN_TEST"]):
+                await await_cb(http.get_network_type())
+            network_type = await await_cb(http.get_network_type())
+            self.assertEqual(network_type, models.NetworkType.MIJIN_TEST)
+            self.assertEqual(cache.hits, 1)
+
+    @harness.async_test(
+        sync_data=(client.TransactionHTTP, requests),
+        async_data=(client.AsyncTransactionHTTP, aiohttp)
+    )
+    async def test_confirmed_transaction(self, data, await_cb, with_cb):
+        cache = client.ResponseCache()
+        network_type = models.NetworkType.MIJIN_TEST
+        async with with_cb(data[0](responses.ENDPOINT, network_type=network_type, cache=cache)) as http:
+            hash = '47490969DB1960AD8565E67700C47FE41BBE07C6F490A66D3001AC46B6684600'
+            with data[1].default_response(200, **responses.TRANSACTION["Ok"]):
+                transaction = await await_cb(http.get_transaction(hash))
+            self.assertIs(await await_cb(http.get_transaction(hash)), transaction)
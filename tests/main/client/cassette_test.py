@@ -0,0 +1,106 @@
+import aiohttp
+import json
+import os
+import requests
+import tempfile
+import websockets
+from unittest import mock
+
+from xpxchain import client
+from xpxchain import errors
+from xpxchain import models
+from xpxchain.client import cassette as cassette_module
+from tests import harness
+from tests import responses
+
+NETWORK_TYPE = models.NetworkType.MIJIN_TEST
+UID = '{"uid": "A7Z3K5CZ3WMPMCI2IKHRCPWDHGJAYR76"}'
+BLOCK = json.loads(responses.BLOCK_INFO['Ok']['content'])
+
+
+class TestCassette(harness.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    @harness.async_test(
+        sync_data=(client.BlockchainHTTP, requests, 'chain.json'),
+        async_data=(client.AsyncBlockchainHTTP, aiohttp, 'chain.json.gz')
+    )
+    async def test_http(self, data, await_cb, with_cb):
+        path = os.path.join(self.tmpdir.name, data[2])
+        with client.Cassette(path, mode='record') as cassette:
+            with data[1].default_response(200, **responses.CHAIN_HEIGHT['Ok']):
+                async with with_cb(data[0](responses.ENDPOINT, network_type=NETWORK_TYPE, cassette=cassette)) as http:
+                    self.assertEqual(await await_cb(http.get_blockchain_height()), 53577)
+        self.assertEqual(len(cassette.interactions), 1)
+        self.assertEqual(cassette.interactions[0].method, 'GET')
+        self.assertEqual(cassette.interactions[0].url, 'http://localhost:3000/chain/height')
+
+        # Replays never touch the network.
+        cassette = client.Cassette(path, latency=0.001)
+        with data[1].default_exception(ConnectionRefusedError):
+            async with with_cb(data[0](responses.ENDPOINT, network_type=NETWORK_TYPE, cassette=cassette)) as http:
+                self.assertEqual(await await_cb(http.get_blockchain_height()), 53577)
+                self.assertEqual(await await_cb(http.get_blockchain_height()), 53577)
+                with self.assertRaises(errors.CassetteMissError):
+                    await await_cb(http.get_blockchain_score())
+        self.assertEqual(cassette.misses, 1)
+
+    @harness.async_test(
+        sync_data=(client.TransactionHTTP,),
+        async_data=(client.AsyncTransactionHTTP,)
+    )
+    async def test_body(self, data, await_cb, with_cb):
+        recorder = client.Cassette(mode='record')
+        hashes = ['135B65FF4E9E90E2F3283D75E2AD3D45EC46729013786841E32904D5134FD2B9']
+        body = cassette_module.request_body({'json': {'hashes': hashes}})
+        key = ('POST', 'http://localhost:3000/transaction/statuses', body)
+        content = responses.TRANSACTION_STATUSES['Ok']['content']
+        recorder.record(cassette_module.Interaction(*key, 200, content, 0.0))
+        recorder.record(cassette_module.Interaction(*key, 503, b'', 0.0))
+
+        cassette = recorder.replay()
+        async with with_cb(data[0](responses.ENDPOINT, network_type=NETWORK_TYPE, cassette=cassette)) as http:
+            statuses = await await_cb(http.get_transaction_statuses(hashes))
+            self.assertEqual(statuses[0].hash, hashes[0])
+            # Repeated requests replay the recorded responses in order.
+            with self.assertRaises((client.HTTPError, client.AsyncHTTPError)):
+                await await_cb(http.get_transaction_statuses(hashes))
+            with self.assertRaises(errors.CassetteMissError):
+                await await_cb(http.get_transaction_statuses(hashes[0][:32]))
+
+    async def test_listener(self):
+        path = os.path.join(self.tmpdir.name, 'listener.json')
+        block = json.dumps(BLOCK)
+        with client.Cassette(path, mode='record') as cassette:
+            with websockets.default_response([UID, block]):
+                async with client.Listener(f'{responses.ENDPOINT}/ws', cassette=cassette) as listener:
+                    await listener.new_block()
+                    message = await listener.__anext__()
+        self.assertEqual(message.message.height, 1)
+        frames = cassette.frames('ws://localhost:3000/ws')[0]
+        self.assertEqual([i.direction for i in frames], ['recv', 'send', 'recv'])
+
+        cassette = client.Cassette(path, latency='recorded')
+        with mock.patch('asyncio.sleep') as sleep:
+            async with client.Listener(f'{responses.ENDPOINT}/ws', cassette=cassette) as listener:
+                await listener.new_block()
+                messages = [i async for i in listener]
+        self.assertEqual([i.message.height for i in messages], [1])
+        # Both received frames are replayed after their recorded delay.
+        self.assertEqual(sleep.call_count, 2)
+        self.assertTrue(all(0 < i.args[0] < 1 for i in sleep.call_args_list))
+
+    def test_latency(self):
+        self.assertEqual(client.Cassette().delay(0.5), 0)
+        self.assertEqual(client.Cassette(latency='recorded').delay(0.5), 0.5)
+        self.assertEqual(client.Cassette(latency=0.1).delay(0.5), 0.1)
+        self.assertEqual(client.Cassette(latency=lambda x: x * 2).delay(0.5), 1.0)
+        with self.assertRaises(ValueError):
+            client.Cassette(latency='random')
+        with self.assertRaises(ValueError):
+            client.Cassette(mode='rewind')
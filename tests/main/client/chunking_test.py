@@ -0,0 +1,84 @@
+import aiohttp
+import requests
+from unittest import mock
+
+import xpxchain
+from xpxchain import client
+from xpxchain import models
+from xpxchain.client import chunking
+from tests import harness
+from tests import responses
+
+
+def send(cbs, items):
+    if 'fail' in items:
+        raise ConnectionRefusedError
+    return [cbs + str(i) for i in items]
+
+
+async def async_send(cbs, items):
+    return send(cbs, items)
+
+
+class TestChunker(harness.TestCase):
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            chunking.Chunker(0)
+
+    def test_accepts(self):
+        chunker = chunking.Chunker(2)
+        self.assertTrue(chunker.accepts('get_transactions', [['A', 'B', 'C']]))
+        self.assertFalse(chunker.accepts('get_transactions', [['A', 'B']]))
+        self.assertFalse(chunker.accepts('get_transaction', ['ABC']))
+        self.assertFalse(chunker.accepts('get_transactions', [iter('ABC')]))
+
+    def test_split(self):
+        chunker = chunking.Chunker(2)
+        self.assertEqual(chunker.split(range(5)), [[0, 1], [2, 3], [4]])
+
+    def test_run(self):
+        chunker = chunking.Chunker(2, concurrency=2)
+        self.assertEqual(chunker.run(send, 'x', list(range(5))), ['x0', 'x1', 'x2', 'x3', 'x4'])
+
+        with self.assertRaises(xpxchain.BulkRequestError) as context:
+            chunker.run(send, 'x', [0, 1, 'fail', 3, 4])
+        error = context.exception
+        self.assertEqual(error.results, ['x0', 'x1', 'x4'])
+        self.assertEqual(len(error.errors), 1)
+        self.assertEqual(error.errors[0][0], ['fail', 3])
+        self.assertIsInstance(error.errors[0][1], ConnectionRefusedError)
+        self.assertEqual(error.chunks, 3)
+
+    async def test_run_async(self):
+        chunker = chunking.Chunker(2, concurrency=2)
+        self.assertEqual(await chunker.run_async(async_send, 'x', list(range(5))), ['x0', 'x1', 'x2', 'x3', 'x4'])
+
+        with self.assertRaises(xpxchain.BulkRequestError) as context:
+            await chunker.run_async(async_send, 'x', ['fail', 1, 2])
+        self.assertEqual(context.exception.results, ['x2'])
+
+
+class TestChunking(harness.TestCase):
+
+    @harness.async_test(
+        sync_data=(client.AccountHTTP, requests),
+        async_data=(client.AsyncAccountHTTP, aiohttp)
+    )
+    async def test_http(self, data, await_cb, with_cb):
+        addresses = [models.Address('SD3MA6SM7GWRX4DEJVAZEGFXF7G7D36MA6TMSIBM')] * 5
+        network_type = models.NetworkType.MIJIN_TEST
+        async with with_cb(data[0](responses.ENDPOINT, network_type=network_type, chunk_size=2)) as http:
+            session = http.raw._session
+            with mock.patch.object(session, 'request', wraps=session.request) as request:
+                with data[1].default_response(200, **responses.ACCOUNTS_INFO["Ok"]):
+                    infos = await await_cb(http.get_accounts_info(addresses))
+                self.assertEqual(request.call_count, 3)
+
+                # Small requests are not chunked.
+                with data[1].default_response(200, **responses.ACCOUNTS_INFO["Ok"]):
+                    await await_cb(http.get_accounts_info(addresses[:2]))
+                self.assertEqual(request.call_count, 4)
+
+            self.assertEqual(len(infos), 3)
+            self.assertIs(http.root.account.chunker, http.chunker)
@@ -0,0 +1,48 @@
+import aiohttp
+import requests
+from unittest import mock
+
+from xpxchain import client
+from xpxchain import models
+from xpxchain.client import codec
+from tests import harness
+from tests import responses
+
+
+class TestCodec(harness.TestCase):
+
+    def tearDown(self):
+        codec.set_codec(codec.default_codec())
+
+    def test_available(self):
+        names = codec.available_codecs()
+        self.assertEqual(names[-1], 'json')
+        self.assertEqual(codec.get_codec().name, names[0])
+
+    def test_unknown(self):
+        with self.assertRaises(ValueError):
+            codec.set_codec('yaml')
+
+    def test_roundtrip(self):
+        data = {'uid': 'abc', 'values': [1, 2, 3], 'nested': {'a': None}}
+        for name in codec.available_codecs():
+            codec.set_codec(name)
+            self.assertEqual(codec.get_codec().name, name)
+            self.assertIsInstance(codec.dumps(data), str)
+            self.assertEqual(codec.loads(codec.dumps(data)), data)
+            self.assertEqual(codec.loads(codec.dumps(data).encode('utf-8')), data)
+
+    @harness.async_test(
+        sync_data=(client.BlockchainHTTP, requests),
+        async_data=(client.AsyncBlockchainHTTP, aiohttp)
+    )
+    async def test_http(self, data, await_cb, with_cb):
+        network_type = models.NetworkType.MIJIN_TEST
+        custom = codec.Codec('custom', mock.Mock(wraps=codec.json_codec().loads), codec.json_codec().dumps)
+        codec.set_codec(custom)
+        async with with_cb(data[0](responses.ENDPOINT, network_type=network_type)) as http:
+            with data[1].default_response(200, **responses.CHAIN_HEIGHT["Ok"]):
+                self.assertEqual(await await_cb(http.get_blockchain_height()), 53577)
+
+        # The codec decodes the raw response body.
+        custom.loads.assert_called_once_with(responses.CHAIN_HEIGHT["Ok"]['content'])
@@ -0,0 +1,124 @@
+import asyncio
+import datetime
+from unittest import mock
+
+from xpxchain import client
+from xpxchain import models
+from xpxchain.client import abc
+from tests import harness
+
+HASHES = ['%064X' % i for i in range(5)]
+DEADLINE = models.Deadline(datetime.datetime(2019, 1, 1))
+ADDRESS = models.Address('SD5DT3CH4BLABL5HIMEKP2TAPUKF4NY3L5HRIR54')
+
+
+def make_status(hash, group, status='Success', height=10):
+    return models.TransactionStatus(models.TransactionStatusGroup(group), status, hash, DEADLINE, height)
+
+
+class FakeTransactionHTTP:
+    """Serve transaction statuses, changing them between polls."""
+
+    def __init__(self, statuses=None):
+        self.statuses = statuses or {}
+        self.requests = []
+
+    async def get_transaction_statuses(self, hashes):
+        self.requests.append(list(hashes))
+        return [self.statuses[i] for i in hashes if i in self.statuses]
+
+
+class TestConfirmationTracker(harness.TestCase):
+
+    async def test_poll(self):
+        http = FakeTransactionHTTP({
+            HASHES[0]: make_status(HASHES[0], 'confirmed'),
+            HASHES[1]: make_status(HASHES[1], 'failed', 'Failure_Core_Insufficient_Balance', 0),
+            HASHES[2]: make_status(HASHES[2], 'unconfirmed', height=0),
+        })
+        tracker = client.ConfirmationTracker(http, batch_size=2)
+        futures = [tracker.track(i.lower()) for i in HASHES[:4]]
+        self.assertIs(tracker.track(HASHES[0]), futures[0])
+
+        self.assertEqual(await tracker.poll(), 2)
+        self.assertEqual(http.requests, [HASHES[:2], HASHES[2:4]])
+        self.assertEqual(futures[0].result().group, models.TransactionStatusGroup.CONFIRMED)
+        self.assertEqual(futures[1].result().status, 'Failure_Core_Insufficient_Balance')
+        self.assertFalse(futures[2].done() or futures[3].done())
+        self.assertEqual(tracker.pending, 2)
+
+        # Polls only request unresolved transactions.
+        http.statuses[HASHES[2]] = make_status(HASHES[2], 'confirmed')
+        self.assertEqual(await tracker.poll(), 1)
+        self.assertEqual(http.requests[-1], HASHES[2:4])
+        self.assertEqual(futures[2].result().height, 10)
+        await tracker.close()
+        self.assertTrue(futures[3].cancelled())
+
+    async def test_deadline(self):
+        http = FakeTransactionHTTP()
+        tracker = client.ConfirmationTracker(http, grace=0)
+        expired = tracker.track(HASHES[0], DEADLINE)
+        future = models.Deadline(datetime.datetime.now() + datetime.timedelta(hours=1))
+        pending = tracker.track(HASHES[1], future)
+
+        self.assertEqual(await tracker.poll(), 1)
+        status = expired.result()
+        self.assertEqual(status.group, models.TransactionStatusGroup.FAILED)
+        self.assertEqual(status.status, 'Failure_Core_Past_Deadline')
+        self.assertEqual(status.deadline, DEADLINE)
+        self.assertFalse(pending.done())
+        await tracker.close()
+
+    async def test_feed(self):
+        tracker = client.ConfirmationTracker(FakeTransactionHTTP())
+        failed = tracker.track(HASHES[0])
+        confirmed = tracker.track(HASHES[1])
+
+        error = models.TransactionStatusError(HASHES[0], 'Failure_Core_Invalid_Network', DEADLINE, 'status', ADDRESS)
+        self.assertTrue(tracker.feed(abc.ListenerMessage('status', error)))
+        self.assertIs(failed.result(), error)
+
+        transaction = mock.Mock(spec=models.Transaction)
+        transaction.deadline = DEADLINE
+        transaction.transaction_info = models.TransactionInfo(25, 0, '1', HASHES[1].lower(), HASHES[1])
+        self.assertFalse(tracker.feed(abc.ListenerMessage('unconfirmedAdded', transaction)))
+        self.assertTrue(tracker.feed(abc.ListenerMessage('confirmedAdded', transaction)))
+        self.assertEqual(confirmed.result().height, 25)
+        self.assertEqual(confirmed.result().group, models.TransactionStatusGroup.CONFIRMED)
+
+        # Untracked transactions are ignored.
+        self.assertFalse(tracker.feed(abc.ListenerMessage('status', error)))
+
+    async def test_background(self):
+        http = FakeTransactionHTTP({i: make_status(i, 'unconfirmed', height=0) for i in HASHES})
+        async with client.ConfirmationTracker(http, min_interval=0.001, max_interval=0.004) as tracker:
+            future = tracker.track(HASHES[0])
+            while tracker.polls < 4:
+                await asyncio.sleep(0.001)
+            # Polls resolving nothing back off to the maximum interval.
+            self.assertEqual(tracker.interval, 0.004)
+
+            http.statuses[HASHES[0]] = make_status(HASHES[0], 'confirmed')
+            status, = await tracker.wait([HASHES[0]], timeout=1)
+            self.assertIs(status, future.result())
+
+            with self.assertRaises(asyncio.TimeoutError):
+                await tracker.wait([HASHES[1]], timeout=0.01)
+            self.assertEqual(tracker.pending, 1)
+
+    async def test_errors(self):
+        http = FakeTransactionHTTP()
+        http.get_transaction_statuses = mock.AsyncMock(side_effect=[
+            client.AsyncHTTPError(503, 'Service Unavailable'),
+            [make_status(HASHES[0], 'confirmed')],
+        ])
+        async with client.ConfirmationTracker(http, min_interval=0.001, max_interval=0.002) as tracker:
+            status = await asyncio.wait_for(tracker.track(HASHES[0]), 1)
+        self.assertEqual(status.hash, HASHES[0])
+        self.assertEqual(tracker.errors, 1)
+        self.assertIsInstance(tracker.last_error, client.AsyncHTTPError)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            client.ConfirmationTracker(FakeTransactionHTTP(), min_interval=5, max_interval=1)
@@ -1,9 +1,11 @@
 import asyncio
 import aiohttp
 import requests
+from unittest import mock
 
 from xpxchain import client
 from xpxchain import models
+from xpxchain.client import nis
 from tests import harness
 from tests import responses
 
@@ -58,3 +60,22 @@ class TestHTTP(harness.TestCase):
         async with with_cb(data[0](responses.ENDPOINT)) as http:
             with data[1].default_response(200, **responses.NETWORK_TYPE["MIJIN_TEST"]):
                 self.assertEqual(await await_cb(http.network_type), models.NetworkType.MIJIN_TEST)
+
+    async def test_resolved_network_type(self):
+        async with client.AsyncBlockchainHTTP(responses.ENDPOINT) as http:
+            with aiohttp.default_response(200, **responses.NETWORK_TYPE["MIJIN_TEST"]):
+                await http.network_type
+
+            # Once resolved, requests never await the network type property.
+            prop = mock.PropertyMock()
+            with mock.patch.object(client.AsyncBlockchainHTTP, 'network_type', prop):
+                with aiohttp.default_response(200, **responses.CHAIN_HEIGHT["Ok"]):
+                    self.assertEqual(await http.get_blockchain_height(), 53577)
+            self.assertFalse(prop.called)
+
+    def test_bound_endpoints(self):
+        # Wrappers are bound to their callbacks at import, not looked up per request.
+        with client.BlockchainHTTP(responses.ENDPOINT, network_type=models.NetworkType.MIJIN_TEST) as http:
+            with mock.patch.dict(nis.ENDPOINTS, clear=True):
+                with requests.default_response(200, **responses.CHAIN_HEIGHT["Ok"]):
+                    self.assertEqual(http.get_blockchain_height(), 53577)
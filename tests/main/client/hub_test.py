@@ -0,0 +1,216 @@
+import asyncio
+import datetime
+import json
+
+from xpxchain import client
+from xpxchain import models
+from xpxchain.client import abc
+from xpxchain.client import lazy
+from xpxchain.client import reconnect
+from tests import harness
+from tests import responses
+
+BLOCK = json.loads(responses.BLOCK_INFO['Ok']['content'])
+TRANSACTION_DTO = json.loads(responses.TRANSACTION['Ok']['content'])
+TRANSACTION = models.Transaction.create_from_dto(TRANSACTION_DTO)
+RECIPIENT = TRANSACTION.recipient
+OTHER = models.Address('SD5DT3CH4BLABL5HIMEKP2TAPUKF4NY3L5HRIR54')
+DEADLINE = models.Deadline(datetime.datetime(2019, 1, 1))
+
+
+def block_message(height):
+    data = json.loads(json.dumps(BLOCK))
+    data['block']['height'] = [height, 0]
+    return abc.ListenerMessage('block', models.BlockInfo.create_from_dto(data))
+
+
+def status_message(address):
+    error = models.TransactionStatusError('%064X' % 1, 'Failure_Core_Insufficient_Balance', DEADLINE, 'status', address)
+    return abc.ListenerMessage('status', error)
+
+
+class FakeListener:
+    """Listener yielding the messages pushed by the test."""
+
+    def __init__(self):
+        self.queue = asyncio.Queue()
+        self.subscribed = []
+        self.unsubscribed = []
+        self.entered = self.exited = False
+
+    async def __aenter__(self):
+        self.entered = True
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.exited = True
+
+    @property
+    async def uid(self):
+        return 'A7Z3K5CZ3WMPMCI2IKHRCPWDHGJAYR76'
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        item = await self.queue.get()
+        if item is None:
+            raise StopAsyncIteration
+        elif isinstance(item, Exception):
+            raise item
+        return item
+
+    async def subscribe(self, channel):
+        self.subscribed.append(channel)
+
+    async def unsubscribe(self, channel):
+        self.unsubscribed.append(channel)
+
+    async def push(self, *items):
+        for item in items:
+            self.queue.put_nowait(item)
+        # Let the hub dispatch the messages.
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+
+def drain(consumer):
+    messages = []
+    while consumer.depth:
+        messages.append(consumer._queue.get_nowait())
+    return messages
+
+
+def heights(messages):
+    return [i.message.height for i in messages]
+
+
+class TestListenerHub(harness.TestCase):
+
+    async def test_refcount(self):
+        listener = FakeListener()
+        async with client.ListenerHub(listener) as hub:
+            first = hub.consumer()
+            second = hub.consumer()
+            await first.new_block()
+            await second.new_block()
+            await second.status(OTHER)
+            self.assertEqual(listener.subscribed, ['block', f'status/{OTHER.address}'])
+            self.assertEqual(hub.channels, {'block': 2, f'status/{OTHER.address}': 1})
+
+            await first.unsubscribe('block')
+            self.assertEqual(listener.unsubscribed, [])
+            await second.close()
+            self.assertEqual(listener.unsubscribed, ['block', f'status/{OTHER.address}'])
+            self.assertEqual(hub.channels, {})
+            self.assertEqual([i.name for i in hub.consumers], [first.name])
+
+        self.assertTrue(listener.entered and listener.exited)
+        self.assertTrue(first.closed)
+
+    async def test_routing(self):
+        listener = FakeListener()
+        async with client.ListenerHub(listener) as hub:
+            blocks = hub.consumer('blocks')
+            recipient = hub.consumer('recipient')
+            other = hub.consumer('other')
+            await blocks.new_block()
+            await recipient.confirmed(RECIPIENT)
+            await other.status(OTHER)
+            await other.confirmed(OTHER)
+
+            confirmed = abc.ListenerMessage('confirmedAdded', TRANSACTION)
+            await listener.push(block_message(2), confirmed, status_message(OTHER))
+            self.assertEqual(hub.depths, {'blocks': 1, 'recipient': 1, 'other': 1})
+            self.assertEqual(heights(drain(blocks)), [2])
+            self.assertIs(drain(recipient)[0].message, TRANSACTION)
+            self.assertEqual(drain(other)[0].channel_name, 'status')
+
+            # Messages for no known subscriber go to every subscriber of the channel.
+            await listener.push(status_message(RECIPIENT))
+            self.assertEqual(hub.depths, {'blocks': 0, 'recipient': 0, 'other': 1})
+
+    async def test_lazy_routing(self):
+        listener = FakeListener()
+        async with client.ListenerHub(listener) as hub:
+            recipient = hub.consumer('recipient')
+            other = hub.consumer('other')
+            await recipient.confirmed(RECIPIENT)
+            await other.confirmed(OTHER)
+
+            # Lazy transactions are routed from the DTO, without decoding them.
+            value = lazy.LazyModel(models.Transaction, TRANSACTION_DTO)
+            await listener.push(abc.ListenerMessage('confirmedAdded', value))
+            self.assertEqual(hub.depths, {'recipient': 1, 'other': 0})
+            self.assertIs(drain(recipient)[0].message, value)
+            self.assertFalse(value.materialized)
+
+        addresses = reconnect.transaction_dto_addresses(TRANSACTION_DTO)
+        self.assertEqual(addresses, reconnect.transaction_addresses(TRANSACTION))
+
+    async def test_overflow(self):
+        listener = FakeListener()
+        async with client.ListenerHub(listener, maxsize=2) as hub:
+            newest = hub.consumer(overflow='drop-newest')
+            oldest = hub.consumer(overflow='drop-oldest')
+            await newest.new_block()
+            await oldest.new_block()
+            await listener.push(*[block_message(i) for i in range(1, 5)])
+
+            self.assertEqual(heights(drain(newest)), [1, 2])
+            self.assertEqual(heights(drain(oldest)), [3, 4])
+            self.assertEqual((newest.dropped, oldest.dropped), (2, 2))
+            self.assertEqual((newest.delivered, oldest.delivered), (2, 4))
+            self.assertEqual(newest.max_depth, 2)
+
+    async def test_block(self):
+        listener = FakeListener()
+        async with client.ListenerHub(listener) as hub:
+            slow = hub.consumer(maxsize=1)
+            fast = hub.consumer(overflow='drop-newest')
+            await slow.new_block()
+            await fast.new_block()
+            await listener.push(*[block_message(i) for i in range(1, 4)])
+
+            # The full queue of the slow consumer holds back the others.
+            self.assertEqual(fast.depth, 1)
+            self.assertEqual(heights([await slow.__anext__()]), [1])
+            await listener.push()
+            self.assertEqual(fast.depth, 2)
+
+            # Closing the slow consumer releases the hub.
+            await slow.close()
+            await listener.push(block_message(4))
+            self.assertEqual(heights(drain(fast)), [1, 2, 3, 4])
+
+    async def test_end(self):
+        listener = FakeListener()
+        async with client.ListenerHub(listener) as hub:
+            consumer = hub.consumer()
+            await consumer.new_block()
+            await listener.push(block_message(2), None)
+            self.assertEqual(heights([i async for i in consumer]), [2])
+
+        listener = FakeListener()
+        error = ConnectionResetError()
+        async with client.ListenerHub(listener) as hub:
+            consumer = hub.consumer()
+            await consumer.new_block()
+            await listener.push(error)
+            with self.assertRaises(ConnectionResetError):
+                await consumer.__anext__()
+            await consumer.close()
+            # Dead connections are not unsubscribed from.
+            self.assertEqual(listener.unsubscribed, [])
+
+    async def test_invalid(self):
+        hub = client.ListenerHub(FakeListener())
+        hub.consumer('consumer')
+        with self.assertRaises(ValueError):
+            hub.consumer('consumer')
+        with self.assertRaises(ValueError):
+            hub.consumer(maxsize=0)
+        with self.assertRaises(ValueError):
+            hub.consumer(overflow='drop-all')
+        with self.assertRaises(ValueError):
+            client.ListenerHub(FakeListener(), overflow='drop-all')
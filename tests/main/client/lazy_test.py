@@ -0,0 +1,138 @@
+import aiohttp
+import collections
+import datetime
+import json
+import pickle
+import requests
+from unittest import mock
+
+from xpxchain import client
+from xpxchain import models
+from tests import harness
+from tests import responses
+
+TRANSACTION_HASH = '47490969DB1960AD8565E67700C47FE41BBE07C6F490A66D3001AC46B6684600'
+UID = 'A7Z3K5CZ3WMPMCI2IKHRCPWDHGJAYR76'
+
+
+def listener_messages():
+    block = json.loads(responses.BLOCK_INFO['Ok']['content'])
+    transaction = json.loads(responses.TRANSACTION['Ok']['content'])
+    transaction['meta']['channelName'] = 'confirmedAdded'
+    deadline = models.Deadline(datetime.datetime(2019, 1, 1))
+    address = models.Address('SD5DT3CH4BLABL5HIMEKP2TAPUKF4NY3L5HRIR54')
+    error = models.TransactionStatusError(TRANSACTION_HASH, 'Failure_Core_Past_Deadline', deadline, 'status', address)
+    status = error.to_dto()
+    status['meta']['address'] = address.hex
+    return [json.dumps(i) for i in (block, transaction, status)]
+
+
+class FakeSession:
+
+    def __init__(self, messages):
+        self.messages = messages
+
+    async def recv(self):
+        return json.dumps({'uid': UID})
+
+    async def send(self, message):
+        pass
+
+    async def __aiter__(self):
+        for message in self.messages:
+            yield message
+
+
+class FakeConnect:
+
+    def __init__(self, session):
+        self.session = session
+
+    async def __aenter__(self):
+        return self.session
+
+    async def __aexit__(self, exc_type, exc, tb):
+        pass
+
+
+class TestLazyModel(harness.TestCase):
+
+    @harness.async_test(
+        sync_data=(client.BlockchainHTTP, requests),
+        async_data=(client.AsyncBlockchainHTTP, aiohttp)
+    )
+    async def test_blocks(self, data, await_cb, with_cb):
+        network_type = models.NetworkType.MIJIN_TEST
+        async with with_cb(data[0](responses.ENDPOINT, network_type=network_type)) as http:
+            with data[1].default_response(200, **responses.BLOCKS_INFO["Ok"]):
+                blocks = await await_cb(http.get_blocks_by_height_with_limit(1, 25))
+                lazy_blocks = await await_cb(http.get_blocks_by_height_with_limit(1, 25, lazy=True))
+
+        self.assertEqual(len(lazy_blocks), len(blocks))
+        block = lazy_blocks[0]
+        self.assertIsInstance(block, client.LazyModel)
+        self.assertIs(block.model_type, models.BlockInfo)
+
+        # Common fields are read from the DTO.
+        self.assertEqual(block.height, blocks[0].height)
+        self.assertEqual(block.hash, blocks[0].hash)
+        self.assertEqual(block.timestamp, blocks[0].timestamp)
+        self.assertFalse(block.materialized)
+
+        # Other fields decode the model.
+        self.assertEqual(block.signer, blocks[0].signer)
+        self.assertTrue(block.materialized)
+        self.assertEqual(block.materialize(), blocks[0])
+        self.assertEqual(block, blocks[0])
+
+    @harness.async_test(
+        sync_data=(client.TransactionHTTP, requests),
+        async_data=(client.AsyncTransactionHTTP, aiohttp)
+    )
+    async def test_transactions(self, data, await_cb, with_cb):
+        network_type = models.NetworkType.MIJIN_TEST
+        async with with_cb(data[0](responses.ENDPOINT, network_type=network_type)) as http:
+            with data[1].default_response(200, **responses.TRANSACTIONS["Ok"]):
+                transactions = await await_cb(http.get_transactions([TRANSACTION_HASH], lazy=True))
+
+        proxy = transactions[0]
+        self.assertEqual(proxy.type, models.TransactionType.TRANSFER)
+        self.assertEqual(proxy.dto['meta']['hash'], TRANSACTION_HASH)
+        self.assertFalse(proxy.materialized)
+        self.assertEqual(proxy.transaction_info.hash, TRANSACTION_HASH)
+        self.assertIsInstance(proxy.materialize(), models.TransferTransaction)
+
+    def test_pickle(self):
+        dto = json.loads(responses.BLOCKS_INFO["Ok"]['content'])[0]
+        block = client.LazyModel(models.BlockInfo, dto)
+        block.materialize()
+        copy = pickle.loads(pickle.dumps(block))
+        self.assertFalse(copy.materialized)
+        self.assertEqual(copy, block)
+
+    async def test_listener(self):
+        session = FakeSession(listener_messages())
+        with mock.patch('websockets.connect', lambda *args, **kwds: FakeConnect(session)):
+            listener = client.Listener(responses.ENDPOINT, lazy=True, full_channels=['status/SD5DT3CH4BLABL5HIMEKP2TAPUKF4NY3L5HRIR54'])
+            async with listener:
+                block, confirmed, status = [i async for i in listener]
+
+        self.assertIsInstance(block.message, client.LazyModel)
+        self.assertIs(client.model_type(block.message), models.BlockInfo)
+        self.assertEqual(block.message.height, 1)
+        self.assertIsInstance(status.message, models.TransactionStatusError)
+
+        # Confirmations resolve from the hash, height and deadline alone.
+        tracker = client.ConfirmationTracker(None)
+        future = tracker.track(TRANSACTION_HASH)
+        self.assertTrue(tracker.feed(confirmed))
+        self.assertEqual(future.result().deadline, confirmed.message.materialize().deadline)
+        self.assertEqual(listener.decoded, collections.Counter({'status': 1, 'confirmedAdded': 1}))
+        self.assertEqual(listener.received, collections.Counter({'block': 1, 'confirmedAdded': 1, 'status': 1}))
+
+        self.assertIsInstance(client.materialize(block.message), models.BlockInfo)
+        self.assertEqual(listener.decoded['block'], 1)
+        copy = pickle.loads(pickle.dumps(block.message))
+        self.assertIs(type(copy), client.LazyModel)
+        copy.materialize()
+        self.assertEqual(listener.decoded['block'], 1)
@@ -0,0 +1,135 @@
+import logging
+import os
+import requests
+import tempfile
+import time
+from unittest import mock
+
+from xpxchain import client
+from xpxchain import models
+from xpxchain.client import metrics as metrics_module
+from tests import harness
+from tests import responses
+from tests.main.client.retry_test import async_outcomes, sync_outcomes
+
+
+class TestHistogram(harness.TestCase):
+
+    def test_observe(self):
+        histogram = client.Histogram((1.0, 2.0, 4.0))
+        for value in (0.5, 1.5, 1.5, 3.0, 8.0):
+            histogram.observe(value)
+        self.assertEqual(histogram.counts, [1, 2, 1, 1])
+        self.assertEqual(histogram.count, 5)
+        self.assertEqual(histogram.mean, 2.9)
+        self.assertEqual((histogram.min, histogram.max), (0.5, 8.0))
+        self.assertEqual(histogram.quantile(0.5), 2.0)
+        self.assertEqual(histogram.quantile(1.0), 8.0)
+        self.assertEqual(client.Histogram((1.0,)).quantile(0.5), 0.0)
+
+
+class TestMetrics(harness.TestCase):
+
+    @harness.async_test(
+        sync_data=(client.BlockchainHTTP, client.HTTPError, sync_outcomes),
+        async_data=(client.AsyncBlockchainHTTP, client.AsyncHTTPError, async_outcomes)
+    )
+    async def test_http(self, data, await_cb, with_cb):
+        network_type = models.NetworkType.MIJIN_TEST
+        samples = []
+        metrics = client.Metrics([client.CallbackExporter(samples.append)])
+        policy = client.RetryPolicy(backoff_base=0)
+        http = data[0](responses.ENDPOINT, network_type=network_type, retry=policy, metrics=metrics)
+        async with with_cb(http):
+            self.assertIs(http.root.blockchain.metrics, metrics)
+            self.assertIs(http.raw.metrics, metrics)
+            outcomes = data[2](503, ConnectionRefusedError(), 200)
+            with mock.patch.object(http.raw._session, 'request', side_effect=outcomes):
+                self.assertEqual(await await_cb(http.get_blockchain_height()), 53577)
+
+        # Every attempt is recorded.
+        self.assertEqual([i.status for i in samples], [503, None, 200])
+        self.assertEqual([i.error for i in samples], [None, 'ConnectionRefusedError', None])
+        size = len(responses.CHAIN_HEIGHT["Ok"]['content'])
+        self.assertEqual(samples[-1].size, size)
+        self.assertEqual(set(samples[-1].phases), set(metrics_module.PHASES) - {'queue'})
+        self.assertEqual(set(samples[1].phases), {'total'})
+
+        stats = metrics.stats('get_blockchain_height')
+        self.assertEqual(stats.statuses, {503: 1, 200: 1})
+        self.assertEqual(stats.errors, {'ConnectionRefusedError': 1})
+        self.assertEqual(stats.phases['total'].count, 3)
+        self.assertEqual(stats.phases['model'].count, 1)
+        self.assertEqual(stats.size.max, size)
+        self.assertEqual(list(metrics.stats()), ['get_blockchain_height'])
+
+        metrics.reset()
+        self.assertIsNone(metrics.stats('get_blockchain_height'))
+
+    def test_queue(self):
+        samples = []
+        metrics = client.Metrics([client.CallbackExporter(samples.append)])
+        http = client.BlockchainHTTP(
+            responses.ENDPOINT,
+            network_type=models.NetworkType.MIJIN_TEST,
+            max_in_flight=1,
+            metrics=metrics,
+        )
+        with http:
+            limiter = http.raw.rate_limiter
+
+            def acquire():
+                time.sleep(0.05)
+                return limiter_acquire()
+
+            limiter_acquire = limiter.acquire
+            with mock.patch.object(limiter, 'acquire', acquire):
+                with requests.default_response(200, **responses.CHAIN_HEIGHT["Ok"]):
+                    http.get_blockchain_height()
+
+        # Waiting for the rate limiter is not reported as network time.
+        phases = samples[0].phases
+        self.assertGreaterEqual(phases['queue'], 0.05)
+        self.assertLess(phases['request'], 0.05)
+
+    def test_timer(self):
+        metrics = client.Metrics()
+        with mock.patch('time.perf_counter', side_effect=[1.0, 1.5, 1.75, 2.0, 2.0]):
+            timer = metrics.timer('get_node_info')
+            # Headers were received 0.1s in, while the body was read by 0.5s.
+            timer.response(200, 0.1)
+            timer.body(64)
+            timer.lap('json')
+            timer.finish()
+        phases = metrics.stats('get_node_info').phases
+        self.assertAlmostEqual(phases['request'].sum, 0.1)
+        self.assertAlmostEqual(phases['transfer'].sum, 0.65)
+        self.assertAlmostEqual(phases['json'].sum, 0.25)
+        self.assertAlmostEqual(phases['total'].sum, 1.0)
+
+    def test_logging(self):
+        metrics = client.Metrics([client.LoggingExporter(level=logging.INFO)])
+        with self.assertLogs('xpxchain.client', logging.INFO) as logs:
+            metrics.record(metrics_module.Sample('get_node_info', 200, 64, {'total': 0.002}, None))
+        self.assertEqual(logs.output, [
+            'INFO:xpxchain.client:get_node_info status=200 bytes=64 error=None total=2.000ms'
+        ])
+
+    def test_prometheus(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'xpxchain.prom')
+            exporter = client.PrometheusExporter(path, interval=0)
+            metrics = client.Metrics([exporter])
+            metrics.record(metrics_module.Sample('get_node_info', 200, 300, {'total': 0.002}, None))
+            metrics.record(metrics_module.Sample('get_node_info', None, None, {'total': 0.5}, 'OSError'))
+            with open(path) as f:
+                text = f.read()
+
+        lines = text.splitlines()
+        self.assertIn('# TYPE xpxchain_client_phase_seconds histogram', lines)
+        self.assertIn('xpxchain_client_phase_seconds_bucket{endpoint="get_node_info",phase="total",le="0.0025"} 1', lines)
+        self.assertIn('xpxchain_client_phase_seconds_bucket{endpoint="get_node_info",phase="total",le="+Inf"} 2', lines)
+        self.assertIn('xpxchain_client_phase_seconds_count{endpoint="get_node_info",phase="total"} 2', lines)
+        self.assertIn('xpxchain_client_response_bytes_bucket{endpoint="get_node_info",le="1024.0"} 1', lines)
+        self.assertIn('xpxchain_client_responses_total{endpoint="get_node_info",status="200"} 1', lines)
+        self.assertIn('xpxchain_client_errors_total{endpoint="get_node_info",error="OSError"} 1', lines)
@@ -0,0 +1,244 @@
+import aiohttp
+import asyncio
+import itertools
+import json
+import requests
+import threading
+from unittest import mock
+
+from xpxchain import client
+from xpxchain import errors
+from xpxchain import models
+from tests import harness
+from tests import responses
+
+PUBLIC_KEY = '7A562888C7AE1E082579951D6D93BF931DE979360ACCA4C4085D754E5E122808'
+TRANSACTION_ID = '5CC07CBCA03D9100014F5754'
+
+
+def advance(page):
+    return page[-1] + 1 if page[-1] < 9 else None
+
+
+class TestIterPages(harness.TestCase):
+
+    def test_sync(self):
+        fetched = []
+        prefetched = threading.Event()
+
+        def fetch(cursor):
+            fetched.append(cursor)
+            if cursor == 3:
+                prefetched.set()
+            return list(range(cursor, min(cursor + 3, 10)))
+
+        with client.HTTP(responses.ENDPOINT) as http:
+            items = http._iter_pages(fetch, advance, 0)
+            self.assertEqual(next(items), 0)
+            # The next page is requested before the first is consumed.
+            self.assertTrue(prefetched.wait(5))
+            self.assertEqual(list(items), list(range(1, 10)))
+            self.assertEqual(fetched, [0, 3, 6, 9])
+
+    async def test_async(self):
+        fetched = []
+
+        async def fetch(cursor):
+            fetched.append(cursor)
+            await asyncio.sleep(0)
+            return list(range(cursor, min(cursor + 3, 10)))
+
+        async with client.AsyncHTTP(responses.ENDPOINT) as http:
+            items = [i async for i in http._iter_pages(fetch, advance, 0)]
+            self.assertEqual(items, list(range(10)))
+            self.assertEqual(fetched, [0, 3, 6, 9])
+
+    async def test_async_close(self):
+        event = asyncio.Event()
+
+        async def fetch(cursor):
+            if cursor:
+                await event.wait()
+            return [cursor]
+
+        async with client.AsyncHTTP(responses.ENDPOINT) as http:
+            items = http._iter_pages(fetch, lambda x: x[0] + 1, 0)
+            self.assertEqual(await items.__anext__(), 0)
+            await items.aclose()
+
+
+class TestIterTransactions(harness.TestCase):
+
+    @harness.async_test(
+        sync_data=(client.AccountHTTP, requests),
+        async_data=(client.AsyncAccountHTTP, aiohttp)
+    )
+    async def test_iter_transactions(self, data, await_cb, with_cb):
+        network_type = models.NetworkType.MIJIN_TEST
+        public_account = models.PublicAccount.create_from_public_key(PUBLIC_KEY, network_type)
+        async with with_cb(data[0](responses.ENDPOINT, network_type=network_type)) as http:
+            session = http.raw._session
+            with mock.patch.object(session, 'request', wraps=session.request) as request:
+                with data[1].default_response(200, **responses.BLOCK_TRANSACTIONS["Ok"]):
+                    # Full pages continue from the last transaction ID.
+                    iterator = http.iter_transactions(public_account, page_size=1, direction='incoming')
+                    if hasattr(iterator, '__aiter__'):
+                        transactions = []
+                        async for transaction in iterator:
+                            transactions.append(transaction)
+                            if len(transactions) == 2:
+                                break
+                        await iterator.aclose()
+                    else:
+                        transactions = list(itertools.islice(iterator, 2))
+                        iterator.close()
+
+                    self.assertEqual(len(transactions), 2)
+                    self.assertEqual(transactions[0].transaction_info.id, TRANSACTION_ID)
+                    url = request.call_args_list[0][0][1]
+                    self.assertTrue(url.endswith(f'/account/{PUBLIC_KEY}/transactions/incoming'))
+                    self.assertEqual(request.call_args_list[0][1]['params'], {'pageSize': 1})
+                    self.assertEqual(request.call_args_list[1][1]['params'], {'pageSize': 1, 'id': TRANSACTION_ID})
+
+                    # A partial page is the last page, and page sizes are
+                    # clamped to the maximum returned by nodes.
+                    iterator = http.iter_transactions(public_account, page_size=500)
+                    if hasattr(iterator, '__aiter__'):
+                        transactions = [i async for i in iterator]
+                    else:
+                        transactions = list(iterator)
+                    self.assertEqual(len(transactions), 1)
+                    self.assertIn({'pageSize': 100}, [i[1]['params'] for i in request.call_args_list])
+
+    def test_invalid(self):
+        with client.AccountHTTP(responses.ENDPOINT) as http:
+            with self.assertRaises(ValueError):
+                http.iter_transactions(None, direction='sideways')
+            with self.assertRaises(ValueError):
+                http.iter_transactions(None, page_size=0)
+
+
+class TestIterPipeline(harness.TestCase):
+
+    def test_sync(self):
+        fetched = []
+
+        def fetch(cursor):
+            fetched.append(cursor)
+            return list(range(cursor + 2, cursor - 1, -1))
+
+        with client.HTTP(responses.ENDPOINT) as http:
+            items = http._iter_pipeline(fetch, range(0, 9, 3), 2, lambda c, p: sorted(p), lambda x: (x * 2, None))
+            self.assertEqual(list(items), [(i, i * 2, None) for i in range(9)])
+            self.assertEqual(sorted(fetched), [0, 3, 6])
+
+    async def test_async(self):
+        in_flight = 0
+        max_in_flight = 0
+
+        async def fetch(cursor):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(in_flight, max_in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return list(range(cursor + 2, cursor - 1, -1))
+
+        async def double(x):
+            return x * 2
+
+        async with client.AsyncHTTP(responses.ENDPOINT) as http:
+            items = http._iter_pipeline(fetch, range(0, 30, 3), 3, lambda c, p: sorted(p), lambda x: (double(x), None))
+            self.assertEqual([i async for i in items], [(i, i * 2, None) for i in range(30)])
+            self.assertEqual(max_in_flight, 3)
+
+
+class TestCollectPages(harness.TestCase):
+
+    def test_sync(self):
+        with client.HTTP(responses.ENDPOINT) as http:
+            items = http._collect_pages(lambda x: list(range(x, min(x + 3, 10))), advance, 0)
+            self.assertEqual(items, list(range(10)))
+
+    async def test_async(self):
+        async def fetch(cursor):
+            await asyncio.sleep(0)
+            return list(range(cursor, min(cursor + 3, 10)))
+
+        async with client.AsyncHTTP(responses.ENDPOINT) as http:
+            self.assertEqual(await http._collect_pages(fetch, advance, 0), list(range(10)))
+
+
+class TestIterBlocks(harness.TestCase):
+
+    @harness.async_test(
+        sync_data=(client.BlockchainHTTP, requests),
+        async_data=(client.AsyncBlockchainHTTP, aiohttp)
+    )
+    async def test_iter_blocks(self, data, await_cb, with_cb):
+        async def collect(iterator):
+            if hasattr(iterator, '__aiter__'):
+                return [i async for i in iterator]
+            return list(iterator)
+
+        network_type = models.NetworkType.MIJIN_TEST
+        async with with_cb(data[0](responses.ENDPOINT, network_type=network_type)) as http:
+            session = http.raw._session
+            with mock.patch.object(session, 'request', wraps=session.request) as request:
+                with data[1].default_response(200, **responses.BLOCKS_INFO["Ok"]):
+                    # Windows are clamped to the maximum returned by nodes.
+                    blocks = await collect(http.iter_blocks(1, 1, window=500, depth=2))
+                    self.assertEqual([i.height for i in blocks], [1])
+                    self.assertTrue(request.call_args_list[0][0][1].endswith('/blocks/1/limit/100'))
+
+                    # Heights missing from a window are never skipped.
+                    with self.assertRaises(errors.MissingBlockError) as context:
+                        await collect(http.iter_blocks(1, 250, window=100, depth=2))
+                    self.assertEqual(context.exception.height, 2)
+
+    @harness.async_test(
+        sync_data=(client.BlockchainHTTP, False),
+        async_data=(client.AsyncBlockchainHTTP, True)
+    )
+    async def test_iter_blocks_transactions(self, data, await_cb, with_cb):
+        block = json.loads(responses.BLOCK_INFO["Ok"]["content"])
+        blocks = []
+        for height in (1, 2):
+            block['block']['height'] = [height, 0]
+            blocks.append(models.BlockInfo.create_from_dto(block))
+        ids = [f'{i:024X}' for i in range(150)]
+        calls = []
+
+        def call(self, cbs, *args, **kwds):
+            name = cbs[0].__name__
+            calls.append((name, args))
+            if name == 'get_blocks_by_height_with_limit':
+                value = blocks
+            else:
+                height, page_size, id = args
+                offset = 0 if id is None else ids.index(id) + 1
+                value = [mock.Mock(transaction_info=mock.Mock(id=i)) for i in ids[offset:offset + page_size]]
+
+            async def resolve():
+                return value
+            return resolve() if data[1] else value
+
+        async with with_cb(data[0](responses.ENDPOINT, network_type=models.NetworkType.MIJIN_TEST)) as http:
+            with mock.patch.object(data[0], '__call__', call):
+                iterator = http.iter_blocks(1, 2, transactions=True)
+                if hasattr(iterator, '__aiter__'):
+                    items = [i async for i in iterator]
+                else:
+                    items = list(iterator)
+
+        # Every page of the transactions of each block is fetched.
+        self.assertEqual([i[0].height for i in items], [1, 2])
+        self.assertTrue(all(len(i[1]) == 150 and i[2] is None for i in items))
+        self.assertEqual([i.transaction_info.id for i in items[0][1]], ids)
+        pages = sorted((i[1] for i in calls if i[0] == 'get_block_transactions'), key=lambda x: (x[0], x[2] or ''))
+        self.assertEqual(pages, [(1, 100, None), (1, 100, ids[99]), (2, 100, None), (2, 100, ids[99])])
+
+    def test_invalid(self):
+        with client.BlockchainHTTP(responses.ENDPOINT) as http:
+            with self.assertRaises(ValueError):
+                http.iter_blocks(1, 10, window=0)
@@ -0,0 +1,150 @@
+import asyncio
+import types
+
+from xpxchain import client
+from xpxchain import models
+from tests import harness
+
+SIGNER = 'A04335F99D9EE3787528A16C7A302F80D511E9CF71D97D95C2182E0EA75A1EF9'
+
+
+def make_transaction(index):
+    return models.SignedTransaction(
+        payload='00',
+        hash='%064X' % index,
+        signer=SIGNER,
+        type=models.TransactionType.TRANSFER,
+        network_type=models.NetworkType.MIJIN_TEST,
+    )
+
+
+class FakeNode:
+    """Accept announces after a delay, failing according to a schedule."""
+
+    def __init__(self, endpoint, errors=None, delay=0.001):
+        self.raw = types.SimpleNamespace(endpoint=endpoint)
+        self.errors = errors or {}
+        self.delay = delay
+        self.announced = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def announce(self, transaction):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            errors = self.errors.get(transaction.hash)
+            if errors:
+                raise errors.pop(0)
+            self.announced.append(transaction.hash)
+            return models.TransactionAnnounceResponse('packet 9 was pushed to the network via /transaction')
+        finally:
+            self.in_flight -= 1
+
+
+def make_error(status):
+    error = client.AsyncHTTPError(f'Error: {status}')
+    error.status = status
+    return error
+
+
+async def collect(pipeline, transactions):
+    return [i async for i in pipeline.announce(transactions)]
+
+
+class TestAnnouncePipeline(harness.TestCase):
+
+    async def test_announce(self):
+        nodes = [FakeNode('http://node1:3000'), FakeNode('http://node2:3000')]
+        pipeline = client.AnnouncePipeline(nodes, concurrency=4)
+        transactions = [make_transaction(i) for i in range(40)]
+        outcomes = await collect(pipeline, transactions + transactions[:5])
+
+        self.assertEqual(len(outcomes), 40)
+        self.assertTrue(all(i.ok and i.attempts == 1 for i in outcomes))
+        self.assertEqual({i.hash for i in outcomes}, {i.hash for i in transactions})
+        self.assertEqual(len(nodes[0].announced) + len(nodes[1].announced), 40)
+        self.assertTrue(nodes[0].announced and nodes[1].announced)
+        self.assertTrue(all(i.max_in_flight <= 4 for i in nodes))
+        self.assertEqual((pipeline.submitted, pipeline.announced, pipeline.duplicates), (40, 40, 5))
+        self.assertGreater(pipeline.throughput, 0)
+
+        # Announced hashes are skipped by later runs.
+        self.assertEqual(await collect(pipeline, transactions[:3]), [])
+        self.assertEqual(pipeline.duplicates, 8)
+
+    async def test_async_source(self):
+        async def source():
+            for index in range(10):
+                await asyncio.sleep(0)
+                yield make_transaction(index)
+
+        node = FakeNode('http://node1:3000')
+        outcomes = await collect(client.AnnouncePipeline([node], concurrency=2), source())
+        self.assertEqual(len(outcomes), 10)
+        self.assertLessEqual(node.max_in_flight, 2)
+
+    async def test_retry(self):
+        busy = make_error(503)
+        invalid = make_error(409)
+        transactions = [make_transaction(i) for i in range(3)]
+        slow = FakeNode('http://node1:3000', {
+            transactions[0].hash: [busy],
+            transactions[1].hash: [invalid],
+            transactions[2].hash: [ConnectionRefusedError()] * 3,
+        })
+        nodes = [slow, FakeNode('http://node2:3000', {
+            transactions[1].hash: [invalid],
+            transactions[2].hash: [ConnectionRefusedError()] * 3,
+        })]
+        pipeline = client.AnnouncePipeline(nodes, concurrency=8, backoff_base=0)
+        outcomes = {i.hash: i for i in await collect(pipeline, transactions)}
+
+        # Transient failures are retried on the other node.
+        retried = outcomes[transactions[0].hash]
+        self.assertTrue(retried.ok)
+        self.assertEqual((retried.attempts, retried.endpoint), (2, 'http://node2:3000'))
+
+        rejected = outcomes[transactions[1].hash]
+        self.assertIs(rejected.error, invalid)
+        self.assertEqual(rejected.attempts, 1)
+
+        exhausted = outcomes[transactions[2].hash]
+        self.assertIsInstance(exhausted.error, ConnectionRefusedError)
+        self.assertEqual(exhausted.attempts, 3)
+
+        self.assertEqual((pipeline.announced, pipeline.failed, pipeline.retries), (1, 2, 3))
+        # Windows shrink for nodes reporting transient failures.
+        self.assertLess(pipeline.windows['http://node1:3000'], 8)
+
+        # Failed transactions may be announced again.
+        slow.errors.clear()
+        nodes[1].errors.clear()
+        outcomes = await collect(pipeline, transactions)
+        self.assertEqual(len(outcomes), 2)
+
+    async def test_cancel(self):
+        node = FakeNode('http://node1:3000', delay=0.01)
+        pipeline = client.AnnouncePipeline([node], concurrency=2)
+        iterator = pipeline.announce(make_transaction(i) for i in range(100))
+        await iterator.__anext__()
+        await iterator.aclose()
+        self.assertEqual(node.in_flight, 0)
+        self.assertLess(pipeline.submitted, 10)
+
+    async def test_slow_consumer(self):
+        node = FakeNode('http://node1:3000')
+        pipeline = client.AnnouncePipeline([node], concurrency=2)
+        iterator = pipeline.announce(make_transaction(i) for i in range(100))
+        await iterator.__anext__()
+        # Queued outcomes hold their slot, so the source is not read ahead.
+        await asyncio.sleep(0.05)
+        self.assertLess(pipeline.submitted, 10)
+        await iterator.aclose()
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            client.AnnouncePipeline([])
+        with self.assertRaises(ValueError):
+            client.AnnouncePipeline([FakeNode('http://node1:3000')], concurrency=0)
@@ -0,0 +1,110 @@
+import aiohttp
+import requests
+
+from xpxchain import client
+from xpxchain import models
+from xpxchain.client import pool
+from tests import harness
+from tests import responses
+
+ENDPOINTS = ['//localhost:3000', '//localhost:3001', '//localhost:3002']
+
+
+class TestNodeSet(harness.TestCase):
+
+    def test_requires_endpoints(self):
+        with self.assertRaises(ValueError):
+            pool.NodeSet([])
+
+    def test_select_unmeasured(self):
+        nodes = pool.NodeSet(ENDPOINTS)
+        self.assertIs(nodes.select(), nodes.nodes[0])
+        nodes.nodes[0].in_flight += 1
+        self.assertIs(nodes.select(), nodes.nodes[1])
+
+    def test_select_latency(self):
+        nodes = pool.NodeSet(ENDPOINTS)
+        nodes.record(nodes.nodes[0], 0.5, True)
+        nodes.record(nodes.nodes[1], 0.05, True)
+        nodes.record(nodes.nodes[2], 0.2, True)
+        self.assertIs(nodes.select(), nodes.nodes[1])
+
+    def test_select_error_rate(self):
+        nodes = pool.NodeSet(ENDPOINTS[:2])
+        nodes.record(nodes.nodes[0], 0.05, False)
+        nodes.record(nodes.nodes[1], 0.1, True)
+        self.assertIs(nodes.select(), nodes.nodes[1])
+        self.assertEqual(nodes.nodes[0].failures, 1)
+        self.assertEqual(nodes.nodes[0].requests, 1)
+
+    def test_cooldown(self):
+        nodes = pool.NodeSet(ENDPOINTS[:2], max_failures=2, cooldown=60)
+        fast, slow = nodes.nodes
+        nodes.record(slow, 1.0, True)
+        nodes.record(fast, 0.01, False)
+        self.assertEqual(fast.retry_at, 0.0)
+        nodes.record(fast, 0.01, False)
+        self.assertGreater(fast.retry_at, 0.0)
+        self.assertIs(nodes.select(), slow)
+
+        # All nodes cooling down, choose the first to recover.
+        nodes.record(slow, 1.0, False)
+        nodes.record(slow, 1.0, False)
+        self.assertIs(nodes.select(), fast)
+
+
+class TestNodePool(harness.TestCase):
+
+    @harness.async_test(
+        sync_data=(client.NodePool, requests),
+        async_data=(client.AsyncNodePool, aiohttp)
+    )
+    async def test_routing(self, data, await_cb, with_cb):
+        network_type = models.NetworkType.MIJIN_TEST
+        async with with_cb(data[0](ENDPOINTS, network_type=network_type)) as http:
+            first, second, third = http.nodes
+            with data[1].endpoint_exception('localhost:3000', ConnectionRefusedError):
+                with self.assertRaises(ConnectionRefusedError):
+                    await await_cb(http.blockchain.get_blockchain_height())
+            self.assertEqual(first.failures, 1)
+
+            # Remaining requests avoid the failed node.
+            with data[1].endpoint_response('localhost:3001', 200, **responses.CHAIN_HEIGHT["Ok"]):
+                with data[1].endpoint_response('localhost:3002', 200, **responses.CHAIN_HEIGHT["Ok"]):
+                    for _ in range(4):
+                        height = await await_cb(http.blockchain.get_blockchain_height())
+                        self.assertEqual(height, 53577)
+            self.assertEqual(first.requests, 1)
+            self.assertEqual(second.requests + third.requests, 4)
+            self.assertEqual(second.failures + third.failures, 0)
+
+    @harness.async_test(
+        sync_data=(client.NodePool, requests),
+        async_data=(client.AsyncNodePool, aiohttp)
+    )
+    async def test_server_error(self, data, await_cb, with_cb):
+        async with with_cb(data[0](ENDPOINTS[:2])) as http:
+            first, second = http.nodes
+            with data[1].endpoint_response('localhost:3000', 503, content=b'{}'):
+                with self.assertRaises(Exception):
+                    await await_cb(http.network_type)
+            self.assertEqual(first.failures, 1)
+
+            with data[1].default_response(200, **responses.NETWORK_TYPE["MIJIN_TEST"]):
+                network_type = await await_cb(http.network_type)
+            self.assertEqual(network_type, models.NetworkType.MIJIN_TEST)
+            self.assertEqual(second.requests, 1)
+
+    @harness.async_test(
+        sync_data=client.NodePool,
+        async_data=client.AsyncNodePool
+    )
+    async def test_shared_pool(self, data, await_cb, with_cb):
+        async with with_cb(data(ENDPOINTS)) as http:
+            self.assertIs(http.account.raw, http.raw)
+            self.assertIs(http.transaction.raw.nodes, http.raw.nodes)
+            self.assertEqual([i.endpoint for i in http.nodes], [
+                'http://localhost:3000',
+                'http://localhost:3001',
+                'http://localhost:3002',
+            ])
@@ -0,0 +1,136 @@
+import aiohttp
+import asyncio
+import requests
+import threading
+import time
+
+from xpxchain import client
+from xpxchain import models
+from tests import harness
+from tests import responses
+
+
+class TestRateLimiter(harness.TestCase):
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            client.RateLimiter(rate=0)
+        with self.assertRaises(ValueError):
+            client.RateLimiter(max_in_flight=0)
+        with self.assertRaises(ValueError):
+            client.RateLimiter(rate=10, burst=0.5)
+
+    def test_rate(self):
+        limiter = client.RateLimiter(rate=100, burst=2)
+        for _ in range(3):
+            limiter.acquire()
+            limiter.release()
+        # The burst is sent immediately, the next request waits for a token.
+        self.assertEqual((limiter.requests, limiter.queued), (3, 1))
+        self.assertGreater(limiter.queue_time, 0)
+        self.assertEqual(limiter.max_queue_time, limiter.queue_time)
+
+    def test_max_in_flight(self):
+        limiter = client.RateLimiter(max_in_flight=1)
+        order = []
+
+        def worker(index):
+            limiter.acquire()
+            order.append(index)
+            limiter.release()
+
+        limiter.acquire()
+        threads = []
+        for index in range(3):
+            thread = threading.Thread(target=worker, args=(index,))
+            thread.start()
+            threads.append(thread)
+            # Wait until the worker is queued, so the queue order is known.
+            while limiter._tickets <= index:
+                time.sleep(0.001)
+
+        self.assertEqual(order, [])
+        limiter.release()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(order, [0, 1, 2])
+        self.assertEqual((limiter.requests, limiter.queued, limiter.in_flight), (4, 3, 0))
+
+    def test_interrupted(self):
+        limiter = client.RateLimiter(max_in_flight=1)
+        order = []
+        caller = threading.get_ident()
+        wait = limiter._condition.wait
+
+        def interrupt(timeout=None):
+            if threading.get_ident() == caller:
+                raise KeyboardInterrupt
+            return wait(timeout)
+
+        def worker(index):
+            limiter.acquire()
+            order.append(index)
+            limiter.release()
+
+        limiter.acquire()
+        limiter._condition.wait = interrupt
+        threads = []
+        for index in range(3):
+            if index == 1:
+                # Abandon the ticket between two queued workers.
+                with self.assertRaises(KeyboardInterrupt):
+                    limiter.acquire()
+                continue
+            thread = threading.Thread(target=worker, args=(index,))
+            thread.start()
+            threads.append(thread)
+            while limiter._tickets <= index:
+                time.sleep(0.001)
+
+        limiter.release()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(order, [0, 2])
+        self.assertEqual((limiter._serving, limiter._tickets, limiter.in_flight), (3, 3, 0))
+
+    async def test_async(self):
+        limiter = client.RateLimiter(max_in_flight=2)
+        order = []
+        in_flight = 0
+        max_in_flight = 0
+
+        async def worker(index):
+            nonlocal in_flight, max_in_flight
+            await limiter.acquire_async()
+            order.append(index)
+            in_flight += 1
+            max_in_flight = max(in_flight, max_in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            limiter.release()
+
+        await asyncio.gather(*(worker(i) for i in range(6)))
+        self.assertEqual(order, list(range(6)))
+        self.assertEqual(max_in_flight, 2)
+        self.assertEqual((limiter.requests, limiter.queued, limiter.in_flight), (6, 4, 0))
+        self.assertGreater(limiter.mean_queue_time, 0)
+
+
+class TestRateLimiting(harness.TestCase):
+
+    @harness.async_test(
+        sync_data=(client.BlockchainHTTP, requests),
+        async_data=(client.AsyncBlockchainHTTP, aiohttp)
+    )
+    async def test_http(self, data, await_cb, with_cb):
+        network_type = models.NetworkType.MIJIN_TEST
+        http = data[0](responses.ENDPOINT, network_type=network_type, rate_limit=1000, max_in_flight=1)
+        async with with_cb(http):
+            limiter = http.rate_limiter
+            self.assertEqual((limiter.rate, limiter.max_in_flight), (1000, 1))
+            self.assertIs(http.root.blockchain.rate_limiter, limiter)
+            self.assertIs(http.raw.rate_limiter, limiter)
+            with data[1].default_response(200, **responses.CHAIN_HEIGHT["Ok"]):
+                for _ in range(3):
+                    await await_cb(http.get_blockchain_height())
+            self.assertEqual((limiter.requests, limiter.in_flight), (3, 0))
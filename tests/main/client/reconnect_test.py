@@ -0,0 +1,201 @@
+import aiohttp
+import json
+import websockets
+from unittest import mock
+
+from xpxchain import client
+from xpxchain import models
+from tests import harness
+from tests import responses
+
+UIDS = ['A7Z3K5CZ3WMPMCI2IKHRCPWDHGJAYR76', 'B7Z3K5CZ3WMPMCI2IKHRCPWDHGJAYR76']
+BLOCK = json.loads(responses.BLOCK_INFO['Ok']['content'])
+TRANSACTION = json.loads(responses.TRANSACTION['Ok']['content'])
+RECIPIENT = models.Address.create_from_encoded(TRANSACTION['transaction']['recipient'])
+
+
+def block_dto(height):
+    data = json.loads(json.dumps(BLOCK))
+    data['block']['height'] = [height, 0]
+    return data
+
+
+def transaction_dto(height, index=0):
+    data = json.loads(json.dumps(TRANSACTION))
+    data['meta']['height'] = [height, 0]
+    data['meta']['hash'] = '%064X' % (height * 100 + index)
+    return data
+
+
+def confirmed_message(height, index=0):
+    data = transaction_dto(height, index)
+    data['meta']['channelName'] = 'confirmedAdded'
+    return json.dumps(data)
+
+
+class FakeSession:
+    """Websocket session yielding messages, then dropping the connection."""
+
+    def __init__(self, uid, messages, drop=True):
+        self.uid = uid
+        self.messages = messages
+        self.drop = drop
+        self.sent = []
+        self.closed = False
+
+    async def recv(self):
+        return json.dumps({'uid': self.uid})
+
+    async def send(self, message):
+        if self.closed:
+            raise websockets.ConnectionClosed(1006, '')
+        self.sent.append(json.loads(message))
+
+    async def __aiter__(self):
+        for message in self.messages:
+            yield message
+        self.closed = True
+        if self.drop:
+            raise websockets.ConnectionClosed(1006, '')
+
+
+class FakeConnect:
+
+    def __init__(self, session):
+        self.session = session
+
+    async def __aenter__(self):
+        if isinstance(self.session, Exception):
+            raise self.session
+        return self.session
+
+    async def __aexit__(self, exc_type, exc, tb):
+        pass
+
+
+class FakeBlockchainHTTP:
+    """Serve blocks and block transactions from a growing chain."""
+
+    def __init__(self, heights, transactions=None):
+        self.heights = iter(heights)
+        self.transactions = transactions or {}
+        self.ranges = []
+
+    async def get_blockchain_height(self):
+        return next(self.heights)
+
+    async def iter_blocks(self, start, end, transactions=False):
+        self.ranges.append((start, end))
+        for height in range(start, end + 1):
+            block = models.BlockInfo.create_from_dto(block_dto(height))
+            if not transactions:
+                yield block
+                continue
+            dtos = self.transactions.get(height, [])
+            yield block, [models.Transaction.create_from_dto(i) for i in dtos], None
+
+
+def connect_sequence(*sessions):
+    connections = iter(FakeConnect(i) for i in sessions)
+    return mock.patch('websockets.connect', lambda *args, **kwds: next(connections))
+
+
+async def take(listener, count):
+    return [await listener.__anext__() for _ in range(count)]
+
+
+def describe(message):
+    if message.channel_name == 'block':
+        return ('block', message.message.height)
+    return (message.channel_name, message.message.transaction_info.height)
+
+
+class TestReconnect(harness.TestCase):
+
+    async def test_backfill(self):
+        first = FakeSession(UIDS[0], [json.dumps(block_dto(11))])
+        second = FakeSession(UIDS[1], [
+            json.dumps(block_dto(14)),
+            confirmed_message(13),
+            json.dumps(block_dto(15)),
+            confirmed_message(15),
+        ], drop=False)
+        http = FakeBlockchainHTTP([10, 14], {13: [transaction_dto(13)], 14: [transaction_dto(14)]})
+        policy = client.ReconnectPolicy(backoff_base=0)
+
+        with connect_sequence(first, second):
+            async with client.Listener(responses.ENDPOINT, reconnect=policy, http=http) as listener:
+                await listener.new_block()
+                await listener.confirmed(RECIPIENT)
+                messages = await take(listener, 8)
+
+        self.assertEqual([describe(i) for i in messages], [
+            ('block', 11),
+            # Backfilled after reconnecting, when the chain is at height 14.
+            ('block', 12),
+            ('block', 13),
+            ('confirmedAdded', 13),
+            ('block', 14),
+            ('confirmedAdded', 14),
+            # Live messages, skipping those already backfilled.
+            ('block', 15),
+            ('confirmedAdded', 15),
+        ])
+        self.assertEqual(http.ranges, [(12, 14)])
+        self.assertEqual(second.sent, [
+            {'uid': UIDS[1], 'subscribe': 'block'},
+            {'uid': UIDS[1], 'subscribe': f'confirmedAdded/{RECIPIENT.address}'},
+        ])
+        self.assertEqual((policy.reconnects, policy.backfilled), (1, 5))
+
+    async def test_default_http(self):
+        policy = client.ReconnectPolicy()
+        listener = client.Listener(responses.ENDPOINT, network_type=models.NetworkType.MIJIN_TEST, reconnect=policy)
+        with connect_sequence(FakeSession(UIDS[0], [])):
+            with aiohttp.default_response(200, **responses.CHAIN_HEIGHT['Ok']):
+                async with listener:
+                    self.assertEqual(listener._http.raw.endpoint, 'http://localhost:3000')
+                    self.assertEqual(listener._recovery.height, 53577)
+        self.assertTrue(listener._http.raw.closed)
+
+    async def test_exhausted(self):
+        first = FakeSession(UIDS[0], [])
+        policy = client.ReconnectPolicy(max_attempts=2, backoff_base=0, backfill=False)
+        with connect_sequence(first, ConnectionRefusedError(), ConnectionRefusedError()):
+            async with client.Listener(responses.ENDPOINT, reconnect=policy) as listener:
+                await listener.new_block()
+                with self.assertRaises(ConnectionRefusedError):
+                    await listener.__anext__()
+        self.assertEqual(policy.reconnects, 0)
+
+    async def test_disconnected_subscribe(self):
+        first = FakeSession(UIDS[0], [])
+        first.closed = True
+        second = FakeSession(UIDS[1], [json.dumps(block_dto(2))], drop=False)
+        policy = client.ReconnectPolicy(backoff_base=0, backfill=False)
+        with connect_sequence(first, second):
+            async with client.Listener(responses.ENDPOINT, reconnect=policy) as listener:
+                # Subscriptions while disconnected are sent after reconnecting.
+                await listener.new_block()
+                message = await listener.__anext__()
+        self.assertEqual(message.message.height, 2)
+        self.assertEqual(second.sent, [{'uid': UIDS[1], 'subscribe': 'block'}])
+
+    async def test_no_policy(self):
+        first = FakeSession(UIDS[0], [])
+        with connect_sequence(first):
+            async with client.Listener(responses.ENDPOINT) as listener:
+                await listener.new_block()
+                with self.assertRaises(websockets.ConnectionClosed):
+                    await listener.__anext__()
+
+    def test_policy(self):
+        policy = client.ReconnectPolicy(max_attempts=3, backoff_base=1, backoff_max=4)
+        self.assertTrue(all(0 <= policy.delay(i) <= min(4, 2 ** i) for i in range(6)))
+        self.assertFalse(policy.exhausted(2))
+        self.assertTrue(policy.exhausted(3))
+        self.assertFalse(client.ReconnectPolicy().exhausted(100))
+        # Long outages never overflow the backoff.
+        self.assertLessEqual(policy.delay(5000), 4)
+        with self.assertRaises(ValueError):
+            client.ReconnectPolicy(max_attempts=0)
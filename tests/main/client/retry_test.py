@@ -0,0 +1,179 @@
+import aiohttp
+import requests
+from unittest import mock
+
+import xpxchain
+from xpxchain import client
+from xpxchain import models
+from xpxchain.client import retry
+from tests import harness
+from tests import responses
+
+
+def sync_outcomes(*outcomes):
+    """Serve each status code, or raise each exception, in turn."""
+
+    iterator = iter(outcomes)
+
+    def request(method, url, **kwds):
+        outcome = next(iterator)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return requests.Response.mock(outcome, **responses.CHAIN_HEIGHT["Ok"])
+
+    return request
+
+
+def async_outcomes(*outcomes):
+    """Serve each status code, or raise each exception, in turn."""
+
+    iterator = iter(outcomes)
+
+    async def respond():
+        outcome = next(iterator)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return aiohttp.ClientResponse.mock(outcome, **responses.CHAIN_HEIGHT["Ok"])
+
+    def request(method, url, **kwds):
+        return aiohttp.AsyncContextManager(respond())
+
+    return request
+
+
+class TestRetryPolicy(harness.TestCase):
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            client.RetryPolicy(max_attempts=0)
+
+    def test_attempts(self):
+        policy = client.RetryPolicy(max_attempts=4)
+        self.assertEqual(policy.attempts('get_account_info'), 4)
+        self.assertEqual(policy.attempts('announce'), 1)
+        self.assertEqual(client.RetryPolicy(retry_announces=True).attempts('announce'), 3)
+
+    def test_delay(self):
+        policy = client.RetryPolicy(backoff_base=1.0, backoff_max=3.0)
+        for attempt, ceiling in ((1, 1.0), (2, 2.0), (3, 3.0), (10, 3.0)):
+            delay = policy.delay(attempt)
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, ceiling)
+        self.assertLessEqual(policy.delay(5000), 3.0)
+
+
+class TestCircuitBreaker(harness.TestCase):
+
+    def test_trip(self):
+        breaker = client.CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        breaker.record('a', False)
+        breaker.check('a')
+        breaker.record('a', False)
+        self.assertEqual(breaker.state('a'), retry.OPEN)
+        self.assertEqual(breaker.state('b'), retry.CLOSED)
+        with self.assertRaises(xpxchain.CircuitOpenError):
+            breaker.check('a')
+        self.assertEqual((breaker.trips, breaker.rejections), (1, 1))
+
+    def test_probe(self):
+        breaker = client.CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record('a', False)
+        self.assertEqual(breaker.state('a'), retry.HALF_OPEN)
+
+        # Only a single probe is allowed through.
+        breaker.check('a')
+        with self.assertRaises(xpxchain.CircuitOpenError):
+            breaker.check('a')
+
+        # A failed probe opens the circuit again, a successful one closes it.
+        breaker.record('a', False)
+        breaker.check('a')
+        breaker.record('a', True)
+        self.assertEqual(breaker.state('a'), retry.CLOSED)
+        self.assertEqual(breaker.trips, 1)
+
+        # A released probe allows another probe through.
+        breaker.record('a', False)
+        self.assertTrue(breaker.check('a'))
+        breaker.release('a')
+        self.assertTrue(breaker.check('a'))
+
+
+class TestRetry(harness.TestCase):
+
+    @harness.async_test(
+        sync_data=(client.BlockchainHTTP, client.HTTPError, sync_outcomes),
+        async_data=(client.AsyncBlockchainHTTP, client.AsyncHTTPError, async_outcomes)
+    )
+    async def test_retry(self, data, await_cb, with_cb):
+        network_type = models.NetworkType.MIJIN_TEST
+        policy = client.RetryPolicy(backoff_base=0)
+        http = data[0](responses.ENDPOINT, network_type=network_type, retry=policy)
+        async with with_cb(http):
+            self.assertIs(http.root.blockchain.retry, policy)
+            session = http.raw._session
+            outcomes = data[2](503, ConnectionRefusedError(), 200)
+            with mock.patch.object(session, 'request', side_effect=outcomes) as request:
+                self.assertEqual(await await_cb(http.get_blockchain_height()), 53577)
+            self.assertEqual(request.call_count, 3)
+            self.assertEqual(policy.retries, 2)
+
+            # The last response is returned once attempts are exhausted.
+            outcomes = data[2](503, 503, 503)
+            with mock.patch.object(session, 'request', side_effect=outcomes) as request:
+                with self.assertRaises(data[1]):
+                    await await_cb(http.get_blockchain_height())
+            self.assertEqual(request.call_count, 3)
+
+            # Client errors are not retried.
+            outcomes = data[2](404)
+            with mock.patch.object(session, 'request', side_effect=outcomes) as request:
+                with self.assertRaises(data[1]):
+                    await await_cb(http.get_blockchain_height())
+            self.assertEqual(request.call_count, 1)
+
+    @harness.async_test(
+        sync_data=(client.BlockchainHTTP, client.HTTPError, sync_outcomes),
+        async_data=(client.AsyncBlockchainHTTP, client.AsyncHTTPError, async_outcomes)
+    )
+    async def test_circuit_breaker(self, data, await_cb, with_cb):
+        network_type = models.NetworkType.MIJIN_TEST
+        breaker = client.CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        http = data[0](responses.ENDPOINT, network_type=network_type, circuit_breaker=breaker)
+        async with with_cb(http):
+            session = http.raw._session
+            outcomes = data[2](ConnectionRefusedError(), 500)
+            with mock.patch.object(session, 'request', side_effect=outcomes) as request:
+                with self.assertRaises(ConnectionRefusedError):
+                    await await_cb(http.get_blockchain_height())
+                with self.assertRaises(data[1]):
+                    await await_cb(http.get_blockchain_height())
+
+                # The open circuit fails fast, without a request.
+                with self.assertRaises(xpxchain.CircuitOpenError):
+                    await await_cb(http.get_blockchain_height())
+            self.assertEqual(request.call_count, 2)
+            self.assertEqual(breaker.state(http.raw.endpoint), retry.OPEN)
+            self.assertEqual((breaker.trips, breaker.rejections), (1, 1))
+
+    @harness.async_test(
+        sync_data=(client.BlockchainHTTP, sync_outcomes),
+        async_data=(client.AsyncBlockchainHTTP, async_outcomes)
+    )
+    async def test_probe_released(self, data, await_cb, with_cb):
+        network_type = models.NetworkType.MIJIN_TEST
+        breaker = client.CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        http = data[0](responses.ENDPOINT, network_type=network_type, circuit_breaker=breaker)
+        async with with_cb(http):
+            session = http.raw._session
+            outcomes = data[1](ConnectionRefusedError(), ValueError(), 200)
+            with mock.patch.object(session, 'request', side_effect=outcomes):
+                with self.assertRaises(ConnectionRefusedError):
+                    await await_cb(http.get_blockchain_height())
+
+                # A probe failing without an outcome does not block the endpoint.
+                with self.assertRaises(ValueError):
+                    await await_cb(http.get_blockchain_height())
+                self.assertEqual(breaker.state(http.raw.endpoint), retry.HALF_OPEN)
+                self.assertEqual(await await_cb(http.get_blockchain_height()), 53577)
+            self.assertEqual(breaker.state(http.raw.endpoint), retry.CLOSED)
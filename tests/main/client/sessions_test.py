@@ -0,0 +1,85 @@
+import aiohttp
+import asyncio
+import requests
+
+from xpxchain import client
+from xpxchain import models
+from tests import harness
+from tests import responses
+
+
+class TestSessionRegistry(harness.TestCase):
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            client.SessionRegistry(pool_size=0)
+
+    def test_session(self):
+        with client.SessionRegistry(pool_size=4) as sessions:
+            first = sessions.session('http://localhost:3000')
+            second = sessions.session('http://localhost:3000')
+            other = sessions.session('http://localhost:3001')
+            self.assertIs(first.session, second.session)
+            self.assertIsNot(first.session, other.session)
+            self.assertEqual(len(sessions), 2)
+            self.assertEqual(first.session.adapters['http://'].pool_maxsize, 4)
+
+            first.close()
+            self.assertTrue(first.closed)
+            self.assertFalse(second.closed)
+        self.assertEqual(len(sessions), 0)
+
+    async def test_async_session(self):
+        async with client.SessionRegistry(keepalive_timeout=5, dns_ttl=60) as sessions:
+            first = sessions.async_session('http://localhost:3000')
+            second = sessions.async_session('http://localhost:3000')
+            self.assertIs(first.session, second.session)
+            self.assertEqual(first.session.connector.kwds['ttl_dns_cache'], 60)
+            self.assertEqual(first.session.connector.kwds['keepalive_timeout'], 5)
+
+            await first.close()
+            self.assertTrue(first.closed)
+            self.assertFalse(second.closed)
+
+            shared = first.session
+        self.assertTrue(shared.closed)
+        self.assertEqual(len(sessions), 0)
+
+    def test_async_session_loops(self):
+        async def get(sessions):
+            return sessions.async_session('http://localhost:3000').session
+
+        sessions = client.SessionRegistry()
+        shared = []
+        for _ in range(2):
+            loop = asyncio.new_event_loop()
+            shared.append(loop.run_until_complete(get(sessions)))
+            loop.close()
+
+        # A session from a closed loop is never reused.
+        self.assertIsNot(shared[0], shared[1])
+        self.assertEqual(len(sessions), 1)
+
+    def test_default_registry(self):
+        self.assertIs(client.default_registry(), client.default_registry())
+
+    @harness.async_test(
+        sync_data=(client.BlockchainHTTP, requests),
+        async_data=(client.AsyncBlockchainHTTP, aiohttp)
+    )
+    async def test_http(self, data, await_cb, with_cb):
+        network_type = models.NetworkType.MIJIN_TEST
+        sessions = client.SessionRegistry()
+        shared = set()
+        for _ in range(3):
+            async with with_cb(data[0](responses.ENDPOINT, network_type=network_type, sessions=sessions)) as http:
+                with data[1].default_response(200, **responses.CHAIN_HEIGHT["Ok"]):
+                    self.assertEqual(await await_cb(http.get_blockchain_height()), 53577)
+                shared.add(id(http.raw._session.session))
+            # Closing the client keeps the shared session open.
+            self.assertTrue(http.raw.closed)
+
+        self.assertEqual(len(shared), 1)
+        self.assertEqual(len(sessions), 1)
+        await sessions.close_async()
+        self.assertEqual(len(sessions), 0)
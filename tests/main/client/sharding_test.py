@@ -0,0 +1,157 @@
+import asyncio
+import json
+from unittest import mock
+
+from xpxchain import client
+from xpxchain import models
+from xpxchain.client import abc
+from tests import harness
+from tests import responses
+
+BLOCK = json.loads(responses.BLOCK_INFO['Ok']['content'])
+TRANSACTION = models.Transaction.create_from_dto(json.loads(responses.TRANSACTION['Ok']['content']))
+ADDRESSES = [
+    models.Address.create_from_public_key('%064X' % i, models.NetworkType.MIJIN_TEST)
+    for i in range(1, 31)
+]
+
+
+def block_message(height):
+    data = json.loads(json.dumps(BLOCK))
+    data['block']['height'] = [height, 0]
+    return abc.ListenerMessage('block', models.BlockInfo.create_from_dto(data))
+
+
+class FakeListener:
+    """Listener yielding the messages pushed by the test."""
+
+    def __init__(self, broken=False):
+        self.broken = broken
+        self.queue = asyncio.Queue()
+        self.subscribed = []
+        self.unsubscribed = []
+        self.entered = self.exited = False
+
+    async def __aenter__(self):
+        if self.broken:
+            raise ConnectionRefusedError()
+        self.entered = True
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.exited = True
+
+    @property
+    async def uid(self):
+        return 'A7Z3K5CZ3WMPMCI2IKHRCPWDHGJAYR76'
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        item = await self.queue.get()
+        if item is None:
+            raise StopAsyncIteration
+        elif isinstance(item, Exception):
+            raise item
+        return item
+
+    async def subscribe(self, channel):
+        self.subscribed.append(channel)
+
+    async def unsubscribe(self, channel):
+        self.unsubscribed.append(channel)
+
+
+async def settle():
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+class TestShardedListener(harness.TestCase):
+
+    async def test_assignment(self):
+        listeners = [FakeListener() for _ in range(3)]
+        async with client.ShardedListener(listeners) as listener:
+            await listener.new_block()
+            await listener.watch(ADDRESSES)
+            self.assertEqual(sum(len(i.subscribed) for i in listeners), 91)
+            self.assertEqual(sum(listener.loads.values()), 91)
+            self.assertTrue(all(listener.loads.values()))
+
+            # Every channel of an address is on the same shard.
+            for address in ADDRESSES:
+                shard = listener.shard(f'status/{address.address}')
+                channels = [f'{i}/{address.address}' for i in ('confirmedAdded', 'unconfirmedAdded', 'status')]
+                self.assertTrue(all(i in listeners[shard].subscribed for i in channels))
+
+            channel = f'status/{ADDRESSES[0].address}'
+            shard = listener.channels[channel]
+            await listener.unsubscribe(channel)
+            self.assertEqual(listeners[shard].unsubscribed, [channel])
+            self.assertNotIn(channel, listener.channels)
+
+        self.assertTrue(all(i.exited for i in listeners))
+
+    async def test_merge(self):
+        listeners = [FakeListener() for _ in range(2)]
+        async with client.ShardedListener(listeners) as listener:
+            confirmed = abc.ListenerMessage('confirmedAdded', TRANSACTION)
+            unconfirmed = abc.ListenerMessage('unconfirmedAdded', TRANSACTION)
+            for item in (block_message(2), confirmed, unconfirmed):
+                listeners[0].queue.put_nowait(item)
+            await settle()
+            for item in (confirmed, block_message(2), block_message(3)):
+                listeners[1].queue.put_nowait(item)
+            await settle()
+
+            messages = [await listener.__anext__() for _ in range(4)]
+            self.assertEqual([i.channel_name for i in messages], ['block', 'confirmedAdded', 'unconfirmedAdded', 'block'])
+            self.assertEqual(messages[-1].message.height, 3)
+            self.assertEqual(listener.duplicates, 2)
+            self.assertEqual(listener.depth, 0)
+
+    async def test_rebalance(self):
+        listeners = [FakeListener() for _ in range(3)]
+        async with client.ShardedListener(listeners) as listener:
+            await listener.watch(ADDRESSES)
+            before = listener.channels
+            lost = [k for k, v in before.items() if v == 1]
+
+            listeners[1].queue.put_nowait(ConnectionResetError())
+            await settle()
+            self.assertEqual(listener.live, [0, 2])
+            self.assertTrue(listeners[1].exited)
+            self.assertEqual(listener.rebalanced, len(lost))
+
+            # Only the channels of the lost shard move.
+            after = listener.channels
+            self.assertEqual(set(after), set(before))
+            self.assertTrue(all(after[k] == v for k, v in before.items() if v != 1))
+            self.assertTrue(all(i in listeners[after[i]].subscribed for i in lost))
+
+            # Losing every shard ends the stream with the last error.
+            listeners[0].queue.put_nowait(None)
+            listeners[2].queue.put_nowait(ConnectionResetError())
+            await settle()
+            with self.assertRaises(ConnectionResetError):
+                await listener.__anext__()
+
+    async def test_broken(self):
+        listeners = [FakeListener(broken=True), FakeListener()]
+        async with client.ShardedListener(listeners) as listener:
+            self.assertEqual(listener.live, [1])
+            await listener.watch(ADDRESSES[:2])
+            self.assertEqual(len(listeners[1].subscribed), 6)
+
+        with self.assertRaises(ConnectionRefusedError):
+            async with client.ShardedListener([FakeListener(broken=True)]):
+                pass
+
+    def test_create(self):
+        with mock.patch('websockets.connect', lambda *args, **kwds: None):
+            listener = client.ShardedListener.create(['ws://localhost:3000', 'ws://localhost:3001'], shards=3, lazy=True)
+        self.assertEqual(len(listener.listeners), 3)
+        self.assertTrue(all(i._lazy for i in listener.listeners))
+        with self.assertRaises(ValueError):
+            client.ShardedListener([])
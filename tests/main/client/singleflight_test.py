@@ -0,0 +1,101 @@
+import aiohttp
+import asyncio
+from unittest import mock
+
+from xpxchain import client
+from xpxchain import models
+from xpxchain.client.singleflight import SingleFlight
+from tests import harness
+from tests import responses
+
+
+class TestSingleFlight(harness.TestCase):
+
+    def test_key(self):
+        self.assertEqual(SingleFlight.key('get_account_info', ['A'], {}), ('get_account_info', ('A',), ()))
+        self.assertEqual(SingleFlight.key('get_network_type', [], {'network_type': None}), ('get_network_type', (), ()))
+        self.assertEqual(SingleFlight.key('get_accounts_info', [['A']], {}), None)
+
+    async def test_run(self):
+        single_flight = SingleFlight()
+        calls = []
+
+        async def factory():
+            calls.append(None)
+            await asyncio.sleep(0)
+            return 1
+
+        results = await asyncio.gather(*(single_flight.run('key', factory) for _ in range(5)))
+        self.assertEqual(results, [1] * 5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual((single_flight.calls, single_flight.shared), (1, 4))
+        self.assertEqual(len(single_flight), 0)
+
+        # Completed requests are not reused.
+        await single_flight.run('key', factory)
+        self.assertEqual(len(calls), 2)
+
+    async def test_exception(self):
+        single_flight = SingleFlight()
+
+        async def factory():
+            await asyncio.sleep(0)
+            raise ValueError
+
+        results = await asyncio.gather(*(single_flight.run('key', factory) for _ in range(3)), return_exceptions=True)
+        self.assertTrue(all(isinstance(i, ValueError) for i in results))
+        self.assertNotIn('key', single_flight)
+
+    async def test_cancel(self):
+        single_flight = SingleFlight()
+        event = asyncio.Event()
+
+        async def factory():
+            await event.wait()
+            return 1
+
+        first = asyncio.ensure_future(single_flight.run('key', factory))
+        second = asyncio.ensure_future(single_flight.run('key', factory))
+        await asyncio.sleep(0)
+        first.cancel()
+        event.set()
+        self.assertEqual(await second, 1)
+
+
+class TestCoalescing(harness.TestCase):
+
+    async def test_http(self):
+        network_type = models.NetworkType.MIJIN_TEST
+        async with client.AsyncHTTP(responses.ENDPOINT, network_type=network_type, coalesce=True) as http:
+            session = http.raw._session
+            with mock.patch.object(session, 'request', wraps=session.request) as request:
+                with aiohttp.default_response(200, **responses.CHAIN_HEIGHT["Ok"]):
+                    heights = await asyncio.gather(*(
+                        http.blockchain.get_blockchain_height() for _ in range(10)
+                    ))
+                self.assertEqual(heights, [53577] * 10)
+                self.assertEqual(request.call_count, 1)
+
+                with aiohttp.default_response(200, **responses.CHAIN_HEIGHT["Ok"]):
+                    await http.blockchain.get_blockchain_height()
+                self.assertEqual(request.call_count, 2)
+
+            self.assertIs(http.blockchain.single_flight, http.single_flight)
+            self.assertEqual((http.single_flight.calls, http.single_flight.shared), (2, 9))
+
+    async def test_network_type(self):
+        async with client.AsyncNetworkHTTP(responses.ENDPOINT, coalesce=True) as http:
+            with aiohttp.default_response(200, **responses.NETWORK_TYPE["MIJIN_TEST"]):
+                network_types = await asyncio.gather(*(http.get_network_type() for _ in range(3)))
+            self.assertEqual(network_types, [models.NetworkType.MIJIN_TEST] * 3)
+            self.assertEqual(http.single_flight.calls, 1)
+
+    async def test_disabled(self):
+        network_type = models.NetworkType.MIJIN_TEST
+        async with client.AsyncBlockchainHTTP(responses.ENDPOINT, network_type=network_type) as http:
+            self.assertIs(http.single_flight, None)
+            session = http.raw._session
+            with mock.patch.object(session, 'request', wraps=session.request) as request:
+                with aiohttp.default_response(200, **responses.CHAIN_HEIGHT["Ok"]):
+                    await asyncio.gather(*(http.get_blockchain_height() for _ in range(3)))
+                self.assertEqual(request.call_count, 3)
@@ -0,0 +1,90 @@
+import json
+import os
+import re
+import requests
+import tempfile
+from unittest import mock
+
+from xpxchain import client
+from xpxchain import indexer
+from xpxchain import models
+from tests import harness
+from tests import responses
+
+# The block fixture, including only the transaction in the transactions fixture.
+BLOCKS = json.loads(responses.BLOCKS_INFO["Ok"]["content"])
+BLOCKS[0]['meta']['numTransactions'] = 1
+BLOCKS_INFO = {**responses.BLOCKS_INFO["Ok"], 'content': json.dumps(BLOCKS).encode('utf-8')}
+
+ROUTES = [
+    (r'/chain/height$', responses.CHAIN_HEIGHT["Ok"]),
+    (r'/blocks/\d+/limit/\d+$', BLOCKS_INFO),
+    (r'/block/\d+/transactions$', responses.TRANSACTIONS["Ok"]),
+    (r'/block/\d+/receipts$', responses.BLOCK_RECEIPTS["Ok"]),
+]
+
+TRANSACTION_HASH = '47490969DB1960AD8565E67700C47FE41BBE07C6F490A66D3001AC46B6684600'
+SIGNER = '0EB448D07C7CCB312989AC27AA052738FF589E2F83973F909B506B450DC5C4E2'
+
+
+def route(method, url, **kwds):
+    """Serve the response fixture for the request path."""
+
+    for pattern, data in ROUTES:
+        if re.search(pattern, url):
+            return requests.Response.mock(200, **data)
+    return requests.Response.mock(404, content=b'{}')
+
+
+class TestIndexer(harness.TestCase):
+
+    def test_run(self):
+        network_type = models.NetworkType.MIJIN_TEST
+        with client.BlockchainHTTP(responses.ENDPOINT, network_type=network_type) as http:
+            with mock.patch.object(http.raw._session, 'request', side_effect=route) as request:
+                with indexer.Database() as database:
+                    self.assertEqual(database.checkpoint, 0)
+                    self.assertEqual(indexer.Indexer(http, database).run(end=1), 1)
+                    self.assertEqual(request.call_count, 3)
+
+                    block = database.get_block(1)
+                    self.assertEqual(block[0], 1)
+                    self.assertEqual(database.get_block_height(block[1]), 1)
+                    self.assertEqual(database.get_transactions_by_height(1), [TRANSACTION_HASH])
+                    self.assertEqual(database.get_transaction(TRANSACTION_HASH)[:4], (TRANSACTION_HASH, 1, 0, 16724))
+                    self.assertEqual(database.get_transactions_by_signer(SIGNER), [TRANSACTION_HASH])
+                    self.assertEqual(database.get_transactions_by_mosaic(models.MosaicId(0x0dc67fbe1cad29e3)), [TRANSACTION_HASH])
+                    recipients = database.connection.execute('SELECT recipient FROM recipients').fetchall()
+                    self.assertEqual(len(recipients), 1)
+                    self.assertEqual(database.connection.execute('SELECT COUNT(*) FROM receipts').fetchone(), (1,))
+
+                    # Resuming from the checkpoint does not refetch indexed blocks.
+                    self.assertEqual(indexer.Indexer(http, database).run(end=1), 1)
+                    self.assertEqual(request.call_count, 3)
+
+    def test_resume(self):
+        network_type = models.NetworkType.MIJIN_TEST
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'chain.db')
+            with client.BlockchainHTTP(responses.ENDPOINT, network_type=network_type) as http:
+                with mock.patch.object(http.raw._session, 'request', side_effect=route):
+                    with indexer.Database(path) as database:
+                        indexer.Indexer(http, database, receipts=False).run(end=1)
+
+                    # The fixture node only has the first block, so indexing
+                    # stops at the gap, rather than skipping past it.
+                    with indexer.Database(path) as database:
+                        self.assertEqual(database.checkpoint, 1)
+                        self.assertEqual(indexer.Indexer(http, database).run(), 1)
+                        self.assertEqual(database.connection.execute('SELECT COUNT(*) FROM blocks').fetchone(), (1,))
+
+    def test_incomplete(self):
+        network_type = models.NetworkType.MIJIN_TEST
+        with client.BlockchainHTTP(responses.ENDPOINT, network_type=network_type) as http:
+            # The block claims 31 transactions, but the node only returns one.
+            with mock.patch.object(http.raw._session, 'request', side_effect=route):
+                with mock.patch.dict(ROUTES[1][1], responses.BLOCKS_INFO["Ok"]):
+                    with indexer.Database() as database:
+                        self.assertEqual(indexer.Indexer(http, database).run(end=1), 0)
+                        self.assertEqual(database.checkpoint, 0)
+                        self.assertEqual(database.connection.execute('SELECT COUNT(*) FROM blocks').fetchone(), (0,))
@@ -0,0 +1,88 @@
+import aiohttp
+import concurrent.futures
+import json
+import requests
+from unittest import mock
+
+from xpxchain import client
+from xpxchain import models
+from xpxchain import parallel
+from tests import harness
+from tests import responses
+
+NETWORK_TYPE = models.NetworkType.MIJIN_TEST
+
+
+def load_dtos(response, count):
+    data = json.loads(response['content'])
+    return (data * count)[:count]
+
+
+class TestDecoder(harness.TestCase):
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            parallel.Decoder(chunk_size=0)
+
+    def test_inline(self):
+        executor = mock.Mock(spec=concurrent.futures.Executor)
+        dtos = load_dtos(responses.TRANSACTIONS["Ok"], 3)
+        transactions = parallel.decode_many(models.Transaction, dtos, NETWORK_TYPE, executor=executor, threshold=4)
+        self.assertEqual(len(transactions), 3)
+        self.assertFalse(executor.submit.called)
+
+    def test_process_pool(self):
+        dtos = load_dtos(responses.TRANSACTIONS["Ok"], 5)
+        expected = [models.Transaction.create_from_dto(i, NETWORK_TYPE) for i in dtos]
+        with concurrent.futures.ProcessPoolExecutor(max_workers=2) as executor:
+            decoder = parallel.Decoder(executor, threshold=1, chunk_size=2)
+            self.assertEqual(decoder.decode(models.Transaction, dtos, NETWORK_TYPE), expected)
+
+    def test_statements(self):
+        data = json.loads(responses.BLOCK_RECEIPTS["Ok"]['content'])
+        dtos = (data['transactionStatements'] * 5)[:5]
+        expected = [models.TransactionStatement.create_from_dto(i, NETWORK_TYPE) for i in dtos]
+        # Receipts are pickled back from the worker processes.
+        with concurrent.futures.ProcessPoolExecutor(max_workers=2) as executor:
+            decoder = parallel.Decoder(executor, threshold=1, chunk_size=2)
+            statements = decoder.decode(models.TransactionStatement, dtos, NETWORK_TYPE)
+        self.assertEqual(statements, expected)
+        self.assertEqual(statements[0].receipts[0].network_type, NETWORK_TYPE)
+
+    async def test_async(self):
+        dtos = load_dtos(responses.BLOCKS_INFO["Ok"], 5)
+        expected = [models.BlockInfo.create_from_dto(i) for i in dtos]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            submit = mock.patch.object(executor, 'submit', wraps=executor.submit)
+            with submit as submit:
+                blocks = await parallel.decode_many_async(
+                    models.BlockInfo,
+                    dtos,
+                    executor=executor,
+                    threshold=1,
+                    chunk_size=2,
+                )
+        self.assertEqual(blocks, expected)
+        self.assertEqual(submit.call_count, 3)
+
+
+class TestParallelHTTP(harness.TestCase):
+
+    @harness.async_test(
+        sync_data=(client.BlockchainHTTP, requests),
+        async_data=(client.AsyncBlockchainHTTP, aiohttp)
+    )
+    async def test_http(self, data, await_cb, with_cb):
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            decoder = parallel.Decoder(executor, threshold=1)
+            with mock.patch.object(executor, 'submit', wraps=executor.submit) as submit:
+                async with with_cb(data[0](responses.ENDPOINT, network_type=NETWORK_TYPE, decoder=decoder)) as http:
+                    self.assertIs(http.root.blockchain.decoder, decoder)
+                    with data[1].default_response(200, **responses.BLOCKS_INFO["Ok"]):
+                        blocks = await await_cb(http.get_blocks_by_height_with_limit(1, 25))
+                        # Lazy requests are never decoded in the executor.
+                        await await_cb(http.get_blocks_by_height_with_limit(1, 25, lazy=True))
+
+        expected = load_dtos(responses.BLOCKS_INFO["Ok"], 1)
+        self.assertEqual(blocks, [models.BlockInfo.create_from_dto(i) for i in expected])
+        self.assertEqual(submit.call_count, 1)
@@ -1,4 +1,5 @@
 import copy
+import pickle
 import typing
 
 from xpxchain import util
@@ -45,6 +46,10 @@ class TestDataclass(harness.TestCase):
         ll = LinkedList(5)
         self.assertEqual(ll, copy.deepcopy(ll))
 
+    def test_pickle(self):
+        ll = LinkedList(5, next=LinkedList(6))
+        self.assertEqual(ll, pickle.loads(pickle.dumps(ll)))
+
     def test_asdict(self):
         ll = LinkedList(5)
         self.assertEqual(ll.asdict(), {'value': 5, 'prev': None, 'next': None})
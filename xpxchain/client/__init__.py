@@ -23,8 +23,36 @@
 """
 
 # type: ignore
+from .bootstrap import *
+from .cache import *
+from .cassette import *
+from .codec import *
+from .confirmation import *
 from .default import *
+from .hub import *
+from .lazy import *
+from .metrics import *
+from .pipeline import *
+from .ratelimit import *
+from .reconnect import *
+from .retry import *
+from .sessions import *
+from .sharding import *
 
 __all__ = (
-    default.__all__
+    bootstrap.__all__
+    + cache.__all__
+    + cassette.__all__
+    + codec.__all__
+    + confirmation.__all__
+    + default.__all__
+    + hub.__all__
+    + lazy.__all__
+    + metrics.__all__
+    + pipeline.__all__
+    + ratelimit.__all__
+    + reconnect.__all__
+    + retry.__all__
+    + sessions.__all__
+    + sharding.__all__
 )
@@ -23,13 +23,26 @@
 """
 
 from __future__ import annotations
-import json
+import functools
 import typing
 
+from . import cache
 from . import client
+from . import codec
+from . import lazy
 from . import nis
+from . import paging
 from .. import models
 from .. import util
+from ..parallel import Decoder
+from .batching import Batcher
+from .cache import ResponseCache
+from .chunking import Chunker
+from .metrics import Metrics
+from .ratelimit import RateLimiter
+from .reconnect import ListenerRecovery
+from .retry import CircuitBreaker, RetryPolicy
+from .singleflight import SingleFlight
 
 
 T = typing.TypeVar('T')
@@ -38,20 +51,52 @@ MessageType = typing.Union[
     models.CosignatureSignedTransaction,
     models.Transaction,
     models.TransactionStatusError,
+    lazy.LazyModel,
     str,
 ]
 
+# Number of transactions requested per page, when iterating transactions.
+DEFAULT_PAGE_SIZE = 100
+# Maximum number of transactions per page returned by nodes.
+MAX_PAGE_SIZE = 100
+# Number of blocks requested per window, when iterating blocks.
+DEFAULT_BLOCK_WINDOW = 100
+# Maximum number of blocks per request returned by nodes.
+MAX_BLOCK_WINDOW = 100
+# Number of requests issued ahead of the consumer, when iterating blocks.
+DEFAULT_PREFETCH_DEPTH = 4
+# NIS callbacks for account transactions, by direction.
+TRANSACTION_DIRECTIONS = {
+    'all': nis.get_account_transactions,
+    'incoming': nis.get_account_incoming_transactions,
+    'outgoing': nis.get_account_outgoing_transactions,
+    'unconfirmed': nis.get_account_unconfirmed_transactions,
+    'partial': nis.get_account_partial_transactions,
+}
+
 # HTTP
 # ----
 
 
 class HTTPSharedBase(util.Object):
-    """Shared, abstract base class for sync and async HTTP clients."""
+    """
+    Shared, abstract base class for sync and async HTTP clients.
+
+    Requests returning lists of models accept the `lazy` keyword, to
+    return `LazyModel` proxies decoding each model on first access.
+    """
 
     _endpoint: str
     _client: client.ClientSharedBase
     _index: int
     _network_type: typing.Optional[models.NetworkType] = None
+    _cache: typing.Optional[ResponseCache] = None
+    _chunker: typing.Optional[Chunker] = None
+    _retry: typing.Optional[RetryPolicy] = None
+    _circuit_breaker: typing.Optional[CircuitBreaker] = None
+    _rate_limiter: typing.Optional[RateLimiter] = None
+    _decoder: typing.Optional[Decoder] = None
+    _metrics: typing.Optional[Metrics] = None
 
     @property
     def index(self) -> int:
@@ -85,22 +130,130 @@ class HTTPSharedBase(util.Object):
         inst._client = http._client
         inst._index = http._index
         inst._network_type = http._network_type
+        inst._cache = http._cache
+        inst._chunker = http._chunker
+        inst._retry = http._retry
+        inst._circuit_breaker = http._circuit_breaker
+        inst._rate_limiter = http._rate_limiter
+        inst._decoder = http._decoder
+        inst._metrics = http._metrics
         return typing.cast(T, inst)
 
     def close(self):
         """Close the client session."""
         raise util.AbstractMethodError
 
+    @property
+    def cache(self) -> typing.Optional[ResponseCache]:
+        """Get the response cache for the client, if enabled."""
+        return self._cache
+
+    @property
+    def chunker(self) -> typing.Optional[Chunker]:
+        """Get the chunker for bulk requests, if chunking is enabled."""
+        return self._chunker
+
+    @property
+    def retry(self) -> typing.Optional[RetryPolicy]:
+        """Get the retry policy for failed requests, if enabled."""
+        return self._retry
+
+    @property
+    def circuit_breaker(self) -> typing.Optional[CircuitBreaker]:
+        """Get the circuit breaker for unhealthy endpoints, if enabled."""
+        return self._circuit_breaker
+
+    @property
+    def rate_limiter(self) -> typing.Optional[RateLimiter]:
+        """Get the rate limiter shared by all clients for the endpoint, if enabled."""
+        return self._rate_limiter
+
+    @property
+    def decoder(self) -> typing.Optional[Decoder]:
+        """Get the decoder for large list responses, if enabled."""
+        return self._decoder
+
+    @property
+    def metrics(self) -> typing.Optional[Metrics]:
+        """Get the request metrics, if enabled."""
+        return self._metrics
+
     def __call__(self, cbs, *args, **kwds):
         """Invoke the NIS callback."""
-        cb = cbs[self.index]
+
+        chunker = self._chunker
+        if chunker is not None and chunker.accepts(cbs[0].__name__, args):
+            return self._call_chunked(chunker, cbs, *args, **kwds)
+
+        response_cache = self._cache
+        if response_cache is not None and not kwds.get('lazy'):
+            # Synchronous callbacks are named after their NIS endpoint.
+            name = cbs[0].__name__
+            if name == cache.TIP_ENDPOINT:
+                return self._call_observed(response_cache, cbs, *args, **kwds)
+            key = response_cache.key(name, args, self.raw.endpoint)
+            if key is not None:
+                return self._call_cached(response_cache, key, cbs, *args, **kwds)
+        return self._call(cbs, *args, **kwds)
+
+    def _call_cached(self, response_cache, key, cbs, *args, **kwds):
+        """Invoke the NIS callback, using the cached response if present."""
+        raise util.AbstractMethodError
+
+    def _call_observed(self, response_cache, cbs, *args, **kwds):
+        """Invoke the NIS callback for the chain height, recording it in the cache."""
+        raise util.AbstractMethodError
+
+    def _call_chunked(self, chunker, cbs, *args, **kwds):
+        """Invoke the bulk NIS callback once per chunk of items."""
+        raise util.AbstractMethodError
+
+    def _iter_pages(self, fetch, advance, cursor=None):
+        """
+        Iterate over items from consecutive pages, prefetching the next page.
+
+        :param fetch: Callback to request the page at a cursor.
+        :param advance: Callback to get the next cursor from a page, or None if last.
+        :param cursor: (Optional) cursor for the first page.
+        """
+        raise util.AbstractMethodError
+
+    def _collect_pages(self, fetch, advance, cursor=None):
+        """
+        Get the items from every consecutive page, as a single list.
+
+        :param fetch: Callback to request the page at a cursor.
+        :param advance: Callback to get the next cursor from a page, or None if last.
+        :param cursor: (Optional) cursor for the first page.
+        """
+        raise util.AbstractMethodError
+
+    def _iter_pipeline(self, fetch, cursors, depth, process=None, expand=None):
+        """
+        Iterate over items from pages at known cursors, prefetching pages.
+
+        :param fetch: Callback to request the page at a cursor.
+        :param cursors: Cursors for each page, in order.
+        :param depth: Maximum number of pages requested ahead of the consumer.
+        :param process: (Optional) callback to filter the page for a cursor.
+        :param expand: (Optional) callback to request extra data for each item.
+        """
+        raise util.AbstractMethodError
+
+    def _call(self, cbs, *args, **kwds):
+        """Invoke the NIS callback without any caching."""
+
+        cb = cbs[self._index]
         # Force self.network_type to be executed on a different logical
         # block. Otherwise, we lead to infinite recursion when calling
-        # get_network_type().
-        try:
+        # get_network_type(). Once resolved, pass the network type
+        # directly, rather than creating a coroutine for each request.
+        if 'network_type' in kwds:
             network_type = kwds.pop('network_type')
-        except KeyError:
-            network_type = self.network_type
+        else:
+            network_type = self._network_type
+            if network_type is None:
+                network_type = self.network_type
 
         return typing.cast(T, cb(self.raw, network_type, *args, **kwds))
 
@@ -123,6 +276,33 @@ class HTTPBase(HTTPSharedBase):
     def close(self) -> None:
         self.raw.close()
 
+    def _call_cached(self, response_cache, key, cbs, *args, **kwds):
+        try:
+            return response_cache[key]
+        except KeyError:
+            value = self._call(cbs, *args, **kwds)
+            response_cache.put(key, value)
+            return value
+
+    def _call_observed(self, response_cache, cbs, *args, **kwds):
+        value = self._call(cbs, *args, **kwds)
+        response_cache.observe_height(self.raw.endpoint, value)
+        return value
+
+    def _call_chunked(self, chunker, cbs, *args, **kwds):
+        # Resolve the network type once, rather than once per chunk.
+        self.network_type
+        return chunker.run(self._call, cbs, *args, **kwds)
+
+    def _iter_pages(self, fetch, advance, cursor=None):
+        return paging.iter_pages(fetch, advance, cursor)
+
+    def _collect_pages(self, fetch, advance, cursor=None):
+        return paging.collect_pages(fetch, advance, cursor)
+
+    def _iter_pipeline(self, fetch, cursors, depth, process=None, expand=None):
+        return paging.iter_pipeline(fetch, cursors, depth, process, expand)
+
     @property
     def raw(self) -> client.Client:
         try:
@@ -152,6 +332,8 @@ class AsyncHTTPBase(HTTPSharedBase):
     """
 
     _loop: util.OptionalLoopType
+    _single_flight: typing.Optional[SingleFlight] = None
+    _batcher: typing.Optional[Batcher] = None
 
     def __enter__(self) -> AsyncHTTPBase:
         raise TypeError("Only use async with.")
@@ -179,13 +361,84 @@ class AsyncHTTPBase(HTTPSharedBase):
         return self.call(cbs, *args, **kwds)
 
     @util.observable
-    async def call(self, cbs, *args, **kwds):
-        return await super().__call__(cbs, *args, **kwds)
+    def call(self, cbs, *args, **kwds):
+        # Return the request coroutine directly, rather than awaiting it
+        # inside another coroutine.
+        single_flight = self._single_flight
+        if single_flight is not None:
+            key = single_flight.key(cbs[0].__name__, args, kwds)
+            if key is not None:
+                return self._call_shared(single_flight, key, cbs, *args, **kwds)
+        return super().__call__(cbs, *args, **kwds)
+
+    async def _call_shared(self, single_flight, key, cbs, *args, **kwds):
+        """Invoke the NIS callback, sharing any identical in-flight request."""
+
+        started = False
+
+        def factory():
+            nonlocal started
+            started = True
+            return HTTPSharedBase.__call__(self, cbs, *args, **kwds)
+
+        try:
+            return await single_flight.run(key, factory)
+        finally:
+            # Await any explicit network type, so it is never left pending.
+            awaitable = kwds.get('network_type')
+            if not started and awaitable is not None:
+                await awaitable
+
+    def _call(self, cbs, *args, **kwds):
+        batcher = self._batcher
+        if batcher is not None:
+            name = cbs[0].__name__
+            if batcher.accepts(name, args, kwds):
+                return batcher.load(self._call_unbatched, name, args[0])
+        return self._call_unbatched(cbs, *args, **kwds)
+
+    def _call_unbatched(self, cbs, *args, **kwds):
+        """Invoke the NIS callback without batching."""
+        return super()._call(cbs, *args, **kwds)
+
+    async def _call_chunked(self, chunker, cbs, *args, **kwds):
+        # Resolve the network type once, rather than once per chunk.
+        await self.network_type
+        return await chunker.run_async(self._call, cbs, *args, **kwds)
+
+    def _iter_pages(self, fetch, advance, cursor=None):
+        return paging.iter_pages_async(fetch, advance, cursor, self._loop)
+
+    def _collect_pages(self, fetch, advance, cursor=None):
+        return paging.collect_pages_async(fetch, advance, cursor)
+
+    def _iter_pipeline(self, fetch, cursors, depth, process=None, expand=None):
+        return paging.iter_pipeline_async(fetch, cursors, depth, process, expand, self._loop)
+
+    async def _call_cached(self, response_cache, key, cbs, *args, **kwds):
+        try:
+            value = response_cache[key]
+        except KeyError:
+            value = await self._call(cbs, *args, **kwds)
+            response_cache.put(key, value)
+        else:
+            # Await any explicit network type, so it is never left pending.
+            awaitable = kwds.get('network_type')
+            if awaitable is not None:
+                await awaitable
+        return value
+
+    async def _call_observed(self, response_cache, cbs, *args, **kwds):
+        value = await self._call(cbs, *args, **kwds)
+        response_cache.observe_height(self.raw.endpoint, value)
+        return value
 
     @classmethod
     def create_from_http(cls: typing.Type[T], http) -> T:
         inst = super(AsyncHTTPBase, cls).create_from_http(http)  # type: ignore
         setattr(inst, '_loop', getattr(http, '_loop'))
+        setattr(inst, '_single_flight', getattr(http, '_single_flight'))
+        setattr(inst, '_batcher', getattr(http, '_batcher'))
         return inst  # type: ignore
 
     @property
@@ -193,6 +446,16 @@ class AsyncHTTPBase(HTTPSharedBase):
         """Get event loop."""
         return self._loop
 
+    @property
+    def single_flight(self) -> typing.Optional[SingleFlight]:
+        """Get the registry of in-flight requests, if coalescing is enabled."""
+        return self._single_flight
+
+    @property
+    def batcher(self) -> typing.Optional[Batcher]:
+        """Get the batcher for single-item lookups, if batching is enabled."""
+        return self._batcher
+
     @property
     async def network_type(self) -> models.NetworkType:
         if self._network_type is None:
@@ -404,6 +667,43 @@ class AccountHTTP(HTTPSharedBase):
         :return: List of aggregate bonded transaction objects.
         """
         return self(nis.get_account_partial_transactions, public_account, **kwds)
+
+    def iter_transactions(
+        self,
+        public_account: models.PublicAccount,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        direction: str = 'all',
+        **kwds
+    ):
+        """
+        Iterate over transactions for account, one page at a time.
+
+        The next page is requested while the current page is consumed.
+        Returns a generator for synchronous clients, and an asynchronous
+        generator for asynchronous clients.
+
+        :param public_account: Public key and address for account.
+        :param page_size: (Optional) number of transactions per request, at most 100.
+        :param direction: (Optional) 'all', 'incoming', 'outgoing', 'unconfirmed' or 'partial'.
+        :return: Iterator over transaction objects.
+        """
+
+        try:
+            cbs = TRANSACTION_DIRECTIONS[direction]
+        except KeyError:
+            raise ValueError(f'Invalid transaction direction {direction!r}.')
+        if page_size < 1:
+            raise ValueError('Page size must be positive.')
+        # Nodes return at most 100 transactions per page, so larger
+        # pages would always look partial.
+        page_size = min(page_size, MAX_PAGE_SIZE)
+
+        def fetch(id):
+            return self(cbs, public_account, page_size=page_size, id=id, **kwds)
+
+        advance = functools.partial(paging.next_transaction_id, page_size=page_size)
+        return self._iter_pages(fetch, advance)
+
 # TODO: Check when stabilized
 #     def contracts(
 #         self,
@@ -454,14 +754,22 @@ class BlockchainHTTP(HTTPSharedBase):
         """
         return self(nis.get_blocks_by_height_with_limit, height, limit, **kwds)
 
-    def get_block_transactions(self, height: int, **kwds):
+    def get_block_transactions(
+        self,
+        height: int,
+        page_size: typing.Optional[int] = None,
+        id: typing.Optional[str] = None,
+        **kwds
+    ):
         """
-        Get information for all transactions included in a block by height.
+        Get information for transactions included in a block by height.
 
         :param height: Block height.
+        :param page_size: (Optional) maximum number of transactions to return.
+        :param id: (Optional) return transactions after this transaction ID.
         :return: Sequence of information models describing transactions.
         """
-        return self(nis.get_block_transactions, height, **kwds)
+        return self(nis.get_block_transactions, height, page_size, id, **kwds)
 
     def get_block_receipts(self, height: int, **kwds):
         """
@@ -472,6 +780,65 @@ class BlockchainHTTP(HTTPSharedBase):
         """
         return self(nis.get_block_receipts, height, **kwds)
 
+    def iter_blocks(
+        self,
+        start: int,
+        end: int,
+        window: int = DEFAULT_BLOCK_WINDOW,
+        depth: int = DEFAULT_PREFETCH_DEPTH,
+        transactions: bool = False,
+        receipts: bool = False,
+        **kwds
+    ):
+        """
+        Iterate over blocks between [start, end], in height order.
+
+        Up to `depth` windows of blocks are requested ahead of the consumer.
+        If transactions or receipts are requested, they are fetched within
+        the same pipeline, and each item is a `(block, transactions, receipts)`
+        tuple, with None for the data not requested. Every page of the
+        transactions of a block is fetched. Raises `MissingBlockError` if
+        the node does not return a block in the range. Returns a generator
+        for synchronous clients, and an asynchronous generator for
+        asynchronous clients.
+
+        :param start: Height of the first block.
+        :param end: Height of the last block.
+        :param window: (Optional) number of blocks per request, at most 100.
+        :param depth: (Optional) maximum number of requests ahead of the consumer.
+        :param transactions: (Optional) fetch the transactions for each block.
+        :param receipts: (Optional) fetch the receipts for each block.
+        :return: Iterator over block info objects.
+        """
+
+        if window < 1 or depth < 1:
+            raise ValueError('Window and depth must be positive.')
+        # Nodes return at most 100 blocks per request, so larger windows
+        # would skip the remaining blocks.
+        window = min(window, MAX_BLOCK_WINDOW)
+
+        def fetch(height):
+            return self(nis.get_blocks_by_height_with_limit, height, window, **kwds)
+
+        def process(height, blocks):
+            return paging.select_window(blocks, height, min(height + window - 1, end))
+
+        def fetch_transactions(height, id):
+            return self(nis.get_block_transactions, height, MAX_PAGE_SIZE, id, **kwds)
+
+        advance = functools.partial(paging.next_transaction_id, page_size=MAX_PAGE_SIZE)
+
+        def expand(block):
+            fetch_page = functools.partial(fetch_transactions, block.height)
+            return (
+                self._collect_pages(fetch_page, advance) if transactions else None,
+                self(nis.get_block_receipts, block.height, **kwds) if receipts else None,
+            )
+
+        cursors = range(start, end + 1, window)
+        extras = expand if transactions or receipts else None
+        return self._iter_pipeline(fetch, cursors, depth, process, extras)
+
     def get_blockchain_height(self, **kwds):
         """
         Get current blockchain height.
@@ -914,8 +1281,65 @@ class ListenerMessage(util.Object):
     message: MessageType
 
 
+class ListenerChannels(util.Object):
+    """Abstract base class for subscriptions to websockets channels."""
+
+    async def subscribe(self, channel: str) -> None:
+        """Subscribe to websockets channel."""
+        raise util.AbstractMethodError
+
+    async def unsubscribe(self, channel: str) -> None:
+        """Unsubscribe from websockets channel."""
+        raise util.AbstractMethodError
+
+    @util.observable
+    async def new_block(self) -> None:
+        """Emit message when new blocks are added to chain."""
+        await self.subscribe('block')
+
+    @util.observable
+    async def confirmed(self, address: models.Address) -> None:
+        """Emit message when new transactions are confirmed for a given address."""
+        await self.subscribe(f'confirmedAdded/{address.address}')
+
+    @util.observable
+    async def confirmed_added(self, address: models.Address) -> None:
+        """Emit message when new transactions are confirmed for a given address."""
+        await self.confirmed(address)
+
+    @util.observable
+    async def unconfirmed_added(self, address: models.Address) -> None:
+        """Emit message for unconfirmed transactions are announced."""
+        await self.subscribe(f'unconfirmedAdded/{address.address}')
+
+    @util.observable
+    async def unconfirmed_removed(self, address: models.Address) -> None:
+        """Emit message when unconfirmed transactions change state."""
+        await self.subscribe(f'unconfirmedRemoved/{address.address}')
+
+    @util.observable
+    async def aggregate_bonded_added(self, address: models.Address) -> None:
+        """Emit message when new, unconfirmed, aggregate transactions are announced."""
+        await self.subscribe(f'partialAdded/{address.address}')
+
+    @util.observable
+    async def aggregate_bonded_removed(self, address: models.Address) -> None:
+        """Emit message when unconfirmed, aggregate transactions change state."""
+        await self.subscribe(f'partialRemoved/{address.address}')
+
+    @util.observable
+    async def status(self, address: models.Address) -> None:
+        """Emit message each time a transaction contains an error."""
+        await self.subscribe(f'status/{address.address}')
+
+    @util.observable
+    async def cosignature_added(self, address: models.Address) -> None:
+        """Emit message each time a cosigner signs a message"""
+        await self.subscribe(f'cosignature/{address.address}')
+
+
 @util.observable
-class Listener(util.Object):
+class Listener(ListenerChannels):
     """
     Abstract base class for the websockets-based listener.
 
@@ -927,6 +1351,14 @@ class Listener(util.Object):
     _conn: typing.AsyncContextManager
     _loop: util.OptionalLoopType
     _uid: typing.Optional[str] = None
+    _recovery: typing.Optional[ListenerRecovery] = None
+    _http: typing.Optional[BlockchainHTTP] = None
+    _channels: typing.Dict[str, None]
+    _backlog: typing.Deque[ListenerMessage]
+    _lazy: bool = False
+    _full_channels: typing.FrozenSet[str] = frozenset()
+    received: typing.Counter[str]
+    decoded: typing.Counter[str]
 
     def __enter__(self) -> Listener:
         raise TypeError("Only use async with.")
@@ -964,7 +1396,7 @@ class Listener(util.Object):
         """Get UUID (unique identifier) for WS requests."""
 
         if self._uid is None:
-            self._uid = json.loads(await self.raw.recv())['uid']
+            self._uid = codec.loads(await self.raw.recv())['uid']
         return self._uid
 
     def __aiter__(self) -> Listener:
@@ -973,95 +1405,101 @@ class Listener(util.Object):
     async def __anext__(self) -> typing.Optional[ListenerMessage]:
         """Iterate over subscribed messages."""
 
-        message: bytes = await self._iter.__anext__()
-        data = json.loads(message)
+        recovery = self._recovery
+        if recovery is None:
+            message: bytes = await self._iter.__anext__()
+            return self._parse(message)
+
+        while True:
+            if self._backlog:
+                return self._backlog.popleft()
+            try:
+                message = await self._iter.__anext__()
+            except (StopAsyncIteration,) + recovery.policy.exceptions:
+                # Reconnect, resubscribe, and backfill missed messages.
+                await recovery.reconnect(self._resubscribe)
+                async for channel_name, value in recovery.backfill(self._channels):
+                    self._backlog.append(ListenerMessage(channel_name, value))
+                continue
+            result = self._parse(message)
+            if recovery.accept(result.channel_name, result.message):
+                return result
+
+    async def _reopen(self) -> None:
+        """Replace the websockets connection. Internal use only."""
+        raise util.AbstractMethodError
+
+    async def _resubscribe(self) -> None:
+        """Reconnect, and replay the active subscriptions."""
+
+        await self._reopen()
+        self._uid = None
+        for channel in list(self._channels):
+            await self._send_subscription('subscribe', channel)
+
+    def _parse(self, message: bytes) -> ListenerMessage:
+        """Parse a message from the websockets connection."""
+
+        data = codec.loads(message)
         if 'transaction' in data:
             # New transaction data.
             channel_name = typing.cast(str, data['meta'].pop('channelName'))
-            transaction = models.Transaction.create_from_dto(data)
-            return ListenerMessage(channel_name, transaction)
+            return self._decode(channel_name, models.Transaction, data)
         elif 'block' in data:
             # New block info.
-            block = models.BlockInfo.create_from_dto(data)
-            return ListenerMessage('block', block)
+            return self._decode('block', models.BlockInfo, data)
         elif 'status' in data:
             # New transaction status error.
-            error = models.TransactionStatusError.create_from_dto(data)
-            return ListenerMessage('status', error)
+            return self._decode('status', models.TransactionStatusError, data)
         elif 'meta' in data:
             # New metadata.
             channel_name = typing.cast(str, data['meta']['channelName'])
             hash = typing.cast(str, data['meta']['hash'])
+            self.received[channel_name] += 1
             return ListenerMessage(channel_name, hash)
         elif 'parentHash' in data:
             # New cosignature for transaction.
-            cosignature = models.CosignatureSignedTransaction.create_from_dto(data)
-            return ListenerMessage('cosignature', cosignature)
+            return self._decode('cosignature', models.CosignatureSignedTransaction, data)
         else:
             # Unknown data information, don't pollute the message,
             # only send the information's keys.
             msg = f"Unknown message from Listener subscription, keys are {data.keys()}."
             raise ValueError(msg)
 
-    @util.observable
-    async def new_block(self) -> None:
-        """Emit message when new blocks are added to chain."""
-        await self.subscribe('block')
-
-    @util.observable
-    async def confirmed(self, address: models.Address) -> None:
-        """Emit message when new transactions are confirmed for a given address."""
-        await self.subscribe(f'confirmedAdded/{address.address}')
-
-    @util.observable
-    async def confirmed_added(self, address: models.Address) -> None:
-        """Emit message when new transactions are confirmed for a given address."""
-        await self.confirmed(address)
+    def _decode(self, channel_name: str, type: typing.Type[util.DTO], data: dict) -> ListenerMessage:
+        """Decode the model for a message, or defer it for lazy listeners."""
 
-    @util.observable
-    async def unconfirmed_added(self, address: models.Address) -> None:
-        """Emit message for unconfirmed transactions are announced."""
-        await self.subscribe(f'unconfirmedAdded/{address.address}')
-
-    @util.observable
-    async def unconfirmed_removed(self, address: models.Address) -> None:
-        """Emit message when unconfirmed transactions change state."""
-        await self.subscribe(f'unconfirmedRemoved/{address.address}')
-
-    @util.observable
-    async def aggregate_bonded_added(self, address: models.Address) -> None:
-        """Emit message when new, unconfirmed, aggregate transactions are announced."""
-        await self.subscribe(f'partialAdded/{address.address}')
-
-    @util.observable
-    async def aggregate_bonded_removed(self, address: models.Address) -> None:
-        """Emit message when unconfirmed, aggregate transactions change state."""
-        await self.subscribe(f'partialRemoved/{address.address}')
-
-    @util.observable
-    async def status(self, address: models.Address) -> None:
-        """Emit message each time a transaction contains an error."""
-        await self.subscribe(f'status/{address.address}')
-
-    @util.observable
-    async def cosignature_added(self, address: models.Address) -> None:
-        """Emit message each time a cosigner signs a message"""
-        await self.subscribe(f'cosignature/{address.address}')
+        self.received[channel_name] += 1
+        if self._lazy and channel_name not in self._full_channels:
+            value = lazy.CountedLazyModel(type, data, self.decoded, channel_name)
+            return ListenerMessage(channel_name, value)
+        self.decoded[channel_name] += 1
+        return ListenerMessage(channel_name, type.create_from_dto(data))
 
     async def subscribe(self, channel: str) -> None:
         """Subscribe to websockets channel."""
 
-        message = json.dumps({
-            'uid': await self.uid,
-            'subscribe': channel
-        })
-        await self.raw.send(message)
+        self._channels[channel] = None
+        await self._update_subscription('subscribe', channel)
 
     async def unsubscribe(self, channel: str) -> None:
         """Unsubscribe from websockets channel."""
 
-        message = json.dumps({
+        self._channels.pop(channel, None)
+        await self._update_subscription('unsubscribe', channel)
+
+    async def _update_subscription(self, action: str, channel: str) -> None:
+        try:
+            await self._send_subscription(action, channel)
+        except Exception as exc:
+            # Subscriptions are replayed when dropped listeners reconnect.
+            recovery = self._recovery
+            if recovery is None or not isinstance(exc, recovery.policy.exceptions):
+                raise
+
+    async def _send_subscription(self, action: str, channel: str) -> None:
+        message = codec.dumps({
             'uid': await self.uid,
-            'unsubscribe': channel
+            action: channel
         })
         await self.raw.send(message)
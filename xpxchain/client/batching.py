@@ -0,0 +1,273 @@
+"""
+    batching
+    ========
+
+    Automatic batching of asynchronous, single-item lookups into the
+    equivalent bulk NIS endpoints.
+
+    Single-item requests made within the same event-loop iteration
+    (or within a configurable window) are collected, sent as a single
+    bulk request, and the decoded results are returned to each caller.
+    Items missing from the bulk response are requested individually,
+    so callers see the same results and errors as without batching.
+
+    Example:
+        .. code-block:: python
+
+           >>> from xpxchain import client
+           >>> async with client.AsyncAccountHTTP(endpoint, batch_window=0) as http:
+           ...     infos = await asyncio.gather(*(
+           ...         http.get_account_info(i) for i in addresses
+           ...     ))
+           >>> http.batcher.batches
+           1
+
+    License
+    -------
+
+    Copyright 2019 NEM
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import annotations
+import asyncio
+import typing
+
+from . import nis
+from .. import util
+
+__all__ = [
+    'BATCH_RULES',
+    'BatchRule',
+    'Batcher',
+]
+
+DEFAULT_MAX_SIZE = 100
+
+Callbacks = typing.Tuple[typing.Callable, typing.Callable]
+Send = typing.Callable[..., typing.Awaitable[typing.Any]]
+Pending = typing.List[typing.Tuple[typing.Any, asyncio.Future]]
+
+
+class BatchRule(typing.NamedTuple):
+    """
+    Describe how to batch a single-item NIS endpoint.
+
+    :param single: NIS callbacks for the single-item request.
+    :param bulk: NIS callbacks for the equivalent bulk request.
+    :param request_key: Key identifying the item from the request argument.
+    :param response_key: Key identifying the item from the decoded model.
+    """
+
+    single: Callbacks
+    bulk: Callbacks
+    request_key: typing.Callable[[typing.Any], typing.Hashable]
+    response_key: typing.Callable[[typing.Any], typing.Hashable]
+
+
+def address_key(address: typing.Any) -> str:
+    return address.address
+
+
+def mosaic_id_key(id: typing.Any) -> str:
+    return f'{id:016x}'
+
+
+def hash_key(hash: str) -> str:
+    return hash.upper()
+
+
+def transaction_key(transaction: typing.Any) -> typing.Optional[str]:
+    hash = transaction.transaction_info.hash
+    return hash and hash_key(hash)
+
+
+# Single-item endpoints, mapped to their equivalent bulk endpoints.
+BATCH_RULES: typing.Mapping[str, BatchRule] = {
+    'get_account_info': BatchRule(
+        nis.get_account_info,
+        nis.get_accounts_info,
+        address_key,
+        lambda x: address_key(x.address),
+    ),
+    'get_account_properties': BatchRule(
+        nis.get_account_properties,
+        nis.get_accounts_properties,
+        address_key,
+        lambda x: address_key(x.address),
+    ),
+    'get_mosaic': BatchRule(
+        nis.get_mosaic,
+        nis.get_mosaics,
+        mosaic_id_key,
+        lambda x: mosaic_id_key(x.mosaic_id),
+    ),
+    'get_transaction': BatchRule(
+        nis.get_transaction,
+        nis.get_transactions,
+        hash_key,
+        transaction_key,
+    ),
+    'get_transaction_status': BatchRule(
+        nis.get_transaction_status,
+        nis.get_transaction_statuses,
+        hash_key,
+        lambda x: hash_key(x.hash),
+    ),
+}
+
+
+class Batcher(util.Object):
+    """
+    Collect single-item lookups and dispatch them as bulk requests.
+
+    :param window: (Optional) seconds to collect requests for, 0 for the current loop iteration.
+    :param max_size: (Optional) maximum number of items per bulk request.
+    :param rules: (Optional) batching rules by endpoint name.
+    :param loop: (Optional) Event loop to schedule requests on.
+    """
+
+    batches: int
+    items: int
+    _window: float
+    _max_size: int
+    _rules: typing.Mapping[str, BatchRule]
+    _loop: util.OptionalLoopType
+    _pending: typing.Dict[str, Pending]
+    _handles: typing.Dict[str, asyncio.Handle]
+    _tasks: typing.Set[asyncio.Future]
+
+    def __init__(
+        self,
+        window: float = 0.0,
+        max_size: int = DEFAULT_MAX_SIZE,
+        rules: typing.Mapping[str, BatchRule] = BATCH_RULES,
+        loop: util.OptionalLoopType = None,
+    ) -> None:
+        self.batches = 0
+        self.items = 0
+        self._window = window
+        self._max_size = max_size
+        self._rules = rules
+        self._loop = loop
+        self._pending = {}
+        self._handles = {}
+        self._tasks = set()
+
+    def accepts(
+        self,
+        name: str,
+        args: typing.Sequence[typing.Any],
+        kwds: typing.Mapping[str, typing.Any],
+    ) -> bool:
+        """
+        Determine if a request may be batched.
+
+        :param name: Name of the NIS endpoint.
+        :param args: Positional arguments for the request.
+        :param kwds: Keyword arguments for the request.
+        """
+
+        # Request options, like timeouts, cannot be shared between callers.
+        return name in self._rules and len(args) == 1 and not kwds
+
+    async def load(self, send: Send, name: str, arg: typing.Any) -> typing.Any:
+        """
+        Queue a single-item request, and wait for the result.
+
+        :param send: Callback to invoke NIS callbacks, without batching.
+        :param name: Name of the NIS endpoint.
+        :param arg: Request argument identifying the item.
+        """
+
+        loop = self._loop or asyncio.get_event_loop()
+        future = loop.create_future()
+        pending = self._pending.setdefault(name, [])
+        pending.append((arg, future))
+        if len(pending) >= self._max_size:
+            self._flush(send, name)
+        elif len(pending) == 1:
+            if self._window > 0:
+                handle = loop.call_later(self._window, self._flush, send, name)
+            else:
+                handle = loop.call_soon(self._flush, send, name)
+            self._handles[name] = handle
+        return await future
+
+    def _flush(self, send: Send, name: str) -> None:
+        """Dispatch all queued requests for the endpoint."""
+
+        handle = self._handles.pop(name, None)
+        if handle is not None:
+            handle.cancel()
+        pending = self._pending.pop(name, [])
+        if pending:
+            task = asyncio.ensure_future(self._dispatch(send, name, pending), loop=self._loop)
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, send: Send, name: str, pending: Pending) -> None:
+        """Make the bulk request, and resolve each queued request."""
+
+        rule = self._rules[name]
+        requests: typing.Dict[typing.Hashable, Pending] = {}
+        for arg, future in pending:
+            requests.setdefault(rule.request_key(arg), []).append((arg, future))
+        args = [i[0][0] for i in requests.values()]
+        self.batches += 1
+        self.items += len(pending)
+
+        try:
+            values = await send(rule.bulk, args)
+        except Exception as exc:
+            self._settle(pending, error=exc)
+            return
+
+        found = {rule.response_key(i): i for i in values}
+        missing = []
+        for key, queued in requests.items():
+            if key in found:
+                self._settle(queued, found[key])
+            else:
+                missing.append(queued)
+
+        # Items missing from the bulk response are requested individually,
+        # to reproduce the single-item response or error.
+        await asyncio.gather(*(self._resolve(send, rule, i) for i in missing))
+
+    async def _resolve(self, send: Send, rule: BatchRule, queued: Pending) -> None:
+        """Request a single item, and resolve the queued requests for it."""
+
+        try:
+            value = await send(rule.single, queued[0][0])
+        except Exception as exc:
+            self._settle(queued, error=exc)
+        else:
+            self._settle(queued, value)
+
+    def _settle(
+        self,
+        queued: Pending,
+        value: typing.Any = None,
+        error: typing.Optional[BaseException] = None,
+    ) -> None:
+        """Resolve the queued requests still waiting, with a value or an error."""
+
+        for _, future in queued:
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(value)
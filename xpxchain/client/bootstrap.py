@@ -0,0 +1,391 @@
+"""
+    bootstrap
+    =========
+
+    Persisted cache for the data every client fetches on start.
+
+    New clients resolve the network type on first use, and signers need
+    the generation hash of the nemesis block. Short-lived processes,
+    such as command-line tools, therefore make the same requests on
+    every start. The bootstrap cache fetches the network type, nemesis
+    generation hash, node info and current network config once per
+    endpoint, and persists them to a small JSON file, so later processes
+    preload them into clients without any requests.
+
+    Example:
+        .. code-block:: python
+
+           >>> from xpxchain import client
+           >>> bootstrap = client.BootstrapCache(ttl=3600)
+           >>> with client.HTTP(endpoint, bootstrap=bootstrap) as http:
+           ...     info = bootstrap.load(http)
+           ...     info.generation_hash
+
+    License
+    -------
+
+    Copyright 2019 NEM
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import annotations
+import asyncio
+import contextlib
+import json
+import os
+import tempfile
+import threading
+import time
+import typing
+
+try:
+    import fcntl
+except ImportError:
+    # Windows has no advisory file locks.
+    fcntl = None
+
+from .client import parse_http_url
+from .. import models
+from .. import util
+
+__all__ = [
+    'BootstrapCache',
+    'BootstrapInfo',
+]
+
+# Seconds before cached bootstrap data is refetched.
+DEFAULT_TTL = 24 * 60 * 60
+# Version of the file format, files with other versions are ignored.
+FORMAT_VERSION = 1
+
+
+def default_path() -> str:
+    """Get the default path for the bootstrap cache file."""
+
+    root = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(root, 'xpxchain', 'bootstrap.json')
+
+
+class BootstrapInfo(util.Object):
+    """
+    Bootstrap data for an endpoint.
+
+    :param endpoint: Normalized URL for the endpoint.
+    :param network_type: Network type for the endpoint.
+    :param generation_hash: Generation hash of the nemesis block.
+    :param node_info: Node info for the endpoint.
+    :param config: Network config at `height`.
+    :param height: Blockchain height the config was fetched at.
+    :param fetched: Unix timestamp the data was fetched at.
+    """
+
+    endpoint: str
+    network_type: models.NetworkType
+    generation_hash: str
+    node_info: models.NodeInfo
+    config: models.CatapultConfig
+    height: int
+    fetched: float
+
+    def __init__(
+        self,
+        endpoint: str,
+        network_type: models.NetworkType,
+        generation_hash: str,
+        node_info: models.NodeInfo,
+        config: models.CatapultConfig,
+        height: int,
+        fetched: typing.Optional[float] = None,
+    ) -> None:
+        self.endpoint = endpoint
+        self.network_type = network_type
+        self.generation_hash = generation_hash
+        self.node_info = node_info
+        self.config = config
+        self.height = height
+        self.fetched = time.time() if fetched is None else fetched
+
+    def __eq__(self, other: typing.Any) -> bool:
+        if not isinstance(other, BootstrapInfo):
+            return NotImplemented
+        return self.to_json() == other.to_json()
+
+    def age(self) -> float:
+        """Get the seconds since the data was fetched."""
+        return time.time() - self.fetched
+
+    def validate(self) -> None:
+        """Check the data is consistent, raising a ValueError if not."""
+
+        if self.node_info.network_identifier != self.network_type:
+            raise ValueError('Node network identifier does not match the network type.')
+        if len(self.generation_hash) != 64:
+            raise ValueError('Invalid generation hash.')
+        int(self.generation_hash, 16)
+
+    def to_json(self) -> dict:
+        """Export the bootstrap data to JSON-serializable data."""
+
+        network_type = self.network_type
+        return {
+            'endpoint': self.endpoint,
+            'networkType': int(network_type),
+            'generationHash': self.generation_hash,
+            'nodeInfo': self.node_info.to_dto(network_type),
+            'config': self.config.to_dto(network_type),
+            'height': self.height,
+            'fetched': self.fetched,
+        }
+
+    @classmethod
+    def create_from_json(cls, data: dict) -> BootstrapInfo:
+        """
+        Load the bootstrap data from JSON data.
+
+        :param data: Data from `to_json`.
+        """
+
+        network_type = models.NetworkType(data['networkType'])
+        info = cls(
+            endpoint=data['endpoint'],
+            network_type=network_type,
+            generation_hash=data['generationHash'],
+            node_info=models.NodeInfo.create_from_dto(data['nodeInfo'], network_type),
+            config=models.CatapultConfig.create_from_dto(data['config'], network_type),
+            height=data['height'],
+            fetched=data['fetched'],
+        )
+        info.validate()
+        return info
+
+
+class BootstrapCache(util.Object):
+    """
+    Bootstrap data by endpoint, persisted to a local file.
+
+    The file is read on first use, and rewritten atomically whenever data
+    is fetched, so concurrent processes never read a partial file. Updates
+    reread the file under an advisory lock, so processes updating at once
+    keep each other's entries. Entries older than the TTL, or failing
+    validation, are refetched.
+
+    :param path: (Optional) path to the cache file, defaults to the user cache directory.
+    :param ttl: (Optional) seconds before cached data is refetched.
+    :param persist: (Optional) persist the cache to the file.
+    """
+
+    _path: typing.Optional[str]
+    _ttl: float
+    _entries: typing.Optional[typing.Dict[str, BootstrapInfo]]
+    _lock: threading.Lock
+    hits: int
+    misses: int
+
+    def __init__(
+        self,
+        path: typing.Optional[str] = None,
+        ttl: float = DEFAULT_TTL,
+        persist: bool = True,
+    ) -> None:
+        if persist and path is None:
+            path = default_path()
+        self._path = path if persist else None
+        self._ttl = ttl
+        self._entries = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def path(self) -> typing.Optional[str]:
+        """Get the path to the cache file, or None if not persisted."""
+        return self._path
+
+    @property
+    def ttl(self) -> float:
+        """Get the seconds before cached data is refetched."""
+        return self._ttl
+
+    def get(self, endpoint: str) -> typing.Optional[BootstrapInfo]:
+        """
+        Get the bootstrap data for an endpoint, if cached and fresh.
+
+        :param endpoint: Domain name and port for the endpoint.
+        """
+
+        key = parse_http_url(endpoint).url
+        with self._lock:
+            info = self._load().get(key)
+        if info is None or info.age() > self._ttl:
+            return None
+        return info
+
+    def put(self, info: BootstrapInfo) -> None:
+        """
+        Store the bootstrap data for an endpoint, and persist the cache.
+
+        :param info: Bootstrap data.
+        """
+
+        info.validate()
+        with self._update() as entries:
+            entries[info.endpoint] = info
+
+    def invalidate(self, endpoint: typing.Optional[str] = None) -> None:
+        """
+        Remove the bootstrap data for an endpoint, or for all endpoints.
+
+        :param endpoint: (Optional) domain name and port for the endpoint.
+        """
+
+        with self._update() as entries:
+            if endpoint is None:
+                entries.clear()
+            else:
+                entries.pop(parse_http_url(endpoint).url, None)
+
+    def load(self, http) -> BootstrapInfo:
+        """
+        Get the bootstrap data for a synchronous client, fetching it if required.
+
+        Preloads the network type into the client.
+
+        :param http: Synchronous HTTP client.
+        """
+
+        info = self._lookup(http)
+        if info is None:
+            network_type = http.root.network.get_network_type()
+            http._network_type = network_type
+            root = http.root
+            nemesis = root.blockchain.get_block_by_height(1)
+            node_info = root.node.get_node_info()
+            height = root.blockchain.get_blockchain_height()
+            config = root.config.get_config(height)
+            info = self._store(http, network_type, nemesis, node_info, config, height)
+        http._network_type = info.network_type
+        return info
+
+    async def load_async(self, http) -> BootstrapInfo:
+        """
+        Get the bootstrap data for an asynchronous client, fetching it if required.
+
+        Preloads the network type into the client.
+
+        :param http: Asynchronous HTTP client.
+        """
+
+        info = self._lookup(http)
+        if info is None:
+            network_type = await http.root.network.get_network_type()
+            http._network_type = network_type
+            root = http.root
+            nemesis, node_info, height = await asyncio.gather(
+                root.blockchain.get_block_by_height(1),
+                root.node.get_node_info(),
+                root.blockchain.get_blockchain_height(),
+            )
+            config = await root.config.get_config(height)
+            info = self._store(http, network_type, nemesis, node_info, config, height)
+        http._network_type = info.network_type
+        return info
+
+    def _lookup(self, http) -> typing.Optional[BootstrapInfo]:
+        info = self.get(http.raw.endpoint)
+        if info is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return info
+
+    def _store(self, http, network_type, nemesis, node_info, config, height) -> BootstrapInfo:
+        info = BootstrapInfo(
+            http.raw.endpoint,
+            network_type,
+            nemesis.generation_hash,
+            node_info,
+            config,
+            height,
+        )
+        self.put(info)
+        return info
+
+    @contextlib.contextmanager
+    def _update(self) -> typing.Iterator[typing.Dict[str, BootstrapInfo]]:
+        # Reread, change and save the entries while holding the file lock,
+        # so entries other processes just wrote are never dropped.
+        with self._lock, self._lock_file():
+            self._entries = None
+            entries = self._load()
+            yield entries
+            self._save(entries)
+
+    @contextlib.contextmanager
+    def _lock_file(self) -> typing.Iterator[None]:
+        # Take an advisory lock on a sibling file, which, unlike the cache
+        # file, is never replaced.
+        if self._path is None or fcntl is None:
+            yield
+            return
+
+        os.makedirs(os.path.dirname(self._path) or '.', exist_ok=True)
+        with open(self._path + '.lock', 'a') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _load(self) -> typing.Dict[str, BootstrapInfo]:
+        # Read the cache file, ignoring invalid or outdated entries.
+        if self._entries is not None:
+            return self._entries
+
+        self._entries = {}
+        if self._path is None:
+            return self._entries
+        try:
+            with open(self._path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return self._entries
+        if not isinstance(data, dict) or data.get('version') != FORMAT_VERSION:
+            return self._entries
+        for item in data.get('entries', ()):
+            try:
+                info = BootstrapInfo.create_from_json(item)
+            except (KeyError, TypeError, ValueError):
+                continue
+            self._entries[info.endpoint] = info
+        return self._entries
+
+    def _save(self, entries: typing.Dict[str, BootstrapInfo]) -> None:
+        # Write to a temporary file and rename it, so the update is atomic.
+        if self._path is None:
+            return
+
+        data = {
+            'version': FORMAT_VERSION,
+            'entries': [i.to_json() for i in entries.values()],
+        }
+        directory = os.path.dirname(self._path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix='.bootstrap-', suffix='.json')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp, self._path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
@@ -0,0 +1,294 @@
+"""
+    cache
+    =====
+
+    Opt-in, in-memory LRU cache for decoded responses of immutable
+    REST resources.
+
+    Only endpoints with a cacheability rule are cached, and the rule
+    decides, from the decoded model, if the response may be stored.
+    For example, blocks at a given height never change, while a
+    transaction may only be cached once it has been confirmed.
+
+    Blocks near the chain tip may not be fully indexed by the node yet,
+    so responses for a block height are only stored once the height is
+    `confirmations` blocks below the highest chain height seen from the
+    same endpoint, through `get_blockchain_height` or block responses.
+    Cache keys include the endpoint, so a cache may be shared between
+    clients for different nodes.
+
+    Example:
+        .. code-block:: python
+
+           >>> from xpxchain import client
+           >>> cache = client.ResponseCache(max_entries=4096)
+           >>> with client.BlockchainHTTP(endpoint, cache=cache) as http:
+           ...     http.get_blockchain_height()
+           ...     http.get_block_by_height(1)
+           ...     http.get_block_by_height(1)
+           >>> cache.hits, cache.misses
+           (1, 1)
+
+    License
+    -------
+
+    Copyright 2019 NEM
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import annotations
+import collections
+import enum
+import sys
+import threading
+import typing
+
+from .. import util
+
+__all__ = [
+    'CACHE_RULES',
+    'ResponseCache',
+]
+
+CacheRule = typing.Callable[[typing.Any], bool]
+CacheRules = typing.Mapping[str, CacheRule]
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Blocks a height must be below the chain tip for its responses to be cached.
+DEFAULT_CONFIRMATIONS = 10
+
+# Endpoints whose first argument is a block height.
+HEIGHT_ENDPOINTS = frozenset({
+    'get_block_by_height',
+    'get_block_transactions',
+    'get_block_receipts',
+})
+# Endpoint returning the chain height, observed to find the chain tip.
+TIP_ENDPOINT = 'get_blockchain_height'
+
+
+def always(value: typing.Any) -> bool:
+    """Cache the response unconditionally."""
+    return True
+
+
+def is_confirmed(transaction: typing.Any) -> bool:
+    """Cache the transaction only once it has been included in a block."""
+
+    info = getattr(transaction, 'transaction_info', None)
+    return info is not None and info.is_confirmed()
+
+
+# Endpoints whose responses cannot change, once returned, mapped to a
+# predicate deciding if the decoded response may be stored.
+CACHE_RULES: CacheRules = {
+    'get_block_by_height': always,
+    'get_block_transactions': always,
+    'get_block_receipts': always,
+    'get_config': always,
+    'get_upgrade': always,
+    'get_network_type': always,
+    'get_transaction': is_confirmed,
+}
+
+
+def estimate_size(value: typing.Any) -> int:
+    """Estimate the memory used by a decoded model (in bytes)."""
+
+    seen: typing.Set[int] = set()
+    stack = [value]
+    size = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen or isinstance(item, enum.Enum):
+            # Enumerations are singletons, and do not count.
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if isinstance(item, (str, bytes, bytearray, int, float)):
+            continue
+        elif isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        else:
+            for cls in type(item).__mro__:
+                for slot in getattr(cls, '__slots__', ()):
+                    stack.append(getattr(item, slot, None))
+            try:
+                stack.extend(vars(item).values())
+            except TypeError:
+                pass
+    return size
+
+
+class ResponseCache(util.Object):
+    """
+    Memory-bounded LRU cache for decoded REST responses.
+
+    :param max_entries: (Optional) maximum number of cached responses.
+    :param max_bytes: (Optional) approximate memory bound for the cache.
+    :param rules: (Optional) cacheability rules by endpoint name.
+    :param confirmations: (Optional) blocks a height must be below the chain tip to be cached.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    _entries: typing.OrderedDict[typing.Hashable, typing.Tuple[typing.Any, int]]
+    _size: int
+    _max_entries: int
+    _max_bytes: int
+    _rules: CacheRules
+    _confirmations: int
+    _tips: typing.Dict[str, int]
+    _lock: threading.Lock
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        rules: CacheRules = CACHE_RULES,
+        confirmations: int = DEFAULT_CONFIRMATIONS,
+    ) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = collections.OrderedDict()
+        self._size = 0
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._rules = rules
+        self._confirmations = confirmations
+        self._tips = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: typing.Hashable) -> bool:
+        return key in self._entries
+
+    def __getitem__(self, key: typing.Hashable) -> typing.Any:
+        with self._lock:
+            try:
+                value, _ = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                raise
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    @property
+    def size(self) -> int:
+        """Get the approximate memory used by the cached responses."""
+        return self._size
+
+    def tip(self, endpoint: str) -> typing.Optional[int]:
+        """
+        Get the highest chain height seen from an endpoint, if any.
+
+        :param endpoint: Normalized URL for the endpoint.
+        """
+        return self._tips.get(endpoint)
+
+    def observe_height(self, endpoint: str, height: int) -> None:
+        """
+        Record that the chain of an endpoint reached a height.
+
+        :param endpoint: Normalized URL for the endpoint.
+        :param height: Chain height.
+        """
+
+        with self._lock:
+            tip = self._tips.get(endpoint)
+            if tip is None or height > tip:
+                self._tips[endpoint] = height
+
+    def is_final(self, endpoint: str, height: int) -> bool:
+        """
+        Determine if a block height is far enough below the chain tip to cache.
+
+        :param endpoint: Normalized URL for the endpoint.
+        :param height: Block height.
+        """
+
+        tip = self._tips.get(endpoint)
+        return tip is not None and height + self._confirmations <= tip
+
+    def key(
+        self,
+        name: str,
+        args: typing.Sequence[typing.Any],
+        endpoint: str = '',
+    ) -> typing.Optional[typing.Hashable]:
+        """
+        Get the cache key for a request, or None if it is not cacheable.
+
+        :param name: Name of the NIS endpoint.
+        :param args: Positional arguments for the request.
+        :param endpoint: (Optional) normalized URL for the endpoint.
+        """
+
+        if name not in self._rules:
+            return None
+        key = (name, endpoint, tuple(args))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def put(self, key: typing.Hashable, value: typing.Any) -> bool:
+        """
+        Store the decoded response if the endpoint's rule allows it.
+
+        :param key: Cache key from `key`.
+        :param value: Decoded model for the response.
+        :return: If the response was stored.
+        """
+
+        name, endpoint, args = key   # type: ignore
+        if not self._rules[name](value):
+            return False
+        if name in HEIGHT_ENDPOINTS:
+            # The node returned the block, so the chain reached its height.
+            self.observe_height(endpoint, args[0])
+            if not self.is_final(endpoint, args[0]):
+                return False
+        size = estimate_size(value)
+        if size > self._max_bytes:
+            return False
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous[1]
+            self._entries[key] = (value, size)
+            self._size += size
+            while len(self._entries) > self._max_entries or self._size > self._max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= evicted
+                self.evictions += 1
+        return True
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
@@ -0,0 +1,744 @@
+"""
+    cassette
+    ========
+
+    Record and replay HTTP and websocket traffic.
+
+    In record mode, a cassette wraps the real sessions and connections
+    used by the clients and listeners, and stores each request and
+    response, and each websocket frame, to a compact JSON file (gzip
+    compressed if the path ends with ".gz"). In replay mode, the
+    cassette replaces the sessions and connections entirely, serving
+    the recorded responses and frames without a live node. Replays
+    optionally sleep for the recorded latency, a fixed latency, or
+    a latency from a callback, to benchmark and profile clients
+    deterministically and offline.
+
+    Example:
+        .. code-block:: python
+
+           >>> from xpxchain import client
+           >>> with client.Cassette('chain.json.gz', mode='record') as cassette:
+           ...     with client.HTTP(endpoint, cassette=cassette) as http:
+           ...         http.blockchain.get_blockchain_height()
+           >>> cassette = client.Cassette('chain.json.gz', latency='recorded')
+           >>> with client.HTTP(endpoint, cassette=cassette) as http:
+           ...     http.blockchain.get_blockchain_height()
+
+    License
+    -------
+
+    Copyright 2019 NEM
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import annotations
+import aiohttp
+import asyncio
+import base64
+import datetime
+import gzip
+import json
+import os
+import requests
+import tempfile
+import threading
+import time
+import typing
+import urllib.parse
+import websockets
+
+from .. import util
+from ..errors import CassetteMissError
+
+__all__ = ['Cassette']
+
+RECORD = 'record'
+REPLAY = 'replay'
+# Version of the file format, files with other versions are rejected.
+FORMAT_VERSION = 1
+
+Latency = typing.Union[None, str, float, typing.Callable[[float], float]]
+Key = typing.Tuple[str, str, typing.Optional[str]]
+
+
+class Interaction(typing.NamedTuple):
+    """
+    Recorded HTTP request and response.
+
+    :param method: Uppercase HTTP method.
+    :param url: Request URL, including the sorted query parameters.
+    :param body: Canonical request body, if any.
+    :param status: Status code for the response.
+    :param content: Response body.
+    :param elapsed: Seconds until the response was received.
+    """
+
+    method: str
+    url: str
+    body: typing.Optional[str]
+    status: int
+    content: bytes
+    elapsed: float
+
+    @property
+    def key(self) -> Key:
+        return (self.method, self.url, self.body)
+
+    def to_json(self) -> dict:
+        data: dict = {
+            'method': self.method,
+            'url': self.url,
+            'status': self.status,
+            'elapsed': round(self.elapsed, 6),
+        }
+        if self.body is not None:
+            data['body'] = self.body
+        try:
+            data['content'] = self.content.decode('utf-8')
+        except UnicodeDecodeError:
+            data['content64'] = base64.b64encode(self.content).decode('ascii')
+        return data
+
+    @classmethod
+    def create_from_json(cls, data: dict) -> Interaction:
+        if 'content64' in data:
+            content = base64.b64decode(data['content64'])
+        else:
+            content = data['content'].encode('utf-8')
+        return cls(
+            data['method'],
+            data['url'],
+            data.get('body'),
+            data['status'],
+            content,
+            data['elapsed'],
+        )
+
+
+class Frame(typing.NamedTuple):
+    """
+    Recorded websocket frame.
+
+    :param direction: "recv" for received frames, "send" for sent frames.
+    :param data: Frame data.
+    :param offset: Seconds since the previous frame, or the connection.
+    """
+
+    direction: str
+    data: str
+    offset: float
+
+
+def request_url(url: str, params: typing.Optional[typing.Mapping[str, typing.Any]]) -> str:
+    """Get the URL for a request, including the sorted query parameters."""
+
+    if not params:
+        return url
+    query = urllib.parse.urlencode(sorted(params.items()))
+    return f'{url}&{query}' if '?' in url else f'{url}?{query}'
+
+
+def request_body(kwds: typing.Mapping[str, typing.Any]) -> typing.Optional[str]:
+    """Get the canonical body for a request, so equal bodies match."""
+
+    if kwds.get('json') is not None:
+        return json.dumps(kwds['json'], sort_keys=True, separators=(',', ':'))
+    data = kwds.get('data')
+    if isinstance(data, bytes):
+        return data.decode('utf-8')
+    return data
+
+
+class Cassette(util.Object):
+    """
+    Recorded HTTP interactions and websocket frames.
+
+    Repeated, identical requests replay the recorded responses in order,
+    repeating the last one once exhausted.
+
+    :param path: (Optional) path to the cassette file, None to keep it in memory.
+    :param mode: (Optional) "record" to record traffic, "replay" to replay it.
+    :param latency: (Optional) None for no latency, "recorded" for the recorded latency,
+        fixed seconds, or a callback mapping the recorded to the replayed seconds.
+    """
+
+    _path: typing.Optional[str]
+    _mode: str
+    _latency: Latency
+    _interactions: typing.List[Interaction]
+    _index: typing.Dict[Key, typing.List[Interaction]]
+    _websockets: typing.Dict[str, typing.List[typing.List[Frame]]]
+    _played: typing.Dict[typing.Any, int]
+    _lock: threading.Lock
+    misses: int
+
+    def __init__(
+        self,
+        path: typing.Optional[str] = None,
+        mode: str = REPLAY,
+        latency: Latency = None,
+    ) -> None:
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f'Invalid cassette mode {mode!r}.')
+        if isinstance(latency, str) and latency != 'recorded':
+            raise ValueError(f'Invalid cassette latency {latency!r}.')
+        self._path = path
+        self._mode = mode
+        self._latency = latency
+        self._interactions = []
+        self._index = {}
+        self._websockets = {}
+        self._played = {}
+        self._lock = threading.Lock()
+        self.misses = 0
+        if mode == REPLAY and path is not None:
+            self.load()
+
+    def __enter__(self) -> Cassette:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self._mode == RECORD:
+            self.save()
+
+    @property
+    def path(self) -> typing.Optional[str]:
+        """Get the path to the cassette file."""
+        return self._path
+
+    @property
+    def mode(self) -> str:
+        """Get if the cassette records or replays traffic."""
+        return self._mode
+
+    @property
+    def interactions(self) -> typing.Sequence[Interaction]:
+        """Get the recorded HTTP interactions."""
+        return tuple(self._interactions)
+
+    def frames(self, url: str) -> typing.Sequence[typing.Sequence[Frame]]:
+        """
+        Get the recorded frames for each connection to a websocket URL.
+
+        :param url: Websocket URL.
+        """
+
+        return tuple(tuple(i) for i in self._websockets.get(url, ()))
+
+    def replay(self, latency: Latency = None) -> Cassette:
+        """
+        Get a cassette replaying the traffic recorded so far.
+
+        :param latency: (Optional) latency for the replayed traffic.
+        """
+
+        cassette = Cassette(mode=REPLAY, latency=latency)
+        with self._lock:
+            for interaction in self._interactions:
+                cassette.record(interaction)
+            cassette._websockets = {k: [list(i) for i in v] for k, v in self._websockets.items()}
+        return cassette
+
+    # STORAGE
+
+    def load(self) -> None:
+        """Load the cassette from the file."""
+
+        path = typing.cast(str, self._path)
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != FORMAT_VERSION:
+            raise ValueError(f'Unsupported cassette version {data.get("version")!r}.')
+
+        self._interactions = []
+        self._index = {}
+        self._played = {}
+        for item in data['interactions']:
+            self.record(Interaction.create_from_json(item))
+        self._websockets = {
+            url: [[Frame(*i) for i in frames] for frames in connections]
+            for url, connections in data['websockets'].items()
+        }
+
+    def save(self) -> None:
+        """Save the cassette to the file."""
+
+        if self._path is None:
+            return
+        with self._lock:
+            data = {
+                'version': FORMAT_VERSION,
+                'interactions': [i.to_json() for i in self._interactions],
+                'websockets': {
+                    url: [[[i.direction, i.data, round(i.offset, 6)] for i in frames] for frames in connections]
+                    for url, connections in self._websockets.items()
+                },
+            }
+
+        # Write to a temporary file and rename it, so the update is atomic.
+        directory = os.path.dirname(self._path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix='.cassette-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                text = json.dumps(data, separators=(',', ':')).encode('utf-8')
+                f.write(gzip.compress(text) if self._path.endswith('.gz') else text)
+            os.replace(tmp, self._path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    # RECORDING
+
+    def record(self, interaction: Interaction) -> None:
+        """
+        Add an HTTP interaction to the cassette.
+
+        :param interaction: Recorded request and response.
+        """
+
+        with self._lock:
+            self._interactions.append(interaction)
+            self._index.setdefault(interaction.key, []).append(interaction)
+
+    def record_connection(self, url: str) -> typing.List[Frame]:
+        """
+        Add a websocket connection to the cassette, returning the list for its frames.
+
+        :param url: Websocket URL.
+        """
+
+        frames: typing.List[Frame] = []
+        with self._lock:
+            self._websockets.setdefault(url, []).append(frames)
+        return frames
+
+    # REPLAYING
+
+    def find(self, method: str, url: str, body: typing.Optional[str] = None) -> Interaction:
+        """
+        Find the next recorded interaction for a request.
+
+        :param method: HTTP method.
+        :param url: Request URL, including the query parameters.
+        :param body: (Optional) canonical request body.
+        """
+
+        key = (method.upper(), url, body)
+        with self._lock:
+            matches = self._index.get(key)
+            if not matches:
+                self.misses += 1
+                raise CassetteMissError(key[0], url)
+            count = self._played.get(key, 0)
+            self._played[key] = count + 1
+        return matches[min(count, len(matches) - 1)]
+
+    def replay_connection(self, url: str) -> typing.List[Frame]:
+        """
+        Get the recorded frames for the next connection to a websocket URL.
+
+        :param url: Websocket URL.
+        """
+
+        key = ('websocket', url)
+        with self._lock:
+            connections = self._websockets.get(url)
+            if not connections:
+                self.misses += 1
+                raise CassetteMissError('CONNECT', url)
+            count = self._played.get(key, 0)
+            self._played[key] = count + 1
+        return connections[min(count, len(connections) - 1)]
+
+    def delay(self, recorded: float) -> float:
+        """
+        Get the seconds to wait before replaying a response or frame.
+
+        :param recorded: Recorded seconds.
+        """
+
+        latency = self._latency
+        if latency is None:
+            return 0.0
+        elif latency == 'recorded':
+            return recorded
+        elif callable(latency):
+            return latency(recorded)
+        return typing.cast(float, latency)
+
+    # TRANSPORTS
+
+    def session(self, factory: typing.Callable[[], typing.Any] = requests.Session):
+        """
+        Get a synchronous session, recording or replaying requests.
+
+        :param factory: (Optional) callback for the real session to record.
+        """
+
+        if self._mode == RECORD:
+            return RecordingSession(factory(), self)
+        return ReplaySession(self)
+
+    def async_session(self, factory: typing.Callable[[], typing.Any] = aiohttp.ClientSession):
+        """
+        Get an asynchronous session, recording or replaying requests.
+
+        :param factory: (Optional) callback for the real session to record.
+        """
+
+        if self._mode == RECORD:
+            return AsyncRecordingSession(factory(), self)
+        return AsyncReplaySession(self)
+
+    def connect(self, url: str, factory: typing.Callable[[], typing.Any] = None):
+        """
+        Get a websocket connection, recording or replaying frames.
+
+        :param url: Websocket URL.
+        :param factory: (Optional) callback for the real connection to record.
+        """
+
+        if self._mode == RECORD:
+            connect = factory() if factory is not None else websockets.connect(url)
+            return RecordingConnect(connect, self, url)
+        return ReplayConnect(self, url)
+
+
+# HTTP
+
+
+class SessionMethods:
+    """Dispatch the HTTP method shortcuts to `request`."""
+
+    def request(self, method: str, url: str, **kwds):
+        raise util.AbstractMethodError
+
+    def delete(self, url: str, **kwds):
+        return self.request('DELETE', url, **kwds)
+
+    def get(self, url: str, **kwds):
+        return self.request('GET', url, **kwds)
+
+    def head(self, url: str, **kwds):
+        return self.request('HEAD', url, **kwds)
+
+    def options(self, url: str, **kwds):
+        return self.request('OPTIONS', url, **kwds)
+
+    def patch(self, url: str, **kwds):
+        return self.request('PATCH', url, **kwds)
+
+    def post(self, url: str, **kwds):
+        return self.request('POST', url, **kwds)
+
+    def put(self, url: str, **kwds):
+        return self.request('PUT', url, **kwds)
+
+
+class RecordingSession(SessionMethods):
+    """Synchronous session recording the requests of a real session."""
+
+    def __init__(self, session, cassette: Cassette) -> None:
+        self._session = session
+        self._cassette = cassette
+
+    def __getattr__(self, name: str):
+        return getattr(self._session, name)
+
+    def request(self, method: str, url: str, **kwds):
+        response = self._session.request(method, url, **kwds)
+        elapsed = response.elapsed.total_seconds() if response.elapsed is not None else 0.0
+        self._cassette.record(Interaction(
+            method.upper(),
+            request_url(url, kwds.get('params')),
+            request_body(kwds),
+            response.status_code,
+            response.content,
+            elapsed,
+        ))
+        return response
+
+    def close(self) -> None:
+        self._session.close()
+
+
+class ReplayResponse:
+    """Replayed response, for synchronous and asynchronous sessions."""
+
+    def __init__(self, interaction: Interaction) -> None:
+        self.url = interaction.url
+        self.method = interaction.method
+        self.status = self.status_code = interaction.status
+        self.content = interaction.content
+        self.elapsed = datetime.timedelta(seconds=interaction.elapsed)
+
+    @property
+    def ok(self) -> bool:
+        return self.status < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8')
+
+    def json(self) -> typing.Any:
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if not self.ok:
+            raise requests.HTTPError(f'{self.status} Error for url: {self.url}')
+
+    def close(self) -> None:
+        pass
+
+
+class ReplaySession(SessionMethods):
+    """Synchronous session replaying recorded responses."""
+
+    def __init__(self, cassette: Cassette) -> None:
+        self._cassette = cassette
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def request(self, method: str, url: str, **kwds) -> ReplayResponse:
+        interaction = self._cassette.find(method, request_url(url, kwds.get('params')), request_body(kwds))
+        delay = self._cassette.delay(interaction.elapsed)
+        if delay > 0:
+            time.sleep(delay)
+        return ReplayResponse(interaction)
+
+    def close(self) -> None:
+        self._closed = True
+
+
+class AsyncRecordingRequest:
+    """Context manager recording the response for an asynchronous request."""
+
+    def __init__(self, context, cassette: Cassette, method: str, url: str, body: typing.Optional[str]) -> None:
+        self._context = context
+        self._cassette = cassette
+        self._key = (method.upper(), url, body)
+
+    async def __aenter__(self):
+        start = time.perf_counter()
+        response = await self._context.__aenter__()
+        # Aiohttp caches the body, so clients may still read it.
+        content = await response.read()
+        elapsed = time.perf_counter() - start
+        self._cassette.record(Interaction(*self._key, response.status, content, elapsed))
+        return response
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self._context.__aexit__(exc_type, exc, tb)
+
+
+class AsyncRecordingSession(SessionMethods):
+    """Asynchronous session recording the requests of a real session."""
+
+    def __init__(self, session, cassette: Cassette) -> None:
+        self._session = session
+        self._cassette = cassette
+
+    def __getattr__(self, name: str):
+        return getattr(self._session, name)
+
+    def request(self, method: str, url: str, **kwds) -> AsyncRecordingRequest:
+        context = self._session.request(method, url, **kwds)
+        full_url = request_url(url, kwds.get('params'))
+        return AsyncRecordingRequest(context, self._cassette, method, full_url, request_body(kwds))
+
+    async def close(self) -> None:
+        await self._session.close()
+
+
+class AsyncReplayResponse(ReplayResponse):
+    """Replayed response for asynchronous sessions."""
+
+    async def read(self) -> bytes:
+        return self.content
+
+    async def text(self) -> str:  # type: ignore
+        return self.content.decode('utf-8')
+
+    async def json(self) -> typing.Any:
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if not self.ok:
+            request_info = aiohttp.RequestInfo(self.url, self.method, {}, self.url)
+            raise aiohttp.ClientResponseError(request_info, (), status=self.status, message='Error')
+
+    def release(self) -> None:
+        pass
+
+
+class AsyncReplayRequest:
+    """Context manager replaying the response for an asynchronous request."""
+
+    def __init__(self, cassette: Cassette, method: str, url: str, body: typing.Optional[str]) -> None:
+        self._cassette = cassette
+        self._key = (method, url, body)
+
+    async def __aenter__(self) -> AsyncReplayResponse:
+        interaction = self._cassette.find(*self._key)
+        delay = self._cassette.delay(interaction.elapsed)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return AsyncReplayResponse(interaction)
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+class AsyncReplaySession(SessionMethods):
+    """Asynchronous session replaying recorded responses."""
+
+    def __init__(self, cassette: Cassette) -> None:
+        self._cassette = cassette
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def request(self, method: str, url: str, **kwds) -> AsyncReplayRequest:
+        return AsyncReplayRequest(self._cassette, method, request_url(url, kwds.get('params')), request_body(kwds))
+
+    async def close(self) -> None:
+        self._closed = True
+
+
+# WEBSOCKETS
+
+
+class RecordingWebsocket:
+    """Websocket connection recording the frames of a real connection."""
+
+    def __init__(self, connection, frames: typing.List[Frame]) -> None:
+        self._connection = connection
+        self._frames = frames
+        self._last = time.monotonic()
+
+    def __getattr__(self, name: str):
+        return getattr(self._connection, name)
+
+    def _record(self, direction: str, data: typing.AnyStr) -> None:
+        now = time.monotonic()
+        if isinstance(data, bytes):
+            data = data.decode('utf-8')
+        self._frames.append(Frame(direction, typing.cast(str, data), now - self._last))
+        self._last = now
+
+    async def __aiter__(self) -> typing.AsyncIterator[typing.AnyStr]:
+        async for message in self._connection:
+            self._record('recv', message)
+            yield message
+
+    async def recv(self) -> typing.AnyStr:
+        message = await self._connection.recv()
+        self._record('recv', message)
+        return message
+
+    async def send(self, message: typing.AnyStr) -> None:
+        self._record('send', message)
+        await self._connection.send(message)
+
+
+class RecordingConnect:
+    """Context manager for a recorded websocket connection."""
+
+    def __init__(self, connect, cassette: Cassette, url: str) -> None:
+        self._connect = connect
+        self._cassette = cassette
+        self._url = url
+
+    async def __aenter__(self) -> RecordingWebsocket:
+        connection = await self._connect.__aenter__()
+        return RecordingWebsocket(connection, self._cassette.record_connection(self._url))
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self._connect.__aexit__(exc_type, exc, tb)
+
+
+class ReplayWebsocket:
+    """Websocket connection replaying recorded frames."""
+
+    def __init__(self, cassette: Cassette, frames: typing.Sequence[Frame]) -> None:
+        self._cassette = cassette
+        # Received frames, with the seconds since the previous received frame.
+        self._received: typing.List[typing.Tuple[str, float]] = []
+        offset = 0.0
+        for frame in frames:
+            offset += frame.offset
+            if frame.direction == 'recv':
+                self._received.append((frame.data, offset))
+                offset = 0.0
+        self._position = 0
+        self._closed = False
+        self.sent: typing.List[typing.AnyStr] = []
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    async def __aiter__(self) -> typing.AsyncIterator[str]:
+        while self._position < len(self._received):
+            yield await self.recv()
+
+    async def recv(self) -> str:
+        if self._position >= len(self._received):
+            self._closed = True
+            raise websockets.ConnectionClosed(1000, 'Cassette exhausted.')
+        data, offset = self._received[self._position]
+        self._position += 1
+        delay = self._cassette.delay(offset)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return data
+
+    async def send(self, message: typing.AnyStr) -> None:
+        self.sent.append(message)
+
+    async def ping(self, data: typing.Optional[bytes] = None) -> typing.Awaitable[None]:
+        future = asyncio.get_event_loop().create_future()
+        future.set_result(None)
+        return future
+
+    async def pong(self, data: bytes = b'') -> None:
+        pass
+
+    async def close(self, code: int = 1000, reason: str = '') -> None:
+        self._closed = True
+
+
+class ReplayConnect:
+    """Context manager for a replayed websocket connection."""
+
+    def __init__(self, cassette: Cassette, url: str) -> None:
+        self._cassette = cassette
+        self._url = url
+        self._connection: typing.Optional[ReplayWebsocket] = None
+
+    async def __aenter__(self) -> ReplayWebsocket:
+        self._connection = ReplayWebsocket(self._cassette, self._cassette.replay_connection(self._url))
+        return self._connection
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if self._connection is not None:
+            await self._connection.close()
@@ -0,0 +1,192 @@
+"""
+    chunking
+    ========
+
+    Split large bulk requests into chunks, dispatched concurrently.
+
+    Bulk endpoints send every item in a single JSON body, so very large
+    requests may exceed server limits or produce a single, huge response.
+    Chunked requests are dispatched with a thread pool for synchronous
+    clients, and with a bounded semaphore for asynchronous clients. The
+    results are merged in the order of the chunks, and if any chunk
+    fails, a `BulkRequestError` reports both the merged results from the
+    successful chunks and the items and error for each failed chunk.
+
+    Example:
+        .. code-block:: python
+
+           >>> from xpxchain import client
+           >>> with client.AccountHTTP(endpoint, chunk_size=100) as http:
+           ...     infos = http.get_accounts_info(addresses)
+
+    License
+    -------
+
+    Copyright 2019 NEM
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import annotations
+import asyncio
+import concurrent.futures
+import typing
+
+from .. import util
+from ..errors import BulkRequestError
+
+__all__ = [
+    'CHUNKED_ENDPOINTS',
+    'Chunker',
+]
+
+DEFAULT_CONCURRENCY = 4
+
+# Bulk endpoints taking a sequence of items as the first argument, and
+# returning a list of results, so chunks may be requested separately.
+CHUNKED_ENDPOINTS: typing.FrozenSet[str] = frozenset({
+    'get_accounts_info',
+    'get_accounts_properties',
+    'get_account_names',
+    'get_metadatas',
+    'get_mosaics',
+    'get_mosaic_names',
+    'get_namespaces_name',
+    'get_transactions',
+    'get_transaction_statuses',
+})
+
+Outcome = typing.Union[typing.List[typing.Any], BaseException]
+
+
+class Chunker(util.Object):
+    """
+    Split bulk requests into chunks, and merge the results.
+
+    :param size: Maximum number of items per request.
+    :param concurrency: (Optional) maximum number of concurrent requests.
+    :param endpoints: (Optional) names of the endpoints to chunk.
+    """
+
+    _size: int
+    _concurrency: int
+    _endpoints: typing.AbstractSet[str]
+
+    def __init__(
+        self,
+        size: int,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        endpoints: typing.AbstractSet[str] = CHUNKED_ENDPOINTS,
+    ) -> None:
+        if size < 1:
+            raise ValueError('Chunk size must be positive.')
+        self._size = size
+        self._concurrency = concurrency
+        self._endpoints = endpoints
+
+    @property
+    def size(self) -> int:
+        """Get the maximum number of items per request."""
+        return self._size
+
+    @property
+    def concurrency(self) -> int:
+        """Get the maximum number of concurrent requests."""
+        return self._concurrency
+
+    def accepts(self, name: str, args: typing.Sequence[typing.Any]) -> bool:
+        """
+        Determine if a request must be split into chunks.
+
+        :param name: Name of the NIS endpoint.
+        :param args: Positional arguments for the request.
+        """
+
+        if name not in self._endpoints or not args:
+            return False
+        return isinstance(args[0], typing.Sized) and len(args[0]) > self._size
+
+    def split(self, items: typing.Sequence[typing.Any]) -> typing.List[typing.Sequence[typing.Any]]:
+        """
+        Split the items into chunks, in order.
+
+        :param items: Sequence of items for the bulk request.
+        """
+
+        size = self._size
+        items = list(items)
+        return [items[i:i + size] for i in range(0, len(items), size)]
+
+    def merge(
+        self,
+        chunks: typing.Sequence[typing.Sequence[typing.Any]],
+        outcomes: typing.Sequence[Outcome],
+    ) -> typing.List[typing.Any]:
+        """
+        Merge the results for each chunk, in order.
+
+        :param chunks: Items for each chunk.
+        :param outcomes: Results or exception for each chunk.
+        :raises BulkRequestError: If any chunk failed.
+        """
+
+        results: typing.List[typing.Any] = []
+        errors = []
+        for chunk, outcome in zip(chunks, outcomes):
+            if isinstance(outcome, BaseException):
+                if not isinstance(outcome, Exception):
+                    # Never suppress cancellation or interrupts.
+                    raise outcome
+                errors.append((chunk, outcome))
+            else:
+                results += outcome
+        if errors:
+            raise BulkRequestError(results, errors, len(chunks)) from errors[0][1]
+        return results
+
+    def run(self, send, cbs, *args, **kwds) -> typing.List[typing.Any]:
+        """
+        Dispatch the chunks with a thread pool.
+
+        :param send: Callback to invoke a NIS callback.
+        :param cbs: NIS callbacks for the bulk endpoint.
+        :param \\*args: Positional arguments for the request.
+        :param \\**kwds: Keyword arguments for the request.
+        """
+
+        chunks = self.split(args[0])
+        workers = min(self._concurrency, len(chunks))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(send, cbs, i, *args[1:], **kwds) for i in chunks]
+        outcomes = [i.exception() or i.result() for i in futures]
+        return self.merge(chunks, outcomes)
+
+    async def run_async(self, send, cbs, *args, **kwds) -> typing.List[typing.Any]:
+        """
+        Dispatch the chunks concurrently, bounded by a semaphore.
+
+        :param send: Callback to invoke a NIS callback.
+        :param cbs: NIS callbacks for the bulk endpoint.
+        :param \\*args: Positional arguments for the request.
+        :param \\**kwds: Keyword arguments for the request.
+        """
+
+        chunks = self.split(args[0])
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def dispatch(chunk):
+            async with semaphore:
+                return await send(cbs, chunk, *args[1:], **kwds)
+
+        outcomes = await asyncio.gather(*(dispatch(i) for i in chunks), return_exceptions=True)
+        return self.merge(chunks, outcomes)
@@ -11,7 +11,11 @@ import typing
 import urllib.error
 import urllib3
 
+from .metrics import Metrics
+from .ratelimit import RateLimiter
+from .retry import CircuitBreaker, RetryPolicy
 from .. import util
+from ..parallel import Decoder
 
 # UTILITY
 
@@ -60,10 +64,29 @@ class ClientSharedBase(util.Object):
 
     _session: typing.Any
     _endpoint: str
+    _retry: typing.Optional[RetryPolicy] = None
+    _circuit_breaker: typing.Optional[CircuitBreaker] = None
+    _rate_limiter: typing.Optional[RateLimiter] = None
+    _decoder: typing.Optional[Decoder] = None
+    _metrics: typing.Optional[Metrics] = None
 
-    def __init__(self, session, endpoint) -> None:
+    def __init__(
+        self,
+        session,
+        endpoint,
+        retry: typing.Optional[RetryPolicy] = None,
+        circuit_breaker: typing.Optional[CircuitBreaker] = None,
+        rate_limiter: typing.Optional[RateLimiter] = None,
+        decoder: typing.Optional[Decoder] = None,
+        metrics: typing.Optional[Metrics] = None,
+    ) -> None:
         self._session = session
         self._endpoint = parse_http_url(endpoint).url
+        self._retry = retry
+        self._circuit_breaker = circuit_breaker
+        self._rate_limiter = rate_limiter
+        self._decoder = decoder
+        self._metrics = metrics
 
     def close(self):
         """Close the client session."""
@@ -74,6 +97,49 @@ class ClientSharedBase(util.Object):
         """Get if client session has been closed."""
         raise util.AbstractMethodError
 
+    @property
+    def endpoint(self) -> str:
+        """Get the normalized URL for the endpoint."""
+        return self._endpoint
+
+    @property
+    def retry(self) -> typing.Optional[RetryPolicy]:
+        """Get the retry policy for failed requests, if enabled."""
+        return self._retry
+
+    @property
+    def circuit_breaker(self) -> typing.Optional[CircuitBreaker]:
+        """Get the circuit breaker for unhealthy endpoints, if enabled."""
+        return self._circuit_breaker
+
+    @property
+    def rate_limiter(self) -> typing.Optional[RateLimiter]:
+        """Get the rate limiter for requests, if enabled."""
+        return self._rate_limiter
+
+    @property
+    def decoder(self) -> typing.Optional[Decoder]:
+        """Get the decoder for large list responses, if enabled."""
+        return self._decoder
+
+    @property
+    def metrics(self) -> typing.Optional[Metrics]:
+        """Get the request metrics, if enabled."""
+        return self._metrics
+
+    def _request(self, method, relative_path, *args, **kwds):
+        """
+        Dispatch the request for the HTTP method to the session.
+
+        :param method: Lowercase name of the HTTP method.
+        :param relative_path: Relative path from endpoint prefixed with "/".
+        :param \\*args: Optional positional arguments for request.
+        :param \\**kwds: Optional keyword arguments for request.
+        """
+
+        path = self._endpoint + relative_path
+        return getattr(self._session, method)(path, *args, **kwds)
+
     def delete(self, relative_path, *args, **kwds):
         """
         Make DELETE request from relative path.
@@ -83,8 +149,7 @@ class ClientSharedBase(util.Object):
         :param \\**kwds: Optional keyword arguments for request.
         """
 
-        path = self._endpoint + relative_path
-        return self._session.delete(path, *args, **kwds)
+        return self._request('delete', relative_path, *args, **kwds)
 
     def get(self, relative_path, *args, **kwds):
         """
@@ -95,8 +160,7 @@ class ClientSharedBase(util.Object):
         :param \\**kwds: Optional keyword arguments for request.
         """
 
-        path = self._endpoint + relative_path
-        return self._session.get(path, *args, **kwds)
+        return self._request('get', relative_path, *args, **kwds)
 
     def head(self, relative_path, *args, **kwds):
         """
@@ -107,8 +171,7 @@ class ClientSharedBase(util.Object):
         :param \\**kwds: Optional keyword arguments for request.
         """
 
-        path = self._endpoint + relative_path
-        return self._session.head(path, *args, **kwds)
+        return self._request('head', relative_path, *args, **kwds)
 
     def options(self, relative_path, *args, **kwds):
         """
@@ -119,8 +182,7 @@ class ClientSharedBase(util.Object):
         :param \\**kwds: Optional keyword arguments for request.
         """
 
-        path = self._endpoint + relative_path
-        return self._session.options(path, *args, **kwds)
+        return self._request('options', relative_path, *args, **kwds)
 
     def patch(self, relative_path, *args, **kwds):
         """
@@ -131,8 +193,7 @@ class ClientSharedBase(util.Object):
         :param \\**kwds: Optional keyword arguments for request.
         """
 
-        path = self._endpoint + relative_path
-        return self._session.patch(path, *args, **kwds)
+        return self._request('patch', relative_path, *args, **kwds)
 
     def post(self, relative_path, *args, **kwds):
         """
@@ -143,8 +204,7 @@ class ClientSharedBase(util.Object):
         :param \\**kwds: Optional keyword arguments for request.
         """
 
-        path = self._endpoint + relative_path
-        return self._session.post(path, *args, **kwds)
+        return self._request('post', relative_path, *args, **kwds)
 
     def put(self, relative_path, *args, **kwds):
         """
@@ -155,8 +215,7 @@ class ClientSharedBase(util.Object):
         :param \\**kwds: Optional keyword arguments for request.
         """
 
-        path = self._endpoint + relative_path
-        return self._session.put(path, *args, **kwds)
+        return self._request('put', relative_path, *args, **kwds)
 
 
 @util.inherit_doc
@@ -166,12 +225,26 @@ class Client(ClientSharedBase):
 
     :param session: Requests or aiohttp-like HTTP client session.
     :param endpoint: Domain name and port for the endpoint.
+    :param retry: (Optional) retry policy for failed requests.
+    :param circuit_breaker: (Optional) circuit breaker for unhealthy endpoints.
+    :param rate_limiter: (Optional) rate limiter for requests.
+    :param decoder: (Optional) decoder for large list responses.
+    :param metrics: (Optional) request metrics.
     """
 
     _closed: bool
 
-    def __init__(self, session, endpoint) -> None:
-        super().__init__(session, endpoint)
+    def __init__(
+        self,
+        session,
+        endpoint,
+        retry: typing.Optional[RetryPolicy] = None,
+        circuit_breaker: typing.Optional[CircuitBreaker] = None,
+        rate_limiter: typing.Optional[RateLimiter] = None,
+        decoder: typing.Optional[Decoder] = None,
+        metrics: typing.Optional[Metrics] = None,
+    ) -> None:
+        super().__init__(session, endpoint, retry, circuit_breaker, rate_limiter, decoder, metrics)
         self._closed = False
 
     def __enter__(self) -> Client:
@@ -196,11 +269,25 @@ class AsyncClient(ClientSharedBase):
 
     :param session: Requests or aiohttp-like HTTP client session.
     :param endpoint: Domain name and port for the endpoint.
+    :param retry: (Optional) retry policy for failed requests.
+    :param circuit_breaker: (Optional) circuit breaker for unhealthy endpoints.
+    :param rate_limiter: (Optional) rate limiter for requests.
+    :param decoder: (Optional) decoder for large list responses.
+    :param metrics: (Optional) request metrics.
     :param loop: Event loop.
     """
 
-    def __init__(self, session, endpoint) -> None:
-        super().__init__(session, endpoint)
+    def __init__(
+        self,
+        session,
+        endpoint,
+        retry: typing.Optional[RetryPolicy] = None,
+        circuit_breaker: typing.Optional[CircuitBreaker] = None,
+        rate_limiter: typing.Optional[RateLimiter] = None,
+        decoder: typing.Optional[Decoder] = None,
+        metrics: typing.Optional[Metrics] = None,
+    ) -> None:
+        super().__init__(session, endpoint, retry, circuit_breaker, rate_limiter, decoder, metrics)
 
     def __enter__(self) -> AsyncClient:
         raise TypeError("Only use async with.")
@@ -0,0 +1,155 @@
+"""
+    codec
+    =====
+
+    Pluggable JSON codec for REST responses and websocket messages.
+
+    The fastest installed backend is used by default, preferring orjson,
+    then ujson, then the standard library. Responses are decoded directly
+    from the raw response body, without first decoding it to text.
+
+    Example:
+        .. code-block:: python
+
+           >>> from xpxchain.client import codec
+           >>> codec.get_codec().name
+           'orjson'
+           >>> codec.set_codec('json')
+
+    License
+    -------
+
+    Copyright 2019 NEM
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import annotations
+import importlib
+import json
+import typing
+
+__all__ = [
+    'Codec',
+    'available_codecs',
+    'get_codec',
+    'set_codec',
+]
+
+Data = typing.Union[bytes, str]
+
+# Backends, in order of preference.
+BACKENDS = ('orjson', 'ujson', 'json')
+
+
+class Codec(typing.NamedTuple):
+    """JSON backend to decode and encode messages."""
+
+    name: str
+    loads: typing.Callable[[Data], typing.Any]
+    dumps: typing.Callable[[typing.Any], str]
+
+
+def orjson_codec() -> Codec:
+    """Create codec using orjson, which only encodes to bytes."""
+
+    orjson = importlib.import_module('orjson')
+    encode = orjson.dumps   # type: ignore
+
+    def dumps(obj: typing.Any) -> str:
+        return typing.cast(str, encode(obj).decode('utf-8'))
+
+    return Codec('orjson', orjson.loads, dumps)   # type: ignore
+
+
+def ujson_codec() -> Codec:
+    """Create codec using ujson."""
+
+    ujson = importlib.import_module('ujson')
+    return Codec('ujson', ujson.loads, ujson.dumps)   # type: ignore
+
+
+def json_codec() -> Codec:
+    """Create codec using the standard library."""
+    return Codec('json', json.loads, json.dumps)
+
+
+FACTORIES: typing.Dict[str, typing.Callable[[], Codec]] = {
+    'orjson': orjson_codec,
+    'ujson': ujson_codec,
+    'json': json_codec,
+}
+
+
+def load_codec(name: str) -> Codec:
+    """
+    Create codec for a backend by name.
+
+    :param name: Name of the JSON backend.
+    :raises ImportError: Backend is not installed.
+    """
+
+    try:
+        factory = FACTORIES[name]
+    except KeyError:
+        raise ValueError(f'Unknown JSON backend "{name}".')
+    return factory()
+
+
+def available_codecs() -> typing.List[str]:
+    """Get the names of the installed backends, in order of preference."""
+
+    names = []
+    for name in BACKENDS:
+        try:
+            load_codec(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def default_codec() -> Codec:
+    """Create codec for the fastest installed backend."""
+    return load_codec(available_codecs()[0])
+
+
+CODEC: Codec = default_codec()
+
+
+def get_codec() -> Codec:
+    """Get the codec used for all clients."""
+    return CODEC
+
+
+def set_codec(codec: typing.Union[str, Codec]) -> None:
+    """
+    Set the codec used for all clients.
+
+    :param codec: Codec, or name of the JSON backend.
+    """
+
+    global CODEC
+    if isinstance(codec, str):
+        codec = load_codec(codec)
+    CODEC = codec
+
+
+def loads(data: Data) -> typing.Any:
+    """Decode JSON from bytes or text."""
+    return CODEC.loads(data)
+
+
+def dumps(obj: typing.Any) -> str:
+    """Encode object to JSON text."""
+    return CODEC.dumps(obj)
@@ -0,0 +1,375 @@
+"""
+    confirmation
+    ============
+
+    Track the confirmation of many announced transactions at once.
+
+    Registered hashes are polled in batches through the bulk
+    "/transaction/statuses" endpoint, rather than one request per hash.
+    The poll interval starts short, backs off while no transaction
+    changes state, and resets once transactions resolve or new hashes
+    are registered. Listener messages on the `confirmed` and `status`
+    channels resolve transactions immediately, without waiting for
+    the next poll.
+
+    Each registered hash returns a future, resolved with the final
+    `TransactionStatus` (confirmed, failed or expired), or with the
+    `TransactionStatusError` received from a listener.
+
+    Example:
+        .. code-block:: python
+
+           >>> from xpxchain import client
+           >>> async with client.AsyncTransactionHTTP(endpoint) as http:
+           ...     async with client.ConfirmationTracker(http) as tracker:
+           ...         futures = [tracker.track(i.hash, deadline) for i in signed]
+           ...         statuses = await asyncio.gather(*futures)
+
+    License
+    -------
+
+    Copyright 2019 NEM
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import annotations
+import asyncio
+import datetime
+import logging
+import typing
+
+from . import lazy
+from .. import models
+from .. import util
+
+__all__ = ['ConfirmationTracker']
+
+DEFAULT_MIN_INTERVAL = 1.0
+DEFAULT_MAX_INTERVAL = 15.0
+DEFAULT_BACKOFF = 2.0
+DEFAULT_BATCH_SIZE = 100
+# Seconds past the deadline before an unconfirmed transaction expires.
+DEFAULT_GRACE = 30.0
+# Status reported by nodes for transactions announced past their deadline.
+DEADLINE_EXPIRED = 'Failure_Core_Past_Deadline'
+
+FINAL_GROUPS = frozenset({
+    models.TransactionStatusGroup.CONFIRMED,
+    models.TransactionStatusGroup.FAILED,
+})
+
+Result = typing.Union[models.TransactionStatus, models.TransactionStatusError]
+Hashes = typing.Iterable[typing.Union[str, models.SignedTransaction]]
+
+
+def hash_key(transaction: typing.Union[str, models.SignedTransaction]) -> str:
+    if isinstance(transaction, models.SignedTransaction):
+        transaction = transaction.hash
+    return transaction.upper()
+
+
+class ConfirmationTracker(util.Object):
+    """
+    Resolve futures for announced transactions once they reach a final state.
+
+    :param http: Asynchronous transaction HTTP client.
+    :param min_interval: (Optional) minimum seconds between polls.
+    :param max_interval: (Optional) maximum seconds between polls.
+    :param backoff: (Optional) interval multiplier after polls resolving nothing.
+    :param batch_size: (Optional) maximum number of hashes per request.
+    :param grace: (Optional) seconds past the deadline before transactions expire.
+    :param loop: (Optional) Event loop to schedule polls on.
+    """
+
+    polls: int
+    requests: int
+    errors: int
+    interval: float
+    last_error: typing.Optional[Exception]
+    _http: typing.Any
+    _min_interval: float
+    _max_interval: float
+    _backoff: float
+    _batch_size: int
+    _grace: datetime.timedelta
+    _loop: util.OptionalLoopType
+    _futures: typing.Dict[str, asyncio.Future]
+    _deadlines: typing.Dict[str, typing.Optional[models.Deadline]]
+    _wakeup: typing.Optional[asyncio.Event]
+    _task: typing.Optional[asyncio.Future]
+
+    def __init__(
+        self,
+        http,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+        backoff: float = DEFAULT_BACKOFF,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        grace: float = DEFAULT_GRACE,
+        loop: util.OptionalLoopType = None,
+    ) -> None:
+        if min_interval > max_interval:
+            raise ValueError('Minimum interval must not exceed the maximum interval.')
+        self.polls = 0
+        self.requests = 0
+        self.errors = 0
+        self.interval = min_interval
+        self.last_error = None
+        self._http = http
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._backoff = backoff
+        self._batch_size = batch_size
+        self._grace = datetime.timedelta(seconds=grace)
+        self._loop = loop
+        self._futures = {}
+        self._deadlines = {}
+        self._wakeup = None
+        self._task = None
+
+    async def __aenter__(self) -> ConfirmationTracker:
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Get the event loop for the tracker."""
+        return self._loop or asyncio.get_event_loop()
+
+    @property
+    def pending(self) -> int:
+        """Get the number of unresolved transactions."""
+        return len(self._futures)
+
+    def track(
+        self,
+        transaction: typing.Union[str, models.SignedTransaction],
+        deadline: typing.Optional[models.Deadline] = None,
+    ) -> asyncio.Future:
+        """
+        Register a transaction, and get a future for its final state.
+
+        Tracking the same hash twice returns the same future. Without
+        a deadline, unknown transactions are polled until the tracker closes.
+
+        :param transaction: Transaction hash or signed transaction.
+        :param deadline: (Optional) transaction deadline.
+        """
+
+        key = hash_key(transaction)
+        future = self._futures.get(key)
+        if future is None:
+            future = self.loop.create_future()
+            self._futures[key] = future
+            self._deadlines[key] = deadline
+            if self._wakeup is not None:
+                self._wakeup.set()
+        return future
+
+    async def wait(
+        self,
+        transactions: Hashes,
+        timeout: typing.Optional[float] = None,
+    ) -> typing.List[Result]:
+        """
+        Track transactions, and wait for all of them to reach a final state.
+
+        :param transactions: Transaction hashes or signed transactions.
+        :param timeout: (Optional) seconds to wait for.
+        """
+
+        # Unlike `asyncio.wait_for`, a timeout does not cancel the futures,
+        # so the transactions stay tracked.
+        futures = [self.track(i) for i in transactions]
+        if futures:
+            _, pending = await asyncio.wait(futures, timeout=timeout)
+            if pending:
+                raise asyncio.TimeoutError
+        return [i.result() for i in futures]
+
+    def feed(self, message) -> bool:
+        """
+        Resolve a transaction from a listener message.
+
+        Returns if a tracked transaction was resolved.
+
+        :param message: Message from a listener.
+        """
+
+        # Lazy models are only decoded for status errors.
+        value = message.message
+        kind = lazy.model_type(value)
+        result: Result
+        if issubclass(kind, models.TransactionStatusError):
+            hash = value.hash
+            result = lazy.materialize(value)
+        elif issubclass(kind, models.Transaction) and message.channel_name == 'confirmedAdded':
+            info = value.transaction_info
+            hash = getattr(info, 'hash', None)
+            if hash is None:
+                return False
+            result = models.TransactionStatus(
+                group=models.TransactionStatusGroup.CONFIRMED,
+                status='Success',
+                hash=hash,
+                deadline=value.deadline,
+                height=info.height,
+            )
+        else:
+            return False
+        return self._resolve(hash.upper(), result)
+
+    async def consume(
+        self,
+        listener,
+        addresses: typing.Iterable[models.Address] = (),
+    ) -> None:
+        """
+        Resolve transactions from listener messages until the listener closes.
+
+        :param listener: Listener, inside its `async with` block.
+        :param addresses: (Optional) signer addresses to subscribe to.
+        """
+
+        for address in addresses:
+            await listener.confirmed(address)
+            await listener.status(address)
+        async for message in listener:
+            self.feed(message)
+
+    def start(self) -> None:
+        """Start polling in the background."""
+
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.ensure_future(self._run(), loop=self._loop)
+
+    async def close(self) -> None:
+        """Stop polling, and cancel the futures for unresolved transactions."""
+
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._wakeup = None
+        for future in self._futures.values():
+            future.cancel()
+        self._futures.clear()
+        self._deadlines.clear()
+
+    async def poll(self) -> int:
+        """
+        Poll the status of all unresolved transactions once.
+
+        Returns the number of resolved transactions.
+        """
+
+        # Stop tracking transactions whose futures were cancelled.
+        for key in [k for k, v in self._futures.items() if v.done()]:
+            self._resolve(key, None)
+        hashes = list(self._futures)
+        resolved = 0
+        for index in range(0, len(hashes), self._batch_size):
+            batch = hashes[index:index + self._batch_size]
+            statuses = await self._http.get_transaction_statuses(batch)
+            self.requests += 1
+            for status in statuses:
+                if status.group in FINAL_GROUPS:
+                    resolved += self._resolve(status.hash.upper(), status)
+
+            # Only expire transactions once the node confirmed they are
+            # still unresolved, so a slow poll cannot expire them early.
+            resolved += self._expire(batch)
+        self.polls += 1
+        return resolved
+
+    def _expire(self, batch: typing.Sequence[str]) -> int:
+        """Fail unresolved transactions past their deadline and grace period."""
+
+        limit = datetime.datetime.now() - self._grace
+        expired = 0
+        for key in batch:
+            deadline = self._deadlines.get(key)
+            if key in self._futures and deadline is not None and deadline.deadline < limit:
+                expired += self._resolve(key, models.TransactionStatus(
+                    group=models.TransactionStatusGroup.FAILED,
+                    status=DEADLINE_EXPIRED,
+                    hash=key,
+                    deadline=deadline,
+                    height=0,
+                ))
+        return expired
+
+    def _resolve(self, key: str, result: typing.Optional[Result]) -> bool:
+        """Resolve the future for a tracked transaction."""
+
+        future = self._futures.pop(key, None)
+        self._deadlines.pop(key, None)
+        if future is None:
+            return False
+        if not future.done():
+            future.set_result(result)
+        return True
+
+    async def _run(self) -> None:
+        """Poll unresolved transactions, adapting the interval to activity."""
+
+        wakeup = typing.cast(asyncio.Event, self._wakeup)
+        while True:
+            wakeup.clear()
+            if not self._futures:
+                self.interval = self._min_interval
+                await wakeup.wait()
+                continue
+
+            if await self._poll_safely():
+                self.interval = self._min_interval
+            else:
+                self.interval = min(self.interval * self._backoff, self._max_interval)
+            await self._wait(wakeup)
+
+    async def _poll_safely(self) -> int:
+        """Poll once, returning the number of resolved transactions, or 0 on error."""
+
+        try:
+            return await self.poll()
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            # Keep tracking through node errors, backing off the interval.
+            self.errors += 1
+            self.last_error = exc
+            logging.getLogger('xpxchain.client').debug('Confirmation poll failed: %r', exc)
+            return 0
+
+    async def _wait(self, wakeup: asyncio.Event) -> None:
+        """Wait for the next poll."""
+
+        # New registrations are polled after the minimum interval,
+        # otherwise wait for the full, backed-off interval.
+        await asyncio.sleep(self._min_interval)
+        if wakeup.is_set():
+            self.interval = self._min_interval
+        remaining = self.interval - self._min_interval
+        if remaining > 0 and not wakeup.is_set():
+            try:
+                await asyncio.wait_for(wakeup.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
@@ -27,13 +27,27 @@
 
 from __future__ import annotations
 import aiohttp
+import collections
 import requests
 import websockets
 import typing
 
 from . import abc
+from . import batching
+from . import chunking
 from . import client
+from . import pool
+from .bootstrap import BootstrapCache
+from .cache import ResponseCache
+from .cassette import Cassette
+from .metrics import Metrics
+from .ratelimit import RateLimiter
+from .reconnect import ListenerRecovery, ReconnectPolicy
+from .retry import CircuitBreaker, RetryPolicy
+from .sessions import SessionRegistry
+from .singleflight import SingleFlight
 from .. import util
+from ..parallel import Decoder
 from ..models.blockchain.network_type import NetworkType
 
 __all__ = [
@@ -49,6 +63,7 @@ __all__ = [
     'NamespaceHTTP',
     'NetworkHTTP',
     'TransactionHTTP',
+    'NodePool',
 
     # Asynchronous
     'AsyncHTTP',
@@ -62,6 +77,7 @@ __all__ = [
     'AsyncNamespaceHTTP',
     'AsyncNetworkHTTP',
     'AsyncTransactionHTTP',
+    'AsyncNodePool',
 
     # Websockets
     'Listener',
@@ -76,25 +92,109 @@ __all__ = [
 HTTPError = requests.HTTPError
 AsyncHTTPError = aiohttp.ClientResponseError
 
+# HELPERS
+
+
+def preload_network_type(
+    bootstrap: typing.Optional[BootstrapCache],
+    endpoint: str,
+) -> typing.Optional[NetworkType]:
+    """Get the cached network type for an endpoint, if present."""
+
+    if bootstrap is None:
+        return None
+    info = bootstrap.get(endpoint)
+    return info.network_type if info is not None else None
+
+
 # SYNCHRONOUS
 
 
 @util.inherit_doc
 class HTTPBase(abc.HTTPBase):
-    """Abstract base class for synchronous HTTP clients."""
+    """
+    Abstract base class for synchronous HTTP clients.
+
+    :param endpoint: Domain name and port for the endpoint.
+    :param network_type: (Optional) network type for the endpoint.
+    :param cache: (Optional) cache for immutable responses.
+    :param chunk_size: (Optional) maximum items per bulk request, None to disable chunking.
+    :param chunk_concurrency: (Optional) maximum number of concurrent chunk requests.
+    :param retry: (Optional) retry policy for failed requests.
+    :param circuit_breaker: (Optional) circuit breaker for unhealthy endpoints.
+    :param rate_limit: (Optional) maximum requests per second, None to disable.
+    :param burst: (Optional) maximum requests sent at once under the rate limit.
+    :param max_in_flight: (Optional) maximum concurrent requests, None to disable.
+    :param decoder: (Optional) decoder for large list responses, such as a process pool.
+    :param metrics: (Optional) per-endpoint request metrics.
+    :param sessions: (Optional) registry to share sessions and connections across clients.
+    :param bootstrap: (Optional) persisted cache to preload the network type from.
+    :param cassette: (Optional) cassette to record or replay requests with.
+    """
+
+    _sessions: typing.Optional[SessionRegistry] = None
+    _cassette: typing.Optional[Cassette] = None
 
-    def __init__(self, endpoint: str, network_type: typing.Optional[NetworkType] = None) -> None:
+    def __init__(
+        self,
+        endpoint: str,
+        network_type: typing.Optional[NetworkType] = None,
+        cache: typing.Optional[ResponseCache] = None,
+        chunk_size: typing.Optional[int] = None,
+        chunk_concurrency: int = chunking.DEFAULT_CONCURRENCY,
+        retry: typing.Optional[RetryPolicy] = None,
+        circuit_breaker: typing.Optional[CircuitBreaker] = None,
+        rate_limit: typing.Optional[float] = None,
+        burst: typing.Optional[float] = None,
+        max_in_flight: typing.Optional[int] = None,
+        decoder: typing.Optional[Decoder] = None,
+        metrics: typing.Optional[Metrics] = None,
+        sessions: typing.Optional[SessionRegistry] = None,
+        bootstrap: typing.Optional[BootstrapCache] = None,
+        cassette: typing.Optional[Cassette] = None,
+    ) -> None:
         self._endpoint = endpoint
         self._index = 0
-        self._network_type = network_type
+        self._network_type = network_type or preload_network_type(bootstrap, endpoint)
+        self._cache = cache
+        self._chunker = None
+        if chunk_size is not None:
+            self._chunker = chunking.Chunker(chunk_size, chunk_concurrency)
+        self._retry = retry
+        self._circuit_breaker = circuit_breaker
+        self._rate_limiter = None
+        if rate_limit is not None or max_in_flight is not None:
+            self._rate_limiter = RateLimiter(rate_limit, burst, max_in_flight)
+        self._decoder = decoder
+        self._metrics = metrics
+        self._sessions = sessions
+        self._cassette = cassette
 
     def __enter__(self) -> HTTPBase:
-        self._client = client.Client(requests.Session(), self._endpoint)
+        self._client = client.Client(
+            self._new_session(),
+            self._endpoint,
+            self._retry,
+            self._circuit_breaker,
+            self._rate_limiter,
+            self._decoder,
+            self._metrics,
+        )
         return self
 
     def __exit__(self, exc_type, exc, tb) -> None:
         self.close()
 
+    def _new_session(self):
+        if self._cassette is not None:
+            return self._cassette.session(self._shared_session)
+        return self._shared_session()
+
+    def _shared_session(self):
+        if self._sessions is None:
+            return requests.Session()
+        return self._sessions.session(self._endpoint)
+
     @property
     def root(self) -> HTTP:
         return HTTP.create_from_http(self)
@@ -145,6 +245,53 @@ class HTTP(HTTPBase, abc.HTTP):
         return TransactionHTTP.create_from_http(self)
 
 
+@util.inherit_doc
+class NodePool(HTTP):
+    """
+    Main client for the synchronous NIS API, routing across many nodes.
+
+    Each request is sent to the healthiest node, as scored by the
+    latency and error rate of previous requests. Sub-clients share
+    the pool and the health statistics.
+
+    :param endpoints: Domain names and ports for the nodes.
+    :param network_type: (Optional) network type shared by the nodes.
+    :param cooldown: (Optional) seconds to skip a failing node for.
+    :param max_failures: (Optional) consecutive failures before skipping a node.
+    :param \\**kwds: Optional keyword arguments for `HTTP`.
+    """
+
+    _nodes: pool.NodeSet
+
+    def __init__(
+        self,
+        endpoints: typing.Sequence[str],
+        network_type: typing.Optional[NetworkType] = None,
+        cooldown: float = pool.DEFAULT_COOLDOWN,
+        max_failures: int = pool.DEFAULT_MAX_FAILURES,
+        **kwds
+    ) -> None:
+        self._nodes = pool.NodeSet(endpoints, cooldown, max_failures)
+        super().__init__(self._nodes.nodes[0].endpoint, network_type, **kwds)
+
+    def __enter__(self) -> NodePool:
+        self._client = pool.PooledClient(
+            self._new_session(),
+            self._nodes,
+            self._retry,
+            self._circuit_breaker,
+            self._rate_limiter,
+            self._decoder,
+            self._metrics,
+        )
+        return self
+
+    @property
+    def nodes(self) -> typing.Sequence[pool.NodeHealth]:
+        """Get health statistics for all nodes."""
+        return self._nodes.nodes
+
+
 @util.inherit_doc
 class AccountHTTP(HTTPBase, abc.AccountHTTP):
     """Account client for the synchronous NIS API."""
@@ -200,22 +347,92 @@ class TransactionHTTP(HTTPBase, abc.TransactionHTTP):
 
 @util.inherit_doc
 class AsyncHTTPBase(abc.AsyncHTTPBase):
-    """Abstract base class for synchronous HTTP clients."""
+    """
+    Abstract base class for asynchronous HTTP clients.
+
+    :param endpoint: Domain name and port for the endpoint.
+    :param loop: (Optional) Event loop for the client.
+    :param network_type: (Optional) network type for the endpoint.
+    :param cache: (Optional) cache for immutable responses.
+    :param coalesce: (Optional) share identical, concurrent requests.
+    :param batch_window: (Optional) seconds to batch single-item lookups for, None to disable.
+    :param max_batch_size: (Optional) maximum number of items per batched request.
+    :param chunk_size: (Optional) maximum items per bulk request, None to disable chunking.
+    :param chunk_concurrency: (Optional) maximum number of concurrent chunk requests.
+    :param retry: (Optional) retry policy for failed requests.
+    :param circuit_breaker: (Optional) circuit breaker for unhealthy endpoints.
+    :param rate_limit: (Optional) maximum requests per second, None to disable.
+    :param burst: (Optional) maximum requests sent at once under the rate limit.
+    :param max_in_flight: (Optional) maximum concurrent requests, None to disable.
+    :param decoder: (Optional) decoder for large list responses, such as a process pool.
+    :param metrics: (Optional) per-endpoint request metrics.
+    :param sessions: (Optional) registry to share sessions and connections across clients.
+    :param bootstrap: (Optional) persisted cache to preload the network type from.
+    :param cassette: (Optional) cassette to record or replay requests with.
+    """
 
     def __init__(
         self,
         endpoint: str,
         loop: util.OptionalLoopType = None,
         network_type: typing.Optional[NetworkType] = None,
+        cache: typing.Optional[ResponseCache] = None,
+        coalesce: bool = False,
+        batch_window: typing.Optional[float] = None,
+        max_batch_size: int = batching.DEFAULT_MAX_SIZE,
+        chunk_size: typing.Optional[int] = None,
+        chunk_concurrency: int = chunking.DEFAULT_CONCURRENCY,
+        retry: typing.Optional[RetryPolicy] = None,
+        circuit_breaker: typing.Optional[CircuitBreaker] = None,
+        rate_limit: typing.Optional[float] = None,
+        burst: typing.Optional[float] = None,
+        max_in_flight: typing.Optional[int] = None,
+        decoder: typing.Optional[Decoder] = None,
+        metrics: typing.Optional[Metrics] = None,
+        sessions: typing.Optional[SessionRegistry] = None,
+        bootstrap: typing.Optional[BootstrapCache] = None,
+        cassette: typing.Optional[Cassette] = None,
     ) -> None:
         self._endpoint = endpoint
         self._index = 1
         self._loop = loop
-        self._session = aiohttp.ClientSession(loop=loop)
-        self._network_type = network_type
+
+        def new_session():
+            if sessions is None:
+                return aiohttp.ClientSession(loop=loop)
+            return sessions.async_session(endpoint, loop)
+
+        if cassette is None:
+            self._session = new_session()
+        else:
+            self._session = cassette.async_session(new_session)
+        self._network_type = network_type or preload_network_type(bootstrap, endpoint)
+        self._cache = cache
+        self._single_flight = SingleFlight(loop) if coalesce else None
+        self._batcher = None
+        if batch_window is not None:
+            self._batcher = batching.Batcher(batch_window, max_batch_size, loop=loop)
+        self._chunker = None
+        if chunk_size is not None:
+            self._chunker = chunking.Chunker(chunk_size, chunk_concurrency)
+        self._retry = retry
+        self._circuit_breaker = circuit_breaker
+        self._rate_limiter = None
+        if rate_limit is not None or max_in_flight is not None:
+            self._rate_limiter = RateLimiter(rate_limit, burst, max_in_flight)
+        self._decoder = decoder
+        self._metrics = metrics
 
     async def __aenter__(self) -> AsyncHTTPBase:
-        self._client = client.AsyncClient(self._session, self._endpoint)
+        self._client = client.AsyncClient(
+            self._session,
+            self._endpoint,
+            self._retry,
+            self._circuit_breaker,
+            self._rate_limiter,
+            self._decoder,
+            self._metrics,
+        )
         return self
 
     async def __aexit__(self, exc_type, exc, tb) -> None:
@@ -271,6 +488,55 @@ class AsyncHTTP(AsyncHTTPBase, abc.HTTP):
         return AsyncTransactionHTTP.create_from_http(self)
 
 
+@util.inherit_doc
+class AsyncNodePool(AsyncHTTP):
+    """
+    Main client for the asynchronous NIS API, routing across many nodes.
+
+    Each request is sent to the healthiest node, as scored by the
+    latency and error rate of previous requests. Sub-clients share
+    the pool and the health statistics.
+
+    :param endpoints: Domain names and ports for the nodes.
+    :param loop: (Optional) Event loop for the client.
+    :param network_type: (Optional) network type shared by the nodes.
+    :param cooldown: (Optional) seconds to skip a failing node for.
+    :param max_failures: (Optional) consecutive failures before skipping a node.
+    :param \\**kwds: Optional keyword arguments for `AsyncHTTP`.
+    """
+
+    _nodes: pool.NodeSet
+
+    def __init__(
+        self,
+        endpoints: typing.Sequence[str],
+        loop: util.OptionalLoopType = None,
+        network_type: typing.Optional[NetworkType] = None,
+        cooldown: float = pool.DEFAULT_COOLDOWN,
+        max_failures: int = pool.DEFAULT_MAX_FAILURES,
+        **kwds
+    ) -> None:
+        self._nodes = pool.NodeSet(endpoints, cooldown, max_failures)
+        super().__init__(self._nodes.nodes[0].endpoint, loop, network_type, **kwds)
+
+    async def __aenter__(self) -> AsyncNodePool:
+        self._client = pool.AsyncPooledClient(
+            self._session,
+            self._nodes,
+            self._retry,
+            self._circuit_breaker,
+            self._rate_limiter,
+            self._decoder,
+            self._metrics,
+        )
+        return self
+
+    @property
+    def nodes(self) -> typing.Sequence[pool.NodeHealth]:
+        """Get health statistics for all nodes."""
+        return self._nodes.nodes
+
+
 @util.inherit_doc
 class AsyncAccountHTTP(AsyncHTTPBase, abc.AccountHTTP):
     """Account client for the asynchronous NIS API."""
@@ -326,24 +592,87 @@ class AsyncTransactionHTTP(AsyncHTTPBase, abc.TransactionHTTP):
 
 @util.inherit_doc
 class Listener(abc.Listener):
-    """Asynchronous websockets-based listener."""
+    """
+    Asynchronous websockets-based listener.
+
+    With a reconnection policy, dropped connections are reopened,
+    subscriptions replayed, and missed blocks and confirmed transactions
+    backfilled over HTTP, from `http` or a client for the same host.
+
+    Lazy listeners deliver lazy models, so the hash, height and deadline
+    are read without decoding the model, except for channels in
+    `full_channels`. Messages received and models decoded are counted
+    per channel, in `received` and `decoded`.
+
+    :param endpoint: Domain name and port for the endpoint.
+    :param loop: (Optional) Event loop for the listener.
+    :param network_type: (Optional) network type for the endpoint.
+    :param cassette: (Optional) cassette to record or replay messages with.
+    :param reconnect: (Optional) policy to reconnect dropped connections.
+    :param http: (Optional) asynchronous blockchain client to backfill missed messages.
+    :param lazy: (Optional) deliver lazy models, only decoded when first required.
+    :param full_channels: (Optional) channel names always decoded by lazy listeners.
+    """
+
+    _owns_http: bool = False
 
     def __init__(
         self,
         endpoint: str,
         loop: util.OptionalLoopType = None,
         network_type: typing.Optional[NetworkType] = None,
+        cassette: typing.Optional[Cassette] = None,
+        reconnect: typing.Optional[ReconnectPolicy] = None,
+        http: typing.Optional[AsyncBlockchainHTTP] = None,
+        lazy: bool = False,
+        full_channels: typing.Iterable[str] = (),
     ) -> None:
         url = client.parse_ws_url(endpoint)
         self._loop = loop
-        self._conn = websockets.connect(url.url, loop=loop)
+        if cassette is None:
+            self._connect = lambda: websockets.connect(url.url, loop=loop)
+        else:
+            self._connect = lambda: cassette.connect(url.url, lambda: websockets.connect(url.url, loop=loop))
+        self._conn = self._connect()
         self._network_type = network_type
+        self._channels = {}
+        self._backlog = collections.deque()
+        self._lazy = lazy
+        # Messages only carry the channel name, without the address.
+        self._full_channels = frozenset(i.partition('/')[0] for i in full_channels)
+        self.received = collections.Counter()
+        self.decoded = collections.Counter()
+        if reconnect is not None and reconnect.backfill and http is None:
+            scheme = 'https' if url.scheme == 'wss' else 'http'
+            http_url = url._replace(scheme=scheme, path=None, query=None, fragment=None)
+            http = AsyncBlockchainHTTP(http_url.url, loop=loop, network_type=network_type)
+            self._owns_http = True
+        self._http = http
+        if reconnect is not None:
+            self._recovery = ListenerRecovery(reconnect, http)
 
     async def __aenter__(self) -> Listener:
-        self._session = await self._conn.__aenter__()
-        self._client = client.WebsocketClient(self._session)
-        self._iter_ = self._client.__aiter__()
+        await self._open()
+        if self._owns_http:
+            await typing.cast(AsyncBlockchainHTTP, self._http).__aenter__()
+        if self._recovery is not None:
+            await self._recovery.start()
         return self
 
     async def __aexit__(self, exc_type, exc, tb) -> None:
         await self._conn.__aexit__(None, None, None)
+        if self._owns_http:
+            await typing.cast(AsyncBlockchainHTTP, self._http).__aexit__(None, None, None)
+
+    async def _open(self) -> None:
+        self._session = await self._conn.__aenter__()
+        self._client = client.WebsocketClient(self._session)
+        self._iter_ = self._client.__aiter__()
+
+    async def _reopen(self) -> None:
+        try:
+            await self._conn.__aexit__(None, None, None)
+        except typing.cast(ListenerRecovery, self._recovery).policy.exceptions:
+            pass
+        self._conn = self._connect()
+        await self._open()
@@ -0,0 +1,441 @@
+"""
+    hub
+    ===
+
+    Fan-out of a single websockets listener to many consumers.
+
+    A hub owns one listener connection, and hands out consumers, each
+    with their own subscriptions and a bounded queue. Subscriptions are
+    reference-counted across consumers, so each channel is subscribed to
+    once on the connection, and unsubscribed from when its last consumer
+    leaves. Each message is routed only to the consumers subscribed to
+    its channel.
+
+    When a consumer falls behind and its queue is full, its overflow
+    policy applies:
+
+        block: wait for room in the queue, which delays every consumer.
+        drop-oldest: discard the oldest queued message.
+        drop-newest: discard the new message.
+
+    Example:
+        .. code-block:: python
+
+           >>> from xpxchain import client
+           >>> async with client.ListenerHub(client.Listener(endpoint)) as hub:
+           ...     async with hub.consumer(maxsize=100, overflow='drop-oldest') as blocks:
+           ...         await blocks.new_block()
+           ...         async for message in blocks:
+           ...             print(message.message.height)
+           >>> hub.depths
+
+    License
+    -------
+
+    Copyright 2019 NEM
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import annotations
+import asyncio
+import itertools
+import typing
+
+from . import abc
+from . import lazy
+from . import reconnect
+from .. import models
+from .. import util
+
+__all__ = [
+    'HubConsumer',
+    'ListenerHub',
+]
+
+DEFAULT_MAXSIZE = 1000
+DEFAULT_OVERFLOW = 'block'
+OVERFLOW_POLICIES = frozenset({'block', 'drop-oldest', 'drop-newest'})
+
+# Marks the end of the stream in consumer queues.
+END = object()
+
+Consumers = typing.Set['HubConsumer']
+
+
+def split_channel(channel: str) -> typing.Tuple[str, str]:
+    """Split a channel into its name and address, empty for global channels."""
+
+    name, _, address = channel.partition('/')
+    return name, address
+
+
+def message_addresses(message: abc.ListenerMessage) -> typing.Optional[typing.Set[str]]:
+    """Get the addresses a message is for, or None if unknown."""
+
+    value = message.message
+    kind = lazy.model_type(value)
+    if issubclass(kind, models.Transaction):
+        if isinstance(value, lazy.LazyModel) and not value.materialized:
+            # Never decode the whole model just to route the message.
+            return reconnect.transaction_dto_addresses(value.dto)
+        return reconnect.transaction_addresses(lazy.materialize(value))
+    elif issubclass(kind, models.TransactionStatusError):
+        return {value.address.address}
+    return None
+
+
+class HubConsumer(abc.ListenerChannels):
+    """
+    Consumer of a listener hub, with its own subscriptions and queue.
+
+    :param hub: Listener hub delivering the messages.
+    :param index: Position of the consumer, which receives messages in this order.
+    :param name: Name of the consumer, for metrics.
+    :param maxsize: Maximum number of queued messages.
+    :param overflow: Policy when the queue is full.
+    """
+
+    name: str
+    delivered: int
+    dropped: int
+    max_depth: int
+    _hub: ListenerHub
+    _index: int
+    _queue: asyncio.Queue
+    _maxsize: int
+    _space: asyncio.Event
+    _overflow: str
+    _channels: typing.Dict[str, None]
+    _done: bool
+    _error: typing.Optional[BaseException]
+
+    def __init__(
+        self,
+        hub: ListenerHub,
+        index: int,
+        name: str,
+        maxsize: int,
+        overflow: str,
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError('Consumer queues must hold at least one message.')
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f'Unknown overflow policy {overflow!r}.')
+        self.name = name
+        self.delivered = 0
+        self.dropped = 0
+        self.max_depth = 0
+        self._hub = hub
+        self._index = index
+        # The queue is bounded by the overflow policy instead, so the end
+        # marker always fits.
+        self._queue = asyncio.Queue()
+        self._maxsize = maxsize
+        self._space = asyncio.Event()
+        self._overflow = overflow
+        self._channels = {}
+        self._done = False
+        self._error = None
+
+    async def __aenter__(self) -> HubConsumer:
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    def __aiter__(self) -> HubConsumer:
+        return self
+
+    async def __anext__(self) -> abc.ListenerMessage:
+        """Iterate over the messages for the subscribed channels."""
+
+        if self._done and self._queue.empty():
+            return self._end()
+        message = await self._queue.get()
+        self._space.set()
+        if message is END:
+            return self._end()
+        return message
+
+    def _end(self) -> typing.NoReturn:
+        if self._error is not None:
+            raise self._error
+        raise StopAsyncIteration
+
+    @property
+    def channels(self) -> typing.FrozenSet[str]:
+        """Get the subscribed channels."""
+        return frozenset(self._channels)
+
+    @property
+    def depth(self) -> int:
+        """Get the number of queued messages."""
+        return self._queue.qsize()
+
+    @property
+    def maxsize(self) -> int:
+        """Get the maximum number of queued messages."""
+        return self._maxsize
+
+    @property
+    def overflow(self) -> str:
+        """Get the policy when the queue is full."""
+        return self._overflow
+
+    @property
+    def closed(self) -> bool:
+        """Get if the consumer no longer receives messages."""
+        return self._done
+
+    async def subscribe(self, channel: str) -> None:
+        """Subscribe to websockets channel."""
+
+        if channel not in self._channels:
+            self._channels[channel] = None
+            await self._hub._subscribe(self, channel)
+
+    async def unsubscribe(self, channel: str) -> None:
+        """Unsubscribe from websockets channel."""
+
+        if channel in self._channels:
+            del self._channels[channel]
+            await self._hub._unsubscribe(self, channel)
+
+    async def close(self) -> None:
+        """Unsubscribe from all channels, and stop receiving messages."""
+
+        await self._hub._release(self)
+
+    async def _put(self, message: abc.ListenerMessage) -> None:
+        """Queue a message, applying the overflow policy. Internal use only."""
+
+        queue = self._queue
+        if queue.qsize() >= self._maxsize and not self._done:
+            if self._overflow == 'drop-newest':
+                self.dropped += 1
+                return
+            elif self._overflow == 'drop-oldest':
+                queue.get_nowait()
+                self.dropped += 1
+            else:
+                while queue.qsize() >= self._maxsize and not self._done:
+                    self._space.clear()
+                    await self._space.wait()
+        if self._done:
+            return
+        queue.put_nowait(message)
+        self.delivered += 1
+        self.max_depth = max(self.max_depth, queue.qsize())
+
+    def _discard(self) -> None:
+        """Discard all queued messages. Internal use only."""
+
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._space.set()
+
+    def _finish(self, error: typing.Optional[BaseException] = None) -> None:
+        """End the stream of messages. Internal use only."""
+
+        if not self._done:
+            self._done = True
+            self._error = error
+            self._queue.put_nowait(END)
+            self._space.set()
+
+
+class ListenerHub(util.Object):
+    """
+    Share one listener connection between many consumers.
+
+    :param listener: Listener for the connection, entered and exited by the hub.
+    :param maxsize: (Optional) default maximum number of queued messages per consumer.
+    :param overflow: (Optional) default policy when a consumer queue is full.
+    """
+
+    _listener: abc.Listener
+    _maxsize: int
+    _overflow: str
+    _consumers: typing.Dict[str, HubConsumer]
+    _routes: typing.Dict[str, typing.Dict[str, Consumers]]
+    _refcounts: typing.Dict[str, int]
+    _counter: typing.Iterator[int]
+    _task: typing.Optional[asyncio.Future]
+
+    def __init__(
+        self,
+        listener: abc.Listener,
+        maxsize: int = DEFAULT_MAXSIZE,
+        overflow: str = DEFAULT_OVERFLOW,
+    ) -> None:
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f'Unknown overflow policy {overflow!r}.')
+        self._listener = listener
+        self._maxsize = maxsize
+        self._overflow = overflow
+        self._consumers = {}
+        self._routes = {}
+        self._refcounts = {}
+        self._counter = itertools.count()
+        self._task = None
+
+    async def __aenter__(self) -> ListenerHub:
+        await self._listener.__aenter__()
+        # Read the UID first, so subscriptions never wait on the socket
+        # concurrently with the dispatcher.
+        await self._listener.uid
+        self._task = asyncio.ensure_future(self._dispatch())
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Stop dispatching, end every consumer, and close the listener."""
+
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        for consumer in list(self._consumers.values()):
+            consumer._finish()
+        self._consumers.clear()
+        self._routes.clear()
+        self._refcounts.clear()
+        await self._listener.__aexit__(None, None, None)
+
+    @property
+    def listener(self) -> abc.Listener:
+        """Get the shared listener."""
+        return self._listener
+
+    @property
+    def consumers(self) -> typing.Sequence[HubConsumer]:
+        """Get the active consumers."""
+        return list(self._consumers.values())
+
+    @property
+    def channels(self) -> typing.Dict[str, int]:
+        """Get the number of consumers subscribed to each channel."""
+        return dict(self._refcounts)
+
+    @property
+    def depths(self) -> typing.Dict[str, int]:
+        """Get the number of queued messages for each consumer."""
+        return {name: consumer.depth for name, consumer in self._consumers.items()}
+
+    def consumer(
+        self,
+        name: typing.Optional[str] = None,
+        maxsize: typing.Optional[int] = None,
+        overflow: typing.Optional[str] = None,
+    ) -> HubConsumer:
+        """
+        Create a consumer, with its own subscriptions and queue.
+
+        :param name: (Optional) unique name of the consumer, for metrics.
+        :param maxsize: (Optional) maximum number of queued messages.
+        :param overflow: (Optional) policy when the queue is full.
+        """
+
+        index = next(self._counter)
+        if name is None:
+            name = f'consumer-{index}'
+        if name in self._consumers:
+            raise ValueError(f'Duplicate consumer name {name!r}.')
+        consumer = HubConsumer(
+            self,
+            index,
+            name,
+            self._maxsize if maxsize is None else maxsize,
+            self._overflow if overflow is None else overflow,
+        )
+        self._consumers[name] = consumer
+        return consumer
+
+    async def _subscribe(self, consumer: HubConsumer, channel: str) -> None:
+        name, address = split_channel(channel)
+        self._routes.setdefault(name, {}).setdefault(address, set()).add(consumer)
+        count = self._refcounts.get(channel, 0)
+        self._refcounts[channel] = count + 1
+        if count == 0:
+            await self._listener.subscribe(channel)
+
+    async def _unsubscribe(self, consumer: HubConsumer, channel: str) -> None:
+        if channel not in self._refcounts:
+            # Closed hub.
+            return
+        name, address = split_channel(channel)
+        routes = self._routes[name]
+        routes[address].discard(consumer)
+        if not routes[address]:
+            del routes[address]
+            if not routes:
+                del self._routes[name]
+        count = self._refcounts.pop(channel) - 1
+        if count:
+            self._refcounts[channel] = count
+        elif self._task is not None and not self._task.done():
+            # Only unsubscribe while the connection is still dispatching.
+            await self._listener.unsubscribe(channel)
+
+    async def _release(self, consumer: HubConsumer) -> None:
+        if self._consumers.get(consumer.name) is not consumer:
+            return
+        del self._consumers[consumer.name]
+        # Discard queued messages, which also unblocks the dispatcher
+        # if it is waiting for room in the queue.
+        consumer._discard()
+        consumer._finish()
+        for channel in list(consumer._channels):
+            await consumer.unsubscribe(channel)
+
+    def _route(self, message: abc.ListenerMessage) -> typing.List[HubConsumer]:
+        """Get the consumers subscribed to the channel of a message, in order."""
+
+        routes = self._routes.get(message.channel_name)
+        if not routes:
+            return []
+        elif len(routes) == 1:
+            # Every subscriber gets the message, so skip decoding lazy models.
+            return sorted(next(iter(routes.values())), key=lambda x: x._index)
+        matched: Consumers = set()
+        addresses = message_addresses(message)
+        if addresses is not None:
+            matched.update(routes.get('', ()))
+            for address in addresses:
+                matched.update(routes.get(address, ()))
+        if not matched:
+            # The node matches addresses on more than the signer and recipient,
+            # so deliver messages it sent to every subscriber of the channel.
+            matched = set().union(*routes.values())
+        return sorted(matched, key=lambda x: x._index)
+
+    async def _dispatch(self) -> None:
+        try:
+            async for message in self._listener:
+                for consumer in self._route(message):
+                    await consumer._put(message)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            for consumer in list(self._consumers.values()):
+                consumer._finish(exc)
+        else:
+            for consumer in list(self._consumers.values()):
+                consumer._finish()
@@ -0,0 +1,253 @@
+"""
+    lazy
+    ====
+
+    Lazily-decoded models for large list responses.
+
+    Decoding a model validates the data-transfer object, and creates
+    every nested model, such as the public accounts and addresses, even
+    if only a single field is read. Lazy proxies keep the raw DTO, and
+    only create the model when it is first required. Common fields, such
+    as block heights, are read directly from the DTO without creating
+    the model.
+
+    Proxies forward attribute access to the model, but are not instances
+    of the model class: use `materialize` to get the model itself, and
+    `model_type` to check the class of a model or proxy.
+
+    Lazy listeners deliver the same proxies for websockets messages, so
+    consumers that only read the hash or height never decode the model.
+
+    Example:
+        .. code-block:: python
+
+           >>> blocks = http.get_blocks_by_height_with_limit(1, 100, lazy=True)
+           >>> [i for i in blocks if i.num_transactions]
+
+    License
+    -------
+
+    Copyright 2019 NEM
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import annotations
+import typing
+
+from .. import models
+from .. import util
+
+__all__ = [
+    'LazyModel',
+    'materialize',
+    'model_type',
+]
+
+FieldGetter = typing.Callable[[dict], typing.Any]
+Counter = typing.Counter[str]
+
+
+def load_deadline(data: list) -> models.Deadline:
+    """Load a deadline from its timestamp DTO."""
+    return models.Deadline.create_from_timestamp(util.u64_from_dto(data))
+
+
+def load_transaction_info(data: typing.Optional[dict]) -> typing.Any:
+    """Load the metadata of a transaction, as done by the transaction model."""
+
+    if data is None:
+        return None
+    elif 'hash' in data:
+        return models.TransactionInfo.create_from_dto(data)
+    return models.AggregateTransactionInfo.create_from_dto(data)
+
+
+# Fields read directly from the DTO, by model type.
+FIELDS: typing.Dict[type, typing.Dict[str, FieldGetter]] = {
+    models.BlockInfo: {
+        'hash': lambda x: x['meta']['hash'],
+        'generation_hash': lambda x: x['meta']['generationHash'],
+        'num_transactions': lambda x: x['meta'].get('numTransactions', 0),
+        'total_fee': lambda x: util.u64_from_dto(x['meta'].get('totalFee', [0, 0])),
+        'height': lambda x: util.u64_from_dto(x['block']['height']),
+        'timestamp': lambda x: util.u64_from_dto(x['block']['timestamp']),
+    },
+    models.Transaction: {
+        'type': lambda x: models.TransactionType(x['transaction']['type']),
+        'deadline': lambda x: load_deadline(x['transaction']['deadline']),
+        'transaction_info': lambda x: load_transaction_info(x.get('meta')),
+    },
+    models.TransactionStatusError: {
+        'hash': lambda x: x['hash'],
+        'status': lambda x: x['status'],
+        'deadline': lambda x: load_deadline(x['deadline']),
+        'channel_name': lambda x: x['meta']['channelName'],
+    },
+    models.AccountBalance: {
+        'public_key': lambda x: x['publicKey'],
+        'amount': lambda x: util.u64_from_dto(x['amount']),
+    },
+    models.MosaicInfo: {
+        'supply': lambda x: util.u64_from_dto(x['mosaic']['supply']),
+    },
+}
+
+
+class LazyModel(util.Object):
+    """
+    Proxy for a model, decoded from the DTO on first access.
+
+    :param type: Model class.
+    :param data: Data-transfer object.
+    :param network_type: (Optional) network type to decode the model with.
+    """
+
+    __slots__ = ('_type', '_data', '_network_type', '_model')
+
+    _type: typing.Type[util.DTO]
+    _data: typing.Any
+    _network_type: typing.Optional[models.NetworkType]
+    _model: typing.Optional[util.DTO]
+
+    def __init__(
+        self,
+        type: typing.Type[util.DTO],
+        data: typing.Any,
+        network_type: typing.Optional[models.NetworkType] = None,
+    ) -> None:
+        self._type = type
+        self._data = data
+        self._network_type = network_type
+        self._model = None
+
+    @property
+    def model_type(self) -> typing.Type[util.DTO]:
+        """Get the class of the proxied model."""
+        return self._type
+
+    @property
+    def dto(self) -> typing.Any:
+        """Get the raw data-transfer object."""
+        return self._data
+
+    @property
+    def materialized(self) -> bool:
+        """Get if the model has been decoded."""
+        return self._model is not None
+
+    def materialize(self) -> typing.Any:
+        """Decode the model from the DTO, if not already decoded."""
+
+        if self._model is None:
+            self._model = self._type.create_from_dto(self._data, self._network_type)
+        return self._model
+
+    def __getattr__(self, name: str) -> typing.Any:
+        # Never decode the model for special attributes, such as those
+        # looked up by copy and pickle.
+        if name.startswith('__'):
+            raise AttributeError(name)
+        if self._model is None:
+            getter = FIELDS.get(self._type, {}).get(name)
+            if getter is not None:
+                return getter(self._data)
+        return getattr(self.materialize(), name)
+
+    def __getstate__(self) -> tuple:
+        return (self._type, self._data, self._network_type)
+
+    def __setstate__(self, state: tuple) -> None:
+        self._type, self._data, self._network_type = state
+        self._model = None
+
+    def __eq__(self, other: typing.Any) -> bool:
+        if isinstance(other, LazyModel):
+            other = other.materialize()
+        return typing.cast(bool, self.materialize() == other)
+
+    def __hash__(self) -> int:
+        return hash(self.materialize())
+
+    def __repr__(self) -> str:
+        if self._model is None:
+            return f'LazyModel({self._type.__name__}, materialized=False)'
+        return f'LazyModel({self._model!r})'
+
+
+class CountedLazyModel(LazyModel):
+    """
+    Proxy for a model, counting each decode under a key.
+
+    :param type: Model class.
+    :param data: Data-transfer object.
+    :param counter: Counter incremented when the model is decoded.
+    :param key: Key to count the decode under, such as the channel name.
+    :param network_type: (Optional) network type to decode the model with.
+    """
+
+    __slots__ = ('_counter', '_key')
+
+    _counter: Counter
+    _key: str
+
+    def __init__(
+        self,
+        type: typing.Type[util.DTO],
+        data: typing.Any,
+        counter: Counter,
+        key: str,
+        network_type: typing.Optional[models.NetworkType] = None,
+    ) -> None:
+        super().__init__(type, data, network_type)
+        self._counter = counter
+        self._key = key
+
+    def materialize(self) -> typing.Any:
+        if self._model is None:
+            self._counter[self._key] += 1
+        return super().materialize()
+
+    def __reduce__(self) -> tuple:
+        # Copies are detached from the counter.
+        return (LazyModel, (self._type, self._data, self._network_type))
+
+
+def model_type(value: typing.Any) -> type:
+    """Get the class of a model, or of the model proxied by a lazy model."""
+
+    if isinstance(value, LazyModel):
+        return value.model_type
+    return typing.cast(type, value.__class__)
+
+
+def materialize(value: typing.Any) -> typing.Any:
+    """Get a model, decoding it if proxied by a lazy model."""
+
+    if isinstance(value, LazyModel):
+        return value.materialize()
+    return value
+
+
+def process_lazy(type: typing.Type[util.DTO]) -> typing.Callable[..., typing.List[LazyModel]]:
+    """
+    Create a callback to process a list response into lazy models.
+
+    :param type: Model class for each item.
+    """
+
+    def process(status: int, json: list, network_type: models.NetworkType) -> typing.List[LazyModel]:
+        assert status == 200
+        return [LazyModel(type, i, network_type) for i in json]
+
+    return process
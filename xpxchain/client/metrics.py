@@ -0,0 +1,538 @@
+"""
+    metrics
+    =======
+
+    Opt-in instrumentation for NIS requests.
+
+    Each request is timed per phase, to tell if slowness comes from the
+    node, the network, JSON parsing or model construction:
+
+        queue: waiting for the rate limiter, if any.
+        request: from sending the request to receiving the response headers.
+        transfer: reading the response body.
+        json: parsing the response body.
+        model: creating models from the parsed data.
+        total: the whole attempt, including rate limiting.
+
+    Phase times, response sizes, status codes and errors are aggregated
+    per endpoint into in-process histograms, and passed to exporters.
+    Clients without metrics skip all instrumentation.
+
+    Example:
+        .. code-block:: python
+
+           >>> from xpxchain import client
+           >>> metrics = client.Metrics([client.PrometheusExporter('/var/lib/node/xpxchain.prom')])
+           >>> with client.BlockchainHTTP(endpoint, metrics=metrics) as http:
+           ...     http.get_blockchain_height()
+           >>> metrics.stats('get_blockchain_height').phases['total'].mean
+           >>> metrics.export()
+
+    License
+    -------
+
+    Copyright 2019 NEM
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import annotations
+import bisect
+import collections
+import logging
+import math
+import os
+import tempfile
+import threading
+import time
+import typing
+
+from .. import util
+
+__all__ = [
+    'CallbackExporter',
+    'EndpointStats',
+    'Exporter',
+    'Histogram',
+    'LoggingExporter',
+    'Metrics',
+    'PrometheusExporter',
+    'Sample',
+]
+
+PHASES = ('queue', 'request', 'transfer', 'json', 'model', 'total')
+
+# Upper bounds of the histogram buckets for durations (in seconds).
+TIME_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+# Upper bounds of the histogram buckets for response sizes (in bytes).
+SIZE_BUCKETS = tuple(float(4**i) for i in range(4, 13))
+
+
+class Histogram(util.Object):
+    """
+    Histogram with fixed bucket bounds.
+
+    :param buckets: Upper bounds for each bucket, in ascending order.
+    """
+
+    buckets: typing.Tuple[float, ...]
+    counts: typing.List[int]
+    count: int
+    sum: float
+    min: float
+    max: float
+
+    def __init__(self, buckets: typing.Sequence[float]) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def observe(self, value: float) -> None:
+        """
+        Record a value.
+
+        :param value: Observed value.
+        """
+
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    @property
+    def mean(self) -> float:
+        """Get the mean of all recorded values."""
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile, as the upper bound of the bucket containing it.
+
+        :param q: Quantile, between 0 and 1.
+        """
+
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            if total >= rank:
+                return min(bound, self.max)
+        return self.max
+
+
+class EndpointStats(util.Object):
+    """
+    Aggregated statistics for a NIS endpoint.
+
+    :param name: Name of the NIS endpoint.
+    """
+
+    name: str
+    phases: typing.Dict[str, Histogram]
+    size: Histogram
+    statuses: typing.Counter[int]
+    errors: typing.Counter[str]
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.phases = {i: Histogram(TIME_BUCKETS) for i in PHASES}
+        self.size = Histogram(SIZE_BUCKETS)
+        self.statuses = collections.Counter()
+        self.errors = collections.Counter()
+
+    def add(self, sample: Sample) -> None:
+        """
+        Aggregate a request sample.
+
+        :param sample: Measurements for a single request.
+        """
+
+        for phase, value in sample.phases.items():
+            self.phases[phase].observe(value)
+        if sample.size is not None:
+            self.size.observe(sample.size)
+        if sample.status is not None:
+            self.statuses[sample.status] += 1
+        if sample.error is not None:
+            self.errors[sample.error] += 1
+
+
+class Sample(typing.NamedTuple):
+    """Measurements for a single request attempt."""
+
+    name: str
+    status: typing.Optional[int]
+    size: typing.Optional[int]
+    phases: typing.Dict[str, float]
+    error: typing.Optional[str]
+
+
+class Timer(util.Object):
+    """
+    Time the phases of a single request attempt.
+
+    :param metrics: Metrics to record the sample to.
+    :param name: Name of the NIS endpoint.
+    """
+
+    __slots__ = ('_metrics', '_name', '_start', '_last', '_phases', '_status', '_size', '_error')
+
+    def __init__(self, metrics: Metrics, name: str) -> None:
+        self._metrics = metrics
+        self._name = name
+        self._start = self._last = time.perf_counter()
+        self._phases: typing.Dict[str, float] = {}
+        self._status: typing.Optional[int] = None
+        self._size: typing.Optional[int] = None
+        self._error: typing.Optional[str] = None
+
+    def lap(self, phase: str) -> None:
+        """
+        Record the time since the last phase.
+
+        :param phase: Name of the phase that completed.
+        """
+
+        now = time.perf_counter()
+        self._phases[phase] = now - self._last
+        self._last = now
+
+    def response(self, status: int, elapsed: typing.Optional[float] = None) -> None:
+        """
+        Record the response headers were received.
+
+        :param status: HTTP status code.
+        :param elapsed: (Optional) seconds to receive the headers, if the body was already read.
+        """
+
+        now = time.perf_counter()
+        request = now - self._last
+        if elapsed is not None and elapsed < request:
+            # The body was read before returning, so the time after the
+            # headers were received belongs to the transfer.
+            request = elapsed
+        self._phases['request'] = request
+        self._last += request
+        self._status = status
+
+    def body(self, size: int) -> None:
+        """
+        Record the response body was read.
+
+        :param size: Size of the response body (in bytes).
+        """
+
+        self.lap('transfer')
+        self._size = size
+
+    def fail(self, exc: BaseException) -> None:
+        """
+        Record the request failed.
+
+        :param exc: Exception raised by the request.
+        """
+
+        self._error = type(exc).__name__
+
+    def finish(self) -> None:
+        """Record the sample, once the attempt has completed."""
+
+        self._phases['total'] = time.perf_counter() - self._start
+        self._metrics.record(Sample(self._name, self._status, self._size, self._phases, self._error))
+
+
+class Exporter(util.Object):
+    """Base class for metrics exporters."""
+
+    def on_sample(self, metrics: Metrics, sample: Sample) -> None:
+        """
+        Handle a request sample, after it was aggregated.
+
+        :param metrics: Metrics the sample was recorded to.
+        :param sample: Measurements for a single request.
+        """
+
+    def export(self, metrics: Metrics) -> None:
+        """
+        Export the aggregated metrics.
+
+        :param metrics: Metrics to export.
+        """
+
+
+class CallbackExporter(Exporter):
+    """
+    Pass each request sample to a callback.
+
+    :param callback: Callable accepting each `Sample`.
+    """
+
+    _callback: typing.Callable[[Sample], typing.Any]
+
+    def __init__(self, callback: typing.Callable[[Sample], typing.Any]) -> None:
+        self._callback = callback
+
+    def on_sample(self, metrics: Metrics, sample: Sample) -> None:
+        self._callback(sample)
+
+
+class LoggingExporter(Exporter):
+    """
+    Log each request sample.
+
+    :param logger: (Optional) logger, defaults to the `xpxchain.client` logger.
+    :param level: (Optional) logging level for samples.
+    """
+
+    _logger: logging.Logger
+    _level: int
+
+    def __init__(
+        self,
+        logger: typing.Optional[logging.Logger] = None,
+        level: int = logging.DEBUG,
+    ) -> None:
+        self._logger = logger or logging.getLogger('xpxchain.client')
+        self._level = level
+
+    def on_sample(self, metrics: Metrics, sample: Sample) -> None:
+        if not self._logger.isEnabledFor(self._level):
+            return
+        phases = ' '.join(f'{k}={v * 1e3:.3f}ms' for k, v in sample.phases.items())
+        self._logger.log(
+            self._level,
+            '%s status=%s bytes=%s error=%s %s',
+            sample.name,
+            sample.status,
+            sample.size,
+            sample.error,
+            phases,
+        )
+
+
+def format_labels(**labels: typing.Any) -> str:
+    """Format labels for the Prometheus text format."""
+
+    def escape(value: typing.Any) -> str:
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+    return ','.join(f'{k}="{escape(v)}"' for k, v in labels.items())
+
+
+def format_bound(bound: float) -> str:
+    return '+Inf' if bound == math.inf else repr(bound)
+
+
+def format_histogram(name: str, histogram: Histogram, **labels: typing.Any) -> typing.List[str]:
+    """Format a histogram for the Prometheus text format."""
+
+    lines = []
+    total = 0
+    for bound, count in zip(histogram.buckets + (math.inf,), histogram.counts):
+        total += count
+        bucket_labels = format_labels(**labels, le=format_bound(bound))
+        lines.append(f'{name}_bucket{{{bucket_labels}}} {total}')
+    label_text = format_labels(**labels)
+    lines.append(f'{name}_sum{{{label_text}}} {histogram.sum!r}')
+    lines.append(f'{name}_count{{{label_text}}} {histogram.count}')
+    return lines
+
+
+def format_prometheus(metrics: Metrics, prefix: str = 'xpxchain_client') -> str:
+    """
+    Format the aggregated metrics in the Prometheus text format.
+
+    :param metrics: Metrics to format.
+    :param prefix: (Optional) prefix for the metric names.
+    """
+
+    stats = metrics.stats()
+    lines = [
+        f'# HELP {prefix}_phase_seconds Time spent in each phase of NIS requests.',
+        f'# TYPE {prefix}_phase_seconds histogram',
+    ]
+    for name, item in stats.items():
+        for phase, histogram in item.phases.items():
+            lines += format_histogram(f'{prefix}_phase_seconds', histogram, endpoint=name, phase=phase)
+
+    lines += [
+        f'# HELP {prefix}_response_bytes Size of NIS response bodies.',
+        f'# TYPE {prefix}_response_bytes histogram',
+    ]
+    for name, item in stats.items():
+        lines += format_histogram(f'{prefix}_response_bytes', item.size, endpoint=name)
+
+    lines += [
+        f'# HELP {prefix}_responses_total NIS responses by status code.',
+        f'# TYPE {prefix}_responses_total counter',
+    ]
+    for name, item in stats.items():
+        for status, count in sorted(item.statuses.items()):
+            lines.append(f'{prefix}_responses_total{{{format_labels(endpoint=name, status=status)}}} {count}')
+
+    lines += [
+        f'# HELP {prefix}_errors_total Failed NIS requests by exception type.',
+        f'# TYPE {prefix}_errors_total counter',
+    ]
+    for name, item in stats.items():
+        for error, count in sorted(item.errors.items()):
+            lines.append(f'{prefix}_errors_total{{{format_labels(endpoint=name, error=error)}}} {count}')
+
+    return '\n'.join(lines) + '\n'
+
+
+class PrometheusExporter(Exporter):
+    """
+    Write the aggregated metrics to a file in the Prometheus text format.
+
+    The file is replaced atomically, for the node exporter's textfile
+    collector. It is written on `Metrics.export`, and, with an interval,
+    after a request once the interval has passed since the last write.
+
+    :param path: Path to the metrics file.
+    :param interval: (Optional) minimum seconds between writes after requests, None to disable.
+    :param prefix: (Optional) prefix for the metric names.
+    """
+
+    _path: str
+    _interval: typing.Optional[float]
+    _prefix: str
+    _written: float
+
+    def __init__(
+        self,
+        path: str,
+        interval: typing.Optional[float] = None,
+        prefix: str = 'xpxchain_client',
+    ) -> None:
+        self._path = path
+        self._interval = interval
+        self._prefix = prefix
+        self._written = -math.inf
+
+    @property
+    def path(self) -> str:
+        """Get the path to the metrics file."""
+        return self._path
+
+    def on_sample(self, metrics: Metrics, sample: Sample) -> None:
+        interval = self._interval
+        if interval is not None and time.monotonic() - self._written >= interval:
+            self.export(metrics)
+
+    def export(self, metrics: Metrics) -> None:
+        self._written = time.monotonic()
+        text = format_prometheus(metrics, self._prefix)
+        directory = os.path.dirname(self._path) or '.'
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix='.metrics-', suffix='.prom')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(text)
+            os.replace(tmp, self._path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+
+class Metrics(util.Object):
+    """
+    Per-endpoint request metrics, shared by clients.
+
+    :param exporters: (Optional) exporters for request samples and aggregated metrics.
+    """
+
+    _exporters: typing.List[Exporter]
+    _stats: typing.Dict[str, EndpointStats]
+    _lock: threading.Lock
+
+    def __init__(self, exporters: typing.Iterable[Exporter] = ()) -> None:
+        self._exporters = list(exporters)
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    @property
+    def exporters(self) -> typing.Sequence[Exporter]:
+        """Get the exporters for the metrics."""
+        return self._exporters
+
+    def add_exporter(self, exporter: Exporter) -> None:
+        """
+        Add an exporter for the metrics.
+
+        :param exporter: Exporter for request samples and aggregated metrics.
+        """
+        self._exporters.append(exporter)
+
+    def timer(self, name: str) -> Timer:
+        """
+        Start timing a request attempt.
+
+        :param name: Name of the NIS endpoint.
+        """
+        return Timer(self, name)
+
+    def record(self, sample: Sample) -> None:
+        """
+        Aggregate a request sample, and pass it to the exporters.
+
+        :param sample: Measurements for a single request.
+        """
+
+        with self._lock:
+            stats = self._stats.get(sample.name)
+            if stats is None:
+                stats = self._stats[sample.name] = EndpointStats(sample.name)
+            stats.add(sample)
+        for exporter in self._exporters:
+            exporter.on_sample(self, sample)
+
+    @typing.overload
+    def stats(self) -> typing.Dict[str, EndpointStats]:
+        ...
+
+    @typing.overload
+    def stats(self, name: str) -> typing.Optional[EndpointStats]:
+        ...
+
+    def stats(self, name=None):
+        """
+        Get the aggregated statistics for an endpoint, or for all endpoints.
+
+        :param name: (Optional) name of the NIS endpoint.
+        """
+
+        with self._lock:
+            if name is None:
+                return dict(self._stats)
+            return self._stats.get(name)
+
+    def export(self) -> None:
+        """Export the aggregated metrics with every exporter."""
+
+        for exporter in self._exporters:
+            exporter.export(self)
+
+    def reset(self) -> None:
+        """Remove all recorded statistics."""
+
+        with self._lock:
+            self._stats.clear()
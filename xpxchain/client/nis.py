@@ -29,6 +29,9 @@ from __future__ import annotations
 import typing
 
 from . import client
+from . import codec
+from . import retry
+from .lazy import process_lazy
 from .. import util
 from .. import models
 
@@ -39,21 +42,166 @@ OptionalNetworkType = typing.Optional[models.NetworkType]
 # -----------
 
 
+# Marks an attempt that must be retried.
+RETRY = object()
+
+
+def parallel_decoder(endpoint, client, lazy, json):
+    """Get the decoder for a large list response, or None to process it inline."""
+
+    decoder = client.decoder
+    if decoder is None or lazy or endpoint.model is None or not decoder.accepts(json):
+        return None
+    return decoder
+
+
+def process_inline(endpoint, lazy, status, json, network_type):
+    """Process a response on the calling thread."""
+
+    process = endpoint.process
+    if lazy and endpoint.lazy_process is not None:
+        process = endpoint.lazy_process
+    return process(status, json, network_type)
+
+
+def decode_response(endpoint, client, status, content, network_type, lazy, timer):
+    """Parse and decode the body of a response."""
+
+    json = codec.loads(content)
+    if timer is not None:
+        timer.lap('json')
+    decoder = parallel_decoder(endpoint, client, lazy, json)
+    if decoder is not None:
+        result = decoder.decode(endpoint.model, json, network_type)
+    else:
+        result = process_inline(endpoint, lazy, status, json, network_type)
+    if timer is not None:
+        timer.lap('model')
+    return result
+
+
+async def decode_response_async(endpoint, client, status, content, network_type, lazy, timer):
+    """Parse and decode the body of a response, off the event loop for large lists."""
+
+    json = codec.loads(content)
+    if timer is not None:
+        timer.lap('json')
+    decoder = parallel_decoder(endpoint, client, lazy, json)
+    if decoder is not None:
+        result = await decoder.decode_async(endpoint.model, json, network_type)
+    else:
+        result = process_inline(endpoint, lazy, status, json, network_type)
+    if timer is not None:
+        timer.lap('model')
+    return result
+
+
+def retry_exception(attempts, timer, exc):
+    """Record an exception from an attempt, and determine if it must be retried."""
+
+    if timer is not None:
+        timer.fail(exc)
+    return attempts.retry_exception(exc)
+
+
+def send_request(client, request, timer, args, kwds):
+    """Send a synchronous request, within the rate limits of the client."""
+
+    limiter = client.rate_limiter
+    if limiter is not None:
+        limiter.acquire()
+        if timer is not None:
+            timer.lap('queue')
+    try:
+        return request(client, *args, **kwds)
+    finally:
+        if limiter is not None:
+            limiter.release()
+
+
+def attempt_request(endpoint, client, attempts, timer, network_type, lazy, raise_for_status, args, kwds):
+    """Make a single synchronous attempt, returning RETRY if it must be retried."""
+
+    try:
+        response = send_request(client, endpoint.request, timer, args, kwds)
+    except Exception as exc:
+        if retry_exception(attempts, timer, exc):
+            return RETRY
+        raise
+    status = response.status_code
+    if timer is not None:
+        # Requests reads the body before returning, so split the
+        # request and transfer when the headers were received.
+        timer.response(status, response.elapsed.total_seconds())
+        timer.body(len(response.content))
+    if attempts.retry_status(status):
+        return RETRY
+    if raise_for_status:
+        response.raise_for_status()
+    return decode_response(endpoint, client, status, response.content, network_type, lazy, timer)
+
+
+async def attempt_request_async(endpoint, client, attempts, timer, network_type, lazy, raise_for_status, args, kwds):
+    """Make a single asynchronous attempt, returning RETRY if it must be retried."""
+
+    limiter = client.rate_limiter
+    if limiter is not None:
+        await limiter.acquire_async()
+        if timer is not None:
+            timer.lap('queue')
+    try:
+        async with endpoint.request(client, *args, **kwds) as response:
+            status = response.status
+            if timer is not None:
+                timer.response(status)
+            if attempts.retry_status(status):
+                return RETRY
+            if raise_for_status:
+                response.raise_for_status()
+            content = await response.read()
+            if timer is not None:
+                timer.body(len(content))
+        return await decode_response_async(endpoint, client, status, content, network_type, lazy, timer)
+    except Exception as exc:
+        if retry_exception(attempts, timer, exc):
+            return RETRY
+        raise
+    finally:
+        if limiter is not None:
+            limiter.release()
+
+
 def synchronous_request(name, doc="", raise_for_status=True):
     """Generate wrappers for a synchronous request."""
 
-    def f(client, network_type, *args, **kwds):
-        request, process = CLIENT_CB[name]
-        response = request(client, *args, **kwds)
-        if raise_for_status:
-            response.raise_for_status()
-        status = response.status_code
-        json = response.json()
-        return process(status, json, network_type)
+    endpoint = None
+
+    def bind(value):
+        nonlocal endpoint
+        endpoint = value
+
+    def f(client, network_type, *args, lazy=False, **kwds):
+        attempts = retry.Attempts(client.retry, client.circuit_breaker, client.endpoint, name)
+        metrics = client.metrics
+        try:
+            for _ in attempts:
+                timer = metrics.timer(name) if metrics is not None else None
+                try:
+                    result = attempt_request(
+                        endpoint, client, attempts, timer, network_type, lazy, raise_for_status, args, kwds
+                    )
+                finally:
+                    if timer is not None:
+                        timer.finish()
+                if result is not RETRY:
+                    return result
+        finally:
+            attempts.finish()
 
     f.__name__ = name
     f.__doc__ = doc
     f.func_name = name
+    f.bind = bind
 
     return f
 
@@ -61,21 +209,40 @@ def synchronous_request(name, doc="", raise_for_status=True):
 def asynchronous_request(name, doc="", raise_for_status=True):
     """Generate wrappers for an asynchronous request."""
 
-    async def f(client, network_awaitable, *args, **kwds):
+    endpoint = None
+
+    def bind(value):
+        nonlocal endpoint
+        endpoint = value
+
+    async def f(client, network_awaitable, *args, lazy=False, **kwds):
         # Await the network type so if an exception is thrown, we
-        # don't forget to await the awaitable.
-        request, process = CLIENT_CB[name]
-        network_type = await network_awaitable
-        async with request(client, *args, **kwds) as response:
-            if raise_for_status:
-                response.raise_for_status()
-            status = response.status
-            json = await response.json()
-            return process(status, json, network_type)
+        # don't forget to await the awaitable. Once resolved, the
+        # client passes the network type itself.
+        network_type = network_awaitable
+        if not isinstance(network_type, models.NetworkType):
+            network_type = await network_awaitable
+        attempts = retry.Attempts(client.retry, client.circuit_breaker, client.endpoint, name)
+        metrics = client.metrics
+        try:
+            async for _ in attempts:
+                timer = metrics.timer(name) if metrics is not None else None
+                try:
+                    result = await attempt_request_async(
+                        endpoint, client, attempts, timer, network_type, lazy, raise_for_status, args, kwds
+                    )
+                finally:
+                    if timer is not None:
+                        timer.finish()
+                if result is not RETRY:
+                    return result
+        finally:
+            attempts.finish()
 
     f.__name__ = f"async_{name}"
     f.__doc__ = doc
     f.func_name = f"async_{name}"
+    f.bind = bind
 
     return f
 
@@ -88,6 +255,17 @@ def request(*args, **kwds):
     return s, a
 
 
+def page_params(page_size: typing.Optional[int], id: typing.Optional[str]) -> dict:
+    """Get the query parameters for a paginated request."""
+
+    params = {}
+    if page_size is not None:
+        params['pageSize'] = page_size
+    if id is not None:
+        params['id'] = id
+    return params
+
+
 # ACCOUNT HTTP
 # ------------
 
@@ -319,18 +497,22 @@ get_multisig_account_graph_info = request("get_multisig_account_graph_info")
 def request_get_account_transactions(
     client: client.Client,
     public_account: models.PublicAccount,
+    page_size: typing.Optional[int] = None,
+    id: typing.Optional[str] = None,
     **kwds
 ):
     """
     Make "/account/{public_key}/transactions" request.
 
     :param client: Wrapper for client.
-    :param height: Height of block.
+    :param public_account: Public key and address for account.
+    :param page_size: (Optional) maximum number of transactions to return.
+    :param id: (Optional) return transactions after this transaction ID.
     :param timeout: (Optional) timeout for request (in seconds).
     """
 
     url = f"/account/{public_account.public_key}/transactions"
-    return client.get(url, **kwds)
+    return client.get(url, params=page_params(page_size, id), **kwds)
 
 
 def process_get_account_transactions(
@@ -356,18 +538,22 @@ get_account_transactions = request("get_account_transactions")
 def request_get_account_incoming_transactions(
     client: client.Client,
     public_account: models.PublicAccount,
+    page_size: typing.Optional[int] = None,
+    id: typing.Optional[str] = None,
     **kwds
 ):
     """
     Make "/account/{public_key}/transactions/incoming" request.
 
     :param client: Wrapper for client.
-    :param height: Height of block.
+    :param public_account: Public key and address for account.
+    :param page_size: (Optional) maximum number of transactions to return.
+    :param id: (Optional) return transactions after this transaction ID.
     :param timeout: (Optional) timeout for request (in seconds).
     """
 
     url = f"/account/{public_account.public_key}/transactions/incoming"
-    return client.get(url, **kwds)
+    return client.get(url, params=page_params(page_size, id), **kwds)
 
 
 def process_get_account_incoming_transactions(
@@ -393,18 +579,22 @@ get_account_incoming_transactions = request("get_account_incoming_transactions")
 def request_get_account_outgoing_transactions(
     client: client.Client,
     public_account: models.PublicAccount,
+    page_size: typing.Optional[int] = None,
+    id: typing.Optional[str] = None,
     **kwds
 ):
     """
     Make "/account/{public_key}/transactions/outgoing" request.
 
     :param client: Wrapper for client.
-    :param height: Height of block.
+    :param public_account: Public key and address for account.
+    :param page_size: (Optional) maximum number of transactions to return.
+    :param id: (Optional) return transactions after this transaction ID.
     :param timeout: (Optional) timeout for request (in seconds).
     """
 
     url = f"/account/{public_account.public_key}/transactions/outgoing"
-    return client.get(url, **kwds)
+    return client.get(url, params=page_params(page_size, id), **kwds)
 
 
 def process_get_account_outgoing_transactions(
@@ -430,18 +620,22 @@ get_account_outgoing_transactions = request("get_account_outgoing_transactions")
 def request_get_account_unconfirmed_transactions(
     client: client.Client,
     public_account: models.PublicAccount,
+    page_size: typing.Optional[int] = None,
+    id: typing.Optional[str] = None,
     **kwds
 ):
     """
     Make "/account/{public_key}/transactions/unconfirmed" request.
 
     :param client: Wrapper for client.
-    :param height: Height of block.
+    :param public_account: Public key and address for account.
+    :param page_size: (Optional) maximum number of transactions to return.
+    :param id: (Optional) return transactions after this transaction ID.
     :param timeout: (Optional) timeout for request (in seconds).
     """
 
     url = f"/account/{public_account.public_key}/transactions/unconfirmed"
-    return client.get(url, **kwds)
+    return client.get(url, params=page_params(page_size, id), **kwds)
 
 
 def process_get_account_unconfirmed_transactions(
@@ -467,18 +661,22 @@ get_account_unconfirmed_transactions = request("get_account_unconfirmed_transact
 def request_get_account_partial_transactions(
     client: client.Client,
     public_account: models.PublicAccount,
+    page_size: typing.Optional[int] = None,
+    id: typing.Optional[str] = None,
     **kwds
 ):
     """
     Make "/account/{public_key}/transactions/partial" request.
 
     :param client: Wrapper for client.
-    :param height: Height of block.
+    :param public_account: Public key and address for account.
+    :param page_size: (Optional) maximum number of transactions to return.
+    :param id: (Optional) return transactions after this transaction ID.
     :param timeout: (Optional) timeout for request (in seconds).
     """
 
     url = f"/account/{public_account.public_key}/transactions/partial"
-    return client.get(url, **kwds)
+    return client.get(url, params=page_params(page_size, id), **kwds)
 
 
 def process_get_account_partial_transactions(
@@ -660,6 +858,8 @@ get_blocks_by_height_with_limit = request("get_blocks_by_height_with_limit")
 def request_get_block_transactions(
     client: client.Client,
     height: int,
+    page_size: typing.Optional[int] = None,
+    id: typing.Optional[str] = None,
     **kwds
 ):
     """
@@ -667,11 +867,13 @@ def request_get_block_transactions(
 
     :param client: Wrapper for client.
     :param height: Height of block.
+    :param page_size: (Optional) maximum number of transactions to return.
+    :param id: (Optional) return transactions after this transaction ID.
     :param timeout: (Optional) timeout for request (in seconds).
     """
 
     url = f"/block/{height}/transactions"
-    return client.get(url, **kwds)
+    return client.get(url, params=page_params(page_size, id), **kwds)
 
 
 def process_get_block_transactions(
@@ -2203,3 +2405,58 @@ CLIENT_CB = {
         process_announce_cosignature,
     ),
 }
+
+# Model for each item of list responses, which may be decoded lazily or in parallel.
+LIST_MODELS = {
+    'get_accounts_info': models.AccountInfo,
+    'get_accounts_properties': models.AccountProperties,
+    'get_account_transactions': models.Transaction,
+    'get_account_incoming_transactions': models.Transaction,
+    'get_account_outgoing_transactions': models.Transaction,
+    'get_account_unconfirmed_transactions': models.Transaction,
+    'get_account_partial_transactions': models.Transaction,
+    'get_account_names': models.AccountNames,
+    'get_blocks_by_height_with_limit': models.BlockInfo,
+    'get_block_transactions': models.Transaction,
+    'get_diagnostic_blocks_by_height_with_limit': models.BlockInfo,
+    'get_metadatas': models.MetadataInfo,
+    'get_mosaics': models.MosaicInfo,
+    'get_mosaic_names': models.MosaicName,
+    'get_mosaic_richlist': models.AccountBalance,
+    'get_namespaces_name': models.NamespaceName,
+    'get_namespaces_from_account': models.NamespaceInfo,
+    'get_namespaces_from_accounts': models.NamespaceInfo,
+    'get_transactions': models.Transaction,
+    'get_transaction_statuses': models.TransactionStatus,
+}
+
+
+class Endpoint(typing.NamedTuple):
+    """Callbacks for a NIS endpoint, resolved once rather than per request."""
+
+    request: typing.Callable
+    process: typing.Callable
+    lazy_process: typing.Optional[typing.Callable]
+    model: typing.Optional[type]
+
+
+def bind_endpoint(name: str) -> Endpoint:
+    """Resolve the callbacks for a NIS endpoint."""
+
+    request, process = CLIENT_CB[name]
+    model = LIST_MODELS.get(name)
+    if model is None:
+        return Endpoint(request, process, None, None)
+    return Endpoint(request, process, process_lazy(model), model)
+
+
+def bind_wrappers() -> None:
+    """Bind the request wrappers to their endpoint, once every callback is defined."""
+
+    for name, endpoint in ENDPOINTS.items():
+        for wrapper in globals()[name]:
+            wrapper.bind(endpoint)
+
+
+ENDPOINTS = {name: bind_endpoint(name) for name in CLIENT_CB}
+bind_wrappers()
@@ -0,0 +1,262 @@
+"""
+    paging
+    ======
+
+    Prefetching iteration over paged and windowed NIS requests.
+
+    Paged endpoints only reveal the cursor for the next page once the
+    current page is received, so a single page is requested ahead of the
+    consumer. Windowed requests, such as block ranges, have cursors known
+    up front, so a pipeline keeps several windows in flight at once, and
+    may request extra data for each item within the same pipeline.
+    Synchronous clients prefetch with a thread pool, and asynchronous
+    clients with tasks on the event loop.
+
+    Example:
+        .. code-block:: python
+
+           >>> from xpxchain import client
+           >>> with client.AccountHTTP(endpoint) as http:
+           ...     for transaction in http.iter_transactions(public_account):
+           ...         print(transaction.transaction_info.height)
+
+    License
+    -------
+
+    Copyright 2019 NEM
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import annotations
+import asyncio
+import collections
+import concurrent.futures
+import itertools
+import typing
+
+from .. import models
+from .. import util
+from ..errors import MissingBlockError
+
+__all__ = [
+    'collect_pages',
+    'collect_pages_async',
+    'iter_pages',
+    'iter_pages_async',
+    'iter_pipeline',
+    'iter_pipeline_async',
+    'next_transaction_id',
+    'select_window',
+]
+
+
+def next_transaction_id(page: typing.Sequence[models.Transaction], page_size: int) -> typing.Optional[str]:
+    """
+    Get the cursor for the page after a page of transactions, or None if last.
+
+    :param page: Page of transactions.
+    :param page_size: Number of transactions requested per page.
+    """
+
+    # A partial page is the last page.
+    if len(page) < page_size:
+        return None
+    return page[-1].transaction_info.id
+
+
+def select_window(
+    blocks: typing.Sequence[models.BlockInfo],
+    height: int,
+    last: int,
+) -> typing.List[models.BlockInfo]:
+    """
+    Get the blocks between [height, last], in height order.
+
+    Nodes may round the limit up, so blocks outside the window are
+    dropped. Raises `MissingBlockError` if any block is missing.
+
+    :param blocks: Blocks returned for the window.
+    :param height: Height of the first block.
+    :param last: Height of the last block.
+    """
+
+    found = {i.height: i for i in blocks if height <= i.height <= last}
+    for expected in range(height, last + 1):
+        if expected not in found:
+            raise MissingBlockError(expected)
+    return [found[i] for i in range(height, last + 1)]
+
+
+def iter_pages(fetch, advance, cursor=None):
+    """
+    Iterate over items from consecutive pages, prefetching the next page.
+
+    :param fetch: Callback to request the page at a cursor.
+    :param advance: Callback to get the next cursor from a page, or None if last.
+    :param cursor: (Optional) cursor for the first page.
+    """
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    try:
+        future = executor.submit(fetch, cursor)
+        while future is not None:
+            page = future.result()
+            cursor = advance(page)
+            future = None
+            if cursor is not None:
+                future = executor.submit(fetch, cursor)
+            yield from page
+    finally:
+        # Do not wait on an unused page, if the iterator is closed early.
+        executor.shutdown(wait=False)
+
+
+async def iter_pages_async(fetch, advance, cursor=None, loop: util.OptionalLoopType = None):
+    """
+    Iterate over items from consecutive pages, prefetching the next page.
+
+    :param fetch: Coroutine function to request the page at a cursor.
+    :param advance: Callback to get the next cursor from a page, or None if last.
+    :param cursor: (Optional) cursor for the first page.
+    :param loop: (Optional) event loop to prefetch on.
+    """
+
+    task = asyncio.ensure_future(fetch(cursor), loop=loop)
+    try:
+        while task is not None:
+            page = await task
+            cursor = advance(page)
+            task = None
+            if cursor is not None:
+                task = asyncio.ensure_future(fetch(cursor), loop=loop)
+            for item in page:
+                yield item
+    finally:
+        if task is not None:
+            task.cancel()
+
+
+def collect_pages(fetch, advance, cursor=None) -> list:
+    """
+    Get the items from every consecutive page, as a single list.
+
+    :param fetch: Callback to request the page at a cursor.
+    :param advance: Callback to get the next cursor from a page, or None if last.
+    :param cursor: (Optional) cursor for the first page.
+    """
+
+    items: list = []
+    while True:
+        page = fetch(cursor)
+        items += page
+        cursor = advance(page)
+        if cursor is None:
+            return items
+
+
+async def collect_pages_async(fetch, advance, cursor=None) -> list:
+    """
+    Get the items from every consecutive page, as a single list.
+
+    :param fetch: Coroutine function to request the page at a cursor.
+    :param advance: Callback to get the next cursor from a page, or None if last.
+    :param cursor: (Optional) cursor for the first page.
+    """
+
+    items: list = []
+    while True:
+        page = await fetch(cursor)
+        items += page
+        cursor = advance(page)
+        if cursor is None:
+            return items
+
+
+def iter_pipeline(fetch, cursors, depth, process=None, expand=None):
+    """
+    Iterate over items from pages at known cursors, prefetching pages.
+
+    :param fetch: Callback to request the page at a cursor.
+    :param cursors: Cursors for each page, in order.
+    :param depth: Maximum number of pages requested ahead of the consumer.
+    :param process: (Optional) callback to filter the page for a cursor.
+    :param expand: (Optional) callback to request extra data for each item.
+    """
+
+    def load(cursor):
+        page = fetch(cursor)
+        if process is not None:
+            page = process(cursor, page)
+        if expand is not None:
+            page = [(i, *expand(i)) for i in page]
+        return page
+
+    cursors = iter(cursors)
+    pending: typing.Deque[concurrent.futures.Future] = collections.deque()
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=depth)
+    try:
+        for cursor in itertools.islice(cursors, depth):
+            pending.append(executor.submit(load, cursor))
+        while pending:
+            page = pending.popleft().result()
+            for cursor in itertools.islice(cursors, 1):
+                pending.append(executor.submit(load, cursor))
+            yield from page
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+async def iter_pipeline_async(fetch, cursors, depth, process=None, expand=None, loop: util.OptionalLoopType = None):
+    """
+    Iterate over items from pages at known cursors, prefetching pages.
+
+    :param fetch: Coroutine function to request the page at a cursor.
+    :param cursors: Cursors for each page, in order.
+    :param depth: Maximum number of pages requested ahead of the consumer.
+    :param process: (Optional) callback to filter the page for a cursor.
+    :param expand: (Optional) callback to get awaitables, or None, for extra data for each item.
+    :param loop: (Optional) event loop to prefetch on.
+    """
+
+    async def resolve(call):
+        return None if call is None else await call
+
+    async def load(cursor):
+        page = await fetch(cursor)
+        if process is not None:
+            page = process(cursor, page)
+        if expand is not None:
+            extras = await asyncio.gather(*(
+                asyncio.gather(*(resolve(j) for j in expand(i)))
+                for i in page
+            ))
+            page = [(i, *j) for i, j in zip(page, extras)]
+        return page
+
+    cursors = iter(cursors)
+    pending: typing.Deque[asyncio.Future] = collections.deque()
+    try:
+        for cursor in itertools.islice(cursors, depth):
+            pending.append(asyncio.ensure_future(load(cursor), loop=loop))
+        while pending:
+            page = await pending.popleft()
+            for cursor in itertools.islice(cursors, 1):
+                pending.append(asyncio.ensure_future(load(cursor), loop=loop))
+            for item in page:
+                yield item
+    finally:
+        for task in pending:
+            task.cancel()
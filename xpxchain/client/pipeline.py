@@ -0,0 +1,322 @@
+"""
+    pipeline
+    ========
+
+    High-throughput pipeline to announce many signed transactions.
+
+    Transactions are read lazily from an (async) iterable, deduplicated
+    by hash, and announced with bounded concurrency across one or more
+    nodes. Each node has an in-flight window, which grows slowly while
+    announces succeed, and halves when the node reports overload or
+    a transport error, so a slow node receives fewer transactions and
+    the source is only read as fast as the nodes accept transactions.
+    Transient failures are retried with backoff, preferring other
+    nodes, and every transaction yields an outcome.
+
+    Example:
+        .. code-block:: python
+
+           >>> from xpxchain import client
+           >>> async with client.AsyncTransactionHTTP(endpoint) as http:
+           ...     pipeline = client.AnnouncePipeline([http], concurrency=64)
+           ...     async for outcome in pipeline.announce(signed_transactions):
+           ...         if not outcome.ok:
+           ...             print(outcome.hash, outcome.error)
+           >>> pipeline.throughput
+
+    License
+    -------
+
+    Copyright 2019 NEM
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import annotations
+import asyncio
+import time
+import typing
+
+from . import retry
+from .. import models
+from .. import util
+from ..errors import CircuitOpenError
+
+__all__ = [
+    'AnnounceOutcome',
+    'AnnouncePipeline',
+]
+
+DEFAULT_CONCURRENCY = 32
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_BACKOFF_BASE = 0.1
+DEFAULT_BACKOFF_MAX = 5.0
+
+Source = typing.Union[
+    typing.Iterable[models.SignedTransaction],
+    typing.AsyncIterable[models.SignedTransaction],
+]
+
+
+class AnnounceOutcome(typing.NamedTuple):
+    """
+    Outcome of announcing a single transaction.
+
+    :param hash: Transaction hash.
+    :param endpoint: Endpoint of the node the last attempt was sent to.
+    :param attempts: Number of attempts made.
+    :param response: Announce response, if successful.
+    :param error: Exception from the last attempt, if unsuccessful.
+    """
+
+    hash: str
+    endpoint: str
+    attempts: int
+    response: typing.Optional[models.TransactionAnnounceResponse]
+    error: typing.Optional[BaseException]
+
+    @property
+    def ok(self) -> bool:
+        """Get if the transaction was announced."""
+        return self.error is None
+
+
+def is_transient(exc: BaseException) -> bool:
+    """Determine if an announce failed for a reason worth retrying."""
+
+    status = getattr(exc, 'status', None)
+    if isinstance(status, int):
+        return status in retry.RETRY_STATUSES
+    return isinstance(exc, retry.DEFAULT_EXCEPTIONS + (CircuitOpenError,))
+
+
+class Node(util.Object):
+    """In-flight window for a single node."""
+
+    __slots__ = ('http', 'endpoint', 'window', 'in_flight', 'announced', 'failures')
+
+    http: typing.Any
+    endpoint: str
+    window: float
+    in_flight: int
+    announced: int
+    failures: int
+
+    def __init__(self, http, window: float) -> None:
+        self.http = http
+        self.endpoint = http.raw.endpoint
+        self.window = window
+        self.in_flight = 0
+        self.announced = 0
+        self.failures = 0
+
+    @property
+    def free(self) -> float:
+        return self.window - self.in_flight
+
+
+class AnnouncePipeline(util.Object):
+    """
+    Announce signed transactions with bounded, adaptive concurrency.
+
+    :param clients: Asynchronous transaction HTTP clients, one per node.
+    :param concurrency: (Optional) maximum in-flight announces per node.
+    :param max_attempts: (Optional) maximum attempts per transaction.
+    :param backoff_base: (Optional) seconds to wait before the first retry.
+    :param backoff_max: (Optional) maximum seconds to wait between attempts.
+    :param dedupe: (Optional) skip transactions with already announced hashes.
+    """
+
+    submitted: int
+    announced: int
+    failed: int
+    duplicates: int
+    retries: int
+    elapsed: float
+    _nodes: typing.List[Node]
+    _concurrency: int
+    _max_attempts: int
+    _backoff_base: float
+    _backoff_max: float
+    _dedupe: bool
+    _seen: typing.Set[str]
+    _released: typing.Optional[asyncio.Event]
+
+    def __init__(
+        self,
+        clients: typing.Sequence[typing.Any],
+        concurrency: int = DEFAULT_CONCURRENCY,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        backoff_base: float = DEFAULT_BACKOFF_BASE,
+        backoff_max: float = DEFAULT_BACKOFF_MAX,
+        dedupe: bool = True,
+    ) -> None:
+        if not clients:
+            raise ValueError('Announce pipeline requires at least one client.')
+        if concurrency < 1:
+            raise ValueError('Concurrency must be positive.')
+        if max_attempts < 1:
+            raise ValueError('Announce pipeline requires at least one attempt.')
+        self.submitted = 0
+        self.announced = 0
+        self.failed = 0
+        self.duplicates = 0
+        self.retries = 0
+        self.elapsed = 0.0
+        self._nodes = [Node(i, concurrency) for i in clients]
+        self._concurrency = concurrency
+        self._max_attempts = max_attempts
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._dedupe = dedupe
+        self._seen = set()
+        self._released = None
+
+    @property
+    def throughput(self) -> float:
+        """Get the announced transactions per second."""
+        return self.announced / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def windows(self) -> typing.Dict[str, float]:
+        """Get the current in-flight window by endpoint."""
+        return {i.endpoint: i.window for i in self._nodes}
+
+    async def announce(self, transactions: Source) -> typing.AsyncIterator[AnnounceOutcome]:
+        """
+        Announce transactions, yielding outcomes as they complete.
+
+        Outcomes are yielded in completion order. Stopping iteration
+        early cancels all in-flight announces.
+
+        :param transactions: Iterable or async iterable of signed transactions.
+        """
+
+        self._released = asyncio.Event()
+        # Bound the outcomes, so a slow consumer also slows the pipeline.
+        outcomes: asyncio.Queue = asyncio.Queue(self._concurrency * len(self._nodes))
+        tasks: typing.Set[asyncio.Future] = set()
+        start = time.monotonic()
+
+        async def produce() -> None:
+            async for transaction in aiter_source(transactions):
+                key = transaction.hash.upper()
+                if self._dedupe:
+                    if key in self._seen:
+                        self.duplicates += 1
+                        continue
+                    self._seen.add(key)
+                self.submitted += 1
+                # Only read the next transaction once a node has a free slot.
+                node = await self._acquire()
+                task = asyncio.ensure_future(self._send(node, transaction, outcomes))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks)
+
+        producer = asyncio.ensure_future(produce())
+        try:
+            while not (producer.done() and outcomes.empty()):
+                getter = asyncio.ensure_future(outcomes.get())
+                await asyncio.wait({getter, producer}, return_when=asyncio.FIRST_COMPLETED)
+                if getter.done():
+                    yield getter.result()
+                else:
+                    getter.cancel()
+            producer.result()
+        finally:
+            producer.cancel()
+            for task in list(tasks):
+                task.cancel()
+            await asyncio.gather(producer, *tasks, return_exceptions=True)
+            self.elapsed += time.monotonic() - start
+
+    async def _acquire(self, exclude: typing.Optional[Node] = None) -> Node:
+        """Wait for a free slot, on the node with the most free capacity."""
+
+        released = typing.cast(asyncio.Event, self._released)
+        while True:
+            nodes = [i for i in self._nodes if i is not exclude] or self._nodes
+            node = max(nodes, key=lambda x: x.free)
+            if node.free >= 1:
+                node.in_flight += 1
+                return node
+            released.clear()
+            await released.wait()
+
+    def _release(self, node: Node) -> None:
+        node.in_flight -= 1
+        typing.cast(asyncio.Event, self._released).set()
+
+    async def _send(
+        self,
+        node: Node,
+        transaction: models.SignedTransaction,
+        outcomes: asyncio.Queue,
+    ) -> None:
+        """Announce a single transaction, retrying transient failures."""
+
+        attempt = 0
+        outcome: typing.Optional[AnnounceOutcome] = None
+        while True:
+            attempt += 1
+            try:
+                response = await node.http.announce(transaction)
+            except asyncio.CancelledError:
+                self._release(node)
+                self._seen.discard(transaction.hash.upper())
+                raise
+            except Exception as exc:
+                node.failures += 1
+                error = exc
+                if not is_transient(exc):
+                    break
+                # Multiplicative decrease: halve the window of the node.
+                node.window = max(1.0, node.window / 2)
+                if attempt >= self._max_attempts:
+                    break
+                self._release(node)
+                self.retries += 1
+                ceiling = retry.backoff_ceiling(self._backoff_base, self._backoff_max, attempt - 1)
+                await asyncio.sleep(retry.jitter(ceiling))
+                node = await self._acquire(exclude=node)
+            else:
+                node.announced += 1
+                # Additive increase: grow the window by one per full window.
+                node.window = min(self._concurrency, node.window + 1 / node.window)
+                self.announced += 1
+                outcome = AnnounceOutcome(transaction.hash, node.endpoint, attempt, response, None)
+                break
+
+        if outcome is None:
+            # Failed transactions may be announced again later.
+            self._seen.discard(transaction.hash.upper())
+            self.failed += 1
+            outcome = AnnounceOutcome(transaction.hash, node.endpoint, attempt, None, error)
+        # Hold the slot until the outcome is queued, so a slow consumer
+        # also slows the source.
+        try:
+            await outcomes.put(outcome)
+        finally:
+            self._release(node)
+
+
+async def aiter_source(transactions: Source) -> typing.AsyncIterator[models.SignedTransaction]:
+    """Iterate over a synchronous or asynchronous iterable."""
+
+    if hasattr(transactions, '__aiter__'):
+        async for transaction in typing.cast(typing.AsyncIterable, transactions):
+            yield transaction
+    else:
+        for transaction in typing.cast(typing.Iterable, transactions):
+            yield transaction
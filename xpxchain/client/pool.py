@@ -0,0 +1,289 @@
+"""
+    pool
+    ====
+
+    Health-scored routing of HTTP requests across multiple REST nodes.
+
+    Each node tracks an exponentially-weighted moving average (EWMA) of
+    its request latency and error rate. Every request is routed to the
+    node with the lowest score, and nodes failing repeatedly are skipped
+    for a cooldown period, after which they are probed again.
+
+    License
+    -------
+
+    Copyright 2019 NEM
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import annotations
+import time
+import typing
+
+from . import client
+from .. import util
+
+__all__ = [
+    'AsyncPooledClient',
+    'NodeHealth',
+    'NodeSet',
+    'PooledClient',
+]
+
+# Smoothing factor for the latency and error-rate moving averages.
+DEFAULT_ALPHA = 0.3
+# Seconds a node is skipped for after too many consecutive failures.
+DEFAULT_COOLDOWN = 5.0
+# Number of consecutive failures before a node is skipped.
+DEFAULT_MAX_FAILURES = 3
+# Multiplier for the latency penalty from the error rate.
+ERROR_PENALTY = 10.0
+# Minimum latency (in seconds), so unmeasured nodes still spread load.
+LATENCY_FLOOR = 1e-3
+
+
+class NodeHealth(util.Object):
+    """
+    Rolling health statistics for a single REST node.
+
+    :param endpoint: Normalized URL for the node.
+    :param alpha: (Optional) smoothing factor for the moving averages.
+    """
+
+    endpoint: str
+    latency: typing.Optional[float]
+    error_rate: float
+    requests: int
+    failures: int
+    consecutive_failures: int
+    in_flight: int
+    retry_at: float
+    _alpha: float
+
+    def __init__(self, endpoint: str, alpha: float = DEFAULT_ALPHA) -> None:
+        self.endpoint = endpoint
+        self.latency = None
+        self.error_rate = 0.0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.in_flight = 0
+        self.retry_at = 0.0
+        self._alpha = alpha
+
+    def __repr__(self) -> str:
+        return (
+            f'NodeHealth(endpoint={self.endpoint!r}, latency={self.latency!r}, '
+            f'error_rate={self.error_rate!r}, in_flight={self.in_flight!r})'
+        )
+
+    @property
+    def score(self) -> float:
+        """Get the routing score for the node, lower is healthier."""
+
+        latency = max(self.latency or 0.0, LATENCY_FLOOR)
+        penalty = 1.0 + ERROR_PENALTY * self.error_rate
+        return latency * penalty * (1 + self.in_flight)
+
+    def update(self, elapsed: float, ok: bool) -> None:
+        """
+        Record the outcome of a completed request.
+
+        :param elapsed: Time to complete the request (in seconds).
+        :param ok: If the request succeeded.
+        """
+
+        alpha = self._alpha
+        if self.latency is None:
+            self.latency = elapsed
+        else:
+            self.latency += alpha * (elapsed - self.latency)
+        self.error_rate += alpha * (float(not ok) - self.error_rate)
+        self.requests += 1
+        if ok:
+            self.consecutive_failures = 0
+        else:
+            self.failures += 1
+            self.consecutive_failures += 1
+
+
+class NodeSet(util.Object):
+    """
+    Set of nodes to route requests between by health.
+
+    :param endpoints: Domain names and ports for the nodes.
+    :param cooldown: (Optional) seconds to skip a failing node for.
+    :param max_failures: (Optional) consecutive failures before skipping a node.
+    :param alpha: (Optional) smoothing factor for the moving averages.
+    """
+
+    _nodes: typing.Tuple[NodeHealth, ...]
+    _cooldown: float
+    _max_failures: int
+
+    def __init__(
+        self,
+        endpoints: typing.Sequence[str],
+        cooldown: float = DEFAULT_COOLDOWN,
+        max_failures: int = DEFAULT_MAX_FAILURES,
+        alpha: float = DEFAULT_ALPHA,
+    ) -> None:
+        if not endpoints:
+            raise ValueError('NodeSet requires at least one endpoint.')
+        urls = (client.parse_http_url(i).url for i in endpoints)
+        self._nodes = tuple(NodeHealth(i, alpha) for i in urls)
+        self._cooldown = cooldown
+        self._max_failures = max_failures
+
+    @property
+    def nodes(self) -> typing.Tuple[NodeHealth, ...]:
+        """Get health statistics for all nodes."""
+        return self._nodes
+
+    def select(self) -> NodeHealth:
+        """Select the healthiest node for the next request."""
+
+        now = time.monotonic()
+        available = [i for i in self._nodes if i.retry_at <= now]
+        if not available:
+            # Every node is cooling down, probe whichever recovers first.
+            return min(self._nodes, key=lambda x: x.retry_at)
+        return min(available, key=lambda x: x.score)
+
+    def record(self, node: NodeHealth, elapsed: float, ok: bool) -> None:
+        """
+        Record the outcome of a request to a node.
+
+        :param node: Node the request was routed to.
+        :param elapsed: Time to complete the request (in seconds).
+        :param ok: If the request succeeded.
+        """
+
+        node.update(elapsed, ok)
+        if node.consecutive_failures >= self._max_failures:
+            node.retry_at = time.monotonic() + self._cooldown
+
+
+def is_server_error(status: int) -> bool:
+    """Determine if the node failed to process the request."""
+    return status >= 500
+
+
+@util.inherit_doc
+class PooledClient(client.Client):
+    """
+    Client wrapper routing each request to the healthiest node.
+
+    :param session: Requests-like HTTP client session.
+    :param nodes: Set of nodes to route requests between.
+    :param \\*args: Optional positional arguments for the client.
+    :param \\**kwds: Optional keyword arguments for the client.
+    """
+
+    _nodes: NodeSet
+
+    def __init__(self, session, nodes: NodeSet, *args, **kwds) -> None:
+        super().__init__(session, nodes.nodes[0].endpoint, *args, **kwds)
+        self._nodes = nodes
+
+    @property
+    def nodes(self) -> NodeSet:
+        """Get the set of nodes requests are routed between."""
+        return self._nodes
+
+    def _request(self, method, relative_path, *args, **kwds):
+        node = self._nodes.select()
+        path = node.endpoint + relative_path
+        node.in_flight += 1
+        start = time.perf_counter()
+        try:
+            response = getattr(self._session, method)(path, *args, **kwds)
+        except Exception:
+            self._nodes.record(node, time.perf_counter() - start, False)
+            raise
+        finally:
+            node.in_flight -= 1
+
+        ok = not is_server_error(response.status_code)
+        self._nodes.record(node, time.perf_counter() - start, ok)
+        return response
+
+
+class TrackedRequest:
+    """
+    Wrap an aiohttp-like request context to track the node's health.
+
+    :param request: Awaitable, asynchronous context manager for the response.
+    :param nodes: Set of nodes the request was routed between.
+    :param node: Node the request was routed to.
+    """
+
+    def __init__(self, request, nodes: NodeSet, node: NodeHealth) -> None:
+        self._request = request
+        self._nodes = nodes
+        self._node = node
+
+    def __await__(self):
+        return self._track().__await__()
+
+    async def __aenter__(self):
+        return await self._track(self._request.__aenter__())
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return await self._request.__aexit__(exc_type, exc, tb)
+
+    async def _track(self, awaitable=None):
+        node = self._node
+        node.in_flight += 1
+        start = time.perf_counter()
+        try:
+            response = await (awaitable or self._request)
+        except Exception:
+            self._nodes.record(node, time.perf_counter() - start, False)
+            raise
+        finally:
+            node.in_flight -= 1
+
+        ok = not is_server_error(response.status)
+        self._nodes.record(node, time.perf_counter() - start, ok)
+        return response
+
+
+@util.inherit_doc
+class AsyncPooledClient(client.AsyncClient):
+    """
+    Asynchronous client wrapper routing each request to the healthiest node.
+
+    :param session: Aiohttp-like HTTP client session.
+    :param nodes: Set of nodes to route requests between.
+    :param \\*args: Optional positional arguments for the client.
+    :param \\**kwds: Optional keyword arguments for the client.
+    """
+
+    _nodes: NodeSet
+
+    def __init__(self, session, nodes: NodeSet, *args, **kwds) -> None:
+        super().__init__(session, nodes.nodes[0].endpoint, *args, **kwds)
+        self._nodes = nodes
+
+    @property
+    def nodes(self) -> NodeSet:
+        """Get the set of nodes requests are routed between."""
+        return self._nodes
+
+    def _request(self, method, relative_path, *args, **kwds):
+        node = self._nodes.select()
+        path = node.endpoint + relative_path
+        request = getattr(self._session, method)(path, *args, **kwds)
+        return TrackedRequest(request, self._nodes, node)
@@ -0,0 +1,221 @@
+"""
+    ratelimit
+    =========
+
+    Client-side rate limiting and concurrency caps for a REST node.
+
+    Requests take a token from a token bucket, refilled at a fixed rate
+    up to a burst size, and a slot from a maximum number of in-flight
+    requests. When either limit is hit, requests queue, and are served
+    first-in, first-out, so a large fan-out cannot starve other callers.
+    Time spent queueing is recorded, to tune the limits.
+
+    License
+    -------
+
+    Copyright 2019 NEM
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import annotations
+import asyncio
+import math
+import threading
+import time
+import typing
+
+from .. import util
+
+__all__ = ['RateLimiter']
+
+
+class RateLimiter(util.Object):
+    """
+    Token-bucket rate limiter with a cap on in-flight requests.
+
+    The limiter is thread-safe for synchronous clients. Asynchronous
+    clients must only use it from a single event loop.
+
+    :param rate: (Optional) requests per second, None for no rate limit.
+    :param burst: (Optional) maximum requests sent at once, defaults to the rate.
+    :param max_in_flight: (Optional) maximum concurrent requests, None for no cap.
+    """
+
+    _rate: typing.Optional[float]
+    _burst: float
+    _max_in_flight: typing.Optional[int]
+    _tokens: float
+    _updated: float
+    _in_flight: int
+    _condition: threading.Condition
+    _tickets: int
+    _serving: int
+    _abandoned: typing.Set[int]
+    _queue: typing.Optional[asyncio.Lock]
+    _released: typing.Optional[asyncio.Event]
+    requests: int
+    queued: int
+    queue_time: float
+    max_queue_time: float
+
+    def __init__(
+        self,
+        rate: typing.Optional[float] = None,
+        burst: typing.Optional[float] = None,
+        max_in_flight: typing.Optional[int] = None,
+    ) -> None:
+        if rate is not None and rate <= 0:
+            raise ValueError('Rate limit must be positive.')
+        if max_in_flight is not None and max_in_flight < 1:
+            raise ValueError('Maximum in-flight requests must be positive.')
+        if burst is None:
+            burst = max(rate or 1.0, 1.0)
+        if burst < 1:
+            raise ValueError('Burst size must be at least 1.')
+        self._rate = rate
+        self._burst = burst
+        self._max_in_flight = max_in_flight
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._in_flight = 0
+        self._condition = threading.Condition()
+        self._tickets = 0
+        self._serving = 0
+        self._abandoned = set()
+        self._queue = None
+        self._released = None
+        self.requests = 0
+        self.queued = 0
+        self.queue_time = 0.0
+        self.max_queue_time = 0.0
+
+    @property
+    def rate(self) -> typing.Optional[float]:
+        """Get the maximum requests per second."""
+        return self._rate
+
+    @property
+    def burst(self) -> float:
+        """Get the maximum requests sent at once."""
+        return self._burst
+
+    @property
+    def max_in_flight(self) -> typing.Optional[int]:
+        """Get the maximum concurrent requests."""
+        return self._max_in_flight
+
+    @property
+    def in_flight(self) -> int:
+        """Get the number of requests in-flight."""
+        return self._in_flight
+
+    @property
+    def mean_queue_time(self) -> float:
+        """Get the mean seconds requests spent queueing."""
+        return self.queue_time / self.requests if self.requests else 0.0
+
+    def _take(self) -> float:
+        # Take a token and a slot, returning 0, otherwise the seconds
+        # until a token is available, or infinity to wait for a slot.
+        if self._max_in_flight is not None and self._in_flight >= self._max_in_flight:
+            return math.inf
+        if self._rate is not None:
+            now = time.monotonic()
+            self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            if self._tokens < 1:
+                return (1 - self._tokens) / self._rate
+            self._tokens -= 1
+        self._in_flight += 1
+        return 0.0
+
+    def _retire(self, ticket: int) -> None:
+        # Retire a served or abandoned ticket, skipping the queue past
+        # any tickets abandoned by interrupted waiters.
+        self._abandoned.add(ticket)
+        while self._serving in self._abandoned:
+            self._abandoned.remove(self._serving)
+            self._serving += 1
+        self._condition.notify_all()
+
+    def _record(self, start: float) -> None:
+        elapsed = time.monotonic() - start
+        self.requests += 1
+        self.queued += 1
+        self.queue_time += elapsed
+        self.max_queue_time = max(self.max_queue_time, elapsed)
+
+    def acquire(self) -> None:
+        """Wait, in order, until a request may be sent."""
+
+        with self._condition:
+            if self._tickets == self._serving and self._take() == 0:
+                self.requests += 1
+                return
+
+            start = time.monotonic()
+            ticket = self._tickets
+            self._tickets += 1
+            try:
+                while True:
+                    timeout: typing.Optional[float] = None
+                    if ticket == self._serving:
+                        delay = self._take()
+                        if delay == 0:
+                            break
+                        timeout = None if delay == math.inf else delay
+                    self._condition.wait(timeout)
+            finally:
+                # Always give up the ticket, even if the wait was
+                # interrupted, or every later caller would block forever.
+                self._retire(ticket)
+            self._record(start)
+
+    async def acquire_async(self) -> None:
+        """Wait, in order, until a request may be sent."""
+
+        queue = self._queue
+        if queue is None:
+            queue = self._queue = asyncio.Lock()
+            self._released = asyncio.Event()
+        released = typing.cast(asyncio.Event, self._released)
+        with self._condition:
+            if not queue.locked() and self._take() == 0:
+                self.requests += 1
+                return
+
+        # The asyncio lock wakes waiters in order, so only the head of
+        # the queue waits for a token or slot.
+        start = time.monotonic()
+        async with queue:
+            while True:
+                with self._condition:
+                    delay = self._take()
+                if delay == 0:
+                    break
+                if delay == math.inf:
+                    released.clear()
+                    await released.wait()
+                else:
+                    await asyncio.sleep(delay)
+        self._record(start)
+
+    def release(self) -> None:
+        """Release the slot for a completed request."""
+
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+        if self._released is not None:
+            self._released.set()
@@ -0,0 +1,331 @@
+"""
+    reconnect
+    =========
+
+    Reconnection policy for websockets listeners.
+
+    A listener with a reconnection policy survives dropped connections:
+    it reconnects with exponential backoff and full jitter, obtains a new
+    UID, replays its active subscriptions, and backfills the blocks (and
+    the confirmed transactions for watched addresses) produced during the
+    outage, through block range queries over HTTP, reading every page of
+    the transactions of each block. Messages delivered both by the
+    backfill and by the new connection are only emitted once, so
+    consumers see a gap-free stream.
+
+    Example:
+        .. code-block:: python
+
+           >>> from xpxchain import client
+           >>> policy = client.ReconnectPolicy(backoff_max=10)
+           >>> async with client.Listener(endpoint, reconnect=policy) as listener:
+           ...     await listener.new_block()
+           ...     async for message in listener:
+           ...         print(message.message.height)
+           >>> policy.reconnects, policy.backfilled
+
+    License
+    -------
+
+    Copyright 2019 NEM
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import annotations
+import asyncio
+import typing
+import websockets
+
+from . import lazy
+from . import retry
+from .. import models
+from .. import util
+
+__all__ = ['ReconnectPolicy']
+
+DEFAULT_BACKOFF_BASE = 0.5
+DEFAULT_BACKOFF_MAX = 30.0
+# Number of confirmed transaction hashes remembered, to skip duplicates.
+DEFAULT_HISTORY = 10000
+
+# Errors from a dropped connection. The server closing the connection
+# normally ends the iteration, which is handled by the listener.
+DEFAULT_EXCEPTIONS: typing.Tuple[typing.Type[BaseException], ...] = (
+    websockets.ConnectionClosed,
+) + retry.DEFAULT_EXCEPTIONS
+
+# Channel prefix for confirmed transactions of an address.
+CONFIRMED_PREFIX = 'confirmedAdded/'
+# Size of an encoded recipient, an address or a padded namespace ID.
+RECIPIENT_SIZE = 25
+
+Missed = typing.Tuple[str, typing.Any]
+
+
+class ReconnectPolicy(util.Object):
+    """
+    Policy for reconnecting dropped listeners.
+
+    :param max_attempts: (Optional) maximum consecutive attempts, None to retry forever.
+    :param backoff_base: (Optional) seconds to wait before the first attempt.
+    :param backoff_max: (Optional) maximum seconds to wait between attempts.
+    :param backfill: (Optional) backfill messages missed while disconnected.
+    :param history: (Optional) number of confirmed transactions remembered, to skip duplicates.
+    :param exceptions: (Optional) exception types from dropped connections.
+    """
+
+    _max_attempts: typing.Optional[int]
+    _backoff_base: float
+    _backoff_max: float
+    _backfill: bool
+    _history: int
+    _exceptions: typing.Tuple[typing.Type[BaseException], ...]
+    reconnects: int
+    backfilled: int
+
+    def __init__(
+        self,
+        max_attempts: typing.Optional[int] = None,
+        backoff_base: float = DEFAULT_BACKOFF_BASE,
+        backoff_max: float = DEFAULT_BACKOFF_MAX,
+        backfill: bool = True,
+        history: int = DEFAULT_HISTORY,
+        exceptions: typing.Tuple[typing.Type[BaseException], ...] = DEFAULT_EXCEPTIONS,
+    ) -> None:
+        if max_attempts is not None and max_attempts < 1:
+            raise ValueError('Reconnect policy requires at least one attempt.')
+        self._max_attempts = max_attempts
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._backfill = backfill
+        self._history = history
+        self._exceptions = exceptions
+        self.reconnects = 0
+        self.backfilled = 0
+
+    @property
+    def backfill(self) -> bool:
+        """Get if messages missed while disconnected are backfilled."""
+        return self._backfill
+
+    @property
+    def history(self) -> int:
+        """Get the number of confirmed transactions remembered."""
+        return self._history
+
+    @property
+    def exceptions(self) -> typing.Tuple[typing.Type[BaseException], ...]:
+        """Get the exception types from dropped connections."""
+        return self._exceptions
+
+    def exhausted(self, attempt: int) -> bool:
+        """
+        Determine if no further attempts should be made.
+
+        :param attempt: Number of attempts already made.
+        """
+
+        return self._max_attempts is not None and attempt >= self._max_attempts
+
+    def delay(self, attempt: int) -> float:
+        """
+        Get the seconds to wait before reconnecting, with full jitter.
+
+        :param attempt: Number of attempts already made.
+        """
+
+        return retry.jitter(retry.backoff_ceiling(self._backoff_base, self._backoff_max, attempt))
+
+
+def watched_addresses(channels: typing.Iterable[str]) -> typing.FrozenSet[str]:
+    """Get the addresses with subscriptions to confirmed transactions."""
+
+    size = len(CONFIRMED_PREFIX)
+    return frozenset(i[size:] for i in channels if i.startswith(CONFIRMED_PREFIX))
+
+
+def transaction_addresses(transaction: models.Transaction) -> typing.Set[str]:
+    """Get the signer and recipient addresses involved in a transaction."""
+
+    addresses = set()
+    if transaction.signer is not None:
+        addresses.add(transaction.signer.address.address)
+    recipient = getattr(transaction, 'recipient', None)
+    if isinstance(recipient, models.Address):
+        addresses.add(recipient.address)
+    for inner in getattr(transaction, 'inner_transactions', ()):
+        addresses |= transaction_addresses(inner)
+    return addresses
+
+
+def transaction_dto_addresses(data: dict) -> typing.Set[str]:
+    """
+    Get the addresses from `transaction_addresses`, from a transaction DTO.
+
+    Only the signer and recipient are decoded, rather than the whole model.
+    """
+
+    transaction = data['transaction']
+    # The network type is the high byte of the version.
+    network_type = models.NetworkType((transaction['version'] >> 24) & 0xFF)
+    addresses = set()
+    signer = transaction.get('signer')
+    if signer is not None:
+        addresses.add(models.Address.create_from_public_key(signer, network_type).address)
+    recipient = transaction.get('recipient')
+    if isinstance(recipient, str) and len(recipient) == 2 * RECIPIENT_SIZE:
+        encoded = util.unhexlify(recipient)
+        # Namespace aliases have the low bit of the first byte set.
+        if not encoded[0] & 1:
+            addresses.add(models.Address.create_from_encoded(encoded).address)
+    for inner in transaction.get('transactions', ()):
+        addresses |= transaction_dto_addresses(inner)
+    return addresses
+
+
+class ListenerRecovery(util.Object):
+    """
+    Recovery state of a listener with a reconnection policy.
+
+    Tracks the chain height and the recently confirmed transactions
+    delivered, to backfill missed messages and to skip duplicates.
+
+    :param policy: Policy to reconnect dropped connections.
+    :param http: (Optional) asynchronous blockchain client to backfill missed messages.
+    """
+
+    _policy: ReconnectPolicy
+    _http: typing.Any
+    _recent: typing.Dict[str, None]
+    height: typing.Optional[int]
+
+    def __init__(self, policy: ReconnectPolicy, http=None) -> None:
+        self._policy = policy
+        self._http = http
+        self._recent = {}
+        self.height = None
+
+    @property
+    def policy(self) -> ReconnectPolicy:
+        """Get the policy to reconnect dropped connections."""
+        return self._policy
+
+    async def start(self) -> None:
+        """Get the chain height to backfill from, once connected."""
+
+        if self._policy.backfill and self._http is not None:
+            self.height = await self._http.get_blockchain_height()
+
+    async def reconnect(self, reopen: typing.Callable[[], typing.Awaitable[None]]) -> None:
+        """
+        Reopen the connection, with backoff, until it succeeds or the policy is exhausted.
+
+        :param reopen: Callback to reconnect and resubscribe.
+        """
+
+        policy = self._policy
+        attempt = 0
+        while True:
+            await asyncio.sleep(policy.delay(attempt))
+            attempt += 1
+            try:
+                await reopen()
+                break
+            except policy.exceptions:
+                if policy.exhausted(attempt):
+                    raise
+        policy.reconnects += 1
+
+    async def backfill(self, channels: typing.Collection[str]) -> typing.AsyncIterator[Missed]:
+        """
+        Get the blocks and confirmed transactions missed while disconnected.
+
+        Yields the channel name and model of each missed message.
+
+        :param channels: Active subscriptions of the listener.
+        """
+
+        blocks = 'block' in channels
+        watched = watched_addresses(channels)
+        if not self._policy.backfill or self._http is None or self.height is None:
+            return
+        if not blocks and not watched:
+            return
+
+        # Subscriptions are active again, so later messages are live.
+        end = await self._http.get_blockchain_height()
+        async for missed in self._missed(self.height + 1, end, blocks, watched):
+            self._policy.backfilled += 1
+            yield missed
+        self.height = max(self.height, end)
+
+    async def _missed(
+        self,
+        start: int,
+        end: int,
+        blocks: bool,
+        watched: typing.FrozenSet[str],
+    ) -> typing.AsyncIterator[Missed]:
+        """Get the missed blocks, and the new transactions of watched addresses."""
+
+        if start > end:
+            return
+        iterator = self._http.iter_blocks(start, end, transactions=bool(watched))
+        async for item in iterator:
+            block, transactions = (item[0], item[1]) if watched else (item, ())
+            if blocks:
+                yield ('block', block)
+            for transaction in transactions:
+                involved = watched & transaction_addresses(transaction)
+                if involved and self.remember(getattr(transaction.transaction_info, 'hash', None)):
+                    yield ('confirmedAdded', transaction)
+
+    def remember(self, hash: typing.Optional[str]) -> bool:
+        """
+        Remember a confirmed transaction, returning if it is new.
+
+        :param hash: Transaction hash, if known.
+        """
+
+        if hash is None:
+            return True
+        hash = hash.upper()
+        if hash in self._recent:
+            return False
+        self._recent[hash] = None
+        while len(self._recent) > self._policy.history:
+            del self._recent[next(iter(self._recent))]
+        return True
+
+    def accept(self, channel_name: str, value: typing.Any) -> bool:
+        """
+        Track the chain height, returning if a live message was not already delivered.
+
+        :param channel_name: Channel name of the message.
+        :param value: Model, or lazy model, of the message.
+        """
+
+        # Only read fields lazy models get without decoding.
+        kind = lazy.model_type(value)
+        if issubclass(kind, models.BlockInfo):
+            height = value.height
+            if self.height is not None and height <= self.height:
+                return False
+            self.height = height
+        elif issubclass(kind, models.Transaction) and channel_name == 'confirmedAdded':
+            info = value.transaction_info
+            if info is not None and self.height is not None:
+                self.height = max(self.height, info.height - 1)
+            return self.remember(getattr(info, 'hash', None))
+        return True
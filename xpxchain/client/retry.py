@@ -0,0 +1,412 @@
+"""
+    retry
+    =====
+
+    Retry policies and circuit breakers for NIS requests.
+
+    Transient failures (connection errors, timeouts, and server-side
+    status codes) are retried with exponential backoff and full jitter,
+    so clients recovering from an outage do not retry in lockstep. Only
+    idempotent requests are retried by default, since announcing a
+    transaction twice may not be safe.
+
+    A circuit breaker tracks consecutive failures per endpoint, and while
+    an endpoint is unhealthy, fails requests immediately rather than
+    waiting for each to time out. After a cooldown, a single probe
+    request is allowed through, closing the circuit if it succeeds.
+
+    License
+    -------
+
+    Copyright 2019 NEM
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import annotations
+import aiohttp
+import asyncio
+import random
+import threading
+import time
+import typing
+
+from .. import util
+from ..errors import CircuitOpenError
+
+__all__ = [
+    'CircuitBreaker',
+    'RetryPolicy',
+]
+
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_BACKOFF_BASE = 0.1
+DEFAULT_BACKOFF_MAX = 5.0
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 30.0
+
+# Transport errors worth retrying. Requests exceptions derive from
+# IOError, and aiohttp timeouts from asyncio.TimeoutError.
+DEFAULT_EXCEPTIONS: typing.Tuple[typing.Type[BaseException], ...] = (
+    OSError,
+    asyncio.TimeoutError,
+    aiohttp.ClientConnectionError,
+)
+
+# Status codes for responses worth retrying.
+RETRY_STATUSES: typing.FrozenSet[int] = frozenset({429, 500, 502, 503, 504})
+
+# Endpoints which are not safe to repeat.
+NON_IDEMPOTENT: typing.FrozenSet[str] = frozenset({
+    'announce',
+    'announce_partial',
+    'announce_cosignature',
+})
+
+# Largest exponent for exponential backoff, so the ceiling never
+# overflows a float, however many attempts were made.
+MAX_BACKOFF_EXPONENT = 32
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+def is_failure(status: int) -> bool:
+    """Determine if the node failed to process the request."""
+    return status >= 500
+
+
+def backoff_ceiling(base: float, maximum: float, exponent: int) -> float:
+    """Get the longest delay for exponential backoff, at most `maximum`."""
+    return min(maximum, base * 2 ** min(exponent, MAX_BACKOFF_EXPONENT))
+
+
+def jitter(ceiling: float) -> float:
+    """Get a random delay up to `ceiling`, spreading out retries (full jitter)."""
+    # Jitter only staggers retries, so it needs no cryptographic randomness.
+    return random.uniform(0, ceiling)  # nosec
+
+
+class RetryPolicy(util.Object):
+    """
+    Policy for retrying failed requests.
+
+    :param max_attempts: (Optional) maximum number of attempts per request.
+    :param backoff_base: (Optional) seconds to wait before the first retry.
+    :param backoff_max: (Optional) maximum seconds to wait between attempts.
+    :param retry_announces: (Optional) also retry announcing transactions.
+    :param exceptions: (Optional) exception types to retry.
+    """
+
+    _max_attempts: int
+    _backoff_base: float
+    _backoff_max: float
+    _retry_announces: bool
+    _exceptions: typing.Tuple[typing.Type[BaseException], ...]
+    retries: int
+
+    def __init__(
+        self,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        backoff_base: float = DEFAULT_BACKOFF_BASE,
+        backoff_max: float = DEFAULT_BACKOFF_MAX,
+        retry_announces: bool = False,
+        exceptions: typing.Tuple[typing.Type[BaseException], ...] = DEFAULT_EXCEPTIONS,
+    ) -> None:
+        if max_attempts < 1:
+            raise ValueError('Retry policy requires at least one attempt.')
+        self._max_attempts = max_attempts
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._retry_announces = retry_announces
+        self._exceptions = exceptions
+        self.retries = 0
+
+    @property
+    def max_attempts(self) -> int:
+        """Get the maximum number of attempts per request."""
+        return self._max_attempts
+
+    @property
+    def exceptions(self) -> typing.Tuple[typing.Type[BaseException], ...]:
+        """Get the exception types to retry."""
+        return self._exceptions
+
+    def attempts(self, name: str) -> int:
+        """
+        Get the maximum number of attempts for a request.
+
+        :param name: Name of the NIS endpoint.
+        """
+
+        if name in NON_IDEMPOTENT and not self._retry_announces:
+            return 1
+        return self._max_attempts
+
+    def delay(self, attempt: int) -> float:
+        """
+        Get the seconds to wait before retrying, with full jitter.
+
+        :param attempt: Number of attempts already made.
+        """
+
+        return jitter(backoff_ceiling(self._backoff_base, self._backoff_max, attempt - 1))
+
+
+class Circuit(util.Object):
+    """Circuit state for a single endpoint."""
+
+    __slots__ = ('failures', 'retry_at', 'probing')
+
+    failures: int
+    retry_at: typing.Optional[float]
+    probing: bool
+
+    def __init__(self) -> None:
+        self.failures = 0
+        self.retry_at = None
+        self.probing = False
+
+
+class CircuitBreaker(util.Object):
+    """
+    Fail fast while an endpoint is unhealthy.
+
+    The circuit for an endpoint opens after consecutive failures, rejecting
+    all requests until the reset timeout, after which a single probe is
+    allowed through. The circuit closes if the probe succeeds, otherwise
+    it opens again.
+
+    :param failure_threshold: (Optional) consecutive failures before opening the circuit.
+    :param reset_timeout: (Optional) seconds before probing an open circuit.
+    """
+
+    _failure_threshold: int
+    _reset_timeout: float
+    _circuits: typing.Dict[str, Circuit]
+    _lock: threading.Lock
+    trips: int
+    rejections: int
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+    ) -> None:
+        if failure_threshold < 1:
+            raise ValueError('Failure threshold must be positive.')
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._circuits = {}
+        self._lock = threading.Lock()
+        self.trips = 0
+        self.rejections = 0
+
+    def _circuit(self, endpoint: str) -> Circuit:
+        circuit = self._circuits.get(endpoint)
+        if circuit is None:
+            circuit = self._circuits[endpoint] = Circuit()
+        return circuit
+
+    def state(self, endpoint: str) -> str:
+        """
+        Get the state of the circuit for an endpoint.
+
+        :param endpoint: Normalized URL for the endpoint.
+        """
+
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            if circuit.retry_at is None:
+                return CLOSED
+            if circuit.probing or circuit.retry_at <= time.monotonic():
+                return HALF_OPEN
+            return OPEN
+
+    def check(self, endpoint: str) -> bool:
+        """
+        Check a request to an endpoint may be sent.
+
+        The caller must record the outcome of a probe, or release it.
+
+        :param endpoint: Normalized URL for the endpoint.
+        :return: If the request is the probe for a half-open circuit.
+        :raises CircuitOpenError: Circuit is open for the endpoint.
+        """
+
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            if circuit.retry_at is None:
+                return False
+            if not circuit.probing and circuit.retry_at <= time.monotonic():
+                circuit.probing = True
+                return True
+            self.rejections += 1
+            raise CircuitOpenError(endpoint, circuit.retry_at)
+
+    def release(self, endpoint: str) -> None:
+        """
+        Release the probe for an endpoint, without recording an outcome.
+
+        Allows another probe through, for example if the probe was cancelled.
+
+        :param endpoint: Normalized URL for the endpoint.
+        """
+
+        with self._lock:
+            self._circuit(endpoint).probing = False
+
+    def record(self, endpoint: str, ok: bool) -> None:
+        """
+        Record the outcome of a request to an endpoint.
+
+        :param endpoint: Normalized URL for the endpoint.
+        :param ok: If the request succeeded.
+        """
+
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            if ok:
+                circuit.failures = 0
+                circuit.retry_at = None
+                circuit.probing = False
+                return
+
+            circuit.failures += 1
+            if circuit.probing or circuit.failures >= self._failure_threshold:
+                if circuit.retry_at is None:
+                    self.trips += 1
+                circuit.retry_at = time.monotonic() + self._reset_timeout
+                circuit.probing = False
+
+
+class Attempts(util.Object):
+    """
+    Attempts at a single request, under a retry policy and circuit breaker.
+
+    Iterate over the attempts, which waits between attempts, and report
+    the outcome of each, which determines if the request is retried.
+    Always call `finish` once done, so a probe without an outcome, such
+    as a cancelled request, is released.
+
+    :param policy: (Optional) retry policy.
+    :param breaker: (Optional) circuit breaker.
+    :param endpoint: Normalized URL for the endpoint.
+    :param name: Name of the NIS endpoint.
+    """
+
+    __slots__ = ('_policy', '_breaker', '_endpoint', '_count', '_attempt', '_probe')
+
+    _policy: typing.Optional[RetryPolicy]
+    _breaker: typing.Optional[CircuitBreaker]
+    _endpoint: str
+    _count: int
+    _attempt: int
+    _probe: bool
+
+    def __init__(
+        self,
+        policy: typing.Optional[RetryPolicy],
+        breaker: typing.Optional[CircuitBreaker],
+        endpoint: str,
+        name: str,
+    ) -> None:
+        self._policy = policy
+        self._breaker = breaker
+        self._endpoint = endpoint
+        self._count = policy.attempts(name) if policy is not None else 1
+        self._attempt = 0
+        self._probe = False
+
+    @property
+    def last(self) -> bool:
+        """Get if the current attempt is the last."""
+        return self._attempt >= self._count
+
+    def _next(self) -> typing.Optional[float]:
+        # Start the next attempt, returning the delay before it.
+        policy = self._policy
+        delay = None
+        if self._attempt and policy is not None:
+            policy.retries += 1
+            delay = policy.delay(self._attempt)
+        self._attempt += 1
+        return delay
+
+    def _check(self) -> None:
+        if self._breaker is not None:
+            self._probe = self._breaker.check(self._endpoint)
+
+    def _record(self, ok: bool) -> None:
+        if self._breaker is not None:
+            self._breaker.record(self._endpoint, ok)
+            self._probe = False
+
+    def finish(self) -> None:
+        """Release the probe for the endpoint, if its outcome was never recorded."""
+
+        if self._probe:
+            typing.cast(CircuitBreaker, self._breaker).release(self._endpoint)
+            self._probe = False
+
+    # Iterate without generators: requests usually return from inside
+    # the loop, and an unfinished async generator must be finalized by
+    # the event loop, which is costly for every request.
+
+    def __iter__(self) -> Attempts:
+        return self
+
+    def __next__(self) -> int:
+        if self.last:
+            raise StopIteration
+        delay = self._next()
+        if delay:
+            time.sleep(delay)
+        self._check()
+        return self._attempt
+
+    def __aiter__(self) -> Attempts:
+        return self
+
+    async def __anext__(self) -> int:
+        if self.last:
+            raise StopAsyncIteration
+        delay = self._next()
+        if delay:
+            await asyncio.sleep(delay)
+        self._check()
+        return self._attempt
+
+    def retry_status(self, status: int) -> bool:
+        """
+        Record the status of a response, and determine if it must be retried.
+
+        :param status: HTTP status code for the response.
+        """
+
+        self._record(not is_failure(status))
+        return status in RETRY_STATUSES and not self.last
+
+    def retry_exception(self, exc: BaseException) -> bool:
+        """
+        Record an exception from a request, and determine if it must be retried.
+
+        :param exc: Exception raised sending the request.
+        """
+
+        exceptions = self._policy.exceptions if self._policy is not None else DEFAULT_EXCEPTIONS
+        if not isinstance(exc, exceptions):
+            return False
+        self._record(False)
+        return not self.last
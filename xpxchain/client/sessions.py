@@ -0,0 +1,286 @@
+"""
+    sessions
+    ========
+
+    Process-wide registry of HTTP sessions, shared across clients.
+
+    Each client normally creates its own session, and therefore its own
+    connection pool, so short-lived clients pay for a new TCP and TLS
+    handshake on every use. The registry keeps one session per endpoint,
+    and hands out shared handles to the clients: closing a client only
+    closes its handle, and the pooled connections stay open for the
+    next client until the registry itself is closed.
+
+    Example:
+        .. code-block:: python
+
+           >>> from xpxchain import client
+           >>> sessions = client.SessionRegistry(pool_size=20)
+           >>> for _ in range(10):
+           ...     with client.BlockchainHTTP(endpoint, sessions=sessions) as http:
+           ...         http.get_blockchain_height()
+           >>> sessions.close()
+
+    License
+    -------
+
+    Copyright 2019 NEM
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import annotations
+import aiohttp
+import asyncio
+import requests.adapters
+import threading
+import typing
+
+from .client import parse_http_url
+from .. import util
+
+__all__ = [
+    'SessionRegistry',
+    'default_registry',
+]
+
+# Maximum connections kept open per endpoint.
+DEFAULT_POOL_SIZE = 10
+# Seconds to keep idle connections open, for asynchronous sessions.
+DEFAULT_KEEPALIVE = 15.0
+# Seconds to cache DNS lookups, for asynchronous sessions.
+DEFAULT_DNS_TTL = 300
+
+
+class SharedSession(util.Object):
+    """
+    Handle to a shared synchronous session.
+
+    Closing the handle does not close the underlying session.
+
+    :param session: Shared requests session.
+    """
+
+    _session: typing.Any
+    _closed: bool
+
+    def __init__(self, session) -> None:
+        self._session = session
+        self._closed = False
+
+    def __getattr__(self, name: str) -> typing.Any:
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return getattr(self._session, name)
+
+    @property
+    def session(self) -> typing.Any:
+        """Get the underlying, shared session."""
+        return self._session
+
+    @property
+    def closed(self) -> bool:
+        """Get if the handle has been closed."""
+        return self._closed
+
+    def close(self) -> None:
+        """Close the handle, keeping the shared session open."""
+        self._closed = True
+
+
+class AsyncSharedSession(SharedSession):
+    """
+    Handle to a shared asynchronous session.
+
+    Closing the handle does not close the underlying session.
+
+    :param session: Shared aiohttp session.
+    """
+
+    @property
+    def closed(self) -> bool:
+        return self._closed or self._session.closed
+
+    async def close(self) -> None:  # type: ignore
+        self._closed = True
+
+
+class SessionRegistry(util.Object):
+    """
+    Registry of HTTP sessions, shared by endpoint.
+
+    Synchronous sessions are thread-safe to share, as requests pools
+    connections per-host. Asynchronous sessions are bound to an event
+    loop, so are shared by endpoint and loop.
+
+    Requests does not cache DNS lookups, nor expire idle connections, so
+    `keepalive_timeout` and `dns_ttl` only apply to asynchronous sessions.
+
+    :param pool_size: (Optional) maximum connections kept open per endpoint.
+    :param keepalive_timeout: (Optional) seconds to keep idle connections open.
+    :param dns_ttl: (Optional) seconds to cache DNS lookups, None to cache forever.
+    """
+
+    _pool_size: int
+    _keepalive_timeout: float
+    _dns_ttl: typing.Optional[int]
+    _lock: threading.Lock
+    _sessions: typing.Dict[str, typing.Any]
+    _async_sessions: typing.Dict[typing.Tuple[str, typing.Any], typing.Any]
+
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        keepalive_timeout: float = DEFAULT_KEEPALIVE,
+        dns_ttl: typing.Optional[int] = DEFAULT_DNS_TTL,
+    ) -> None:
+        if pool_size < 1:
+            raise ValueError('Pool size must be positive.')
+        self._pool_size = pool_size
+        self._keepalive_timeout = keepalive_timeout
+        self._dns_ttl = dns_ttl
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self._async_sessions = {}
+
+    def __enter__(self) -> SessionRegistry:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    async def __aenter__(self) -> SessionRegistry:
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close_async()
+
+    @property
+    def pool_size(self) -> int:
+        """Get the maximum connections kept open per endpoint."""
+        return self._pool_size
+
+    @property
+    def keepalive_timeout(self) -> float:
+        """Get the seconds to keep idle connections open."""
+        return self._keepalive_timeout
+
+    @property
+    def dns_ttl(self) -> typing.Optional[int]:
+        """Get the seconds to cache DNS lookups."""
+        return self._dns_ttl
+
+    def __len__(self) -> int:
+        return len(self._sessions) + len(self._async_sessions)
+
+    def session(self, endpoint: str) -> SharedSession:
+        """
+        Get a handle to the shared synchronous session for an endpoint.
+
+        :param endpoint: Domain name and port for the endpoint.
+        """
+
+        key = parse_http_url(endpoint).url
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._sessions[key] = self._new_session()
+        return SharedSession(session)
+
+    def async_session(
+        self,
+        endpoint: str,
+        loop: util.OptionalLoopType = None,
+    ) -> AsyncSharedSession:
+        """
+        Get a handle to the shared asynchronous session for an endpoint.
+
+        Sessions are bound to an event loop, so each loop gets its own
+        session, and sessions for closed loops are dropped.
+
+        :param endpoint: Domain name and port for the endpoint.
+        :param loop: (Optional) event loop for the session, the current loop by default.
+        """
+
+        key = (parse_http_url(endpoint).url, current_loop(loop))
+        with self._lock:
+            # Sessions for a closed loop can no longer be used, or closed.
+            for stale in [i for i in self._async_sessions if i[1].is_closed()]:
+                del self._async_sessions[stale]
+            session = self._async_sessions.get(key)
+            if session is None or session.closed:
+                session = self._async_sessions[key] = self._new_async_session(loop)
+        return AsyncSharedSession(session)
+
+    def close(self) -> None:
+        """Close all synchronous sessions."""
+
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+    async def close_async(self) -> None:
+        """Close all sessions, including asynchronous sessions."""
+
+        self.close()
+        with self._lock:
+            sessions = list(self._async_sessions.values())
+            self._async_sessions.clear()
+        for session in sessions:
+            await session.close()
+
+    def _new_session(self):
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=self._pool_size,
+            pool_maxsize=self._pool_size,
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def _new_async_session(self, loop: util.OptionalLoopType):
+        connector = aiohttp.TCPConnector(
+            limit_per_host=self._pool_size,
+            keepalive_timeout=self._keepalive_timeout,
+            ttl_dns_cache=self._dns_ttl,
+            use_dns_cache=True,
+        )
+        return aiohttp.ClientSession(connector=connector, loop=loop)
+
+
+def current_loop(loop: util.OptionalLoopType) -> asyncio.AbstractEventLoop:
+    """Get the event loop a new session is bound to."""
+
+    if loop is not None:
+        return loop
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.get_event_loop()
+
+
+REGISTRY: typing.Optional[SessionRegistry] = None
+REGISTRY_LOCK = threading.Lock()
+
+
+def default_registry() -> SessionRegistry:
+    """Get the process-wide session registry, creating it if required."""
+
+    global REGISTRY
+    with REGISTRY_LOCK:
+        if REGISTRY is None:
+            REGISTRY = SessionRegistry()
+        return REGISTRY
@@ -0,0 +1,416 @@
+"""
+    sharding
+    ========
+
+    Spread the subscriptions of a large address watch-list across many
+    websockets connections, and merge their messages into one stream.
+
+    Every address is assigned to a shard by rendezvous hashing, so all
+    the channels of an address share one connection, and the messages
+    for an address arrive in the order the node sent them. Global
+    channels, such as new blocks, are assigned the same way, by channel
+    name. The shard listeners may connect to the same node or to
+    different nodes.
+
+    When a shard is lost, since its connection failed or closed, its
+    channels are subscribed to on the remaining shards. Rendezvous
+    hashing only moves the channels of the lost shard. Give the shard
+    listeners a reconnection policy to reconnect and backfill dropped
+    connections first, and only rebalance once reconnecting fails.
+
+    Messages from every shard are merged into one stream, in the order
+    they are received. Messages delivered by more than one shard, such
+    as transactions involving addresses on different shards, are only
+    emitted once, and blocks are only emitted in increasing height.
+
+    Example:
+        .. code-block:: python
+
+           >>> from xpxchain import client
+           >>> listener = client.ShardedListener.create([endpoint1, endpoint2], shards=8)
+           >>> async with listener:
+           ...     await listener.watch(addresses)
+           ...     async for message in listener:
+           ...         print(message.channel_name, message.message)
+           >>> listener.duplicates, listener.rebalanced
+
+    License
+    -------
+
+    Copyright 2019 NEM
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import annotations
+import asyncio
+import logging
+import typing
+import zlib
+
+from . import abc
+from . import default
+from . import lazy
+from . import reconnect
+from .. import models
+
+__all__ = ['ShardedListener']
+
+DEFAULT_MAXSIZE = 1000
+# Channels subscribed to for each address by `watch`.
+DEFAULT_WATCH_CHANNELS = ('confirmedAdded', 'unconfirmedAdded', 'status')
+
+# Marks the end of the stream in the merged queue.
+END = object()
+
+
+def shard_key(channel: str) -> str:
+    """Get the key assigning a channel to a shard: its address, or its name."""
+
+    name, _, address = channel.partition('/')
+    return address or name
+
+
+def shard_weight(index: int, key: str) -> int:
+    """Get the rendezvous weight of a key for a shard."""
+
+    return zlib.crc32(f'{index}:{key}'.encode('ascii'))
+
+
+def message_key(message: abc.ListenerMessage) -> typing.Optional[str]:
+    """Get the key identifying duplicate messages, or None for blocks and unknown messages."""
+
+    value = message.message
+    kind = lazy.model_type(value)
+    hash: typing.Optional[str]
+    if isinstance(value, str):
+        hash = value
+    elif issubclass(kind, models.Transaction):
+        hash = getattr(value.transaction_info, 'hash', None)
+    elif issubclass(kind, models.TransactionStatusError):
+        hash = value.hash
+    elif issubclass(kind, models.CosignatureSignedTransaction):
+        cosignature = lazy.materialize(value)
+        hash = f'{cosignature.parent_hash}/{cosignature.signer}'
+    else:
+        return None
+    if hash is None:
+        return None
+    return f'{message.channel_name}/{hash.upper()}'
+
+
+class ShardedListener(abc.ListenerChannels):
+    """
+    Listener spreading subscriptions across shard listeners.
+
+    :param listeners: Shard listeners, entered and exited by the sharded listener.
+    :param maxsize: (Optional) maximum number of merged messages queued.
+    :param history: (Optional) number of messages remembered, to skip duplicates.
+    """
+
+    duplicates: int
+    rebalanced: int
+    _listeners: typing.Sequence[abc.Listener]
+    _live: typing.Dict[int, None]
+    _channels: typing.Dict[str, int]
+    _tasks: typing.Dict[int, asyncio.Future]
+    _queue: asyncio.Queue
+    _maxsize: int
+    _space: asyncio.Event
+    _history: int
+    _recent: typing.Dict[str, None]
+    _height: typing.Optional[int]
+    _error: typing.Optional[BaseException]
+    _done: bool
+
+    def __init__(
+        self,
+        listeners: typing.Sequence[abc.Listener],
+        maxsize: int = DEFAULT_MAXSIZE,
+        history: int = reconnect.DEFAULT_HISTORY,
+    ) -> None:
+        if not listeners:
+            raise ValueError('ShardedListener requires at least one listener.')
+        if maxsize < 1:
+            raise ValueError('ShardedListener must queue at least one message.')
+        self.duplicates = 0
+        self.rebalanced = 0
+        self._listeners = tuple(listeners)
+        self._live = {}
+        self._channels = {}
+        self._tasks = {}
+        # The queue is bounded by `_put` instead, so the end marker always fits.
+        self._queue = asyncio.Queue()
+        self._maxsize = maxsize
+        self._space = asyncio.Event()
+        self._history = history
+        self._recent = {}
+        self._height = None
+        self._error = None
+        self._done = False
+
+    @classmethod
+    def create(
+        cls,
+        endpoints: typing.Union[str, typing.Sequence[str]],
+        shards: typing.Optional[int] = None,
+        maxsize: int = DEFAULT_MAXSIZE,
+        history: int = reconnect.DEFAULT_HISTORY,
+        **kwds,
+    ) -> ShardedListener:
+        """
+        Create a sharded listener, spreading shards across endpoints.
+
+        :param endpoints: Domain name and port for each endpoint.
+        :param shards: (Optional) number of connections, one per endpoint by default.
+        :param maxsize: (Optional) maximum number of merged messages queued.
+        :param history: (Optional) number of messages remembered, to skip duplicates.
+        :param **kwds: (Optional) keyword arguments for each listener.
+        """
+
+        if isinstance(endpoints, str):
+            endpoints = [endpoints]
+        if shards is None:
+            shards = len(endpoints)
+        listeners = [default.Listener(endpoints[i % len(endpoints)], **kwds) for i in range(shards)]
+        return cls(listeners, maxsize, history)
+
+    async def __aenter__(self) -> ShardedListener:
+        results = await asyncio.gather(
+            *(self._open(i) for i in range(len(self._listeners))),
+            return_exceptions=True,
+        )
+        # Shards failing to connect are lost from the start.
+        for index, result in enumerate(results):
+            if not isinstance(result, BaseException):
+                self._live[index] = None
+        if not self._live:
+            raise typing.cast(BaseException, results[0])
+        for index in self._live:
+            self._tasks[index] = asyncio.ensure_future(self._read(index))
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Stop reading, and close every shard listener."""
+
+        tasks = list(self._tasks.values())
+        self._tasks.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        live = list(self._live)
+        self._live.clear()
+        for index in live:
+            await self._exit(index)
+        self._finish(None)
+
+    def __aiter__(self) -> ShardedListener:
+        return self
+
+    async def __anext__(self) -> abc.ListenerMessage:
+        """Iterate over the messages from every shard."""
+
+        message = await self._queue.get()
+        self._space.set()
+        if message is END:
+            # Keep the stream ended for later calls.
+            self._queue.put_nowait(END)
+            if self._error is not None:
+                raise self._error
+            raise StopAsyncIteration
+        return message
+
+    @property
+    def listeners(self) -> typing.Sequence[abc.Listener]:
+        """Get the shard listeners."""
+        return self._listeners
+
+    @property
+    def live(self) -> typing.Sequence[int]:
+        """Get the indexes of the shards still connected."""
+        return list(self._live)
+
+    @property
+    def channels(self) -> typing.Dict[str, int]:
+        """Get the shard index for each subscribed channel."""
+        return dict(self._channels)
+
+    @property
+    def loads(self) -> typing.Dict[int, int]:
+        """Get the number of channels subscribed to on each live shard."""
+
+        loads = dict.fromkeys(self._live, 0)
+        for index in self._channels.values():
+            loads[index] += 1
+        return loads
+
+    @property
+    def depth(self) -> int:
+        """Get the number of merged messages queued."""
+        return self._queue.qsize()
+
+    def shard(self, channel: str) -> int:
+        """
+        Get the live shard index a channel is assigned to.
+
+        :param channel: Channel name, with the address for address channels.
+        """
+
+        if not self._live:
+            raise RuntimeError('ShardedListener has no live shards.')
+        key = shard_key(channel)
+        return max(self._live, key=lambda x: shard_weight(x, key))
+
+    async def subscribe(self, channel: str) -> None:
+        """Subscribe to websockets channel."""
+
+        await self.subscribe_many([channel])
+
+    async def unsubscribe(self, channel: str) -> None:
+        """Unsubscribe from websockets channel."""
+
+        index = self._channels.pop(channel, None)
+        if index is not None and index in self._live:
+            try:
+                await self._listeners[index].unsubscribe(channel)
+            except Exception as exc:
+                await self._lose(index, exc)
+
+    async def subscribe_many(self, channels: typing.Iterable[str]) -> None:
+        """
+        Subscribe to many websockets channels, concurrently across shards.
+
+        :param channels: Channel names, with the address for address channels.
+        """
+
+        groups: typing.Dict[int, typing.List[str]] = {}
+        for channel in channels:
+            if channel not in self._channels:
+                index = self.shard(channel)
+                self._channels[channel] = index
+                groups.setdefault(index, []).append(channel)
+        await asyncio.gather(*(self._send(k, v) for k, v in groups.items()))
+
+    async def watch(
+        self,
+        addresses: typing.Iterable[models.Address],
+        channels: typing.Iterable[str] = DEFAULT_WATCH_CHANNELS,
+    ) -> None:
+        """
+        Subscribe to the channels of many addresses.
+
+        :param addresses: Addresses to watch.
+        :param channels: (Optional) names of the channels to subscribe to for each address.
+        """
+
+        names = tuple(channels)
+        await self.subscribe_many(f'{j}/{i.address}' for i in addresses for j in names)
+
+    async def _open(self, index: int) -> None:
+        listener = self._listeners[index]
+        await listener.__aenter__()
+        try:
+            # Read the UID first, so subscriptions never wait on the socket
+            # concurrently with the reader.
+            await listener.uid
+        except BaseException:
+            await listener.__aexit__(None, None, None)
+            raise
+
+    async def _exit(self, index: int) -> None:
+        try:
+            await self._listeners[index].__aexit__(None, None, None)
+        except reconnect.DEFAULT_EXCEPTIONS as exc:
+            # The connection is already lost.
+            logging.getLogger('xpxchain.client').debug('Closing shard %d failed: %r', index, exc)
+
+    async def _send(self, index: int, channels: typing.Sequence[str]) -> None:
+        """Subscribe to channels on a shard, rebalancing if the shard is lost."""
+
+        listener = self._listeners[index]
+        try:
+            for channel in channels:
+                await listener.subscribe(channel)
+        except Exception as exc:
+            await self._lose(index, exc)
+
+    async def _read(self, index: int) -> None:
+        try:
+            async for message in self._listeners[index]:
+                if self._accept(message):
+                    await self._put(message)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            await self._lose(index, exc)
+        else:
+            await self._lose(index, None)
+
+    async def _lose(self, index: int, error: typing.Optional[BaseException]) -> None:
+        """Remove a lost shard, and move its channels to the live shards."""
+
+        if index not in self._live:
+            return
+        del self._live[index]
+        moved = [k for k, v in self._channels.items() if v == index]
+        for channel in moved:
+            del self._channels[channel]
+        task = self._tasks.pop(index, None)
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+        await self._exit(index)
+        if not self._live:
+            self._finish(error)
+            return
+
+        self.rebalanced += len(moved)
+        await self.subscribe_many(moved)
+
+    def _accept(self, message: abc.ListenerMessage) -> bool:
+        """Skip blocks already delivered, and messages delivered by another shard."""
+
+        if message.channel_name == 'block':
+            height = message.message.height
+            if self._height is not None and height <= self._height:
+                self.duplicates += 1
+                return False
+            self._height = height
+            return True
+
+        key = message_key(message)
+        if key is None:
+            return True
+        elif key in self._recent:
+            self.duplicates += 1
+            return False
+        self._recent[key] = None
+        while len(self._recent) > self._history:
+            del self._recent[next(iter(self._recent))]
+        return True
+
+    async def _put(self, message: abc.ListenerMessage) -> None:
+        while self._queue.qsize() >= self._maxsize and not self._done:
+            self._space.clear()
+            await self._space.wait()
+        if not self._done:
+            self._queue.put_nowait(message)
+
+    def _finish(self, error: typing.Optional[BaseException]) -> None:
+        if not self._done:
+            self._done = True
+            self._error = error
+            self._queue.put_nowait(END)
+            self._space.set()
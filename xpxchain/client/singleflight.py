@@ -0,0 +1,130 @@
+"""
+    singleflight
+    ============
+
+    Coalesce concurrent, identical asynchronous requests.
+
+    While a request is in flight, any identical request (same NIS
+    endpoint and arguments) awaits the pending result rather than
+    making another network round trip, so the response is only
+    fetched and decoded once. Every awaiter receives the same,
+    immutable model.
+
+    Example:
+        .. code-block:: python
+
+           >>> from xpxchain import client
+           >>> async with client.AsyncBlockchainHTTP(endpoint, coalesce=True) as http:
+           ...     heights = await asyncio.gather(*(
+           ...         http.get_blockchain_height() for _ in range(100)
+           ...     ))
+           >>> http.single_flight.calls, http.single_flight.shared
+           (1, 99)
+
+    License
+    -------
+
+    Copyright 2019 NEM
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import annotations
+import asyncio
+import typing
+
+from .. import util
+
+__all__ = ['SingleFlight']
+
+
+class SingleFlight(util.Object):
+    """
+    Registry of in-flight asynchronous requests, by request key.
+
+    :param loop: (Optional) Event loop to schedule requests on.
+    """
+
+    calls: int
+    shared: int
+    _pending: typing.Dict[typing.Hashable, asyncio.Future]
+    _loop: util.OptionalLoopType
+
+    def __init__(self, loop: util.OptionalLoopType = None) -> None:
+        self.calls = 0
+        self.shared = 0
+        self._pending = {}
+        self._loop = loop
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def __contains__(self, key: typing.Hashable) -> bool:
+        return key in self._pending
+
+    @staticmethod
+    def key(
+        name: str,
+        args: typing.Sequence[typing.Any],
+        kwds: typing.Mapping[str, typing.Any],
+    ) -> typing.Optional[typing.Hashable]:
+        """
+        Get the key identifying a request, or None if it cannot be shared.
+
+        :param name: Name of the NIS endpoint.
+        :param args: Positional arguments for the request.
+        :param kwds: Keyword arguments for the request.
+        """
+
+        # The network type only affects decoding, and may be a coroutine.
+        items = tuple(sorted((k, v) for k, v in kwds.items() if k != 'network_type'))
+        key = (name, tuple(args), items)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    async def run(
+        self,
+        key: typing.Hashable,
+        factory: typing.Callable[[], typing.Awaitable[typing.Any]],
+    ) -> typing.Any:
+        """
+        Await the pending request for the key, or start a new request.
+
+        Cancelling a single awaiter does not cancel the shared request.
+
+        :param key: Request key from `key`.
+        :param factory: Callable returning the awaitable for a new request.
+        """
+
+        future = self._pending.get(key)
+        if future is None:
+            self.calls += 1
+            future = asyncio.ensure_future(factory(), loop=self._loop)
+            self._pending[key] = future
+            future.add_done_callback(lambda x: self._done(key, x))
+        else:
+            self.shared += 1
+        return await asyncio.shield(future)
+
+    def _done(self, key: typing.Hashable, future: asyncio.Future) -> None:
+        """Remove the completed request, so later requests are not stale."""
+
+        if self._pending.get(key) is future:
+            del self._pending[key]
+        if not future.cancelled():
+            # Mark the exception as retrieved: every awaiter may have
+            # been cancelled, and the exception is raised to the rest.
+            future.exception()
@@ -1,5 +1,13 @@
+from .bulk_request_error import *
+from .cassette_miss_error import *
+from .circuit_open_error import *
+from .missing_block_error import *
 from .transaction_error import *
 
 __all__ = (
-    transaction_error.__all__
+    bulk_request_error.__all__
+    + cassette_miss_error.__all__
+    + circuit_open_error.__all__
+    + missing_block_error.__all__
+    + transaction_error.__all__
 )
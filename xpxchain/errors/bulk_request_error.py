@@ -0,0 +1,23 @@
+import typing
+
+__all__ = ['BulkRequestError']
+
+
+class BulkRequestError(Exception):
+
+    results: typing.List[typing.Any]
+    errors: typing.List[typing.Tuple[typing.Sequence[typing.Any], Exception]]
+    chunks: int
+
+    def __init__(
+        self,
+        results: typing.List[typing.Any],
+        errors: typing.List[typing.Tuple[typing.Sequence[typing.Any], Exception]],
+        chunks: int,
+    ):
+        self.results = results
+        self.errors = errors
+        self.chunks = chunks
+
+    def __str__(self):
+        return f'{len(self.errors)} of {self.chunks} chunks failed: {self.errors[0][1]!r}'
@@ -0,0 +1,14 @@
+__all__ = ['CassetteMissError']
+
+
+class CassetteMissError(LookupError):
+
+    method: str
+    url: str
+
+    def __init__(self, method: str, url: str):
+        self.method = method
+        self.url = url
+
+    def __str__(self):
+        return f'No recorded response for {self.method} {self.url}.'
@@ -0,0 +1,14 @@
+__all__ = ['CircuitOpenError']
+
+
+class CircuitOpenError(Exception):
+
+    endpoint: str
+    retry_at: float
+
+    def __init__(self, endpoint: str, retry_at: float):
+        self.endpoint = endpoint
+        self.retry_at = retry_at
+
+    def __str__(self):
+        return f'Circuit open for {self.endpoint}, failing fast.'
@@ -0,0 +1,12 @@
+__all__ = ['MissingBlockError']
+
+
+class MissingBlockError(LookupError):
+
+    height: int
+
+    def __init__(self, height: int):
+        self.height = height
+
+    def __str__(self):
+        return f'Node returned no block at height {self.height}.'
@@ -0,0 +1,33 @@
+"""
+    indexer
+    =======
+
+    Resumable indexer of blocks, transactions and receipts into a local
+    SQLite database.
+
+    License
+    -------
+
+    Copyright 2019 NEM
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+# type: ignore
+from .database import *
+from .indexer import *
+
+__all__ = (
+    database.__all__
+    + indexer.__all__
+)
@@ -0,0 +1,334 @@
+"""
+    database
+    ========
+
+    SQLite storage for indexed blocks, transactions and receipts.
+
+    Each batch of blocks is written in a single database transaction,
+    together with the checkpoint, so an interrupted indexer resumes from
+    the last batch written, without duplicate or partial rows.
+
+    License
+    -------
+
+    Copyright 2019 NEM
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import annotations
+import sqlite3
+import typing
+
+from .. import models
+from .. import util
+
+__all__ = ['Database']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blocks (
+    height INTEGER PRIMARY KEY,
+    hash TEXT NOT NULL,
+    signer TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    num_transactions INTEGER NOT NULL,
+    total_fee INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS blocks_hash ON blocks (hash);
+
+CREATE TABLE IF NOT EXISTS transactions (
+    hash TEXT PRIMARY KEY,
+    height INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    type INTEGER NOT NULL,
+    signer TEXT
+);
+CREATE INDEX IF NOT EXISTS transactions_height ON transactions (height);
+
+CREATE TABLE IF NOT EXISTS signers (
+    hash TEXT NOT NULL,
+    height INTEGER NOT NULL,
+    public_key TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS signers_public_key ON signers (public_key);
+CREATE INDEX IF NOT EXISTS signers_height ON signers (height);
+
+CREATE TABLE IF NOT EXISTS recipients (
+    hash TEXT NOT NULL,
+    height INTEGER NOT NULL,
+    recipient TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS recipients_recipient ON recipients (recipient);
+CREATE INDEX IF NOT EXISTS recipients_height ON recipients (height);
+
+CREATE TABLE IF NOT EXISTS mosaics (
+    hash TEXT NOT NULL,
+    height INTEGER NOT NULL,
+    mosaic_id TEXT NOT NULL,
+    amount INTEGER
+);
+CREATE INDEX IF NOT EXISTS mosaics_mosaic_id ON mosaics (mosaic_id);
+CREATE INDEX IF NOT EXISTS mosaics_height ON mosaics (height);
+
+CREATE TABLE IF NOT EXISTS receipts (
+    height INTEGER NOT NULL,
+    type INTEGER NOT NULL,
+    account TEXT,
+    mosaic_id TEXT,
+    amount INTEGER
+);
+CREATE INDEX IF NOT EXISTS receipts_height ON receipts (height);
+CREATE INDEX IF NOT EXISTS receipts_account ON receipts (account);
+
+CREATE TABLE IF NOT EXISTS checkpoint (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    height INTEGER NOT NULL
+);
+"""
+
+# Clear rows of tables keyed by height, without a unique key per row.
+DELETES = {
+    'signers': 'DELETE FROM signers WHERE height BETWEEN ? AND ?',
+    'recipients': 'DELETE FROM recipients WHERE height BETWEEN ? AND ?',
+    'mosaics': 'DELETE FROM mosaics WHERE height BETWEEN ? AND ?',
+    'receipts': 'DELETE FROM receipts WHERE height BETWEEN ? AND ?',
+}
+
+INSERTS = {
+    'blocks': 'INSERT OR REPLACE INTO blocks VALUES (?, ?, ?, ?, ?, ?)',
+    'transactions': 'INSERT OR REPLACE INTO transactions VALUES (?, ?, ?, ?, ?)',
+    'signers': 'INSERT INTO signers VALUES (?, ?, ?)',
+    'recipients': 'INSERT INTO recipients VALUES (?, ?, ?)',
+    'mosaics': 'INSERT INTO mosaics VALUES (?, ?, ?, ?)',
+    'receipts': 'INSERT INTO receipts VALUES (?, ?, ?, ?, ?)',
+}
+
+Rows = typing.Dict[str, typing.List[tuple]]
+OptionalTransactions = typing.Optional[typing.Sequence[models.Transaction]]
+OptionalStatements = typing.Optional[models.Statements]
+
+
+def format_id(id: typing.Any) -> str:
+    """Format a mosaic or namespace ID as hex."""
+    return f'{id:016x}'
+
+
+def format_recipient(recipient: typing.Any) -> str:
+    """Format an address, or a namespace ID alias, for a recipient."""
+
+    address = getattr(recipient, 'address', None)
+    if address is not None:
+        return address
+    return format_id(recipient)
+
+
+def iter_mosaics(transaction: typing.Any) -> typing.Iterator[typing.Tuple[str, typing.Optional[int]]]:
+    """Get the mosaic ID and amount for each mosaic referenced by a transaction."""
+
+    for mosaic in getattr(transaction, 'mosaics', None) or ():
+        yield format_id(mosaic.id), mosaic.amount
+    mosaic = getattr(transaction, 'mosaic', None)
+    if mosaic is not None:
+        yield format_id(mosaic.id), mosaic.amount
+    mosaic_id = getattr(transaction, 'mosaic_id', None)
+    if mosaic_id is not None:
+        yield format_id(mosaic_id), None
+
+
+def add_transaction_rows(rows: Rows, hash: str, height: int, transaction: typing.Any) -> None:
+    """Add the index rows for a transaction, and any inner transactions."""
+
+    signer = transaction.signer
+    if signer is not None:
+        rows['signers'].append((hash, height, signer.public_key))
+    recipient = getattr(transaction, 'recipient', None)
+    if recipient is not None:
+        rows['recipients'].append((hash, height, format_recipient(recipient)))
+    for mosaic_id, amount in iter_mosaics(transaction):
+        rows['mosaics'].append((hash, height, mosaic_id, amount))
+
+    # Inner transactions have no hash, so index them by the aggregate.
+    for inner in getattr(transaction, 'inner_transactions', None) or ():
+        add_transaction_rows(rows, hash, height, inner)
+
+
+def add_block_rows(
+    rows: Rows,
+    block: models.BlockInfo,
+    transactions: OptionalTransactions = None,
+    statements: OptionalStatements = None,
+) -> None:
+    """Add the rows for a block, and its transactions and receipts."""
+
+    height = block.height
+    rows['blocks'].append((
+        height,
+        block.hash,
+        block.signer.public_key,
+        block.timestamp,
+        block.num_transactions,
+        block.total_fee,
+    ))
+
+    for position, transaction in enumerate(transactions or ()):
+        info = transaction.transaction_info
+        hash = info.hash
+        signer = transaction.signer and transaction.signer.public_key
+        rows['transactions'].append((hash, height, position, int(transaction.type), signer))
+        add_transaction_rows(rows, hash, height, transaction)
+
+    for statement in getattr(statements, 'transaction_statements', None) or ():
+        for receipt in statement.receipts:
+            account = getattr(receipt, 'account', None)
+            mosaic = getattr(receipt, 'mosaic', None)
+            rows['receipts'].append((
+                height,
+                int(receipt.type),
+                account and account.public_key,
+                mosaic and format_id(mosaic.id),
+                mosaic and mosaic.amount,
+            ))
+
+
+class Database(util.Object):
+    """
+    SQLite database of indexed blocks, transactions and receipts.
+
+    :param path: (Optional) path to the database file.
+    """
+
+    _connection: sqlite3.Connection
+
+    def __init__(self, path: str = ':memory:') -> None:
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript(SCHEMA)
+
+    def __enter__(self) -> Database:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._connection.close()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Get the underlying SQLite connection."""
+        return self._connection
+
+    @property
+    def checkpoint(self) -> int:
+        """Get the height of the last indexed block, or 0 if none."""
+
+        row = self._connection.execute('SELECT height FROM checkpoint').fetchone()
+        return row[0] if row is not None else 0
+
+    def write(
+        self,
+        entries: typing.Sequence[typing.Tuple[models.BlockInfo, OptionalTransactions, OptionalStatements]],
+    ) -> None:
+        """
+        Write a batch of consecutive blocks, and move the checkpoint.
+
+        :param entries: Block, transactions and receipt statements for each block, by height.
+        """
+
+        if not entries:
+            return
+
+        rows: Rows = {i: [] for i in INSERTS}
+        for entry in entries:
+            add_block_rows(rows, *entry)
+        first = entries[0][0].height
+        last = entries[-1][0].height
+
+        with self._connection:
+            # Remove rows from any previous indexing of these heights.
+            for statement in DELETES.values():
+                self._connection.execute(statement, (first, last))
+            for table, statement in INSERTS.items():
+                self._connection.executemany(statement, rows[table])
+            self._connection.execute('INSERT OR REPLACE INTO checkpoint VALUES (0, ?)', (last,))
+
+    def get_block(self, height: int) -> typing.Optional[tuple]:
+        """
+        Get the indexed row for a block by height.
+
+        :param height: Block height.
+        """
+
+        return self._connection.execute('SELECT * FROM blocks WHERE height = ?', (height,)).fetchone()
+
+    def get_block_height(self, hash: str) -> typing.Optional[int]:
+        """
+        Get the height of a block by hash.
+
+        :param hash: Block hash.
+        """
+
+        row = self._connection.execute('SELECT height FROM blocks WHERE hash = ?', (hash.upper(),)).fetchone()
+        return row[0] if row is not None else None
+
+    def get_transaction(self, hash: str) -> typing.Optional[tuple]:
+        """
+        Get the indexed row for a transaction by hash.
+
+        :param hash: Transaction hash.
+        """
+
+        return self._connection.execute('SELECT * FROM transactions WHERE hash = ?', (hash.upper(),)).fetchone()
+
+    def _hashes(self, statement: str, *args) -> typing.List[str]:
+        return [i[0] for i in self._connection.execute(statement, args)]
+
+    def get_transactions_by_height(self, height: int) -> typing.List[str]:
+        """
+        Get the hashes of transactions included in a block.
+
+        :param height: Block height.
+        """
+
+        statement = 'SELECT hash FROM transactions WHERE height = ? ORDER BY position'
+        return self._hashes(statement, height)
+
+    def get_transactions_by_signer(self, public_key: str) -> typing.List[str]:
+        """
+        Get the hashes of transactions signed by an account, including inner transactions.
+
+        :param public_key: Public key of the signer.
+        """
+
+        statement = 'SELECT DISTINCT hash FROM signers WHERE public_key = ? ORDER BY height'
+        return self._hashes(statement, public_key.upper())
+
+    def get_transactions_by_recipient(self, recipient: typing.Any) -> typing.List[str]:
+        """
+        Get the hashes of transactions sent to an address or namespace alias.
+
+        :param recipient: Address or namespace ID for the recipient.
+        """
+
+        statement = 'SELECT DISTINCT hash FROM recipients WHERE recipient = ? ORDER BY height'
+        return self._hashes(statement, format_recipient(recipient))
+
+    def get_transactions_by_mosaic(self, mosaic_id: typing.Any) -> typing.List[str]:
+        """
+        Get the hashes of transactions referencing a mosaic ID or alias.
+
+        :param mosaic_id: Mosaic or namespace ID.
+        """
+
+        statement = 'SELECT DISTINCT hash FROM mosaics WHERE mosaic_id = ? ORDER BY height'
+        return self._hashes(statement, format_id(mosaic_id))
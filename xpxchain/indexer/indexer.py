@@ -0,0 +1,135 @@
+"""
+    indexer
+    =======
+
+    Pull blocks, transactions and receipts from a node into a database.
+
+    Blocks are streamed with `BlockchainHTTP.iter_blocks`, which fetches
+    windows of blocks, and their transactions and receipts, on worker
+    threads ahead of the indexer, so network requests overlap with the
+    batched database writes.
+
+    Example:
+        .. code-block:: python
+
+           >>> from xpxchain import client, indexer
+           >>> with client.BlockchainHTTP(endpoint) as http:
+           ...     with indexer.Database('chain.db') as database:
+           ...         indexer.Indexer(http, database).run()
+
+    License
+    -------
+
+    Copyright 2019 NEM
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import annotations
+import typing
+
+from .database import Database
+from .. import util
+from ..client import abc
+from ..errors import MissingBlockError
+
+__all__ = ['Indexer']
+
+# Number of blocks written per database transaction.
+DEFAULT_BATCH_SIZE = 100
+
+
+class Indexer(util.Object):
+    """
+    Resumable indexer from a synchronous blockchain client.
+
+    :param http: Synchronous blockchain HTTP client.
+    :param database: Database to index into.
+    :param batch_size: (Optional) number of blocks written per database transaction.
+    :param window: (Optional) number of blocks per request.
+    :param depth: (Optional) maximum number of requests ahead of the indexer.
+    :param receipts: (Optional) index the receipts for each block.
+    """
+
+    _http: typing.Any
+    _database: Database
+    _batch_size: int
+    _window: int
+    _depth: int
+    _receipts: bool
+
+    def __init__(
+        self,
+        http,
+        database: Database,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        window: int = abc.DEFAULT_BLOCK_WINDOW,
+        depth: int = abc.DEFAULT_PREFETCH_DEPTH,
+        receipts: bool = True,
+    ) -> None:
+        self._http = http
+        self._database = database
+        self._batch_size = batch_size
+        self._window = window
+        self._depth = depth
+        self._receipts = receipts
+
+    @property
+    def database(self) -> Database:
+        """Get the database to index into."""
+        return self._database
+
+    def run(self, end: typing.Optional[int] = None) -> int:
+        """
+        Index all blocks after the checkpoint, up to a height.
+
+        Indexing stops before a block missing from the node, or whose
+        transactions do not match the count in the block.
+
+        :param end: (Optional) height of the last block, or the chain height.
+        :return: Height of the last indexed block.
+        """
+
+        start = self._database.checkpoint + 1
+        if end is None:
+            end = self._http.get_blockchain_height()
+        if start > end:
+            return self._database.checkpoint
+
+        blocks = self._http.iter_blocks(
+            start,
+            end,
+            window=self._window,
+            depth=self._depth,
+            transactions=True,
+            receipts=self._receipts,
+        )
+        batch = []
+        try:
+            try:
+                for entry in blocks:
+                    if len(entry[1]) != entry[0].num_transactions:
+                        # The transactions are incomplete, so never
+                        # checkpoint past the block, and retry it later.
+                        break
+                    batch.append(entry)
+                    if len(batch) >= self._batch_size:
+                        self._database.write(batch)
+                        batch = []
+            except MissingBlockError:
+                # The node is missing blocks, so never skip past them.
+                pass
+            self._database.write(batch)
+        finally:
+            blocks.close()
+        return self._database.checkpoint
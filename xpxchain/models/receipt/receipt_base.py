@@ -165,6 +165,9 @@ class ReceiptBase(util.Model):
         # if network_type is not None and network_type != nt:
         #    raise ValueError('Network type does not match receipt.')
 
+        # Store the network type, which the DTO does not carry.
+        inst._set('network_type', network_type)
+
         # Load shared and specific receipt data.
         inst.load_dto_shared(data, network_type)
         inst.load_dto_specific(data, network_type)
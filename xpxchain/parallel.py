@@ -0,0 +1,243 @@
+"""
+    parallel
+    ========
+
+    Decode large batches of data-transfer objects across processes.
+
+    Decoding models is CPU-bound, so large responses decoded on a single
+    core are slow, and block the event loop for asynchronous clients.
+    Large batches are split into chunks, decoded in a process pool, and
+    the pickled models sent back. Small batches are decoded inline,
+    since the cost of sending them to another process outweighs any
+    speedup.
+
+    Example:
+        .. code-block:: python
+
+           >>> from xpxchain import models, parallel
+           >>> transactions = parallel.decode_many(models.Transaction, dtos)
+           >>> async with client.AsyncHTTP(endpoint, decoder=parallel.Decoder()) as http:
+           ...     blocks = await http.get_blocks_by_height_with_limit(1, 100)
+
+    License
+    -------
+
+    Copyright 2019 NEM
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import annotations
+import asyncio
+import concurrent.futures
+import threading
+import typing
+
+from . import util
+from .models.blockchain.network_type import OptionalNetworkType
+
+__all__ = [
+    'Decoder',
+    'decode_many',
+    'decode_many_async',
+    'shutdown',
+]
+
+# Minimum number of items to decode in the process pool.
+DEFAULT_THRESHOLD = 1000
+# Number of items decoded by each task.
+DEFAULT_CHUNK_SIZE = 250
+
+ModelType = typing.Type[util.DTO]
+
+EXECUTOR: typing.Optional[concurrent.futures.Executor] = None
+EXECUTOR_LOCK = threading.Lock()
+
+
+def get_executor() -> concurrent.futures.Executor:
+    """Get the shared process pool, starting it if required."""
+
+    global EXECUTOR
+    with EXECUTOR_LOCK:
+        if EXECUTOR is None:
+            EXECUTOR = concurrent.futures.ProcessPoolExecutor()
+        return EXECUTOR
+
+
+def shutdown(wait: bool = True) -> None:
+    """
+    Shutdown the shared process pool, if started.
+
+    :param wait: (Optional) wait for pending tasks to complete.
+    """
+
+    global EXECUTOR
+    with EXECUTOR_LOCK:
+        executor = EXECUTOR
+        EXECUTOR = None
+    if executor is not None:
+        executor.shutdown(wait)
+
+
+def decode_chunk(
+    type: ModelType,
+    data: typing.Sequence[typing.Any],
+    network_type: OptionalNetworkType = None,
+) -> typing.List[typing.Any]:
+    """Decode a chunk of data-transfer objects, in a worker process."""
+    return [type.create_from_dto(i, network_type) for i in data]
+
+
+def split(data: typing.Sequence[typing.Any], chunk_size: int) -> typing.List[typing.Sequence[typing.Any]]:
+    """Split items into chunks."""
+    return [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)]
+
+
+class Decoder(util.Object):
+    """
+    Decode large batches of models in an executor.
+
+    :param executor: (Optional) executor to decode with, defaults to a shared process pool.
+    :param threshold: (Optional) minimum number of items to decode in the executor.
+    :param chunk_size: (Optional) number of items decoded by each task.
+    """
+
+    _executor: typing.Optional[concurrent.futures.Executor]
+    _threshold: int
+    _chunk_size: int
+
+    def __init__(
+        self,
+        executor: typing.Optional[concurrent.futures.Executor] = None,
+        threshold: int = DEFAULT_THRESHOLD,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        if chunk_size < 1:
+            raise ValueError('Chunk size must be positive.')
+        self._executor = executor
+        self._threshold = threshold
+        self._chunk_size = chunk_size
+
+    @property
+    def executor(self) -> concurrent.futures.Executor:
+        """Get the executor to decode with."""
+        return self._executor or get_executor()
+
+    @property
+    def threshold(self) -> int:
+        """Get the minimum number of items to decode in the executor."""
+        return self._threshold
+
+    @property
+    def chunk_size(self) -> int:
+        """Get the number of items decoded by each task."""
+        return self._chunk_size
+
+    def accepts(self, data: typing.Sequence[typing.Any]) -> bool:
+        """
+        Determine if items must be decoded in the executor.
+
+        :param data: Data-transfer objects to decode.
+        """
+        return len(data) >= self._threshold
+
+    def decode(
+        self,
+        type: ModelType,
+        data: typing.Sequence[typing.Any],
+        network_type: OptionalNetworkType = None,
+    ) -> typing.List[typing.Any]:
+        """
+        Decode models, in the executor for large batches.
+
+        :param type: Model class.
+        :param data: Data-transfer objects to decode.
+        :param network_type: (Optional) network type to decode models with.
+        """
+
+        if not self.accepts(data):
+            return decode_chunk(type, data, network_type)
+
+        executor = self.executor
+        futures = [
+            executor.submit(decode_chunk, type, chunk, network_type)
+            for chunk in split(data, self._chunk_size)
+        ]
+        results: typing.List[typing.Any] = []
+        for future in futures:
+            results += future.result()
+        return results
+
+    async def decode_async(
+        self,
+        type: ModelType,
+        data: typing.Sequence[typing.Any],
+        network_type: OptionalNetworkType = None,
+        loop: util.OptionalLoopType = None,
+    ) -> typing.List[typing.Any]:
+        """
+        Decode models without blocking the event loop for large batches.
+
+        :param type: Model class.
+        :param data: Data-transfer objects to decode.
+        :param network_type: (Optional) network type to decode models with.
+        :param loop: (Optional) event loop.
+        """
+
+        if not self.accepts(data):
+            return decode_chunk(type, data, network_type)
+
+        loop = loop or asyncio.get_event_loop()
+        executor = self.executor
+        chunks = await asyncio.gather(*(
+            loop.run_in_executor(executor, decode_chunk, type, chunk, network_type)
+            for chunk in split(data, self._chunk_size)
+        ))
+        results: typing.List[typing.Any] = []
+        for chunk in chunks:
+            results += chunk
+        return results
+
+
+def decode_many(
+    type: ModelType,
+    data: typing.Sequence[typing.Any],
+    network_type: OptionalNetworkType = None,
+    **kwds
+) -> typing.List[typing.Any]:
+    """
+    Decode models, across a process pool for large batches.
+
+    :param type: Model class.
+    :param data: Data-transfer objects to decode.
+    :param network_type: (Optional) network type to decode models with.
+    :param \\**kwds: Optional keyword arguments for `Decoder`.
+    """
+    return Decoder(**kwds).decode(type, data, network_type)
+
+
+async def decode_many_async(
+    type: ModelType,
+    data: typing.Sequence[typing.Any],
+    network_type: OptionalNetworkType = None,
+    **kwds
+) -> typing.List[typing.Any]:
+    """
+    Decode models, across a process pool for large batches, without blocking the event loop.
+
+    :param type: Model class.
+    :param data: Data-transfer objects to decode.
+    :param network_type: (Optional) network type to decode models with.
+    :param \\**kwds: Optional keyword arguments for `Decoder`.
+    """
+    return await Decoder(**kwds).decode_async(type, data, network_type)
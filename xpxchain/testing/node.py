@@ -0,0 +1,644 @@
+"""
+    node
+    ====
+
+    Local stand-in for a Sirius REST and websocket node.
+
+    The stand-in serves the routes used by the NIS clients, with fixture
+    responses for static data, and synthetic responses for the chain
+    itself: the height grows at a configurable rate, blocks are generated
+    on demand, and announced transactions are tracked, confirmed (or
+    failed) in the next block, and pushed over websockets on the `block`,
+    `confirmedAdded` and `status` channels. Latency and error injection
+    apply to every REST request, so clients can be benchmarked and load
+    tested end to end, without a network.
+
+    Example:
+        .. code-block:: python
+
+           >>> from xpxchain import client
+           >>> from xpxchain.testing import StandInNode
+           >>> async with StandInNode(block_interval=1, latency=0.005) as node:
+           ...     async with client.AsyncHTTP(node.endpoint) as http:
+           ...         await http.blockchain.get_blockchain_height()
+
+        Or from the command line:
+
+        .. code-block:: bash
+
+           python -m xpxchain.testing --port 3000 --block-interval 1
+
+    Fixtures are read from `tests/data` in a source checkout. They are
+    not installed with the package, so installed copies must pass the
+    fixtures directory.
+
+    License
+    -------
+
+    Copyright 2019 NEM
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import annotations
+import argparse
+import asyncio
+import collections
+import copy
+import json
+import os
+import random
+import typing
+import uuid
+
+from aiohttp import web
+
+from .. import models
+from .. import util
+
+__all__ = [
+    'StandInNode',
+    'default_data_dir',
+]
+
+DEFAULT_BLOCK_INTERVAL = 15.0
+DEFAULT_ERROR_STATUS = 503
+# Status for synthetic transaction failures.
+FAILURE_STATUS = 'Failure_Core_Insufficient_Balance'
+
+NETWORK_NAMES = {
+    models.NetworkType.MIJIN: 'mijin',
+    models.NetworkType.MIJIN_TEST: 'mijinTest',
+    models.NetworkType.MAIN_NET: 'public',
+    models.NetworkType.TEST_NET: 'publicTest',
+    models.NetworkType.PRIVATE: 'private',
+    models.NetworkType.PRIVATE_TEST: 'privateTest',
+}
+
+# Routes served from the fixtures, by method and path.
+FIXTURE_ROUTES: typing.Sequence[typing.Tuple[str, str, str]] = (
+    ('GET', '/account/{address}', 'account_info.json'),
+    ('POST', '/account', 'accounts_info.json'),
+    ('GET', '/account/{address}/properties', 'account_properties.json'),
+    ('POST', '/account/properties', 'accounts_properties.json'),
+    ('GET', '/account/{address}/multisig', 'multisig_info.json'),
+    ('GET', '/account/{address}/multisig/graph', 'multisig_graph_info.json'),
+    ('GET', '/account/{public_key}/transactions', 'transactions.json'),
+    ('GET', '/account/{public_key}/transactions/incoming', 'transactions.json'),
+    ('GET', '/account/{public_key}/transactions/outgoing', 'transactions.json'),
+    ('GET', '/account/{public_key}/transactions/unconfirmed', 'transactions.json'),
+    ('GET', '/account/{public_key}/transactions/partial', 'transactions.json'),
+    ('POST', '/account/names', 'account_names.json'),
+    ('GET', '/account/{public_key}/metadata', 'account_metadata.json'),
+    ('GET', '/account/{address}/namespaces', 'namespaces.json'),
+    ('POST', '/account/namespaces', 'namespaces.json'),
+    ('GET', '/block/{height}/receipts', 'block_receipts.json'),
+    ('GET', '/block/{height}/transaction/{hash}/merkle', 'block_transaction_merkle.json'),
+    ('GET', '/chain/score', 'chain_score.json'),
+    ('GET', '/diagnostic/blocks/{height}/limit/{limit}', 'diagnostic_blocks_info.json'),
+    ('GET', '/diagnostic/storage', 'diagnostic_storage.json'),
+    ('GET', '/diagnostic/server', 'diagnostic_server.json'),
+    ('GET', '/mosaic/{mosaic_id}/metadata', 'mosaic_metadata.json'),
+    ('GET', '/namespace/{namespace_id}/metadata', 'namespace_metadata.json'),
+    ('GET', '/metadata/{metadata_id}', 'metadata.json'),
+    ('POST', '/metadata', 'metadatas.json'),
+    ('GET', '/config/{height}', 'config.json'),
+    ('GET', '/upgrade/{height}', 'upgrade.json'),
+    ('GET', '/node/info', 'node_info.json'),
+    ('GET', '/node/time', 'node_time.json'),
+    ('GET', '/mosaic/{mosaic_id}', 'mosaic_info.json'),
+    ('POST', '/mosaic', 'mosaics_info.json'),
+    ('POST', '/mosaic/names', 'mosaic_names.json'),
+    ('GET', '/namespace/{namespace_id}', 'namespace.json'),
+    ('POST', '/namespace/names', 'namespace_names.json'),
+)
+
+Latency = typing.Union[float, typing.Tuple[float, float]]
+
+
+def default_data_dir() -> typing.Optional[str]:
+    """Get the fixtures directory of a source checkout, if available."""
+
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    path = os.path.join(root, 'tests', 'data')
+    return path if os.path.isdir(path) else None
+
+
+def error_response(status: int, code: str, message: str) -> web.Response:
+    return web.json_response({'code': code, 'message': message}, status=status)
+
+
+class TrackedTransaction(util.Object):
+    """Announced transaction, and its state on the stand-in chain."""
+
+    __slots__ = ('hash', 'transaction', 'group', 'status', 'height', 'index')
+
+    hash: str
+    transaction: typing.Optional[models.Transaction]
+    group: str
+    status: str
+    height: int
+    index: int
+
+    def __init__(self, hash: str, transaction: typing.Optional[models.Transaction]) -> None:
+        self.hash = hash
+        self.transaction = transaction
+        self.group = 'unconfirmed'
+        self.status = 'Success'
+        self.height = 0
+        self.index = 0
+
+    @property
+    def address(self) -> typing.Optional[models.Address]:
+        if self.transaction is None:
+            return None
+        return self.transaction.signer.address
+
+    @property
+    def deadline(self) -> typing.List[int]:
+        if self.transaction is None:
+            return [0, 0]
+        return util.u64_to_dto(self.transaction.deadline.to_timestamp())
+
+    def status_dto(self) -> dict:
+        data = {
+            'group': self.group,
+            'status': self.status,
+            'hash': self.hash,
+            'deadline': self.deadline,
+        }
+        if self.height:
+            data['height'] = util.u64_to_dto(self.height)
+        return data
+
+    def meta_dto(self) -> dict:
+        return {
+            'height': util.u64_to_dto(self.height),
+            'hash': self.hash,
+            'merkleComponentHash': self.hash,
+            'index': self.index,
+            'id': self.hash[:24],
+        }
+
+    def to_dto(self, network_type: models.NetworkType) -> dict:
+        data = typing.cast(models.Transaction, self.transaction).to_dto(network_type)
+        data['meta'] = self.meta_dto()
+        return data
+
+
+class StandInNode(util.Object):
+    """
+    Stand-in REST and websocket node, serving fixture and synthetic data.
+
+    :param data_dir: (Optional) directory with the JSON fixtures, required outside a source checkout.
+    :param network_type: (Optional) network type for the node.
+    :param height: (Optional) initial chain height.
+    :param block_interval: (Optional) seconds between new blocks, None to only add blocks manually.
+    :param latency: (Optional) seconds to delay each request by, or a (min, max) range.
+    :param error_rate: (Optional) fraction of requests failing with `error_status`.
+    :param error_status: (Optional) status code for injected errors.
+    :param failure_rate: (Optional) fraction of announced transactions failing in the next block.
+    :param seed: (Optional) seed for latency, errors and failures, for reproducible runs.
+    """
+
+    height: int
+    requests: typing.Counter[str]
+    errors: int
+    _data_dir: str
+    _network_type: models.NetworkType
+    _block_interval: typing.Optional[float]
+    _latency: Latency
+    _error_rate: float
+    _error_status: int
+    _failure_rate: float
+    _random: random.Random
+    _fixtures: typing.Dict[str, bytes]
+    _block: typing.Optional[dict]
+    _transactions: typing.Dict[str, TrackedTransaction]
+    _pending: typing.List[TrackedTransaction]
+    _blocks: typing.Dict[int, typing.List[TrackedTransaction]]
+    _sockets: typing.Dict[web.WebSocketResponse, typing.Set[str]]
+    _app: web.Application
+    _runner: typing.Optional[web.AppRunner]
+    _task: typing.Optional[asyncio.Future]
+    _endpoint: typing.Optional[str]
+
+    def __init__(
+        self,
+        data_dir: typing.Optional[str] = None,
+        network_type: models.NetworkType = models.NetworkType.MIJIN_TEST,
+        height: int = 1,
+        block_interval: typing.Optional[float] = DEFAULT_BLOCK_INTERVAL,
+        latency: Latency = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = DEFAULT_ERROR_STATUS,
+        failure_rate: float = 0.0,
+        seed: typing.Optional[int] = None,
+    ) -> None:
+        if height < 1:
+            raise ValueError('Chain height must be positive.')
+        if not 0 <= error_rate <= 1 or not 0 <= failure_rate <= 1:
+            raise ValueError('Error and failure rates must be between 0 and 1.')
+        self.height = height
+        self.requests = collections.Counter()
+        self.errors = 0
+        data_dir = data_dir or default_data_dir()
+        if data_dir is None or not os.path.isdir(data_dir):
+            # Fixtures are not installed with the package, so fail early,
+            # rather than serving errors for every fixture route.
+            raise FileNotFoundError(f'No fixtures directory, pass `data_dir`: {data_dir}.')
+        self._data_dir = data_dir
+        self._network_type = network_type
+        self._block_interval = block_interval
+        self._latency = latency
+        self._error_rate = error_rate
+        self._error_status = error_status
+        self._failure_rate = failure_rate
+        # Seeded, so failure injection is reproducible, not security-sensitive.
+        self._random = random.Random(seed)  # nosec
+        self._fixtures = {}
+        self._block = None
+        self._transactions = {}
+        self._pending = []
+        self._blocks = {}
+        self._sockets = {}
+        self._runner = None
+        self._task = None
+        self._endpoint = None
+        self._app = self._create_app()
+
+    async def __aenter__(self) -> StandInNode:
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    @property
+    def app(self) -> web.Application:
+        """Get the web application, to serve it with a custom runner."""
+        return self._app
+
+    @property
+    def endpoint(self) -> str:
+        """Get the endpoint of the running node."""
+        if self._endpoint is None:
+            raise RuntimeError('Stand-in node is not running.')
+        return self._endpoint
+
+    @property
+    def ws_endpoint(self) -> str:
+        """Get the websocket endpoint of the running node, for listeners."""
+        return 'ws' + self.endpoint[len('http'):] + '/ws'
+
+    @property
+    def transactions(self) -> typing.Mapping[str, TrackedTransaction]:
+        """Get the announced transactions by hash."""
+        return self._transactions
+
+    # LIFECYCLE
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        """
+        Serve the node, and start growing the chain.
+
+        Returns the endpoint of the node.
+
+        :param host: (Optional) host to bind to.
+        :param port: (Optional) port to bind to, 0 for a free port.
+        """
+
+        self._runner = web.AppRunner(self._app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        server = typing.cast(typing.Any, site)._server
+        port = server.sockets[0].getsockname()[1]
+        self._endpoint = f'http://{host}:{port}'
+        if self._block_interval is not None:
+            self._task = asyncio.ensure_future(self._grow(self._block_interval))
+        return self._endpoint
+
+    async def close(self) -> None:
+        """Stop growing the chain, close websockets, and stop serving."""
+
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        for socket in list(self._sockets):
+            await socket.close()
+        runner, self._runner = self._runner, None
+        if runner is not None:
+            await runner.cleanup()
+        self._endpoint = None
+
+    async def _grow(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            await self.add_block()
+
+    # CHAIN
+
+    async def add_block(self) -> dict:
+        """
+        Add a block, confirming or failing all pending transactions.
+
+        Pushes the block, and the confirmed transactions or status errors,
+        to subscribed websockets. Returns the block DTO.
+        """
+
+        self.height += 1
+        pending, self._pending = self._pending, []
+        confirmed = []
+        for transaction in pending:
+            if transaction.transaction is not None and self._random.random() >= self._failure_rate:
+                transaction.group = 'confirmed'
+                transaction.height = self.height
+                transaction.index = len(confirmed)
+                confirmed.append(transaction)
+            else:
+                transaction.group = 'failed'
+                transaction.status = FAILURE_STATUS
+                transaction.height = self.height
+        self._blocks[self.height] = confirmed
+
+        block = self.block(self.height)
+        await self._publish('block', block)
+        for transaction in pending:
+            address = transaction.address
+            if address is None:
+                continue
+            elif transaction.group == 'confirmed':
+                data = transaction.to_dto(self._network_type)
+                data['meta']['channelName'] = 'confirmedAdded'
+                await self._publish(f'confirmedAdded/{address.address}', data)
+            else:
+                data = transaction.status_dto()
+                del data['group'], data['height']
+                data['meta'] = {'channelName': 'status', 'address': address.hex}
+                await self._publish(f'status/{address.address}', data)
+        return block
+
+    def block(self, height: int) -> dict:
+        """
+        Get the synthetic block DTO at a height.
+
+        :param height: Block height.
+        """
+
+        template = self._template()
+        if height == 1:
+            return template
+
+        block = copy.deepcopy(template)
+        block['meta']['hash'] = block_hash(height)
+        block['meta']['generationHash'] = block_hash(height, b'generation')
+        block['meta']['numTransactions'] = len(self._blocks.get(height, ()))
+        block['block']['height'] = util.u64_to_dto(height)
+        block['block']['timestamp'] = util.u64_to_dto(height * 15000)
+        if height == 2:
+            block['block']['previousBlockHash'] = template['meta']['hash']
+        else:
+            block['block']['previousBlockHash'] = block_hash(height - 1)
+        return block
+
+    def announce(self, payload: str) -> TrackedTransaction:
+        """
+        Track an announced transaction, to confirm in the next block.
+
+        :param payload: Hex-encoded, signed transaction payload.
+        """
+
+        generation_hash = self._template()['meta']['generationHash']
+        hash = models.Transaction.transaction_hash(payload, generation_hash).upper()
+        tracked = self._transactions.get(hash)
+        if tracked is not None:
+            return tracked
+        try:
+            transaction = models.Transaction.create_from_catbuffer(payload, self._network_type)
+        except Exception:
+            # Keep the hash, to report the transaction as failed.
+            transaction = None
+        tracked = TrackedTransaction(hash, transaction)
+        self._transactions[hash] = tracked
+        self._pending.append(tracked)
+        return tracked
+
+    def _template(self) -> dict:
+        if self._block is None:
+            self._block = json.loads(self._fixture('block_info.json'))
+        return self._block
+
+    def _fixture(self, name: str) -> bytes:
+        content = self._fixtures.get(name)
+        if content is None:
+            with open(os.path.join(self._data_dir, name)) as f:
+                content = json.load(f)['content'].encode('utf-8')
+            self._fixtures[name] = content
+        return content
+
+    # WEBSOCKETS
+
+    async def _publish(self, channel: str, data: dict) -> None:
+        message = json.dumps(data)
+        for socket, channels in list(self._sockets.items()):
+            if channel in channels and not socket.closed:
+                await socket.send_str(message)
+
+    async def _websocket(self, request: web.Request) -> web.WebSocketResponse:
+        socket = web.WebSocketResponse()
+        await socket.prepare(request)
+        uid = uuid.uuid4().hex.upper()
+        channels: typing.Set[str] = set()
+        self._sockets[socket] = channels
+        try:
+            await socket.send_str(json.dumps({'uid': uid}))
+            async for message in socket:
+                data = json.loads(message.data)
+                if 'subscribe' in data:
+                    channels.add(data['subscribe'])
+                elif 'unsubscribe' in data:
+                    channels.discard(data['unsubscribe'])
+        finally:
+            del self._sockets[socket]
+        return socket
+
+    # HTTP
+
+    def _create_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._middleware])
+        router = app.router
+        router.add_get('/ws', self._websocket)
+        router.add_get('/network', self._network)
+        router.add_get('/chain/height', self._chain_height)
+        router.add_get('/block/{height}', self._block_handler)
+        router.add_get('/blocks/{height}/limit/{limit}', self._blocks_handler)
+        router.add_get('/block/{height}/transactions', self._block_transactions)
+        router.add_put('/transaction', self._announce)
+        router.add_put('/transaction/partial', self._announce)
+        router.add_put('/transaction/cosignature', self._announce_cosignature)
+        router.add_get('/transaction/{hash}', self._transaction)
+        router.add_post('/transaction', self._transactions_handler)
+        router.add_get('/transaction/{hash}/status', self._transaction_status)
+        router.add_post('/transaction/statuses', self._transaction_statuses)
+        for method, path, name in FIXTURE_ROUTES:
+            router.add_route(method, path, self._fixture_handler(name))
+        return app
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        route = request.match_info.route.resource
+        name = route.canonical if route is not None else request.path
+        self.requests[f'{request.method} {name}'] += 1
+        if name == '/ws':
+            return await handler(request)
+
+        latency = self._latency
+        if isinstance(latency, tuple):
+            latency = self._random.uniform(*latency)
+        if latency > 0:
+            await asyncio.sleep(latency)
+        if self._error_rate and self._random.random() < self._error_rate:
+            self.errors += 1
+            return error_response(self._error_status, 'ServiceUnavailable', 'Injected error.')
+        return await handler(request)
+
+    def _fixture_handler(self, name: str):
+        async def handler(request: web.Request) -> web.Response:
+            try:
+                content = self._fixture(name)
+            except FileNotFoundError:
+                return error_response(404, 'ResourceNotFound', f'No fixture {name}.')
+            return web.Response(body=content, content_type='application/json')
+
+        return handler
+
+    async def _network(self, request: web.Request) -> web.Response:
+        name = NETWORK_NAMES[self._network_type]
+        return web.json_response({'name': name, 'description': 'stand-in network'})
+
+    async def _chain_height(self, request: web.Request) -> web.Response:
+        return web.json_response({'height': util.u64_to_dto(self.height)})
+
+    def _height(self, request: web.Request) -> typing.Optional[int]:
+        try:
+            height = int(request.match_info['height'])
+        except ValueError:
+            return None
+        return height if 1 <= height <= self.height else None
+
+    async def _block_handler(self, request: web.Request) -> web.Response:
+        height = self._height(request)
+        if height is None:
+            return error_response(404, 'ResourceNotFound', 'No block at height.')
+        return web.json_response(self.block(height))
+
+    async def _blocks_handler(self, request: web.Request) -> web.Response:
+        height = self._height(request)
+        if height is None:
+            return web.json_response([])
+        limit = int(request.match_info['limit'])
+        end = min(self.height, height + limit - 1)
+        return web.json_response([self.block(i) for i in range(height, end + 1)])
+
+    async def _block_transactions(self, request: web.Request) -> web.Response:
+        height = self._height(request)
+        if height is None:
+            return error_response(404, 'ResourceNotFound', 'No block at height.')
+        transactions = self._blocks.get(height, ())
+        return web.json_response([i.to_dto(self._network_type) for i in transactions])
+
+    async def _announce(self, request: web.Request) -> web.Response:
+        data = await request.json()
+        try:
+            self.announce(data['payload'])
+        except (KeyError, TypeError, ValueError):
+            return error_response(409, 'InvalidArgument', 'Invalid transaction payload.')
+        message = f'packet 9 was pushed to the network via {request.path}'
+        return web.json_response({'message': message}, status=202)
+
+    async def _announce_cosignature(self, request: web.Request) -> web.Response:
+        await request.json()
+        message = f'packet 0 was pushed to the network via {request.path}'
+        return web.json_response({'message': message}, status=202)
+
+    async def _transaction(self, request: web.Request) -> web.Response:
+        tracked = self._transactions.get(request.match_info['hash'].upper())
+        if tracked is None or tracked.transaction is None:
+            return error_response(404, 'ResourceNotFound', 'No transaction with hash.')
+        return web.json_response(tracked.to_dto(self._network_type))
+
+    async def _transactions_handler(self, request: web.Request) -> web.Response:
+        data = await request.json()
+        tracked = [self._transactions.get(i.upper()) for i in data.get('transactionIds', ())]
+        dtos = [i.to_dto(self._network_type) for i in tracked if i is not None and i.transaction is not None]
+        return web.json_response(dtos)
+
+    async def _transaction_status(self, request: web.Request) -> web.Response:
+        tracked = self._transactions.get(request.match_info['hash'].upper())
+        if tracked is None:
+            return error_response(404, 'ResourceNotFound', 'No transaction with hash.')
+        return web.json_response(tracked.status_dto())
+
+    async def _transaction_statuses(self, request: web.Request) -> web.Response:
+        data = await request.json()
+        tracked = [self._transactions.get(i.upper()) for i in data.get('hashes', ())]
+        return web.json_response([i.status_dto() for i in tracked if i is not None])
+
+
+def block_hash(height: int, salt: bytes = b'block') -> str:
+    """Get a deterministic, synthetic hash for a block."""
+
+    data = salt + height.to_bytes(8, 'little')
+    return util.hashlib.sha3_256(data).hexdigest().upper()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Serve a stand-in Sirius node.')
+    parser.add_argument('--host', default='127.0.0.1', help='host to bind to')
+    parser.add_argument('--port', type=int, default=3000, help='port to bind to')
+    data_dir = default_data_dir()
+    parser.add_argument(
+        '--data-dir',
+        default=data_dir,
+        required=data_dir is None,
+        help='directory with the JSON fixtures, tests/data from a source checkout by default',
+    )
+    parser.add_argument('--block-interval', type=float, default=DEFAULT_BLOCK_INTERVAL, help='seconds between blocks')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds to delay each request by')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests to fail')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='fraction of transactions to fail')
+    parser.add_argument('--seed', type=int, help='random seed')
+    args = parser.parse_args()
+
+    node = StandInNode(
+        data_dir=args.data_dir,
+        block_interval=args.block_interval,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        failure_rate=args.failure_rate,
+        seed=args.seed,
+    )
+    loop = asyncio.get_event_loop()
+    endpoint = loop.run_until_complete(node.start(args.host, args.port))
+    print(f'Serving stand-in node on {endpoint}', flush=True)
+    try:
+        loop.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        loop.run_until_complete(node.close())
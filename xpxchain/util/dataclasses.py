@@ -196,6 +196,32 @@ def set_deepcopy(
     clsdict['__deepcopy__'] = func
 
 
+def rebuild(cls: typing.Type, kwds: typing.Dict[str, typing.Any]):
+    """Recreate an instance from its initializer arguments, when unpickling."""
+    return cls(**kwds)
+
+
+def set_reduce(
+    cls: typing.Type,
+    clsdict: Vars,
+    reduce: bool,
+) -> None:
+    """Set default __reduce__ implementation."""
+
+    # Frozen, slotted instances cannot have their slots restored by
+    # the default pickle protocol, so pickle the initializer arguments.
+    if not reduce or '__reduce__' in clsdict:
+        return
+
+    def func(self):
+        return (rebuild, (type(self), replace_dict(self)))
+
+    func.__name__ = '__reduce__'
+    func.__qualname__ = f'{cls.__qualname__}.__reduce__'
+    func.__module__ = cls.__module__
+    clsdict['__reduce__'] = func
+
+
 def shallow_asdict(self, dict_factory: DictFactory = dict) -> DictType:
     names = [i.name for i in dataclasses.fields(self)]
     return dict_factory([(i, getattr(self, i)) for i in names])
@@ -329,6 +355,7 @@ def wrap_dataclass(
     slots: bool = True,
     copy: bool = True,
     deepcopy: bool = True,
+    reduce: bool = True,
     asdict: bool = True,
     astuple: bool = True,
     fields: bool = True,
@@ -345,6 +372,7 @@ def wrap_dataclass(
     set_slots(cls, clsdict, slots, global_vars, local_vars)
     set_copy(cls, clsdict, copy)
     set_deepcopy(cls, clsdict, deepcopy)
+    set_reduce(cls, clsdict, reduce)
     set_asdict(cls, clsdict, asdict)
     set_astuple(cls, clsdict, astuple)
     set_fields(cls, clsdict, fields)
@@ -452,6 +480,7 @@ def dataclass(
     slots: bool = True,
     copy: bool = True,
     deepcopy: bool = True,
+    reduce: bool = True,
     asdict: bool = True,
     astuple: bool = True,
     fields: bool = True,
@@ -475,6 +504,7 @@ def dataclass(
         'slots': slots,
         'copy': copy,
         'deepcopy': deepcopy,
+        'reduce': reduce,
         'asdict': asdict,
         'astuple': astuple,
         'fields': fields,
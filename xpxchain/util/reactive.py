@@ -94,8 +94,7 @@ try:            # noqa: C901
             # Method
             @functools.wraps(f)
             def wrapper(self, *args, **kwds):
-                loop = getattr(self, "loop", None)
-                return adapter(f(self, *args, **kwds), loop=loop)
+                return adapter(f(self, *args, **kwds), owner=self)
         else:
             # Function
             @functools.wraps(f)
@@ -30,9 +30,14 @@ import rx
 class AsyncGenerator:
     """Asynchronous generator wrapper type."""
 
-    def __init__(self, value, loop=None):
+    __slots__ = ('_value', '_loop', '_owner', '_observable')
+
+    def __init__(self, value, loop=None, owner=None):
         self._value = value
         self._loop = loop
+        # Resolve the loop from the owner only when exported to an
+        # Observable, since most results are just awaited.
+        self._owner = owner
         self._observable = None
         # In case we get an asynchronous iterable, which does not
         # support __anext__. If we get an asynchronous iterator,
@@ -57,10 +62,17 @@ class AsyncGenerator:
         if self._observable is None:
             self._observable = rx.Observable.from_async_iterable(
                 self._value,
-                loop=self._loop
+                loop=self.loop
             )
         return self._observable
 
+    @property
+    def loop(self):
+        """Get event loop for the Observable."""
+        if self._owner is not None:
+            return getattr(self._owner, 'loop', None)
+        return self._loop
+
     @property
     def ag_await(self):
         return self._value.ag_await